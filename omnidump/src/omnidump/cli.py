@@ -1,10 +1,27 @@
+import math
 import pwd
 import os
 import sys
 import click
 import psutil
 from . import pid_mapping_logic
-from .config_pid import CliAppConfig  
+from . import pid_group_logic
+from . import snapshot_logic
+from . import diff_logic
+from . import watch_logic
+from . import sample_logic
+from . import pipeline_logic
+from . import entropy_scan_logic
+from . import key_scan_logic
+from . import rules_scan_logic
+from . import grep_logic
+from . import ioc_logic
+from . import carve_logic
+from . import elf_logic
+from . import shared_lib_logic
+from . import pointer_logic
+from . import walk_logic
+from .config_pid import CliAppConfig, FLAG_TO_SECTION_MAP
 
 def pid_map_file(
         process_maps,
@@ -13,6 +30,12 @@ def pid_map_file(
         ):
     
     dict_to_pass = pid_mapping_logic.group_regions(process_maps)
+    if dict_to_pass is None:
+        # The process exited after it was selected, e.g. a group member.
+        raise FileNotFoundError(f"No such file: '{process_maps}'")
+    if config.flag_snapshot:
+        snapshot_logic.snapshot_dump(process_mem, dict_to_pass, config)
+        return
     pid_mapping_logic.dump_bytes_mem(
             process_mem,
             dict_to_pass,
@@ -28,6 +51,9 @@ def pid_pass_flags(config: CliAppConfig):
         flag_exec_sec (bool): True if the executable sections should be dumped.
         flag_slib_sec (bool): True if the shared library sections should be dumped.
         ... (and so on for all flags)
+
+    Returns:
+        bool: False if the process could not be read, e.g. because it exited.
     """
 
     click.echo(f"Dumping memory segments for PID {config.pid}...\n")
@@ -42,8 +68,35 @@ def pid_pass_flags(config: CliAppConfig):
 
     except PermissionError:
         click.echo("Permission denied. Please run as sudo.")
+        return False
     except FileNotFoundError:
         click.echo("Process file not found. Run 'omnidump' show' to look for another process.")
+        return False
+    return True
+
+def pid_pass_group(config: CliAppConfig, tree_pid, cgroup_path, workers):
+    """
+    Resolves the members of a process tree or cgroup and dumps them together.
+
+    Args:
+        config (CliAppConfig): The dump configuration shared by every member.
+        tree_pid (int or None): Root PID when dumping a process tree.
+        cgroup_path (str or None): cgroup directory when dumping a cgroup.
+        workers (int or None): Size of the shared worker pool.
+    """
+    try:
+        if tree_pid is not None:
+            pids = pid_group_logic.get_tree_pids(tree_pid)
+        else:
+            pids = pid_group_logic.get_cgroup_pids(cgroup_path)
+    except PermissionError:
+        click.echo("Permission denied. Please run as sudo.")
+        return
+    except (FileNotFoundError, ValueError):
+        click.echo("Could not read the process group. Check the '--tree' PID or '--cgroup' path.")
+        return
+
+    pid_group_logic.dump_pid_group(pids, config, pid_pass_flags, workers)
 
 @click.group()
 def main():
@@ -117,8 +170,495 @@ def show(user, flag_sleeping, flag_idle, flag_running):
     if found_processes == 0:
         click.echo("No processes found matching the specified criteria.")
 
+@main.command(name="diff")
+@click.argument('dump_a', type=click.Path(exists=True, file_okay=False, dir_okay=True))
+@click.argument('dump_b', type=click.Path(exists=True, file_okay=False, dir_okay=True))
+def diff(dump_a, dump_b):
+    """
+    Show the pages and mappings that changed between two '--log-sections' dumps.
+    """
+    click.echo(f"Comparing '{dump_a}' with '{dump_b}'...\n")
+    result = diff_logic.diff_dumps(dump_a, dump_b)
+    diff_logic.print_dump_diff(result)
+
+def parse_interval_option(ctx, param, value):
+    # pylint: disable=unused-argument
+    ''' Converts an interval option such as '500ms' to seconds. '''
+    try:
+        return watch_logic.parse_interval(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+@main.command(name="watch")
+@click.argument('pids', type=int, nargs=-1, required=True)
+@click.option('--interval', 'interval', default="1s", callback=parse_interval_option,
+              help="Time between re-reads of /proc/PID/maps, e.g. 500ms, 2s (default 1s).")
+@click.option('--rollup', 'rollup', is_flag=True,
+              help="Also report changes in the smaps_rollup totals (Rss, Pss, Anonymous, Swap).")
+@click.option('--count', 'count', type=click.IntRange(min=1),
+              help="Stop after this many intervals instead of running until the processes exit.")
+def watch(pids, interval, rollup, count):
+    """
+    Watch processes and print mapping events (mmap, munmap, heap growth, new anon regions).
+    """
+    click.echo(f"Watching {len(pids)} process(es) every {interval:g}s. Press Ctrl+C to stop.")
+    try:
+        watch_logic.run_watch(list(pids), interval, rollup, count)
+    except KeyboardInterrupt:
+        click.echo("\nStopped watching.")
+
+def parse_addr_option(ctx, param, value):
+    # pylint: disable=unused-argument
+    ''' Converts '--addr ADDRESS:SIZE' options to (address, size) tuples. '''
+    try:
+        return [sample_logic.parse_sample_address(text) for text in value]
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+@main.command(name="sample")
+@click.argument('pid', type=int)
+@click.option('--addr', 'addresses', multiple=True, required=True, callback=parse_addr_option,
+              help="Address and size to sample, e.g. 0x7ffd1000:8. Repeat for more addresses.")
+@click.option('--rate', 'rate', type=click.FloatRange(min=0, min_open=True), default=1000.0,
+              help="Samples per second (default 1000).")
+@click.option('--count', 'count', type=click.IntRange(min=1), help="Stop after this many samples.")
+@click.option('--duration', 'duration', type=click.FloatRange(min=0, min_open=True),
+              help="Stop after this many seconds.")
+@click.option('--output', 'output_path', required=True,
+              type=click.Path(exists=False, dir_okay=False, file_okay=True),
+              help="Binary time series file to write.")
+def sample(pid, addresses, rate, count, duration, output_path):
+    """
+    Sample a few addresses of a process thousands of times per second.
+    """
+    region_index = sample_logic.build_region_index(pid_mapping_logic.group_regions(f"/proc/{pid}/maps") or {})
+    if not region_index:
+        click.echo("Process file not found. Run 'omnidump' show' to look for another process.")
+        sys.exit(1)
+
+    errors = sample_logic.validate_sample_addresses(region_index, addresses)
+    for error in errors:
+        click.echo(f"Error: {error}")
+    if errors:
+        sys.exit(2)
+
+    click.echo(f"Sampling {len(addresses)} address(es) of PID {pid} at {rate:g} Hz. Press Ctrl+C to stop.")
+    try:
+        samples, late_ticks = sample_logic.run_sampler(pid, addresses, rate, output_path, count, duration)
+    except PermissionError:
+        click.echo("Permission denied. Please run as sudo.")
+        sys.exit(3)
+    except OSError as e:
+        click.echo(f"Error: Sampling stopped: {e}")
+        sys.exit(4)
+    click.secho(f"Wrote {samples} sample(s) to '{output_path}' ({late_ticks} late tick(s)).", fg="green")
+
+def parse_lookup_option(ctx, param, value):
+    # pylint: disable=unused-argument
+    ''' Converts '--lookup ADDRESS' options to integers. '''
+    try:
+        return [int(text, 0) for text in value]
+    except ValueError:
+        raise click.BadParameter("Use a decimal or 0x-prefixed hex address, e.g. 0x7f3a2c01d6a0.") from None
+
+@main.command(name="symbols")
+@click.argument('pid', type=int)
+@click.option('--lookup', 'addresses', multiple=True, callback=parse_lookup_option,
+              help="Address to resolve to MODULE!SYMBOL+OFFSET. Repeat for more addresses.")
+@click.option('--cache-dir', 'cache_dir', type=click.Path(exists=False, dir_okay=True, file_okay=False),
+              default=elf_logic.get_default_cache_dir(), show_default=True,
+              help="Directory of symbol tables cached by build ID.")
+@click.option('--no-cache', 'flag_no_cache', is_flag=True, help="Read every symbol table from memory, and cache none.")
+@click.option('--save-dir', 'save_dir', type=click.Path(exists=False, dir_okay=True, file_okay=False),
+              help="Save each module rebuilt from its loaded segments to this directory.")
+def symbols(pid, addresses, cache_dir, flag_no_cache, save_dir):
+    """
+    Index the ELF modules mapped by a process: build IDs, segments and dynamic symbols.
+
+    Prints one line per module: BASE, BUILD ID, LOAD SEGMENTS, SYMBOLS, SOURCE (memory or cache) and PATH.
+    """
+    input_dict = pid_mapping_logic.group_regions(f"/proc/{pid}/maps")
+    if not input_dict:
+        click.echo("Process file not found. Run 'omnidump' show' to look for another process.")
+        sys.exit(1)
+
+    try:
+        mem_fd = os.open(f"/proc/{pid}/mem", os.O_RDONLY)
+    except PermissionError:
+        click.echo("Permission denied. Please run as sudo.")
+        sys.exit(3)
+    except FileNotFoundError:
+        click.echo("Process file not found. Run 'omnidump' show' to look for another process.")
+        sys.exit(1)
+    try:
+        modules = []
+        for base, path in elf_logic.find_module_bases(input_dict):
+            module = elf_logic.read_module(mem_fd, base, path, None if flag_no_cache else cache_dir)
+            if module is None:
+                continue
+            modules.append(module)
+            click.echo(elf_logic.format_module(module))
+            if save_dir:
+                os.makedirs(save_dir, exist_ok=True)
+                name = f"{os.path.basename(path)}.{module.build_id or f'{base:x}'}.elf"
+                with open(os.path.join(save_dir, name), "wb") as image_file:
+                    image_file.write(elf_logic.reconstruct_image(mem_fd, module))
+    finally:
+        os.close(mem_fd)
+
+    index = elf_logic.SymbolIndex(modules)
+    for address in addresses:
+        click.echo(f"{address:#018x}\t{index.format_address(address)}")
+    cached = sum(module.source == "cache" for module in modules)
+    click.secho(f"Indexed {len(index.entries)} symbol(s) in {len(modules)} module(s) ({cached} from cache).", fg="green")
+
+@main.command(name="pointers")
+@click.argument('pid', type=int)
+@click.option('--section', 'sections', type=click.Choice(list(FLAG_TO_SECTION_MAP.values())), multiple=True,
+              help=f"Section to read pointers from. Repeat for more (default: {', '.join(pointer_logic.DEFAULT_SECTIONS)}).")
+def pointers(pid, sections):
+    """
+    Count the 8-byte words of each region that point into mapped memory, by target category.
+
+    Prints one line per source region: START-END, CATEGORY, WORDS, POINTERS, TARGETS (category:count) and PATH.
+    """
+    input_dict = pid_mapping_logic.group_regions(f"/proc/{pid}/maps")
+    if not input_dict:
+        click.echo("Process file not found. Run 'omnidump' show' to look for another process.")
+        sys.exit(1)
+
+    sinks = [pointer_logic.PointerSink(pointer_logic.PointerIndex(input_dict)), pipeline_logic.StatsSink()]
+    try:
+        pipeline_logic.run_region_pipeline(f"/proc/{pid}/mem", input_dict,
+                                           list(sections or pointer_logic.DEFAULT_SECTIONS), sinks)
+    except PermissionError:
+        click.echo("Permission denied. Please run as sudo.")
+        sys.exit(3)
+
+def parse_start_option(ctx, param, value):
+    # pylint: disable=unused-argument
+    ''' Converts the '--start ADDRESS' option to an integer. '''
+    try:
+        return int(value, 0)
+    except ValueError:
+        raise click.BadParameter("Use a decimal or 0x-prefixed hex address, e.g. 0x55d0c2a41b20.") from None
+
+def parse_max_option(ctx, param, value):
+    # pylint: disable=unused-argument
+    ''' Converts the '--max COUNT' option, which may be written as 1e6, to a positive integer. '''
+    try:
+        count = float(value)
+    except ValueError:
+        count = 0
+    if count < 1 or count != int(count):
+        raise click.BadParameter("Use a positive whole number of nodes, e.g. 1000 or 1e6.")
+    return int(count)
+
+@main.command(name="walk")
+@click.argument('pid', type=int)
+@click.option('--start', 'start', required=True, callback=parse_start_option,
+              help="Address of the first node.")
+@click.option('--next-offset', 'next_offsets', type=int, multiple=True, default=[8], show_default=True,
+              help="Offset of a pointer to the next node inside each node. Repeat for trees, e.g. 8 and 16.")
+@click.option('--max', 'max_nodes', default=str(walk_logic.DEFAULT_MAX_NODES), callback=parse_max_option,
+              show_default=True, help="Stop after this many nodes, e.g. 1e6.")
+@click.option('--cache-pages', 'cache_pages', type=click.IntRange(min=1), default=walk_logic.DEFAULT_CACHE_PAGES,
+              show_default=True, help="Pages kept in the LRU page cache.")
+@click.option('--prefetch', 'prefetch', type=click.IntRange(min=0), default=walk_logic.DEFAULT_PREFETCH,
+              show_default=True, help="Neighbouring pages read on each side of a page that is not cached.")
+def walk(pid, start, next_offsets, max_nodes, cache_pages, prefetch):
+    """
+    Follow linked lists and trees in a process, reading pages in batches through a cache.
+
+    Prints one line per node: ADDRESS, DEPTH and the pointer at each next offset, then one 'cycle' line
+    per pointer back to a node already on its path.
+    """
+    input_dict = pid_mapping_logic.group_regions(f"/proc/{pid}/maps")
+    if not input_dict:
+        click.echo("Process file not found. Run 'omnidump' show' to look for another process.")
+        sys.exit(1)
+    readable_ranges = walk_logic.get_readable_ranges(input_dict)
+
+    try:
+        mem_fd = os.open(f"/proc/{pid}/mem", os.O_RDONLY)
+    except PermissionError:
+        click.echo("Permission denied. Please run as sudo.")
+        sys.exit(3)
+    except FileNotFoundError:
+        click.echo("Process file not found. Run 'omnidump' show' to look for another process.")
+        sys.exit(1)
+    try:
+        cache = walk_logic.PageCache(pid, mem_fd, readable_ranges, cache_pages, prefetch)
+        if not cache.is_readable(start):
+            click.echo(f"Error: {start:#x} is not inside a readable region of PID {pid}.")
+            sys.exit(2)
+        walker = walk_logic.PointerWalker(cache, next_offsets, max_nodes)
+        nodes = 0
+        for node in walker.walk(start):
+            click.echo(walk_logic.format_walk_node(node))
+            nodes += 1
+    finally:
+        os.close(mem_fd)
+
+    for source, target in walker.cycles:
+        click.echo(f"cycle\t{source:#018x}\t{target:#018x}")
+    click.secho(f"Visited {nodes} node(s) over {walker.depth + 1} level(s){' (stopped at --max)' if walker.truncated else ''}: "
+                f"{len(walker.cycles)} cycle(s), {walker.shared} shared node(s), "
+                f"{walker.outside} pointer(s) outside readable memory.", fg="green")
+    click.secho(f"Read {cache.pages_read} page(s) in {cache.batches} batch(es); "
+                f"{cache.hits} cache hit(s), {cache.misses} miss(es).", fg="green")
+
+#Scan command
+@main.group(name="scan")
+def scan():
+    #pylint: disable=W0105
+    ''' Scan process memory for secrets and other notable content. '''
+
+@scan.command(name="entropy")
+@click.argument('pid', type=int)
+@click.option('--window', 'window', type=click.IntRange(min=8, max=4096), default=entropy_scan_logic.DEFAULT_WINDOW,
+              help=f"Sliding window size in bytes (default {entropy_scan_logic.DEFAULT_WINDOW}).")
+@click.option('--threshold', 'threshold', type=click.FloatRange(min=0), default=entropy_scan_logic.DEFAULT_THRESHOLD,
+              help=(f"Minimum window entropy in bits per byte (default {entropy_scan_logic.DEFAULT_THRESHOLD}, "
+                    "for the default window). Must be below log2 of the window size."))
+@click.option('--section', 'sections', type=click.Choice(list(FLAG_TO_SECTION_MAP.values())), multiple=True,
+              help=f"Section to scan. Repeat for more (default: {', '.join(entropy_scan_logic.DEFAULT_SECTIONS)}).")
+def scan_entropy(pid, window, threshold, sections):
+    """
+    Find short high-entropy runs, such as leaked keys, in a process.
+
+    Prints one line per span: ADDRESS, LENGTH, ENTROPY, CATEGORY and PATH.
+    """
+    if threshold >= math.log2(window):
+        click.echo(f"Error: A {window}-byte window cannot exceed {math.log2(window):g} bits per byte. Lower '--threshold'.")
+        sys.exit(2)
+
+    input_dict = pid_mapping_logic.group_regions(f"/proc/{pid}/maps")
+    if not input_dict:
+        click.echo("Process file not found. Run 'omnidump' show' to look for another process.")
+        sys.exit(1)
+
+    sinks = [entropy_scan_logic.EntropyScanSink(window, threshold), pipeline_logic.StatsSink()]
+    try:
+        pipeline_logic.run_region_pipeline(f"/proc/{pid}/mem", input_dict,
+                                           list(sections or entropy_scan_logic.DEFAULT_SECTIONS), sinks)
+    except PermissionError:
+        click.echo("Permission denied. Please run as sudo.")
+        sys.exit(3)
+
+@scan.command(name="keys")
+@click.argument('pid', type=int)
+@click.option('--section', 'sections', type=click.Choice(list(FLAG_TO_SECTION_MAP.values())), multiple=True,
+              help=f"Section to scan. Repeat for more (default: {', '.join(key_scan_logic.DEFAULT_SECTIONS)}).")
+def scan_keys(pid, sections):
+    """
+    Find expanded AES key schedules and ChaCha state blocks in a process.
+
+    Prints one line per key: ADDRESS, TYPE, KEY, CATEGORY and PATH.
+    """
+    input_dict = pid_mapping_logic.group_regions(f"/proc/{pid}/maps")
+    if not input_dict:
+        click.echo("Process file not found. Run 'omnidump' show' to look for another process.")
+        sys.exit(1)
+
+    sinks = [key_scan_logic.KeyScanSink(), pipeline_logic.StatsSink()]
+    try:
+        pipeline_logic.run_region_pipeline(f"/proc/{pid}/mem", input_dict,
+                                           list(sections or key_scan_logic.DEFAULT_SECTIONS), sinks)
+    except PermissionError:
+        click.echo("Permission denied. Please run as sudo.")
+        sys.exit(3)
+
+@scan.command(name="rules")
+@click.argument('rule_file', type=click.Path(exists=True, dir_okay=False))
+@click.argument('pid', type=int)
+@click.option('--section', 'sections', type=click.Choice(list(FLAG_TO_SECTION_MAP.values())), multiple=True,
+              help=f"Section to scan. Repeat for more (default: {', '.join(rules_scan_logic.DEFAULT_SECTIONS)}).")
+def scan_rules(rule_file, pid, sections):
+    """
+    Match a file of byte, string and regex signatures against a process, without writing memory to disk.
+
+    Each line of RULE_FILE is 'NAME "text" [ascii] [wide]', 'NAME { 4D 5A 90 }' or 'NAME /regex/[is]'.
+    Prints one line per match: ADDRESS, RULE, CATEGORY and PATH.
+    """
+    try:
+        literals, regexes = rules_scan_logic.parse_rule_file(rule_file)
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+        sys.exit(2)
+    if not literals and not regexes:
+        click.echo(f"Error: No rules found in '{rule_file}'.")
+        sys.exit(2)
+
+    try:
+        rule_sink = rules_scan_logic.RuleScanSink(literals, regexes)
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+        sys.exit(2)
+
+    input_dict = pid_mapping_logic.group_regions(f"/proc/{pid}/maps")
+    if not input_dict:
+        click.echo("Process file not found. Run 'omnidump' show' to look for another process.")
+        sys.exit(1)
+
+    sinks = [rule_sink, pipeline_logic.StatsSink()]
+    try:
+        pipeline_logic.run_region_pipeline(f"/proc/{pid}/mem", input_dict,
+                                           list(sections or rules_scan_logic.DEFAULT_SECTIONS), sinks)
+    except PermissionError:
+        click.echo("Permission denied. Please run as sudo.")
+        sys.exit(3)
+
+@scan.command(name="iocs")
+@click.argument('pid', type=int)
+@click.option('--section', 'sections', type=click.Choice(list(FLAG_TO_SECTION_MAP.values())), multiple=True,
+              help=f"Section to scan. Repeat for more (default: {', '.join(ioc_logic.DEFAULT_SECTIONS)}).")
+@click.option('--type', 'ioc_types', type=click.Choice(list(ioc_logic.IOC_TYPES)), multiple=True,
+              help="Indicator type to report. Repeat for more (default: all).")
+def scan_iocs(pid, sections, ioc_types):
+    """
+    Extract URLs, IP addresses, domains, emails, file paths and base64 blobs from a process in one pass.
+
+    Prints one line per unique indicator: TYPE, COUNT, FIRST ADDRESS and VALUE.
+    """
+    input_dict = pid_mapping_logic.group_regions(f"/proc/{pid}/maps")
+    if not input_dict:
+        click.echo("Process file not found. Run 'omnidump' show' to look for another process.")
+        sys.exit(1)
+
+    sinks = [ioc_logic.IocSink(ioc_types), pipeline_logic.StatsSink()]
+    try:
+        pipeline_logic.run_region_pipeline(f"/proc/{pid}/mem", input_dict,
+                                           list(sections or ioc_logic.DEFAULT_SECTIONS), sinks)
+    except PermissionError:
+        click.echo("Permission denied. Please run as sudo.")
+        sys.exit(3)
+
+@scan.command(name="carve")
+@click.argument('pid', type=int)
+@click.option('--save-dir', 'save_dir', required=True,
+              type=click.Path(exists=False, dir_okay=True, file_okay=False),
+              help="Directory the carved files are written to.")
+@click.option('--section', 'sections', type=click.Choice(list(FLAG_TO_SECTION_MAP.values())), multiple=True,
+              help=f"Section to scan. Repeat for more (default: {', '.join(carve_logic.DEFAULT_SECTIONS)}).")
+@click.option('--type', 'file_types', type=click.Choice(list(carve_logic.FILE_TYPES)), multiple=True,
+              help="File format to carve. Repeat for more (default: all).")
+@click.option('--max-size', 'max_size', type=click.IntRange(min=1), default=carve_logic.DEFAULT_MAX_SIZE,
+              help="Skip files larger than this many bytes (default is 16 MiB).")
+def scan_carve(pid, save_dir, sections, file_types, max_size):
+    """
+    Carve embedded PNG, ZIP, ELF, PDF and SQLite files out of a process without dumping it first.
+
+    Each file is saved as '<ADDRESS>.<TYPE>' and printed as ADDRESS, TYPE, SIZE, FILE, CATEGORY and PATH.
+    """
+    input_dict = pid_mapping_logic.group_regions(f"/proc/{pid}/maps")
+    if not input_dict:
+        click.echo("Process file not found. Run 'omnidump' show' to look for another process.")
+        sys.exit(1)
+
+    sinks = [carve_logic.CarveSink(save_dir, file_types, max_size), pipeline_logic.StatsSink()]
+    try:
+        pipeline_logic.run_region_pipeline(f"/proc/{pid}/mem", input_dict,
+                                           list(sections or carve_logic.DEFAULT_SECTIONS), sinks)
+    except PermissionError:
+        click.echo("Permission denied. Please run as sudo.")
+        sys.exit(3)
+
+SEARCH_SECTION_OPTIONS = [
+    click.option('-e', 'flag_exec_sec', is_flag=True, help="Search only executable sections."),
+    click.option('-sl', 'flag_slib_sec', is_flag=True, help="Search only shared library sections."),
+    click.option('-h', 'flag_he_sec', is_flag=True, help="Search only heap sections."),
+    click.option('-st', 'flag_st_sec', is_flag=True, help="Search only stack sections."),
+    click.option('-vv', 'flag_vvar_sec', is_flag=True, help="Search only vvar sections."),
+    click.option('-vs', 'flag_vsys_sec', is_flag=True, help="Search only vsys sections."),
+    click.option('-vd', 'flag_vdso_sec', is_flag=True, help="Search only vdso sections."),
+    click.option('-an', 'flag_anon_sec', is_flag=True, help="Search only anon sections."),
+    click.option('-gp', 'flag_gp_sec', is_flag=True, help="Search only guard page sections."),
+    click.option('-fb', 'flag_fb_sec', is_flag=True, help="Search only file backed sections."),
+    click.option('-ts', 'flag_ts_sec', is_flag=True, help="Search only tmpfs or shared memory sections."),
+    click.option('-dm', 'flag_dm_sec', is_flag=True, help="Search only device mapped sections."),
+    click.option('-am', 'flag_anon_map_sec', is_flag=True, help="Search only anon mapping sections."),
+    click.option('--unclassified', 'flag_none_sec', is_flag=True, help="Search only unclassified sections."),
+]
+
+def search_section_options(command):
+    ''' Adds the section flags of 'dump pid' to a search command. '''
+    for option in reversed(SEARCH_SECTION_OPTIONS):
+        command = option(command)
+    return command
+
+def run_search(pid, section_flags, sink):
+    """
+    Runs a search sink over the selected sections of a process.
+
+    Args:
+        pid (int): The process ID to search.
+        section_flags (dict): The section flags of the command; with none set, every section is searched.
+        sink (RegionSink): The search sink.
+    """
+    input_dict = pid_mapping_logic.group_regions(f"/proc/{pid}/maps")
+    if not input_dict:
+        click.echo("Process file not found. Run 'omnidump' show' to look for another process.")
+        sys.exit(1)
+
+    sections = pipeline_logic.get_sections_from_flags(section_flags) or list(FLAG_TO_SECTION_MAP.values())
+    try:
+        pipeline_logic.run_region_pipeline(f"/proc/{pid}/mem", input_dict, sections, [sink, pipeline_logic.StatsSink()])
+    except PermissionError:
+        click.echo("Permission denied. Please run as sudo.")
+        sys.exit(3)
+
+#Search commands
+@main.command(name="grep-bytes")
+@click.argument('pid', type=int)
+@click.argument('pattern', type=str)
+@click.option('--first', 'first', is_flag=True, help="Stop reading at the first match.")
+@search_section_options
+def grep_bytes(pid, pattern, first, **section_flags):
+    """
+    Search the readable regions of a process for a hex byte pattern, e.g. "48 8B ?? ?? 90".
+
+    '??' matches any byte and '?' any nibble, e.g. "4? 8B". Prints one line per match:
+    ADDRESS, BYTES, and the region's START-END, PERMISSIONS, CATEGORY and PATH.
+    """
+    try:
+        hex_pattern = grep_logic.HexPattern(pattern)
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+        sys.exit(2)
+    run_search(pid, section_flags, grep_logic.HexGrepSink(hex_pattern, 1 if first else None))
+
+@main.command(name="grep")
+@click.argument('pid', type=int)
+@click.argument('regex', type=str)
+@click.option('-C', '--context', 'context', type=click.IntRange(min=0), default=grep_logic.DEFAULT_CONTEXT,
+              help=f"Bytes of context shown on each side of a match (default {grep_logic.DEFAULT_CONTEXT}).")
+@click.option('-m', '--max-count', 'max_count', type=click.IntRange(min=1),
+              help="Stop reading once this many matches are found.")
+@click.option('-i', '--ignore-case', 'ignore_case', is_flag=True, help="Match ASCII letters in either case.")
+@search_section_options
+def grep(pid, regex, context, max_count, ignore_case, **section_flags):
+    """
+    Search the readable regions of a process for a regex matched against raw bytes.
+
+    Prints one line per match: ADDRESS, CATEGORY, PATH and the escaped match with its context.
+    """
+    try:
+        compiled = grep_logic.compile_grep_regex(regex, ignore_case)
+    except ValueError as e:
+        click.echo(f"Error: {e}")
+        sys.exit(2)
+    run_search(pid, section_flags, grep_logic.RegexGrepSink(compiled, context, max_count))
+
+
 @dump.command(name="pid")
 @click.argument('pid', type=int, required=False)
+@click.option('--tree', 'tree_pid', type=int,
+              help="Dump a process and all of its descendants together.")
+@click.option('--cgroup', 'cgroup_path', type=str,
+              help="Dump every process listed in a cgroup's cgroup.procs.")
+@click.option('--workers', 'workers', type=click.IntRange(min=1),
+              help="Number of processes captured in parallel with '--tree' or '--cgroup'.")
 @click.option('--verbose', 'verbose_out', is_flag=True,
               help="Dump permissions, inode, and extracted strings.")
 @click.option('--length', 'length_out', type=int,
@@ -128,6 +668,15 @@ def show(user, flag_sleeping, flag_idle, flag_running):
 @click.option('--strings', 'strings_out', is_flag=True,
               help=("Dumps strings to the terminal. Strings by default are length 4. "
                     "Use '--length' to increase the length."))
+@click.option('--encoding', 'encoding', type=click.Choice(["ascii", "utf8", "utf16le", "all"]), default="ascii",
+              help=("String encoding to extract: ascii (default), utf8 for multibyte text "
+                    "('--length' counts characters), utf16le for wide strings, or all to find "
+                    "ascii and utf16le strings in one scan."))
+@click.option('--sample', 'sample_count', type=click.IntRange(min=1),
+              help="Number of strings shown per region with '--verbose' or '--strings' (default is 3).")
+@click.option('--sample-mode', 'sample_mode', type=click.Choice(["first", "reservoir", "stride"]), default="first",
+              help=("How previewed strings are picked: first (default), reservoir for a uniform sample "
+                    "of the whole region, or stride to read only every Nth page (when the preview is the only output)."))
 @click.option('--save-dir', 'save_dir',
               type=click.Path(exists=False, dir_okay=True, file_okay=False),
               help="Path for directory to save data to.")
@@ -136,6 +685,24 @@ def show(user, flag_sleeping, flag_idle, flag_running):
 @click.option('--log-sections', 'flag_sec_log', is_flag=True,
               help=("Save a section and each individual region to bytes to a file."
                     "Provide a parent directory using '--save-dir'."))
+@click.option('--log-hashes', 'flag_hash_log', is_flag=True,
+              help=("Save a SHA-256 manifest (hashes.sha256) of each region. Combined log flags "
+                    "read every region once. Use --save-dir to specify a parent directory."))
+@click.option('--stats', 'flag_stats', is_flag=True,
+              help=("Compute each region's zero and printable byte ratios, entropy and byte histogram. "
+                    "Shown with '--verbose' and saved to stats.json with '--save-dir'."))
+@click.option('--page-map', 'flag_page_map', is_flag=True,
+              help=("Classify each 4 KiB page as zero, text, code, high-entropy, pointer-dense or data. "
+                    "Drawn as a heatmap with '--verbose' and saved per region with '--save-dir'."))
+@click.option('--snapshot', 'flag_snapshot', is_flag=True,
+              help=("Save a consistent snapshot with '--log-sections': dump while the process runs, "
+                    "then stop it briefly to re-read only the pages that changed. Strings, hashes, "
+                    "stats and page maps are taken from the saved snapshot."))
+@click.option('--dedupe-libs', 'flag_libs_dedupe', is_flag=True,
+              help=("With '--log-sections', save each read-only file mapping (shared libraries, executables) "
+                    "once to SAVE_DIR/shared-libs and hard-link it into every process directory that maps it."))
+@click.option('--lib-store', 'lib_store', type=click.Path(exists=False, dir_okay=True, file_okay=False),
+              help="Like '--dedupe-libs', but keep the shared mappings in this directory to reuse them across runs.")
 @click.option('--unclassified', 'flag_none_sec', is_flag=True,
               help="Dump memory sections that cannot be mapped.")
 @click.option('--log-unclassified', 'flag_none_log', is_flag=True,
@@ -144,6 +711,14 @@ def show(user, flag_sleeping, flag_idle, flag_running):
 @click.option('--log-strings', 'flag_strings_log', is_flag=True,
               help=("Save a section and each individual region's strings to a .txt file. "
                     "Use --save-dir to specify a parent directory."))
+@click.option('--dedupe-strings', 'flag_strings_dedupe', is_flag=True,
+              help=("With '--log-strings', save each unique string once to strings-dedupe.txt "
+                    "with its count and first addresses, instead of one file per region."))
+@click.option('--top-strings', 'top_strings', type=click.IntRange(min=1),
+              help=("With '--log-strings', save the K most frequent strings to strings-top.txt "
+                    "using a fixed-memory sketch, instead of one file per region."))
+@click.option('--top-by-section', 'flag_top_by_section', is_flag=True,
+              help="With '--top-strings', also save the most frequent strings of each section.")
 @click.option('-e', 'flag_exec_sec', is_flag=True, help="Dump only executable sections.")
 @click.option('-sl', 'flag_slib_sec', is_flag=True, help="Dump only shared library sections.")
 @click.option('-h', 'flag_he_sec', is_flag=True, help="Dump only heap sections.")
@@ -181,7 +756,22 @@ def dump_pid(
         strings_out,
         save_dir,
         flag_strings_log,
-        flag_anon_map_sec
+        flag_anon_map_sec,
+        tree_pid,
+        cgroup_path,
+        workers,
+        flag_snapshot,
+        flag_hash_log,
+        encoding,
+        flag_strings_dedupe,
+        top_strings,
+        flag_top_by_section,
+        sample_count,
+        sample_mode,
+        flag_stats,
+        flag_page_map,
+        flag_libs_dedupe,
+        lib_store
         ):
     ''' Dumps memory maps from a given process ID or the current process. '''
     # 1. Argument Validation (Fail-fast checks)
@@ -189,7 +779,33 @@ def dump_pid(
         click.echo("Error: Cannot provide both a PID and the --self flag."
                    "Please run omnidump dump pid --help for more information.")
         sys.exit(1)
-    if not pid and not dump_self:
+
+    group_dump = tree_pid is not None or cgroup_path is not None
+    if group_dump and (pid is not None or dump_self or (tree_pid is not None and cgroup_path is not None)):
+        click.echo("Error: '--tree' and '--cgroup' cannot be combined with a PID, '--self', or each other. "
+                   "Please run omnidump dump pid --help for more information.")
+        sys.exit(17)
+    if workers is not None and not group_dump:
+        click.echo("Error: The '--workers' flag requires '--tree' or '--cgroup'. "
+                   "Please run omnidump dump pid --help for more information.")
+        sys.exit(18)
+    if flag_snapshot and not flag_sec_log:
+        click.echo("Error: The '--snapshot' flag requires '--log-sections'. "
+                   "Please run omnidump dump pid --help for more information.")
+        sys.exit(19)
+    if (flag_libs_dedupe or lib_store) and not flag_sec_log:
+        click.echo("Error: The '--dedupe-libs' and '--lib-store' flags require '--log-sections'. "
+                   "Please run omnidump dump pid --help for more information.")
+        sys.exit(31)
+    if (flag_libs_dedupe or lib_store) and flag_snapshot:
+        click.echo("Error: '--snapshot' patches saved region files in place and cannot be used with shared "
+                   "mappings from '--dedupe-libs' or '--lib-store'.")
+        sys.exit(32)
+    if flag_snapshot and dump_self:
+        click.echo("Error: The '--snapshot' flag cannot stop the current process. Provide a PID instead of '--self'. "
+                   "Please run omnidump dump pid --help for more information.")
+        sys.exit(20)
+    if not pid and not dump_self and not group_dump:
         click.echo("Error: A PID or --self flag is required."
                    "Please run omnidump dump pid --help for more information.")
         sys.exit(2)
@@ -270,25 +886,70 @@ def dump_pid(
             click.echo("Error: When using '--log-sections', please reframe from using other flags such as: '--length', and '--verbose'. Please run omnidump dump pid --help for more information.")
             sys.exit(11)
 
-    
+    if flag_strings_dedupe and not flag_strings_log:
+        click.echo("Error: The '--dedupe-strings' flag requires '--log-strings'.")
+        sys.exit(23)
+
+    if top_strings is not None and not flag_strings_log:
+        click.echo("Error: The '--top-strings' flag requires '--log-strings'.")
+        sys.exit(25)
+
+    if flag_top_by_section and top_strings is None:
+        click.echo("Error: The '--top-by-section' flag requires '--top-strings'.")
+        sys.exit(26)
+
+    if (sample_count is not None or sample_mode != "first") and not (verbose_out or strings_out):
+        click.echo("Error: The '--sample' and '--sample-mode' flags require '--verbose' or '--strings'.")
+        sys.exit(27)
+
+    if flag_hash_log:
+        if not any([flag_exec_sec, flag_slib_sec, flag_all_sec, flag_he_sec, flag_st_sec, flag_vvar_sec, flag_vsys_sec, flag_vdso_sec, flag_none_sec, flag_anon_sec, flag_gp_sec, flag_fb_sec, flag_ts_sec, flag_dm_sec, flag_anon_map_sec]):
+            click.echo("Error: The '--log-hashes' flag requires at least one section flag (-e, -h, etc.) to be specified.")
+            sys.exit(21)
+
+        if save_dir is None:
+            click.echo("Error: When using '--log-hashes', the '--save-dir' flag is required. Please run omnidump dump pid --help for more information.")
+            sys.exit(22)
+
     section_flags = any([
         flag_exec_sec, flag_slib_sec, flag_all_sec, flag_he_sec, flag_st_sec,
         flag_vvar_sec, flag_vsys_sec, flag_vdso_sec, flag_none_sec,
         flag_anon_sec, flag_gp_sec, flag_fb_sec, flag_ts_sec, flag_dm_sec, flag_anon_map_sec
     ])
 
-    log_flags = any([flag_none_log, flag_sec_log, flag_strings_log]) 
+    log_flags = any([flag_none_log, flag_sec_log, flag_strings_log, flag_hash_log,
+                     (flag_stats or flag_page_map) and save_dir is not None]) 
+
+    if flag_stats and not ((section_flags or flag_none_log) and (verbose_out or save_dir is not None)):
+        click.echo("Error: The '--stats' flag requires at least one section flag and '--verbose' or '--save-dir'. "
+                   "Please run omnidump dump pid --help for more information.")
+        sys.exit(28)
+
+    if flag_page_map and not ((section_flags or flag_none_log) and (verbose_out or save_dir is not None)):
+        click.echo("Error: The '--page-map' flag requires at least one section flag and '--verbose' or '--save-dir'. "
+                   "Please run omnidump dump pid --help for more information.")
+        sys.exit(29)
+
+    if flag_page_map and sample_mode == "stride":
+        click.echo("Error: The '--page-map' flag reads every page and cannot be used with '--sample-mode stride'.")
+        sys.exit(30)
     
     if length_out is not None and not (verbose_out or strings_out):
         click.echo("Error: The '--length' flag requires the '--verbose' or the '--strings' flag. Please run omnidump dump pid --help for more information.")
         sys.exit(13)
 
-    if (dump_self or pid) and not section_flags:
+    if (dump_self or pid or group_dump) and not section_flags:
         if log_flags is True: 
             pass
         else:
             click.echo("Error: The '--self' or 'pid' flag requires at least one section flag.")
             sys.exit(12)
+
+    if group_dump and not (log_flags and save_dir):
+        click.echo("Error: '--tree' and '--cgroup' save each process to its own 'pid-N' directory and require "
+                   "a log flag (--log-sections, --log-strings, etc.) with '--save-dir'. "
+                   "Please run omnidump dump pid --help for more information.")
+        sys.exit(24)
     
     if length_out is not None and length_out <= 0:
         click.secho("Error: Please provide a value greater than 0 for '--length'. Please run omnidump dump pid --help for more information.")
@@ -329,9 +990,15 @@ def dump_pid(
     if length_out is None:
         length_out = 4
 
+    if sample_count is None:
+        sample_count = 3
+
     if save_dir is None and not log_flags:
         save_dir = ""
 
+    if flag_libs_dedupe and lib_store is None:
+        lib_store = os.path.join(save_dir, shared_lib_logic.STORE_DIR_NAME)
+
 
     config = CliAppConfig(
         pid=target_pid,
@@ -340,11 +1007,22 @@ def dump_pid(
         length_out=length_out,
         verbose_out=verbose_out,
         strings_out=strings_out,
+        encoding=encoding,
+        sample_count=sample_count,
+        sample_mode=sample_mode,
         
         # Log flags
         flag_none_log=flag_none_log,
         flag_sec_log=flag_sec_log,
         flag_strings_log=flag_strings_log,
+        flag_strings_dedupe=flag_strings_dedupe,
+        top_strings=top_strings,
+        flag_top_by_section=flag_top_by_section,
+        flag_snapshot=flag_snapshot,
+        flag_hash_log=flag_hash_log,
+        flag_stats=flag_stats,
+        flag_page_map=flag_page_map,
+        lib_store=lib_store,
         
         # Section flags
         flag_exec_sec=flag_exec_sec,
@@ -362,7 +1040,12 @@ def dump_pid(
         flag_anon_map_sec=flag_anon_map_sec
     )
 
-    pid_pass_flags(config)
+    if group_dump:
+        pid_pass_group(config, tree_pid, cgroup_path, workers)
+    else:
+        pid_pass_flags(config)
+    if lib_store:
+        shared_lib_logic.get_library_store(lib_store).report()
 
 if __name__ == "__main__":
     main()
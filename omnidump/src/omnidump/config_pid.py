@@ -38,9 +38,20 @@ class CliAppConfig:
     verbose_out: bool = False
     length_out: int = None
     strings_out: bool = False
+    encoding: str = "ascii"
+    sample_count: int = 3
+    sample_mode: str = "first"
     flag_none_log: bool = False
     flag_sec_log: bool = False
     flag_strings_log: bool = False
+    flag_strings_dedupe: bool = False
+    top_strings: Optional[int] = None
+    flag_top_by_section: bool = False
+    flag_snapshot: bool = False
+    flag_hash_log: bool = False
+    flag_stats: bool = False
+    flag_page_map: bool = False
+    lib_store: Optional[str] = None
 
     #Section flags
     flag_exec_sec: bool = False
@@ -59,6 +70,12 @@ class CliAppConfig:
     flag_dm_sec: bool = False
     flag_anon_map_sec: bool = False
 
+    def pipeline_outputs_active(self) -> bool:
+        """Returns True when the outputs must share a single read through the region pipeline."""
+        log_outputs = [self.flag_sec_log, self.flag_strings_log, self.flag_hash_log]
+        return (sum(log_outputs) > 1 or self.flag_hash_log or self.flag_strings_dedupe
+                or self.top_strings is not None or ((self.flag_stats or self.flag_page_map) and bool(self.save_dir)))
+
     def section_flags_active(self) -> List [str]:
         """Returns list of section flags that are set to True."""
         active_flags = []
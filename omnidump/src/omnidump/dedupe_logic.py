@@ -0,0 +1,200 @@
+"""Global string counting: an exact dedupe index and a fixed-memory sketch of the most frequent strings."""
+import heapq
+import itertools
+import tempfile
+from .strings_logic import LINE_ESCAPES, STRINGS_BUFFER_SIZE
+
+DEDUPE_MEMORY_BUDGET = 256 << 20
+MAX_ADDRESSES = 3
+# Rough cost of one index entry besides the string itself: the dict slot, the
+# str and list headers, and the address ints.
+ENTRY_OVERHEAD = 200
+# The sketch tracks this many candidates per requested string, and never fewer
+# than TOP_STRINGS_MIN_CAPACITY, so the reported top K are rarely displaced.
+TOP_STRINGS_FACTOR = 10
+TOP_STRINGS_MIN_CAPACITY = 1000
+
+def format_dedupe_line(text, count, addresses):
+    """
+    Formats one line of the deduplicated strings file.
+
+    Args:
+        text (str): The escaped string.
+        count (int): The number of occurrences.
+        addresses (list of int): The first addresses the string was seen at.
+
+    Returns:
+        str: 'COUNT<TAB>ADDRESS,ADDRESS,...<TAB>STRING' followed by a newline.
+    """
+    address_list = ",".join(f"{address:#018x}" for address in addresses)
+    return f"{count}\t{address_list}\t{text}\n"
+
+def format_top_line(text, count, error):
+    """
+    Formats one line of a top strings file.
+
+    Args:
+        text (str): The escaped string.
+        count (int): The estimated number of occurrences.
+        error (int): The most the estimate can exceed the true count by.
+
+    Returns:
+        str: 'COUNT<TAB>ERROR<TAB>STRING' followed by a newline.
+    """
+    return f"{count}\t{error}\t{text}\n"
+
+def parse_run_line(line):
+    """
+    Parses a line of a spilled run back into an index entry.
+
+    Args:
+        line (str): A line written by StringIndex.spill.
+
+    Returns:
+        tuple: (text, count, addresses)
+    """
+    count, address_list, text = line.rstrip("\n").split("\t", 2)
+    return (text, int(count), [int(address, 16) for address in address_list.split(",")])
+
+class StringIndex:
+    """
+    Counts strings across every region of a dump within a memory budget.
+
+    Strings are kept in a dict keyed by their escaped text. When the estimated
+    size of the dict passes the budget, it is written to a temporary file as a
+    run sorted by text and cleared. iter_entries merges the runs and the
+    in-memory remainder with heapq.merge, so memory stays bounded by the budget
+    however many strings the dump holds.
+
+    Args:
+        spill_dir (str): The directory for the temporary run files.
+        memory_budget (int): The estimated index size in bytes that triggers a spill.
+        max_addresses (int): The number of addresses kept per string.
+    """
+
+    def __init__(self, spill_dir, memory_budget=DEDUPE_MEMORY_BUDGET, max_addresses=MAX_ADDRESSES):
+        self.spill_dir = spill_dir
+        self.memory_budget = memory_budget
+        self.max_addresses = max_addresses
+        self.entries = {}
+        self.memory_used = 0
+        self.runs = []
+        self.total = 0
+
+    def add(self, text, address):
+        """
+        Records one occurrence of a string.
+
+        Args:
+            text (str): The string.
+            address (int): The virtual address it was found at.
+        """
+        key = text.translate(LINE_ESCAPES)
+        self.total += 1
+        entry = self.entries.get(key)
+        if entry is None:
+            self.entries[key] = [1, [address]]
+            self.memory_used += ENTRY_OVERHEAD + len(key)
+            if self.memory_used > self.memory_budget:
+                self.spill()
+        else:
+            entry[0] += 1
+            if len(entry[1]) < self.max_addresses:
+                entry[1].append(address)
+
+    def spill(self):
+        """Writes the in-memory entries to a sorted run file and clears them."""
+        run_file = tempfile.TemporaryFile("w+", dir=self.spill_dir, buffering=STRINGS_BUFFER_SIZE)
+        for key in sorted(self.entries):
+            count, addresses = self.entries[key]
+            run_file.write(format_dedupe_line(key, count, addresses))
+        run_file.seek(0)
+        self.runs.append(run_file)
+        self.entries = {}
+        self.memory_used = 0
+
+    def iter_entries(self):
+        """
+        Merges the spilled runs and the in-memory entries.
+
+        Runs are merged in the order they were written, so the addresses of a
+        string are still the first ones seen.
+
+        Yields:
+            tuple: (text, count, addresses) sorted by text, once per unique string.
+        """
+        sources = [map(parse_run_line, run_file) for run_file in self.runs]
+        sources.append((key, count, addresses) for key, (count, addresses) in sorted(self.entries.items()))
+        merged = heapq.merge(*sources, key=lambda entry: entry[0])
+        try:
+            for text, group in itertools.groupby(merged, key=lambda entry: entry[0]):
+                count = 0
+                addresses = []
+                for _, run_count, run_addresses in group:
+                    count += run_count
+                    addresses.extend(run_addresses[:self.max_addresses - len(addresses)])
+                yield (text, count, addresses)
+        finally:
+            self.close()
+
+    def close(self):
+        """Deletes the spilled runs."""
+        for run_file in self.runs:
+            run_file.close()
+        self.runs = []
+
+class TopStrings:
+    """
+    Estimates the most frequent strings of a dump in fixed memory.
+
+    A batched space-saving sketch: strings are counted exactly until twice the
+    capacity is tracked, then only the capacity most frequent are kept. Strings
+    seen after a prune start from the largest evicted count, which is recorded
+    as their error, so every estimate is an upper bound at most 'error' above
+    the true count and any string occurring more than total / capacity times
+    is never lost.
+
+    Args:
+        top_count (int): The number of strings to report.
+        capacity (int, optional): The number of candidates kept after a prune.
+    """
+
+    def __init__(self, top_count, capacity=None):
+        self.top_count = top_count
+        self.capacity = capacity or max(top_count * TOP_STRINGS_FACTOR, TOP_STRINGS_MIN_CAPACITY)
+        self.entries = {}
+        self.floor = 0
+        self.total = 0
+
+    def add(self, text):
+        """
+        Records one occurrence of a string.
+
+        Args:
+            text (str): The string.
+        """
+        key = text.translate(LINE_ESCAPES)
+        self.total += 1
+        entry = self.entries.get(key)
+        if entry is None:
+            self.entries[key] = [self.floor + 1, self.floor]
+            if len(self.entries) > 2 * self.capacity:
+                self.prune()
+        else:
+            entry[0] += 1
+
+    def prune(self):
+        """Keeps the capacity most frequent candidates and raises the floor to the largest evicted count."""
+        ranked = heapq.nlargest(self.capacity + 1, self.entries.items(), key=lambda item: item[1][0])
+        self.floor = max(self.floor, ranked[-1][1][0])
+        self.entries = dict(ranked[:-1])
+
+    def top(self):
+        """
+        Returns the estimated most frequent strings.
+
+        Returns:
+            list of tuple: (text, count, error) by descending count then text, at most top_count long.
+        """
+        ranked = heapq.nsmallest(self.top_count, self.entries.items(), key=lambda item: (-item[1][0], item[0]))
+        return [(text, count, error) for text, (count, error) in ranked]
@@ -0,0 +1,213 @@
+"""Page-level diff between two saved '--log-sections' dumps."""
+import os
+import re
+import mmap
+import click
+
+PAGE_SIZE = 4096
+BLOCK_SIZE = 1 << 20
+MANIFEST_NAME = "hashes.sha256"
+REGION_FILE_PATTERN = re.compile(r"^region-0x([0-9a-f]+)-0x([0-9a-f]+)\.bin$")
+
+def collect_dump_regions(dump_dir):
+    """
+    Finds the region binary files of a saved dump.
+
+    Regions are keyed by their directory relative to the dump root (the section
+    name, and the 'pid-N' directory for group dumps) and their start address.
+
+    Args:
+        dump_dir (str): The '--save-dir' directory of a '--log-sections' dump.
+
+    Returns:
+        dict: {(relative_dir, start): (start, end, full_file_path)}
+    """
+    regions = {}
+    for root, _, files in os.walk(dump_dir):
+        relative_dir = os.path.relpath(root, dump_dir)
+        for filename in files:
+            match = REGION_FILE_PATTERN.match(filename)
+            if not match:
+                continue
+            start, end = int(match.group(1), 16), int(match.group(2), 16)
+            regions[(relative_dir, start)] = (start, end, os.path.join(root, filename))
+    return regions
+
+def load_manifest_hashes(dump_dir):
+    """
+    Loads the region hashes stored by '--log-hashes' under a dump directory.
+
+    Every hashes.sha256 manifest found (one per dump, or one per 'pid-N'
+    directory for group dumps) is read. Paths in a manifest are relative to it.
+
+    Args:
+        dump_dir (str): The '--save-dir' directory of a dump.
+
+    Returns:
+        dict: {full_file_path: (digest, manifest_mtime)}
+    """
+    stored_hashes = {}
+    for root, _, files in os.walk(dump_dir):
+        if MANIFEST_NAME not in files:
+            continue
+        manifest_path = os.path.join(root, MANIFEST_NAME)
+        try:
+            manifest_mtime = os.path.getmtime(manifest_path)
+            with open(manifest_path, "r") as manifest:
+                for line in manifest:
+                    digest, _, relative_path = line.rstrip("\n").partition("  ")
+                    if relative_path:
+                        full_file_path = os.path.normpath(os.path.join(root, relative_path))
+                        stored_hashes[full_file_path] = (digest, manifest_mtime)
+        except OSError:
+            continue
+    return stored_hashes
+
+def get_stored_digest(full_file_path, stored_hashes):
+    """
+    Returns the stored hash of a region file if it is still valid.
+
+    A hash is only trusted when the file has not been modified after the
+    manifest was written.
+
+    Args:
+        full_file_path (str): The region binary file.
+        stored_hashes (dict): The dictionary returned by load_manifest_hashes.
+
+    Returns:
+        str or None: The hex digest, or None if there is no usable stored hash.
+    """
+    entry = stored_hashes.get(os.path.normpath(full_file_path))
+    if entry is None:
+        return None
+    digest, manifest_mtime = entry
+    try:
+        if os.path.getmtime(full_file_path) > manifest_mtime:
+            return None
+    except OSError:
+        return None
+    return digest
+
+def diff_region_pages(full_file_path_a, full_file_path_b):
+    """
+    Finds the changed pages shared by two region files.
+
+    Both files are memory-mapped and compared a block at a time, and only
+    blocks that differ are compared page by page, so multi-GiB regions are
+    compared without loading them into memory.
+
+    Args:
+        full_file_path_a (str): The region binary file from the first dump.
+        full_file_path_b (str): The region binary file from the second dump.
+
+    Returns:
+        list of int: Indexes of the changed pages within the common range.
+    """
+    common_size = min(os.path.getsize(full_file_path_a), os.path.getsize(full_file_path_b))
+    if common_size == 0:
+        return []
+
+    changed_pages = []
+    with open(full_file_path_a, "rb") as file_a, open(full_file_path_b, "rb") as file_b:
+        with mmap.mmap(file_a.fileno(), 0, access=mmap.ACCESS_READ) as mapped_a, \
+             mmap.mmap(file_b.fileno(), 0, access=mmap.ACCESS_READ) as mapped_b:
+            for block_start in range(0, common_size, BLOCK_SIZE):
+                block_end = min(block_start + BLOCK_SIZE, common_size)
+                if mapped_a[block_start:block_end] == mapped_b[block_start:block_end]:
+                    continue
+                for offset in range(block_start, block_end, PAGE_SIZE):
+                    page_end = min(offset + PAGE_SIZE, block_end)
+                    if mapped_a[offset:page_end] != mapped_b[offset:page_end]:
+                        changed_pages.append(offset // PAGE_SIZE)
+    return changed_pages
+
+def get_page_ranges(start, changed_pages):
+    """
+    Coalesces changed page indexes into address ranges.
+
+    Args:
+        start (int): The starting address of the region.
+        changed_pages (list of int): Sorted changed page indexes.
+
+    Returns:
+        list of tuple: (range_start, range_end) address ranges.
+    """
+    ranges = []
+    for page in changed_pages:
+        page_start = start + page * PAGE_SIZE
+        if ranges and ranges[-1][1] == page_start:
+            ranges[-1] = (ranges[-1][0], page_start + PAGE_SIZE)
+        else:
+            ranges.append((page_start, page_start + PAGE_SIZE))
+    return ranges
+
+def diff_dumps(dump_dir_a, dump_dir_b):
+    """
+    Compares two saved dumps region by region.
+
+    When both dumps were saved with '--log-hashes', regions whose stored hashes
+    match are counted as identical without reading their files. Other regions
+    are compared page by page.
+
+    Args:
+        dump_dir_a (str): The earlier dump directory.
+        dump_dir_b (str): The later dump directory.
+
+    Returns:
+        dict: 'new' and 'removed' mappings, 'resized' regions, 'changed' regions
+              with their changed address ranges, and the 'identical' region count.
+    """
+    regions_a = collect_dump_regions(dump_dir_a)
+    regions_b = collect_dump_regions(dump_dir_b)
+    stored_hashes_a = load_manifest_hashes(dump_dir_a)
+    stored_hashes_b = load_manifest_hashes(dump_dir_b)
+
+    result = {"new": [], "removed": [], "resized": [], "changed": [], "identical": 0}
+    for key in sorted(regions_a.keys() - regions_b.keys()):
+        result["removed"].append((key[0],) + regions_a[key][:2])
+    for key in sorted(regions_b.keys() - regions_a.keys()):
+        result["new"].append((key[0],) + regions_b[key][:2])
+
+    for key in sorted(regions_a.keys() & regions_b.keys()):
+        start, end_a, path_a = regions_a[key]
+        _, end_b, path_b = regions_b[key]
+        if end_a != end_b:
+            result["resized"].append((key[0], start, end_a, end_b))
+        else:
+            digest_a = get_stored_digest(path_a, stored_hashes_a)
+            if digest_a is not None and digest_a == get_stored_digest(path_b, stored_hashes_b):
+                result["identical"] += 1
+                continue
+
+        changed_pages = diff_region_pages(path_a, path_b)
+        if changed_pages:
+            result["changed"].append((key[0], start, get_page_ranges(start, changed_pages)))
+        elif end_a == end_b:
+            result["identical"] += 1
+    return result
+
+def print_dump_diff(result):
+    """
+    Prints the result of diff_dumps.
+
+    Args:
+        result (dict): The dictionary returned by diff_dumps.
+    """
+    for section, start, end in result["new"]:
+        click.secho(f"+ New mapping: {section} ({hex(start)}-{hex(end)})", fg="green")
+    for section, start, end in result["removed"]:
+        click.secho(f"- Removed mapping: {section} ({hex(start)}-{hex(end)})", fg="red")
+    for section, start, end_a, end_b in result["resized"]:
+        click.secho(f"~ Resized: {section} ({hex(start)}) {end_a - start} -> {end_b - start} bytes", fg="yellow")
+
+    changed_page_count = 0
+    for section, start, ranges in result["changed"]:
+        click.secho(f"\n--- {section.upper()} ({hex(start)}) CHANGED PAGES ---", fg="yellow")
+        for range_start, range_end in ranges:
+            page_count = (range_end - range_start) // PAGE_SIZE
+            changed_page_count += page_count
+            click.echo(f" {hex(range_start)}-{hex(range_end)} ({page_count} page(s))")
+
+    click.secho(f"\n{result['identical']} identical, {len(result['changed'])} changed, "
+                f"{len(result['resized'])} resized, {len(result['new'])} new, {len(result['removed'])} removed region(s); "
+                f"{changed_page_count} changed page(s).", fg="green")
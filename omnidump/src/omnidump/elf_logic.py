@@ -0,0 +1,535 @@
+"""In-memory ELF modules: segments, build IDs, dynamic symbol tables and address-to-symbol lookup."""
+import os
+import json
+import bisect
+import struct
+from dataclasses import dataclass, field
+from typing import List, Optional
+import click
+from . import pid_mapping_logic
+
+ELF_MAGIC = b"\x7fELF"
+MODULE_SECTIONS = ("executable", "shared_libs")
+PT_LOAD, PT_DYNAMIC, PT_NOTE = 1, 2, 4
+DT_NULL, DT_HASH, DT_STRTAB, DT_SYMTAB, DT_STRSZ, DT_SYMENT, DT_GNU_HASH = 0, 4, 5, 6, 10, 11, 0x6ffffef5
+NT_GNU_BUILD_ID = 3
+STT_OBJECT, STT_FUNC, STT_GNU_IFUNC = 1, 2, 10
+SYMBOL_TYPES = {STT_OBJECT: "object", STT_FUNC: "func", STT_GNU_IFUNC: "ifunc"}
+# Tables larger than this are treated as corrupt rather than read.
+MAX_TABLE_SIZE = 64 * 1024 * 1024
+MAX_PROGRAM_HEADERS = 256
+CACHE_VERSION = 1
+
+@dataclass(frozen=True)
+class ElfHeader:
+    """The fields of an ELF file header used to find its program headers."""
+
+    elf_class: int
+    order: str
+    file_type: int
+    ph_offset: int
+    ph_size: int
+    ph_count: int
+
+    @property
+    def word(self) -> str:
+        """Returns the struct format of an address-sized word."""
+        return "Q" if self.elf_class == 2 else "I"
+
+@dataclass(frozen=True)
+class Segment:
+    """One program header: its type, file extent and runtime address range."""
+
+    kind: int
+    offset: int
+    file_size: int
+    address: int
+    memory_size: int
+
+@dataclass
+class ElfModule:
+    """An ELF image mapped in a process: the executable or a shared library."""
+
+    path: str
+    base: int
+    bias: int = 0
+    build_id: Optional[str] = None
+    segments: List[Segment] = field(default_factory=list)
+    symbols: List[tuple] = field(default_factory=list)
+    source: str = "none"
+
+def read_memory(mem_fd, address, size):
+    """
+    Reads bytes from an open /proc/PID/mem descriptor.
+
+    Args:
+        mem_fd (int): The descriptor.
+        address (int): The first address.
+        size (int): The number of bytes.
+
+    Returns:
+        bytes: The bytes read; shorter than size, or empty, if the range is not mapped.
+    """
+    if address < 0 or size <= 0:
+        return b""
+    try:
+        return os.pread(mem_fd, size, address)
+    except OSError:
+        return b""
+
+def parse_elf_header(data):
+    """
+    Parses an ELF file header.
+
+    Args:
+        data (bytes): At least the first 64 bytes of the image.
+
+    Returns:
+        ElfHeader or None: The header, or None if data is not a supported ELF header.
+    """
+    if len(data) < 64 or not data.startswith(ELF_MAGIC):
+        return None
+    elf_class, byte_order, version = data[4:7]
+    if elf_class not in (1, 2) or byte_order not in (1, 2) or version != 1:
+        return None
+    order = "<" if byte_order == 1 else ">"
+    file_type = struct.unpack_from(order + "H", data, 16)[0]
+    if elf_class == 1:
+        ph_offset = struct.unpack_from(order + "I", data, 28)[0]
+        ph_size, ph_count = struct.unpack_from(order + "HH", data, 42)
+    else:
+        ph_offset = struct.unpack_from(order + "Q", data, 32)[0]
+        ph_size, ph_count = struct.unpack_from(order + "HH", data, 54)
+    if ph_size != (32 if elf_class == 1 else 56) or not 0 < ph_count <= MAX_PROGRAM_HEADERS:
+        return None
+    return ElfHeader(elf_class, order, file_type, ph_offset, ph_size, ph_count)
+
+def parse_program_headers(data, header: ElfHeader):
+    """
+    Parses the program header table.
+
+    Args:
+        data (bytes): The table, header.ph_count entries of header.ph_size bytes.
+        header (ElfHeader): The file header.
+
+    Returns:
+        list of Segment: One entry per program header.
+    """
+    segments = []
+    for index in range(min(header.ph_count, len(data) // header.ph_size)):
+        if header.elf_class == 1:
+            kind, offset, address, _, file_size, memory_size = struct.unpack_from(header.order + "IIIIII", data,
+                                                                                  index * header.ph_size)
+        else:
+            kind, _, offset, address, _, file_size, memory_size = struct.unpack_from(header.order + "IIQQQQQ", data,
+                                                                                     index * header.ph_size)
+        segments.append(Segment(kind, offset, file_size, address, memory_size))
+    return segments
+
+def get_load_bias(base, segments):
+    """
+    Returns what was added to every virtual address of an image when it was mapped.
+
+    Args:
+        base (int): The address of the ELF header in memory.
+        segments (list of Segment): The program headers.
+
+    Returns:
+        int: base minus the page-aligned address of the first loadable segment.
+    """
+    loads = [segment.address - segment.offset for segment in segments if segment.kind == PT_LOAD]
+    return base - (min(loads) & ~0xfff) if loads else base
+
+def parse_build_id(data, order):
+    """
+    Finds the GNU build ID in the contents of a PT_NOTE segment.
+
+    Args:
+        data (bytes): The note segment.
+        order (str): '<' or '>', the byte order of the image.
+
+    Returns:
+        str or None: The build ID as hex, or None if the segment has none.
+    """
+    offset = 0
+    while offset + 12 <= len(data):
+        name_size, desc_size, note_type = struct.unpack_from(order + "III", data, offset)
+        name_start = offset + 12
+        desc_start = name_start + ((name_size + 3) & ~3)
+        if note_type == NT_GNU_BUILD_ID and data[name_start:name_start + name_size] == b"GNU\x00":
+            build_id = data[desc_start:desc_start + desc_size]
+            return build_id.hex() if len(build_id) == desc_size and desc_size else None
+        offset = desc_start + ((desc_size + 3) & ~3)
+    return None
+
+def parse_dynamic(data, header: ElfHeader):
+    """
+    Parses the entries of a PT_DYNAMIC segment up to DT_NULL.
+
+    Args:
+        data (bytes): The dynamic segment.
+        header (ElfHeader): The file header.
+
+    Returns:
+        dict: The value of the first entry of each tag.
+    """
+    entry = struct.Struct(header.order + header.word * 2)
+    entries = {}
+    for offset in range(0, len(data) - entry.size + 1, entry.size):
+        tag, value = entry.unpack_from(data, offset)
+        if tag == DT_NULL:
+            break
+        entries.setdefault(tag, value)
+    return entries
+
+def get_gnu_hash_symbol_count(mem_fd, address, header: ElfHeader):
+    """
+    Counts the dynamic symbols from a DT_GNU_HASH table, which does not store the count.
+
+    The highest bucket gives the first symbol of the last chain; the chain
+    is followed until the entry with its low bit set.
+
+    Args:
+        mem_fd (int): An open /proc/PID/mem descriptor.
+        address (int): The runtime address of the hash table.
+        header (ElfHeader): The file header.
+
+    Returns:
+        int: The number of symbols, or 0 if the table cannot be read.
+    """
+    table = read_memory(mem_fd, address, 16)
+    if len(table) < 16:
+        return 0
+    bucket_count, symbol_offset, bloom_size, _ = struct.unpack_from(header.order + "IIII", table)
+    buckets_address = address + 16 + bloom_size * (8 if header.elf_class == 2 else 4)
+    if not bucket_count or bucket_count * 4 > MAX_TABLE_SIZE:
+        return 0
+    buckets = read_memory(mem_fd, buckets_address, bucket_count * 4)
+    if len(buckets) < bucket_count * 4:
+        return 0
+    last = max(struct.unpack(f"{header.order}{bucket_count}I", buckets))
+    if last < symbol_offset:
+        return symbol_offset
+    chain_address = buckets_address + bucket_count * 4 + (last - symbol_offset) * 4
+    while last * 4 < MAX_TABLE_SIZE:
+        chain = read_memory(mem_fd, chain_address, 4096)
+        if len(chain) < 4:
+            return 0
+        for (value,) in struct.iter_unpack(header.order + "I", chain[:len(chain) & ~3]):
+            last += 1
+            if value & 1:
+                return last
+        chain_address += len(chain) & ~3
+    return 0
+
+def parse_symbols(symbol_table, string_table, header: ElfHeader):
+    """
+    Parses the defined function and object symbols of a dynamic symbol table.
+
+    Args:
+        symbol_table (bytes): The .dynsym entries.
+        string_table (bytes): The .dynstr strings.
+        header (ElfHeader): The file header.
+
+    Returns:
+        list of tuple: (value, size, type, name) sorted by value, with values as in the file.
+    """
+    if header.elf_class == 1:
+        entry, fields = struct.Struct(header.order + "IIIBBH"), (1, 2, 3, 5, 0)
+    else:
+        entry, fields = struct.Struct(header.order + "IBBHQQ"), (4, 5, 1, 3, 0)
+    value_field, size_field, info_field, section_field, name_field = fields
+    symbols = []
+    for offset in range(0, len(symbol_table) - entry.size + 1, entry.size):
+        symbol = entry.unpack_from(symbol_table, offset)
+        symbol_type = SYMBOL_TYPES.get(symbol[info_field] & 0xf)
+        if symbol_type is None or not symbol[section_field] or not symbol[value_field]:
+            continue
+        name_start = symbol[name_field]
+        name_end = string_table.find(b"\x00", name_start)
+        if name_start >= len(string_table) or name_end == -1:
+            continue
+        symbols.append((symbol[value_field], symbol[size_field], symbol_type,
+                        string_table[name_start:name_end].decode("utf-8", "replace")))
+    symbols.sort()
+    return symbols
+
+def read_dynamic_symbols(mem_fd, module: ElfModule, header: ElfHeader):
+    """
+    Reads the dynamic symbol table of a mapped module.
+
+    The dynamic linker rewrites some DT_* addresses to runtime addresses and
+    leaves others as virtual addresses, so values below the load bias are
+    taken as virtual addresses.
+
+    Args:
+        mem_fd (int): An open /proc/PID/mem descriptor.
+        module (ElfModule): The module, with its bias and segments.
+        header (ElfHeader): The file header.
+
+    Returns:
+        list of tuple: The symbols from parse_symbols, or an empty list if the table cannot be read.
+    """
+    dynamic = next((segment for segment in module.segments if segment.kind == PT_DYNAMIC), None)
+    if dynamic is None:
+        return []
+    entries = parse_dynamic(read_memory(mem_fd, module.bias + dynamic.address, dynamic.memory_size), header)
+    runtime = lambda value: value if module.bias and value >= module.bias else value + module.bias
+    if DT_SYMTAB not in entries or DT_STRTAB not in entries:
+        return []
+    entry_size = entries.get(DT_SYMENT, 16 if header.elf_class == 1 else 24)
+    if DT_HASH in entries:
+        hash_header = read_memory(mem_fd, runtime(entries[DT_HASH]), 8)
+        count = struct.unpack_from(header.order + "II", hash_header)[1] if len(hash_header) == 8 else 0
+    elif DT_GNU_HASH in entries:
+        count = get_gnu_hash_symbol_count(mem_fd, runtime(entries[DT_GNU_HASH]), header)
+    else:
+        count = 0
+    string_size = entries.get(DT_STRSZ, 0)
+    if not count or count * entry_size > MAX_TABLE_SIZE or string_size > MAX_TABLE_SIZE:
+        return []
+    symbol_table = read_memory(mem_fd, runtime(entries[DT_SYMTAB]), count * entry_size)
+    string_table = read_memory(mem_fd, runtime(entries[DT_STRTAB]), string_size)
+    return parse_symbols(symbol_table, string_table, header)
+
+def get_cache_path(cache_dir, build_id):
+    """Returns the cache file of the symbols of a build ID."""
+    return os.path.join(cache_dir, f"{build_id}.json")
+
+def load_cached_symbols(cache_dir, build_id):
+    """
+    Loads the symbols of a build ID saved by save_cached_symbols.
+
+    Args:
+        cache_dir (str): The cache directory.
+        build_id (str): The build ID, as hex.
+
+    Returns:
+        list of tuple or None: The symbols, or None if they are not cached or the file is unreadable.
+    """
+    try:
+        with open(get_cache_path(cache_dir, build_id), "r") as cache_file:
+            cached = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("version") != CACHE_VERSION or cached.get("build_id") != build_id:
+        return None
+    return [tuple(symbol) for symbol in cached["symbols"]]
+
+def save_cached_symbols(cache_dir, build_id, path, symbols):
+    """
+    Saves the symbols of a build ID, written to a temporary file and renamed so readers never see a partial file.
+
+    Args:
+        cache_dir (str): The cache directory.
+        build_id (str): The build ID, as hex.
+        path (str): The module path it was read from, kept for reference.
+        symbols (list of tuple): The symbols from parse_symbols.
+    """
+    full_file_path = get_cache_path(cache_dir, build_id)
+    temp_file_path = f"{full_file_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(temp_file_path, "w") as cache_file:
+            json.dump({"version": CACHE_VERSION, "build_id": build_id, "path": path, "symbols": symbols}, cache_file)
+        os.replace(temp_file_path, full_file_path)
+    except OSError as e:
+        click.secho(f"Could not write symbol cache: {e}", fg="yellow")
+
+def read_build_ids(mem_path, input_dict, sections=MODULE_SECTIONS):
+    """
+    Reads the build ID of every ELF module mapped by a process.
+
+    Args:
+        mem_path (str): Path to the /proc/PID/mem file.
+        input_dict (dict): Dictionary of categorized memory regions from group_regions.
+        sections (tuple of str, optional): The categories searched for modules.
+
+    Returns:
+        dict: The build ID of each module path that has one.
+    """
+    try:
+        mem_fd = os.open(mem_path, os.O_RDONLY)
+    except OSError:
+        return {}
+    build_ids = {}
+    try:
+        for base, path in find_module_bases(input_dict, sections):
+            parsed = read_module_headers(mem_fd, base, path)
+            if parsed is not None and parsed[0].build_id:
+                build_ids[path] = parsed[0].build_id
+    finally:
+        os.close(mem_fd)
+    return build_ids
+
+def get_default_cache_dir():
+    """Returns $XDG_CACHE_HOME/omnidump/symbols, or ~/.cache/omnidump/symbols."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "omnidump", "symbols")
+
+def find_module_bases(input_dict, sections=MODULE_SECTIONS):
+    """
+    Groups the executable and shared library mappings by file.
+
+    Args:
+        input_dict (dict): Dictionary of categorized memory regions from group_regions.
+        sections (tuple of str, optional): The categories searched for modules.
+
+    Returns:
+        list of tuple: (base, path) sorted by base, where base is the start of the file's mapping at offset 0.
+    """
+    bases = {}
+    for category in sections:
+        for section in input_dict.get(category, []):
+            address, _, path, _, _ = pid_mapping_logic.get_section_information(section)
+            if int(section.get("offsets", "0"), 16):
+                continue
+            start = int(address.split("-")[0], 16)
+            bases[path] = min(start, bases.get(path, start))
+    return sorted((base, path) for path, base in bases.items())
+
+def read_module_headers(mem_fd, base, path):
+    """
+    Parses the headers of the ELF image mapped at base: its segments, load bias and build ID.
+
+    Args:
+        mem_fd (int): An open /proc/PID/mem descriptor.
+        base (int): The address of the ELF header.
+        path (str): The mapped file.
+
+    Returns:
+        tuple or None: (ElfModule, ElfHeader), or None if no ELF header is mapped at base.
+    """
+    header = parse_elf_header(read_memory(mem_fd, base, 64))
+    if header is None:
+        return None
+    module = ElfModule(path, base)
+    table = read_memory(mem_fd, base + header.ph_offset, header.ph_count * header.ph_size)
+    module.segments = parse_program_headers(table, header)
+    module.bias = get_load_bias(base, module.segments)
+    for segment in module.segments:
+        if segment.kind == PT_NOTE and module.build_id is None:
+            module.build_id = parse_build_id(read_memory(mem_fd, module.bias + segment.address, segment.file_size),
+                                             header.order)
+    return (module, header)
+
+def read_module(mem_fd, base, path, cache_dir=None):
+    """
+    Parses the ELF image mapped at base: its segments, build ID and dynamic symbols.
+
+    Symbols are looked up in cache_dir by build ID first, and saved there after being read from memory.
+
+    Args:
+        mem_fd (int): An open /proc/PID/mem descriptor.
+        base (int): The address of the ELF header.
+        path (str): The mapped file.
+        cache_dir (str, optional): The symbol cache directory; no cache when None.
+
+    Returns:
+        ElfModule or None: The module, or None if no ELF header is mapped at base.
+    """
+    parsed = read_module_headers(mem_fd, base, path)
+    if parsed is None:
+        return None
+    module, header = parsed
+
+    if cache_dir and module.build_id:
+        cached = load_cached_symbols(cache_dir, module.build_id)
+        if cached is not None:
+            module.symbols, module.source = cached, "cache"
+            return module
+    module.symbols = read_dynamic_symbols(mem_fd, module, header)
+    module.source = "memory" if module.symbols else "none"
+    if cache_dir and module.build_id and module.symbols:
+        save_cached_symbols(cache_dir, module.build_id, path, module.symbols)
+    return module
+
+def reconstruct_image(mem_fd, module: ElfModule):
+    """
+    Rebuilds the file image of a module from its loadable segments.
+
+    Each PT_LOAD segment is read from memory and placed at its file offset.
+    Relocated data and anything not mapped, such as section headers, differ
+    from the file on disk.
+
+    Args:
+        mem_fd (int): An open /proc/PID/mem descriptor.
+        module (ElfModule): The module.
+
+    Returns:
+        bytes: The image.
+    """
+    loads = [segment for segment in module.segments if segment.kind == PT_LOAD and segment.file_size]
+    image = bytearray(max((segment.offset + segment.file_size for segment in loads), default=0))
+    for segment in loads:
+        data = read_memory(mem_fd, module.bias + segment.address, segment.file_size)
+        image[segment.offset:segment.offset + len(data)] = data
+    return bytes(image)
+
+class SymbolIndex:
+    """
+    Maps addresses to the symbols of every module, with a binary search over all symbols sorted by runtime address.
+
+    Args:
+        modules (list of ElfModule): The modules.
+    """
+
+    def __init__(self, modules):
+        self.entries = sorted((module.bias + value, size, name, module.path)
+                              for module in modules for value, size, _, name in module.symbols)
+        self.addresses = [entry[0] for entry in self.entries]
+        self.modules = sorted((module.base, module.path) for module in modules)
+
+    def lookup(self, address):
+        """
+        Finds the symbol containing an address.
+
+        A sized symbol contains the addresses up to its end, a symbol of size
+        zero only its own address. Of aliases at one address, the largest wins.
+
+        Args:
+            address (int): The address.
+
+        Returns:
+            tuple or None: (name, offset, module_path), or None if no symbol contains the address.
+        """
+        position = bisect.bisect_right(self.addresses, address) - 1
+        if position < 0:
+            return None
+        start, size, name, path = self.entries[position]
+        if address < start + max(size, 1):
+            return (name, address - start, path)
+        return None
+
+    def format_address(self, address):
+        """
+        Describes an address as 'MODULE!SYMBOL+0xOFFSET', or 'MODULE+0xOFFSET' from the module base.
+
+        Args:
+            address (int): The address.
+
+        Returns:
+            str: The description, or '?' if the address is below every module.
+        """
+        found = self.lookup(address)
+        if found is not None:
+            name, offset, path = found
+            return f"{os.path.basename(path)}!{name}+{offset:#x}"
+        position = bisect.bisect_right(self.modules, (address, chr(0x10ffff))) - 1
+        if position < 0:
+            return "?"
+        base, path = self.modules[position]
+        return f"{os.path.basename(path)}+{address - base:#x}"
+
+def format_module(module: ElfModule):
+    """
+    Formats one module.
+
+    Args:
+        module (ElfModule): The module.
+
+    Returns:
+        str: 'BASE<TAB>BUILD_ID<TAB>SEGMENTS<TAB>SYMBOLS<TAB>SOURCE<TAB>PATH'.
+    """
+    loads = sum(segment.kind == PT_LOAD for segment in module.segments)
+    return f"{module.base:#018x}\t{module.build_id or '-'}\t{loads}\t{len(module.symbols)}\t{module.source}\t{module.path}"
@@ -0,0 +1,180 @@
+"""Sliding-window entropy scan: finds short high-entropy runs, such as keys, in low-entropy memory."""
+import math
+import click
+from . import pipeline_logic
+
+DEFAULT_WINDOW = 32
+# A window of 32 random bytes scores about 4.85 bits per byte; text and pointer
+# tables stay well below 4.5.
+DEFAULT_THRESHOLD = 4.7
+DEFAULT_SECTIONS = ("heap", "stack", "anon_map", "anon")
+
+def format_entropy_span(start, end, entropy, category, path):
+    """
+    Formats one candidate span of the entropy scan.
+
+    Args:
+        start (int): The address of the first byte of the span.
+        end (int): The address after the last byte of the span.
+        entropy (float): The highest window entropy in the span, in bits per byte.
+        category (str): The region category from get_region_category.
+        path (str): The region path.
+
+    Returns:
+        str: 'ADDRESS<TAB>LENGTH<TAB>ENTROPY<TAB>CATEGORY<TAB>PATH'.
+    """
+    return f"{start:#018x}\t{end - start}\t{entropy:.3f}\t{category}\t{path}"
+
+def iter_high_entropy_windows(data, window, threshold):
+    """
+    Yields every window of a buffer whose entropy reaches the threshold.
+
+    The entropy is kept up to date as the window slides one byte at a time:
+    only the counts of the byte leaving and the byte entering change, so the
+    scan is O(n) rather than O(n * window). Spans that cannot hold a match are
+    skipped first: a window with entropy H has at least 2**H distinct bytes, and
+    every window starting in a window-sized block lies within that block and
+    the next, so blocks whose two-block span has fewer distinct bytes are skipped.
+
+    Args:
+        data (bytes): The buffer.
+        window (int): The window size in bytes.
+        threshold (float): The minimum entropy in bits per byte.
+
+    Yields:
+        tuple: (offset, entropy) for each matching window, by offset.
+    """
+    last_start = len(data) - window
+    if last_start < 0:
+        return
+    min_distinct = math.ceil(2 ** threshold - 1e-9)
+    # c * log2(c) for every count a window can hold; H = log2(w) - sum / w.
+    count_terms = [count * math.log2(count) if count else 0.0 for count in range(window + 1)]
+    max_sum = window * (math.log2(window) - threshold) + 1e-9
+    log_window = math.log2(window)
+
+    candidate = [len(set(data[offset:offset + 2 * window])) >= min_distinct for offset in range(0, last_start + 1, window)]
+    offset = 0
+    while offset <= last_start:
+        block = offset // window
+        if not candidate[block]:
+            offset = (block + 1) * window
+            continue
+
+        run_end = min((block + 1) * window, last_start + 1)
+        while run_end <= last_start and candidate[run_end // window]:
+            run_end = min(run_end + window, last_start + 1)
+
+        counts = [0] * 256
+        for byte in data[offset:offset + window]:
+            counts[byte] += 1
+        term_sum = sum(count_terms[count] for count in counts if count)
+        for start in range(offset, run_end):
+            if term_sum <= max_sum:
+                yield (start, log_window - term_sum / window)
+            if start + window < len(data):
+                leaving, entering = data[start], data[start + window]
+                if leaving != entering:
+                    term_sum -= count_terms[counts[leaving]] + count_terms[counts[entering]]
+                    counts[leaving] -= 1
+                    counts[entering] += 1
+                    term_sum += count_terms[counts[leaving]] + count_terms[counts[entering]]
+        offset = run_end
+
+class EntropyScanner:
+    """
+    Finds high-entropy spans in a stream of chunks.
+
+    The last window - 1 bytes of each chunk are carried into the next, so
+    windows across chunk boundaries are scanned exactly once. Overlapping or
+    touching matching windows are merged into one span.
+
+    Args:
+        window (int): The window size in bytes.
+        threshold (float): The minimum entropy in bits per byte.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, threshold=DEFAULT_THRESHOLD):
+        self.window = window
+        self.threshold = threshold
+        self.carry = b""
+        self.carry_address = 0
+        self.span = None
+
+    def reset(self):
+        """Discards any carried bytes and open span before scanning a new region."""
+        self.carry = b""
+        self.carry_address = 0
+        self.span = None
+
+    def feed(self, chunk, address):
+        """
+        Scans the next chunk of a region.
+
+        Args:
+            chunk (bytes): The chunk data.
+            address (int): The virtual address of the first byte of the chunk.
+
+        Yields:
+            tuple: (start, end, entropy) for each span closed by this chunk.
+        """
+        data = self.carry + chunk
+        base = self.carry_address if self.carry else address
+        for offset, entropy in iter_high_entropy_windows(data, self.window, self.threshold):
+            start = base + offset
+            if self.span is not None and start <= self.span[1]:
+                self.span = (self.span[0], start + self.window, max(self.span[2], entropy))
+                continue
+            if self.span is not None:
+                yield self.span
+            self.span = (start, start + self.window, entropy)
+        keep_from = max(len(data) - self.window + 1, 0)
+        self.carry = data[keep_from:]
+        self.carry_address = base + keep_from
+
+    def flush(self):
+        """
+        Finishes the current region.
+
+        Yields:
+            tuple: (start, end, entropy) for a span still open at the end of the region.
+        """
+        span = self.span
+        self.reset()
+        if span is not None:
+            yield span
+
+class EntropyScanSink(pipeline_logic.RegionSink):
+    """
+    Prints the high-entropy spans of every region fed by the region pipeline.
+
+    Args:
+        window (int): The window size in bytes.
+        threshold (float): The minimum entropy in bits per byte.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, threshold=DEFAULT_THRESHOLD):
+        self.scanner = EntropyScanner(window, threshold)
+        self.region = None
+        self.spans = 0
+        self.regions = 0
+
+    def begin_region(self, region: pipeline_logic.RegionInfo):
+        self.region = region
+        self.scanner.reset()
+
+    def report(self, spans):
+        """Prints spans of the current region."""
+        for start, end, entropy in spans:
+            click.echo(format_entropy_span(start, end, entropy, self.region.section_name, self.region.path))
+            self.spans += 1
+
+    def feed(self, address, chunk):
+        self.report(self.scanner.feed(chunk, address))
+
+    def end_region(self):
+        self.report(self.scanner.flush())
+        self.regions += 1
+
+    def close(self):
+        click.secho(f"Found {self.spans} high-entropy span(s) in {self.regions} region(s).", fg="green")
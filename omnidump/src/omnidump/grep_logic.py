@@ -0,0 +1,343 @@
+"""Pattern search over live process memory: hex byte patterns with wildcards and bytes regexes."""
+import abc
+import re
+import click
+from . import pipeline_logic
+
+HEX_DIGITS = "0123456789abcdefABCDEF"
+DEFAULT_CONTEXT = 16
+# Regex matches are only guaranteed across chunk boundaries up to this length.
+MAX_REGEX_MATCH = 4096
+# Printable ASCII is shown as is, every other byte as \xNN.
+BYTE_ESCAPES = [chr(byte) if 0x20 <= byte < 0x7f and byte != 0x5c else f"\\x{byte:02x}" for byte in range(256)]
+BYTE_ESCAPES[0x5c] = "\\\\"
+
+def parse_hex_pattern(text):
+    """
+    Parses a hex byte pattern with wildcards.
+
+    Each byte is two hex digits, in which either digit may be '?'; whitespace
+    between bytes is optional. e.g. '48 8B ?? ?? 90' or '4? 8b ?5'.
+
+    Args:
+        text (str): The pattern.
+
+    Returns:
+        tuple: (values, masks), bytes of equal length. A data byte matches when
+        byte & mask == value.
+
+    Raises:
+        ValueError: If the pattern is empty, has an odd number of digits, an
+        invalid digit, or no fully specified byte.
+    """
+    digits = "".join(text.split())
+    if not digits:
+        raise ValueError("The pattern is empty.")
+    if len(digits) % 2:
+        raise ValueError(f"'{text}' has an odd number of hex digits.")
+    values = bytearray()
+    masks = bytearray()
+    for index in range(0, len(digits), 2):
+        value = mask = 0
+        for digit in digits[index:index + 2]:
+            value <<= 4
+            mask <<= 4
+            if digit == "?":
+                continue
+            if digit not in HEX_DIGITS:
+                raise ValueError(f"'{digit}' is not a hex digit or '?'.")
+            value |= int(digit, 16)
+            mask |= 0xf
+        values.append(value)
+        masks.append(mask)
+    if 0xff not in masks:
+        raise ValueError("The pattern needs at least one fully specified byte.")
+    return (bytes(values), bytes(masks))
+
+def get_byte_class(value, mask):
+    """
+    Returns the regex matching one masked pattern byte.
+
+    Args:
+        value (int): The byte value, with wildcard bits cleared.
+        mask (int): 0xff, 0xf0, 0x0f or 0x00.
+
+    Returns:
+        bytes: A literal, a character class or '.'.
+    """
+    if mask == 0xff:
+        return re.escape(bytes([value]))
+    if mask == 0:
+        return b"."
+    return b"[" + b"".join(re.escape(bytes([byte])) for byte in range(256) if byte & mask == value) + b"]"
+
+class HexPattern:
+    """
+    A compiled hex byte pattern.
+
+    Candidates are found with bytes.find on the longest run of fully specified
+    bytes, the anchor, and only then checked at every masked position with a
+    regex match at the candidate.
+
+    Args:
+        text (str): The pattern, as accepted by parse_hex_pattern.
+    """
+
+    def __init__(self, text):
+        self.values, self.masks = parse_hex_pattern(text)
+        self.size = len(self.values)
+        self.regex = re.compile(b"".join(get_byte_class(value, mask) for value, mask in zip(self.values, self.masks)),
+                                re.DOTALL)
+        runs = [(match.end() - match.start(), match.start()) for match in re.finditer(b"\xff+", self.masks)]
+        length, self.anchor_offset = max(runs, key=lambda run: (run[0], -run[1]))
+        self.anchor = self.values[self.anchor_offset:self.anchor_offset + length]
+
+    def iter_matches(self, data, limit, start=0):
+        """
+        Finds the pattern in a buffer.
+
+        Args:
+            data (bytes): The buffer.
+            limit (int): Only matches starting before this offset are reported.
+            start (int, optional): Only matches starting at or after this offset are reported.
+
+        Yields:
+            int: The offset of each match, in order. Overlapping matches are all reported.
+        """
+        position = start + self.anchor_offset
+        while True:
+            found = data.find(self.anchor, position)
+            if found == -1:
+                return
+            offset = found - self.anchor_offset
+            if offset >= limit:
+                return
+            if self.regex.match(data, offset):
+                yield offset
+            position = found + 1
+
+class ChunkSearcher:
+    """
+    Runs a search over a stream of chunks.
+
+    The last overlap bytes of each chunk are carried into the next, and only
+    matches starting before the carried tail are reported, so each match is
+    found exactly once. Another context bytes before the tail are carried too,
+    but not searched again, so every match has its context on both sides.
+
+    Args:
+        search (callable): search(data, start, limit) yields (offset, size) of
+            each match starting from start and before limit; any further items,
+            e.g. a match kind, are passed through after the context.
+        overlap (int): The longest match, minus one.
+        context (int, optional): The bytes of context kept on each side of a match.
+        overlapping (bool, optional): If False, as for regexes, the search
+            resumes after the end of the last match rather than in it.
+    """
+
+    def __init__(self, search, overlap, context=0, overlapping=True):
+        self.search = search
+        self.overlap = overlap + context
+        self.context = context
+        self.overlapping = overlapping
+        self.reset()
+
+    def reset(self):
+        """Discards any carried bytes before searching a new region."""
+        self.carry = b""
+        self.carry_address = 0
+        self.resume_address = None
+
+    def iter_found(self, data, base, limit):
+        """Yields (address, before, match, after, *extra) for the matches in data from resume_address to limit."""
+        start = 0 if self.resume_address is None else self.resume_address - base
+        for offset, size, *extra in self.search(data, start, limit):
+            end = offset + size
+            if not self.overlapping:
+                self.resume_address = base + end
+            yield (base + offset, data[max(offset - self.context, 0):offset], data[offset:end], data[end:end + self.context], *extra)
+
+    def feed(self, chunk, address):
+        """
+        Searches the next chunk of a region.
+
+        Args:
+            chunk (bytes): The chunk data.
+            address (int): The virtual address of the first byte of the chunk.
+
+        Yields:
+            tuple: (address, before, match, after) for each match that starts before the carried tail.
+        """
+        data = self.carry + chunk
+        base = self.carry_address if self.carry else address
+        keep_from = len(data) - self.overlap
+        if self.resume_address is not None:
+            keep_from = max(keep_from, self.resume_address - base)
+        keep_from = max(keep_from, 0)
+        yield from self.iter_found(data, base, keep_from)
+        carry_from = max(keep_from - self.context, 0)
+        self.carry = data[carry_from:]
+        self.carry_address = base + carry_from
+        self.resume_address = max(base + keep_from, self.resume_address or 0)
+
+    def flush(self):
+        """
+        Finishes the current region.
+
+        Yields:
+            tuple: (address, before, match, after) for matches in the carried tail.
+        """
+        data, base = self.carry, self.carry_address
+        yield from self.iter_found(data, base, len(data))
+        self.reset()
+
+def escape_bytes(data):
+    """
+    Shows bytes as text: printable ASCII as is, other bytes as \\xNN.
+
+    Args:
+        data (bytes): The bytes.
+
+    Returns:
+        str: The escaped text.
+    """
+    return "".join(BYTE_ESCAPES[byte] for byte in data)
+
+def compile_grep_regex(text, ignore_case=False):
+    """
+    Compiles the regex of the 'grep' command.
+
+    Args:
+        text (str): The regex, matched against raw bytes.
+        ignore_case (bool, optional): If True, ASCII letters match either case.
+
+    Returns:
+        re.Pattern: The compiled bytes regex.
+
+    Raises:
+        ValueError: If the regex is invalid or matches the empty string.
+    """
+    try:
+        regex = re.compile(text.encode("utf-8"), re.DOTALL | (re.IGNORECASE if ignore_case else 0))
+    except re.error as e:
+        raise ValueError(f"Invalid regex: {e}") from None
+    if regex.match(b""):
+        raise ValueError("The regex matches the empty string.")
+    return regex
+
+def format_region(region: pipeline_logic.RegionInfo):
+    """
+    Formats the region a match was found in.
+
+    Args:
+        region (RegionInfo): The region.
+
+    Returns:
+        str: 'START-END<TAB>PERMISSIONS<TAB>CATEGORY<TAB>PATH'.
+    """
+    return f"{region.start:x}-{region.end:x}\t{region.permissions}\t{region.section_name}\t{region.path}"
+
+class GrepSink(pipeline_logic.RegionSink, abc.ABC):
+    """
+    Prints every match of a search with the region it was found in.
+
+    Subclasses give the output line of each match with format_match.
+
+    Args:
+        searcher (ChunkSearcher): The search to run over each region.
+        max_count (int, optional): Stop the pipeline after this many matches.
+    """
+
+    def __init__(self, searcher, max_count=None):
+        self.searcher = searcher
+        self.max_count = max_count
+        self.region = None
+        self.matches = 0
+
+    def begin_region(self, region: pipeline_logic.RegionInfo):
+        self.region = region
+        self.searcher.reset()
+
+    @abc.abstractmethod
+    def format_match(self, address, before, match, after):
+        """Returns the output line of one match."""
+
+    def report(self, matches):
+        """Prints matches of the current region, up to max_count in total."""
+        for found in matches:
+            if self.finished:
+                return
+            click.echo(self.format_match(*found))
+            self.matches += 1
+            self.finished = self.max_count is not None and self.matches >= self.max_count
+
+    def feed(self, address, chunk):
+        self.report(self.searcher.feed(chunk, address))
+
+    def end_region(self):
+        self.report(self.searcher.flush())
+
+    def close(self):
+        click.secho(f"Found {self.matches} match(es).", fg="green")
+
+class HexGrepSink(GrepSink):
+    """
+    Prints every match of a hex pattern.
+
+    Each line is 'ADDRESS<TAB>BYTES<TAB>START-END<TAB>PERMISSIONS<TAB>CATEGORY<TAB>PATH'.
+
+    Args:
+        pattern (HexPattern): The pattern.
+        max_count (int, optional): Stop the pipeline after this many matches.
+    """
+
+    def __init__(self, pattern, max_count=None):
+        def search(data, start, limit):
+            return ((offset, pattern.size) for offset in pattern.iter_matches(data, limit, start))
+
+        super().__init__(ChunkSearcher(search, pattern.size - 1), max_count)
+
+    def format_match(self, address, before, match, after):
+        return f"{address:#018x}\t{match.hex(' ')}\t{format_region(self.region)}"
+
+class RegexGrepSink(GrepSink):
+    """
+    Prints every match of a bytes regex with the bytes around it.
+
+    Each line is 'ADDRESS<TAB>CATEGORY<TAB>PATH<TAB>CONTEXT', where CONTEXT is
+    the escaped match, highlighted, between up to context bytes on each side.
+
+    Args:
+        regex (re.Pattern): The compiled bytes regex.
+        context (int, optional): The bytes of context shown on each side.
+        max_count (int, optional): Stop the pipeline after this many matches.
+    """
+
+    def __init__(self, regex, context=DEFAULT_CONTEXT, max_count=None):
+        def search(data, start, limit):
+            return ((match.start(), match.end() - match.start()) for match in iter_regex_matches(regex, data, start, limit))
+
+        super().__init__(ChunkSearcher(search, MAX_REGEX_MATCH - 1, context, overlapping=False), max_count)
+
+    def format_match(self, address, before, match, after):
+        highlighted = click.style(escape_bytes(match), fg="red", bold=True)
+        return (f"{address:#018x}\t{self.region.section_name}\t{self.region.path}\t"
+                f"{escape_bytes(before)}{highlighted}{escape_bytes(after)}")
+
+def iter_regex_matches(regex, data, start, limit):
+    """
+    Yields the non-overlapping regex matches in data that start from start and before limit.
+
+    Args:
+        regex (re.Pattern): The compiled bytes regex.
+        data (bytes): The buffer.
+        start (int): The first offset a match may start at.
+        limit (int): Matches starting at or after this offset end the search.
+
+    Yields:
+        re.Match: Each match, in order.
+    """
+    for match in regex.finditer(data, start):
+        if match.start() >= limit:
+            return
+        yield match
@@ -0,0 +1,208 @@
+"""Page-level classification of memory regions, saved as page maps and drawn as terminal heatmaps."""
+import array
+import collections
+import math
+import os
+import sys
+import click
+from .stats_logic import PRINTABLE_BYTES, get_entropy
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+PAGE_SIZE = 4096
+# One character per page class, in the order a heatmap cell prefers them.
+PAGE_CLASSES = {
+    "E": ("high-entropy", "red"),
+    "p": ("pointers", "yellow"),
+    "c": ("code", "blue"),
+    "t": ("text", "green"),
+    "d": ("data", "white"),
+    ".": ("zero", "bright_black"),
+}
+CLASS_PRIORITY = {symbol: rank for rank, symbol in enumerate(PAGE_CLASSES)}
+TEXT_THRESHOLD = 0.75
+ENTROPY_THRESHOLD = 7.0
+POINTER_THRESHOLD = 0.25
+CODE_THRESHOLD = 0.2
+# Bytes that dominate x86-64 code: REX prefixes, mov, lea, push/pop, call/jmp,
+# jcc, test/cmp, ret, int3 padding and the two-byte opcode escape. push/pop rbp
+# (0x55, 0x5d) are left out: they are also the top bytes of PIE heap pointers.
+CODE_BYTES = bytes([0x0f, 0x41, 0x48, 0x49, 0x4c, 0x4d, 0x53, 0x5b, 0x74, 0x75, 0x83, 0x84,
+                    0x85, 0x89, 0x8b, 0x8d, 0xc3, 0xcc, 0xe8, 0xe9, 0xeb, 0xff])
+# Values that look like user-space pointers: above 4 GiB, below the 47-bit canonical limit.
+POINTER_MIN = 1 << 32
+POINTER_MAX = 1 << 47
+PAGE_MAP_LINE = 64
+HEATMAP_WIDTH = 64
+HEATMAP_ROWS = 8
+
+def classify_page(page):
+    """
+    Classifies one page.
+
+    Args:
+        page (bytes): The page, normally PAGE_SIZE bytes.
+
+    Returns:
+        str: One of the PAGE_CLASSES symbols.
+    """
+    size = len(page)
+    zero_count = page.count(0)
+    if zero_count == size:
+        return "."
+    if size - len(page.translate(None, PRINTABLE_BYTES)) >= TEXT_THRESHOLD * size:
+        return "t"
+    histogram = collections.Counter(page)
+    if get_entropy(histogram.values(), size) >= ENTROPY_THRESHOLD:
+        return "E"
+    words = array.array("Q", page[:size - size % 8])
+    if sys.byteorder != "little":
+        words.byteswap()
+    if sum(POINTER_MIN <= word < POINTER_MAX for word in words) >= POINTER_THRESHOLD * len(words) > 0:
+        return "p"
+    if size - len(page.translate(None, CODE_BYTES)) >= CODE_THRESHOLD * (size - zero_count):
+        return "c"
+    return "d"
+
+def classify_pages_numpy(data):
+    """
+    Classifies every full page of a buffer at once with NumPy.
+
+    Args:
+        data (bytes): The buffer; its length must be a multiple of PAGE_SIZE.
+
+    Returns:
+        str: One PAGE_CLASSES symbol per page.
+    """
+    pages = numpy.frombuffer(data, dtype=numpy.uint8).reshape(-1, PAGE_SIZE)
+    page_count = len(pages)
+
+    printable_table = numpy.zeros(256, dtype=bool)
+    printable_table[list(PRINTABLE_BYTES)] = True
+    code_table = numpy.zeros(256, dtype=bool)
+    code_table[list(CODE_BYTES)] = True
+
+    zero_counts = (pages == 0).sum(axis=1)
+    printable_counts = printable_table[pages].sum(axis=1)
+    code_counts = code_table[pages].sum(axis=1)
+
+    offsets = pages + (numpy.arange(page_count, dtype=numpy.int64) * 256)[:, None]
+    histograms = numpy.bincount(offsets.ravel(), minlength=page_count * 256).reshape(page_count, 256)
+    probabilities = histograms / PAGE_SIZE
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        entropies = -numpy.where(histograms > 0, probabilities * numpy.log2(probabilities), 0.0).sum(axis=1)
+
+    words = pages.view("<u8")
+    pointer_counts = ((words >= POINTER_MIN) & (words < POINTER_MAX)).sum(axis=1)
+
+    classes = numpy.full(page_count, ord("d"), dtype=numpy.uint8)
+    classes[code_counts >= CODE_THRESHOLD * (PAGE_SIZE - zero_counts)] = ord("c")
+    classes[pointer_counts >= POINTER_THRESHOLD * (PAGE_SIZE // 8)] = ord("p")
+    classes[entropies >= ENTROPY_THRESHOLD] = ord("E")
+    classes[printable_counts >= TEXT_THRESHOLD * PAGE_SIZE] = ord("t")
+    classes[zero_counts == PAGE_SIZE] = ord(".")
+    return classes.tobytes().decode("ascii")
+
+def classify_pages(data):
+    """
+    Classifies every page of a buffer.
+
+    Full pages are classified together with NumPy when it is installed;
+    otherwise, and for a trailing partial page, page by page.
+
+    Args:
+        data (bytes): The buffer, starting at a page boundary.
+
+    Returns:
+        str: One PAGE_CLASSES symbol per page.
+    """
+    full_size = len(data) - len(data) % PAGE_SIZE
+    if numpy is not None and full_size:
+        symbols = classify_pages_numpy(data[:full_size])
+    else:
+        symbols = "".join(classify_page(data[offset:offset + PAGE_SIZE]) for offset in range(0, full_size, PAGE_SIZE))
+    if full_size < len(data):
+        symbols += classify_page(data[full_size:])
+    return symbols
+
+class PageMap:
+    """
+    Accumulates the page classes of a region over its chunks.
+
+    Chunks must start on page boundaries, as the pipeline and console reads do.
+    """
+
+    def __init__(self):
+        self.symbols = []
+
+    def update(self, chunk):
+        """
+        Classifies the pages of the next chunk.
+
+        Args:
+            chunk (bytes): The chunk data.
+        """
+        self.symbols.append(classify_pages(chunk))
+
+    def result(self):
+        """Returns one PAGE_CLASSES symbol per page of the region."""
+        return "".join(self.symbols)
+
+def get_heatmap_cells(symbols, width=HEATMAP_WIDTH, rows=HEATMAP_ROWS):
+    """
+    Reduces a page map to at most width * rows heatmap cells.
+
+    Each cell covers the same number of pages and shows the highest priority
+    class among them, so a single interesting page still stands out.
+
+    Args:
+        symbols (str): One PAGE_CLASSES symbol per page.
+        width (int, optional): Cells per row.
+        rows (int, optional): Maximum number of rows.
+
+    Returns:
+        tuple: (cells, pages_per_cell)
+    """
+    pages_per_cell = max(math.ceil(len(symbols) / (width * rows)), 1)
+    cells = "".join(min(symbols[index:index + pages_per_cell], key=CLASS_PRIORITY.__getitem__)
+                    for index in range(0, len(symbols), pages_per_cell))
+    return (cells, pages_per_cell)
+
+def render_heatmap(symbols, width=HEATMAP_WIDTH, rows=HEATMAP_ROWS):
+    """
+    Draws a page map as colored rows for the '--verbose' output.
+
+    Args:
+        symbols (str): One PAGE_CLASSES symbol per page.
+        width (int, optional): Cells per row.
+        rows (int, optional): Maximum number of rows.
+
+    Returns:
+        str: A legend line followed by one line per row, each prefixed with its offset into the region.
+    """
+    cells, pages_per_cell = get_heatmap_cells(symbols, width, rows)
+    legend = " ".join(f"{symbol}={name}" for symbol, (name, _) in PAGE_CLASSES.items())
+    lines = [f" Page Map (1 cell = {pages_per_cell} page(s)): {legend}\n"]
+    for index in range(0, len(cells), width):
+        row = "".join(click.style(symbol, fg=PAGE_CLASSES[symbol][1]) for symbol in cells[index:index + width])
+        lines.append(f"  +{index * pages_per_cell * PAGE_SIZE:#010x} {row}\n")
+    return "".join(lines)
+
+def save_page_map(full_file_path, symbols):
+    """
+    Writes a region's page map: one symbol per page, PAGE_MAP_LINE pages per line.
+
+    Args:
+        full_file_path (str): The output file.
+        symbols (str): One PAGE_CLASSES symbol per page.
+    """
+    try:
+        os.makedirs(os.path.dirname(full_file_path), exist_ok=True)
+        with open(full_file_path, "w", encoding="utf-8") as page_map_file:
+            for index in range(0, len(symbols), PAGE_MAP_LINE):
+                page_map_file.write(symbols[index:index + PAGE_MAP_LINE] + "\n")
+    except OSError as e:
+        click.secho(f"Could not write page map to file: {e}")
@@ -0,0 +1,148 @@
+"""Indicator extraction: URLs, IP addresses, domains, emails, file paths and base64 blobs from raw region bytes."""
+import ipaddress
+import re
+import click
+from . import pipeline_logic
+from .grep_logic import ChunkSearcher, escape_bytes
+
+DEFAULT_SECTIONS = ("heap", "stack", "anon_map", "anon")
+# Every indicator pattern is bounded, so a match never exceeds this length and
+# the chunk overlap catches indicators across chunk boundaries.
+MAX_IOC_LENGTH = 2048
+# Top-level domains accepted for bare domains. Country codes that are also
+# common file extensions (.so, .py, .sh, .md, .pl, ...) are left out.
+DOMAIN_TLDS = ("com", "net", "org", "edu", "gov", "mil", "int", "info", "biz", "io", "co", "me", "tv", "cc", "ws",
+               "xyz", "top", "site", "online", "club", "app", "dev", "cloud", "onion", "ru", "su", "cn", "de", "uk",
+               "us", "fr", "jp", "kr", "br", "in", "nl", "au", "ca", "it", "es", "ir", "ua", "tk")
+# One named group per indicator type. Order matters: at a given position the
+# first alternative that matches wins, so URLs and emails come before the
+# domains they contain.
+IOC_PATTERNS = {
+    "url": rb"(?:https?|ftp|wss?)://[A-Za-z0-9\-._~:/?#\[\]@!$&'()*+,;=%]{3,2000}",
+    "email": rb"[A-Za-z0-9._%+\-]{1,64}@(?:[A-Za-z0-9\-]{1,63}\.){1,8}[A-Za-z]{2,24}(?![A-Za-z0-9\-])",
+    "ipv6": rb"(?<![0-9A-Za-z:])(?:[0-9A-Fa-f]{0,4}:){2,7}[0-9A-Fa-f]{0,4}(?![0-9A-Za-z:])",
+    "ipv4": rb"(?<![0-9.])(?:(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])\.){3}"
+            rb"(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])(?![0-9.])",
+    "domain": rb"(?<![A-Za-z0-9\-.])(?:[A-Za-z0-9](?:[A-Za-z0-9\-]{0,61}[A-Za-z0-9])?\.){1,8}(?:%s)(?![A-Za-z0-9\-])"
+              % b"|".join(tld.encode("ascii") for tld in DOMAIN_TLDS),
+    "path": rb"(?<![A-Za-z0-9_./\-])/(?:[A-Za-z0-9_.\-]{1,64}/){1,24}[A-Za-z0-9_.\-]{1,64}"
+            rb"|[A-Za-z]:\\(?:[^\\\x00-\x1f\x7f-\xff:*?\"<>|]{1,64}\\){0,24}[^\\\x00-\x20\x7f-\xff:*?\"<>|]{1,64}",
+    "base64": rb"(?<![A-Za-z0-9+/])(?:[A-Za-z0-9+/]{4}){10,400}(?:[A-Za-z0-9+/]{2}==|[A-Za-z0-9+/]{3}=)?(?![A-Za-z0-9+/=])",
+}
+IOC_TYPES = tuple(IOC_PATTERNS)
+IOC_PATTERN = re.compile(b"|".join(b"(?P<%s>%s)" % (name.encode("ascii"), pattern) for name, pattern in IOC_PATTERNS.items()))
+
+def is_valid_ioc(ioc_type, value):
+    """
+    Drops pattern matches that are not real indicators.
+
+    IPv6 candidates must parse as addresses, which rules out times and MAC
+    addresses. Base64 candidates must mix upper case, lower case and digits,
+    which rules out long identifiers and hex strings.
+
+    Args:
+        ioc_type (str): One of IOC_TYPES.
+        value (bytes): The matched bytes.
+
+    Returns:
+        bool: True if the match is kept.
+    """
+    if ioc_type == "ipv6":
+        try:
+            ipaddress.IPv6Address(value.decode("ascii"))
+        except ValueError:
+            return False
+        return value.count(b":") >= 2 and any(char not in b":0" for char in value)
+    if ioc_type == "base64":
+        return (re.search(rb"[A-Z]", value) is not None and re.search(rb"[a-z]", value) is not None
+                and re.search(rb"[0-9]", value) is not None)
+    return True
+
+def iter_ioc_matches(data, start, limit):
+    """
+    Finds the indicators in a buffer with the combined pattern.
+
+    Args:
+        data (bytes): The buffer.
+        start (int): The first offset an indicator may start at.
+        limit (int): Indicators starting at or after this offset end the search.
+
+    Yields:
+        tuple: (offset, size, ioc_type) for each valid indicator, in order.
+    """
+    for match in IOC_PATTERN.finditer(data, start):
+        if match.start() >= limit:
+            return
+        if is_valid_ioc(match.lastgroup, match.group()):
+            yield (match.start(), match.end() - match.start(), match.lastgroup)
+
+def format_ioc_line(ioc_type, count, address, value):
+    """
+    Formats one deduplicated indicator.
+
+    Args:
+        ioc_type (str): One of IOC_TYPES.
+        count (int): The number of occurrences.
+        address (int): The first address it was seen at.
+        value (bytes): The indicator.
+
+    Returns:
+        str: 'TYPE<TAB>COUNT<TAB>FIRST_ADDRESS<TAB>VALUE'.
+    """
+    return f"{ioc_type}\t{count}\t{address:#018x}\t{escape_bytes(value)}"
+
+class IocSink(pipeline_logic.RegionSink):
+    """
+    Extracts and deduplicates the indicators of every region fed by the region pipeline.
+
+    The combined pattern runs once over the raw chunks, not over extracted
+    strings. On close, each unique indicator is printed with its count and
+    first address, grouped by type and by descending count.
+
+    Args:
+        ioc_types (list of str, optional): The types to report; all when empty.
+    """
+
+    def __init__(self, ioc_types=None):
+        self.searcher = ChunkSearcher(iter_ioc_matches, MAX_IOC_LENGTH - 1, overlapping=False)
+        self.ioc_types = set(ioc_types or IOC_TYPES)
+        self.iocs = {}
+
+    def begin_region(self, region: pipeline_logic.RegionInfo):
+        self.searcher.reset()
+
+    def add(self, matches):
+        """Counts the matches of the current region."""
+        for address, _, value, _, ioc_type in matches:
+            if ioc_type not in self.ioc_types:
+                continue
+            entry = self.iocs.get((ioc_type, value))
+            if entry is None:
+                self.iocs[(ioc_type, value)] = [1, address]
+            else:
+                entry[0] += 1
+
+    def feed(self, address, chunk):
+        self.add(self.searcher.feed(chunk, address))
+
+    def end_region(self):
+        self.add(self.searcher.flush())
+
+    def iter_results(self):
+        """
+        Returns the deduplicated indicators.
+
+        Yields:
+            tuple: (ioc_type, count, first_address, value) by IOC_TYPES order, descending count, then value.
+        """
+        ranked = sorted(self.iocs.items(), key=lambda item: (IOC_TYPES.index(item[0][0]), -item[1][0], item[0][1]))
+        for (ioc_type, value), (count, address) in ranked:
+            yield (ioc_type, count, address, value)
+
+    def close(self):
+        type_counts = dict.fromkeys(IOC_TYPES, 0)
+        for ioc_type, count, address, value in self.iter_results():
+            click.echo(format_ioc_line(ioc_type, count, address, value))
+            type_counts[ioc_type] += 1
+        summary = ", ".join(f"{count} {ioc_type}" for ioc_type, count in type_counts.items() if count)
+        click.secho(f"Found {len(self.iocs)} unique indicator(s){': ' + summary if summary else ''}.", fg="green")
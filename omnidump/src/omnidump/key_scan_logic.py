@@ -0,0 +1,365 @@
+"""Key schedule scan: finds expanded AES key schedules and ChaCha state blocks in process memory."""
+import array
+import re
+import click
+from . import pipeline_logic
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+DEFAULT_SECTIONS = ("heap", "stack", "anon_map", "anon")
+# Key words (Nk) per AES key size; the expanded schedule holds 4 * (Nk + 7) words.
+AES_KEY_WORDS = {"aes128": 4, "aes192": 6, "aes256": 8}
+AES_RCON = (0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1b, 0x36)
+CHACHA_CONSTANTS = {b"expand 32-byte k": "chacha20-256", b"expand 16-byte k": "chacha20-128"}
+CHACHA_PATTERN = re.compile(b"|".join(re.escape(constant) for constant in CHACHA_CONSTANTS))
+ZERO_SKIP_BLOCK = 4096
+# The longest match: a 240-byte AES-256 schedule.
+MAX_MATCH_SIZE = 4 * 4 * (8 + 7)
+
+def get_aes_sbox():
+    """
+    Builds the AES S-box: the multiplicative inverse in GF(2**8) followed by the affine transform.
+
+    Returns:
+        bytes: The 256 substituted byte values.
+    """
+    sbox = bytearray(256)
+    p = q = 1
+    while True:
+        # p steps through GF(2**8) as powers of 3, q as powers of its inverse.
+        p ^= ((p << 1) ^ (0x1b if p & 0x80 else 0)) & 0xff
+        q ^= q << 1
+        q ^= q << 2
+        q ^= q << 4
+        q &= 0xff
+        if q & 0x80:
+            q ^= 0x09
+        affine = q
+        for shift in range(1, 5):
+            affine ^= ((q << shift) | (q >> (8 - shift))) & 0xff
+        sbox[p] = affine ^ 0x63
+        if p == 1:
+            break
+    sbox[0] = 0x63
+    return bytes(sbox)
+
+AES_SBOX = get_aes_sbox()
+
+def expand_aes_key(key):
+    """
+    Expands an AES key into its encryption key schedule (FIPS-197 section 5.2).
+
+    Args:
+        key (bytes): A 16, 24 or 32 byte key.
+
+    Returns:
+        bytes: The 176, 208 or 240 byte schedule, in FIPS-197 byte order.
+    """
+    key_words = len(key) // 4
+    schedule = bytearray(key)
+    for index in range(key_words, 4 * (key_words + 7)):
+        word = schedule[-4:]
+        if index % key_words == 0:
+            word = bytearray(AES_SBOX[byte] for byte in word[1:] + word[:1])
+            word[0] ^= AES_RCON[index // key_words - 1]
+        elif key_words > 6 and index % key_words == 4:
+            word = bytearray(AES_SBOX[byte] for byte in word)
+        previous = schedule[-4 * key_words:][:4]
+        schedule += bytes(a ^ b for a, b in zip(word, previous))
+    return bytes(schedule)
+
+def swap_words(data):
+    """
+    Reverses the bytes of every 32-bit word, converting between FIPS-197 order
+    and the native little-endian word arrays some libraries store schedules in.
+
+    Args:
+        data (bytes): A buffer whose length is a multiple of 4.
+
+    Returns:
+        bytes: The swapped buffer.
+    """
+    words = array.array("I", data)
+    words.byteswap()
+    return words.tobytes()
+
+def get_aes_pattern(key_words, zero_word, any_word):
+    """
+    Compiles the pattern a schedule leaves in a sequence of per-word consistency marks.
+
+    Every schedule word not at a multiple of Nk (nor, for AES-256, at 4 mod 8)
+    is w[i - 1] ^ w[i - Nk]. The pattern starts at the first run of such
+    words, word Nk + 1, so the regex gets a literal prefix.
+
+    Args:
+        key_words (int): Nk, the number of key words.
+        zero_word (bytes): The literal marking a consistent word.
+        any_word (bytes): The pattern matching any word.
+
+    Returns:
+        re.Pattern: A pattern whose match starts at schedule word Nk + 1.
+    """
+    if key_words == 6:
+        # Groups of six words, one special, down to word 51.
+        return re.compile(zero_word * 5 + b"(?:" + any_word + zero_word * 5 + b"){6}" + any_word + zero_word * 3)
+    # AES-128 (down to word 43) and AES-256 (down to word 59) both repeat one
+    # special word and three linear words.
+    repeats = 9 if key_words == 4 else 12
+    return re.compile(zero_word * 3 + b"(?:" + any_word + zero_word * 3 + b"){%d}" % repeats)
+
+# Byte residues are matched with the zero words spelled out: sre only uses its
+# fast prefix search for literals. NumPy word flags use one byte per word.
+RESIDUE_PATTERNS = {name: get_aes_pattern(key_words, b"\x00" * 4, b"[\x00-\xff]{4}")
+                    for name, key_words in AES_KEY_WORDS.items()}
+FLAG_PATTERNS = {name: get_aes_pattern(key_words, b"\x01", b"[\x00\x01]") for name, key_words in AES_KEY_WORDS.items()}
+
+def get_recurrence_residues(data):
+    """
+    Computes data[p] ^ data[p - 4] ^ data[p - 4 * Nk] for every byte and every AES key size at once.
+
+    The XORs run on the whole buffer as one Python int, so the consistency
+    check is done in C for every word rather than per offset in Python.
+    Bytes before 4 * Nk hold no meaningful residue.
+
+    Args:
+        data (bytes): The buffer.
+
+    Returns:
+        dict: The residue for each AES_KEY_WORDS key type, each as long as data.
+    """
+    value = int.from_bytes(data, "big")
+    previous_word = value ^ (value >> 32)
+    return {key_type: (previous_word ^ (value >> (32 * key_words))).to_bytes(len(data), "big")
+            for key_type, key_words in AES_KEY_WORDS.items()}
+
+def iter_aes_candidates_numpy(data, limit, base_address):
+    """
+    Finds candidate schedule offsets with NumPy, checking every aligned word at once.
+
+    Each word gets a flag byte, set when it is non-zero and equals
+    w[i - 1] ^ w[i - Nk]; the flags are then matched against FLAG_PATTERNS.
+
+    Args:
+        data (bytes): The buffer.
+        limit (int): Only offsets before this one are yielded.
+        base_address (int): The address of data[0], used for word alignment.
+
+    Yields:
+        tuple: (offset, key_type) by key size, then offset.
+    """
+    start = -base_address % 4
+    words = numpy.frombuffer(data, dtype=numpy.uint32, count=(len(data) - start) // 4, offset=start)
+    nonzero = words != 0
+    for key_type, key_words in AES_KEY_WORDS.items():
+        consistent = (words[key_words:] ^ words[key_words - 1:-1] ^ words[:-key_words]) == 0
+        flags = (consistent & nonzero[key_words:]).view(numpy.uint8).tobytes()
+        pattern = FLAG_PATTERNS[key_type]
+        # Flag j marks word j + Nk; a match at j is schedule word Nk + 1.
+        position = 1
+        while True:
+            match = pattern.search(flags, position)
+            if match is None:
+                break
+            offset = start + 4 * (match.start() - 1)
+            if offset >= limit:
+                break
+            yield (offset, key_type)
+            position = match.start() + 1
+
+def skip_zero_bytes(data, position):
+    """
+    Returns the offset of the first non-zero byte at or after position, or len(data).
+
+    Zeros are stripped a block at a time, which is much faster than a regex
+    character class and never copies more than one block.
+    """
+    while position < len(data):
+        block = data[position:position + ZERO_SKIP_BLOCK]
+        stripped = block.lstrip(b"\x00")
+        position += len(block) - len(stripped)
+        if stripped:
+            break
+    return position
+
+def iter_aes_candidates(data, limit, base_address):
+    """
+    Finds candidate schedule offsets from the byte residues of get_recurrence_residues.
+
+    Args:
+        data (bytes): The buffer.
+        limit (int): Only offsets before this one are yielded.
+        base_address (int): The address of data[0], used for word alignment.
+
+    Yields:
+        tuple: (offset, key_type) by key size, then offset.
+    """
+    residues = get_recurrence_residues(data)
+    for key_type, key_words in AES_KEY_WORDS.items():
+        residue = residues[key_type]
+        pattern = RESIDUE_PATTERNS[key_type]
+        prefix = 4 * (key_words + 1)
+        position = prefix
+        while True:
+            match = pattern.search(residue, position)
+            if match is None:
+                break
+            offset = match.start() - prefix
+            if offset >= limit:
+                break
+            if not any(data[match.start():match.start() + 12]):
+                # Zero memory leaves a zero residue too; skip to its end.
+                position = skip_zero_bytes(data, match.start())
+                continue
+            position = match.start() + 1
+            if (base_address + offset) % 4 == 0:
+                yield (offset, key_type)
+
+def find_aes_schedules(data, limit, base_address=0):
+    """
+    Finds the expanded AES key schedules in a buffer.
+
+    Candidates come from the word consistency check, with NumPy when it is
+    installed. Each is confirmed by expanding its first Nk words and
+    comparing the whole schedule, in FIPS-197 byte order and with
+    byte-swapped words.
+
+    Args:
+        data (bytes): The buffer.
+        limit (int): Only schedules starting before this offset are reported.
+        base_address (int, optional): The address of data[0], used for word alignment.
+
+    Yields:
+        tuple: (offset, key_type, key) by key size, then offset.
+    """
+    if len(data) < 16 * (4 + 7):
+        return
+    find_candidates = iter_aes_candidates_numpy if numpy is not None else iter_aes_candidates
+    for offset, key_type in find_candidates(data, limit, base_address):
+        key_words = AES_KEY_WORDS[key_type]
+        schedule = data[offset:offset + 16 * (key_words + 7)]
+        key = schedule[:4 * key_words]
+        if expand_aes_key(key) == schedule:
+            yield (offset, key_type, key)
+        elif expand_aes_key(swap_words(key)) == swap_words(schedule):
+            yield (offset, key_type, swap_words(key))
+
+def format_key_match(address, key_type, key, category, path):
+    """
+    Formats one key found by the key scan.
+
+    Args:
+        address (int): The address of the schedule or state block.
+        key_type (str): e.g. 'aes256' or 'chacha20-256'.
+        key (bytes): The key.
+        category (str): The region category from get_region_category.
+        path (str): The region path.
+
+    Returns:
+        str: 'ADDRESS<TAB>TYPE<TAB>KEY<TAB>CATEGORY<TAB>PATH'.
+    """
+    return f"{address:#018x}\t{key_type}\t{key.hex()}\t{category}\t{path}"
+
+def find_chacha_states(data, limit, base_address=0):
+    """
+    Finds ChaCha state blocks: the 16-byte constant followed by the key.
+
+    Args:
+        data (bytes): The buffer.
+        limit (int): Only blocks starting before this offset are reported.
+        base_address (int, optional): The address of data[0], used for word alignment.
+
+    Yields:
+        tuple: (offset, key_type, key) by offset. All-zero keys of cleared states are skipped.
+    """
+    for match in CHACHA_PATTERN.finditer(data, 0, min(limit + 16, len(data))):
+        offset = match.start()
+        key_size = 32 if CHACHA_CONSTANTS[match.group()] == "chacha20-256" else 16
+        key = data[offset + 16:offset + 16 + key_size]
+        if (base_address + offset) % 4 or len(key) < key_size or not any(key):
+            continue
+        yield (offset, CHACHA_CONSTANTS[match.group()], key)
+
+class KeyScanner:
+    """
+    Finds key schedules and ChaCha states in a stream of chunks.
+
+    The last MAX_MATCH_SIZE - 4 bytes of each chunk are carried into the next,
+    and only matches starting before the carried tail are reported, so a
+    schedule across a chunk boundary is found exactly once.
+    """
+
+    def __init__(self):
+        self.carry = b""
+        self.carry_address = 0
+
+    def reset(self):
+        """Discards any carried bytes before scanning a new region."""
+        self.carry = b""
+        self.carry_address = 0
+
+    def scan(self, data, base, limit):
+        """Yields (address, key_type, key) for matches in data starting before limit."""
+        matches = list(find_aes_schedules(data, limit, base)) + list(find_chacha_states(data, limit, base))
+        for offset, key_type, key in sorted(matches):
+            yield (base + offset, key_type, key)
+
+    def feed(self, chunk, address):
+        """
+        Scans the next chunk of a region.
+
+        Args:
+            chunk (bytes): The chunk data.
+            address (int): The virtual address of the first byte of the chunk.
+
+        Yields:
+            tuple: (address, key_type, key) for each match that starts before the carried tail.
+        """
+        data = self.carry + chunk
+        base = self.carry_address if self.carry else address
+        keep_from = max(len(data) - MAX_MATCH_SIZE + 4, 0)
+        yield from self.scan(data, base, keep_from)
+        self.carry = data[keep_from:]
+        self.carry_address = base + keep_from
+
+    def flush(self):
+        """
+        Finishes the current region.
+
+        Yields:
+            tuple: (address, key_type, key) for matches in the carried tail.
+        """
+        data, base = self.carry, self.carry_address
+        self.reset()
+        yield from self.scan(data, base, len(data))
+
+class KeyScanSink(pipeline_logic.RegionSink):
+    """Prints the AES key schedules and ChaCha states of every region fed by the region pipeline."""
+
+    def __init__(self):
+        self.scanner = KeyScanner()
+        self.region = None
+        self.keys = 0
+        self.regions = 0
+
+    def begin_region(self, region: pipeline_logic.RegionInfo):
+        self.region = region
+        self.scanner.reset()
+
+    def report(self, matches):
+        """Prints matches of the current region."""
+        for address, key_type, key in matches:
+            click.echo(format_key_match(address, key_type, key, self.region.section_name, self.region.path))
+            self.keys += 1
+
+    def feed(self, address, chunk):
+        self.report(self.scanner.feed(chunk, address))
+
+    def end_region(self):
+        self.report(self.scanner.flush())
+        self.regions += 1
+
+    def close(self):
+        click.secho(f"Found {self.keys} key(s) in {self.regions} region(s).", fg="green")
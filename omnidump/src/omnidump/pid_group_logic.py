@@ -0,0 +1,212 @@
+"""Helpers for dumping a group of processes (process trees and cgroups) close together in time."""
+import os
+import glob
+import time
+import dataclasses
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import click
+from . import pid_mapping_logic
+from .config_pid import CliAppConfig, FLAG_TO_SECTION_MAP
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+def get_tree_pids(root_pid):
+    """
+    Collects a process and all of its descendants using /proc/PID/task/*/children.
+
+    Args:
+        root_pid (int): The process ID at the top of the tree.
+
+    Returns:
+        list of int: The root PID followed by its descendants in breadth-first order.
+
+    Raises:
+        FileNotFoundError: If the root process does not exist.
+    """
+    if not os.path.isdir(f"/proc/{root_pid}"):
+        raise FileNotFoundError(f"No such process: {root_pid}")
+
+    tree_pids = [root_pid]
+    seen = {root_pid}
+    pending = deque([root_pid])
+
+    while pending:
+        pid = pending.popleft()
+        for children_path in glob.glob(f"/proc/{pid}/task/*/children"):
+            try:
+                with open(children_path, 'r') as children_file:
+                    children = children_file.read().split()
+            except OSError:
+                # The task exited while we were walking the tree.
+                continue
+            for child in children:
+                child_pid = int(child)
+                if child_pid not in seen:
+                    seen.add(child_pid)
+                    tree_pids.append(child_pid)
+                    pending.append(child_pid)
+    return tree_pids
+
+def get_cgroup_pids(cgroup_path):
+    """
+    Reads the member processes of a cgroup from its cgroup.procs file.
+
+    Args:
+        cgroup_path (str): A cgroup directory, a cgroup.procs file, or a path
+                           relative to /sys/fs/cgroup.
+
+    Returns:
+        list of int: The sorted, unique PIDs in the cgroup.
+    """
+    if not os.path.isabs(cgroup_path) and not os.path.exists(cgroup_path):
+        cgroup_path = os.path.join(CGROUP_ROOT, cgroup_path)
+    if os.path.isdir(cgroup_path):
+        cgroup_path = os.path.join(cgroup_path, "cgroup.procs")
+
+    with open(cgroup_path, 'r') as procs_file:
+        return sorted({int(line) for line in procs_file if line.strip()})
+
+def get_capture_sections(config: CliAppConfig):
+    """
+    Returns the section names a dump with this configuration will read.
+
+    Args:
+        config (CliAppConfig): The dump configuration.
+
+    Returns:
+        list of str: Section names (executable, heap, etc.).
+    """
+    sections = [FLAG_TO_SECTION_MAP[flag] for flag in config.section_flags_active() if flag in FLAG_TO_SECTION_MAP]
+    if config.flag_none_log and "none" not in sections:
+        sections.append("none")
+    return sections
+
+def estimate_capture_size(pid, sections):
+    """
+    Estimates how many bytes a dump of a process will read.
+
+    Args:
+        pid (int): The process ID.
+        sections (list of str): The section names that will be dumped.
+
+    Returns:
+        int: The total size of the readable regions in the selected sections,
+             or 0 if the maps file could not be read.
+    """
+    try:
+        regions = pid_mapping_logic.group_regions(f"/proc/{pid}/maps")
+    except OSError:
+        return 0
+    if not regions:
+        return 0
+
+    total = 0
+    for section_name in sections:
+        for section in regions.get(section_name, []):
+            address, permissions, _, _, _ = pid_mapping_logic.get_section_information(section)
+            if "r" not in permissions:
+                continue
+            start, end = [int(x, 16) for x in address.split("-")]
+            total += max(end - start, 0)
+    return total
+
+def order_pids_for_capture(pids, config: CliAppConfig):
+    """
+    Orders group members largest-first so that captures finish close together.
+
+    Scheduling the longest captures first (LPT order) keeps small processes from
+    finishing long before a large one has even started, which minimizes the skew
+    between the first and last process captured.
+
+    Args:
+        pids (list of int): The member PIDs.
+        config (CliAppConfig): The dump configuration.
+
+    Returns:
+        list of int: The PIDs in capture order.
+    """
+    sections = get_capture_sections(config)
+    sizes = {pid: estimate_capture_size(pid, sections) for pid in pids}
+    return sorted(pids, key=lambda pid: sizes[pid], reverse=True)
+
+def capture_group_member(pid, config: CliAppConfig, dump_func):
+    """
+    Dumps a single group member and records when its capture started and finished.
+
+    Args:
+        pid (int): The member PID.
+        config (CliAppConfig): The group configuration.
+        dump_func (callable): Function that dumps one process given its config.
+                              It returns False if the process could not be read.
+
+    Returns:
+        tuple: (pid, start_time, end_time) using time.monotonic().
+
+    Raises:
+        ProcessLookupError: If the member exited or could not be read.
+    """
+    save_dir = config.save_dir
+    if save_dir:
+        save_dir = os.path.join(save_dir, f"pid-{pid}")
+    member_config = dataclasses.replace(config, pid=pid, save_dir=save_dir)
+
+    start_time = time.monotonic()
+    if dump_func(member_config) is False:
+        raise ProcessLookupError("the process exited or its memory could not be read")
+    return (pid, start_time, time.monotonic())
+
+def dump_pid_group(pids, config: CliAppConfig, dump_func, workers=None):
+    """
+    Dumps every member of a process group through a shared worker pool.
+
+    Args:
+        pids (list of int): The member PIDs.
+        config (CliAppConfig): The group configuration. Each member is written to
+                               its own 'pid-N' directory under save_dir.
+        dump_func (callable): Function that dumps one process given its config.
+        workers (int, optional): Size of the worker pool. Defaults to one worker
+                                 per member, capped at the CPU count.
+
+    Returns:
+        list of tuple: (pid, start_time, end_time) for each member captured, in capture order.
+        Members that exit or cannot be read are reported and left out.
+    """
+    if not pids:
+        click.secho("No processes found in the selected group.", fg="yellow")
+        return []
+
+    ordered_pids = order_pids_for_capture(pids, config)
+    if workers is None:
+        workers = min(len(ordered_pids), os.cpu_count() or 1)
+
+    click.secho(f"Capturing {len(ordered_pids)} process(es) with {workers} worker(s)...", fg="green")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(capture_group_member, pid, config, dump_func) for pid in ordered_pids]
+        timings = []
+        for pid, future in zip(ordered_pids, futures):
+            try:
+                timings.append(future.result())
+            except (OSError, ValueError) as e:
+                click.secho(f"Could not capture PID {pid}: {e}", fg="yellow")
+
+    if not timings:
+        click.secho("No process in the selected group could be captured.", fg="yellow")
+        return []
+    report_capture_spread(timings)
+    return timings
+
+def report_capture_spread(timings):
+    """
+    Prints the capture-time spread of a group dump.
+
+    Args:
+        timings (list of tuple): (pid, start_time, end_time) for each member.
+    """
+    first_start = min(start for _, start, _ in timings)
+    last_start = max(start for _, start, _ in timings)
+    last_end = max(end for _, _, end in timings)
+
+    click.secho(f"\nCaptured {len(timings)} process(es).", fg="green")
+    click.secho(f" Start skew (first to last capture start): {last_start - first_start:.3f}s", fg="green")
+    click.secho(f" Capture-time spread (first start to last finish): {last_end - first_start:.3f}s", fg="green")
@@ -1,41 +1,37 @@
-import string
-import itertools
 import re
 import os
 from datetime import datetime
 import click
 from .config_pid import CliAppConfig, FLAG_TO_SECTION_MAP
+from . import pipeline_logic
+from . import elf_logic
+from . import shared_lib_logic
+from .stats_logic import RegionStats, format_stats
+from .heatmap_logic import PageMap, render_heatmap
+from .strings_logic import (StringScanner, StringSampler, STRINGS_BUFFER_SIZE, PAGE_SIZE, format_string_line,
+                            compile_strings_pattern, iter_string_matches, get_min_length, get_encoding,
+                            get_stride_offsets, get_first_string)
 
 def get_strings_from_bytes(byte_data, config: CliAppConfig):
     """
     Extracts printable strings from a byte sequence, with user-specified length.
 
-    This function is a generator that yields a string as soon as it finds a
-    sequence of printable characters of a certain minimum length.
+    This function is a generator that yields a string as soon as the bulk
+    pattern for the configured encoding matches a run of printable characters
+    of a certain minimum length.
 
     Args:
         byte_data (bytes): The input byte sequence.
-        length_out (int, optional): The minimum length of strings to yield,
-                                    as specified by the user.
+        config (CliAppConfig): Provides length_out, the minimum length of strings
+                               to yield, and encoding ('ascii', 'utf8', 'utf16le' or 'all').
     Yields:
         str: A string of printable characters.
     """
-
-    fixed_default_min_length = 4
     try:
-        min_length = config.length_out if config.length_out else fixed_default_min_length
-        current_string = []
-        for byte in byte_data:
-            char = chr(byte)
-            if char in string.printable:
-                current_string.append(char)
-            else:
-                if len(current_string) >= min_length:
-                    yield "".join(current_string)
-                current_string = []
-        # Yield any remaining string at the end of the data
-        if len(current_string) >= min_length:
-            yield "".join(current_string)
+        encoding = get_encoding(config)
+        pattern = compile_strings_pattern(get_min_length(config), encoding)
+        for _, _, text, _ in iter_string_matches(byte_data, pattern, encoding):
+            yield text
     except TypeError as e:
         click.echo(f"Error: {e}")
 
@@ -91,6 +87,73 @@ def process_lines(line):
             "file_path": file_path
             }
 
+def format_region_details(stats, page_map):
+    """
+    Formats the '--stats' and '--page-map' lines of a verbose region entry.
+
+    Args:
+        stats (RegionStats or None): The region's content statistics.
+        page_map (PageMap or None): The region's page classes.
+
+    Returns:
+        str: The lines, or an empty string when neither is requested.
+    """
+    details = ""
+    if stats is not None:
+        details += f" Stats: {format_stats(stats.summary())}\n"
+    if page_map is not None:
+        details += render_heatmap(page_map.result())
+    return details
+
+def read_region_preview(mem, start, end, config: CliAppConfig):
+    """
+    Reads a region and samples the strings shown in its preview.
+
+    In 'first' and 'reservoir' mode the whole region is read and its strings are
+    sampled. In 'stride' mode only config.sample_count pages spread evenly over
+    the region are read, and the first string of each page is kept.
+
+    With config.flag_stats and config.flag_page_map, the content statistics and
+    page classes of the bytes read are formatted as well.
+
+    Args:
+        mem (file object): The open /proc/PID/mem file handle.
+        start (int): The starting address of the region.
+        end (int): The ending address of the region.
+        config (CliAppConfig): Provides sample_count, sample_mode, length_out and encoding.
+
+    Returns:
+        tuple: (chunk_size, string_list, details) where details is the result of format_region_details.
+    """
+    stats = RegionStats() if config.flag_stats else None
+    page_map = PageMap() if config.flag_page_map else None
+    if config.sample_mode == "stride":
+        encoding = get_encoding(config)
+        pattern = compile_strings_pattern(get_min_length(config), encoding)
+        string_list = []
+        for offset in get_stride_offsets(end - start, config.sample_count):
+            mem.seek(start + offset)
+            page = mem.read(min(PAGE_SIZE, end - start - offset))
+            if stats is not None:
+                stats.update(page)
+            text = get_first_string(page, pattern, encoding)
+            if text is not None:
+                string_list.append(text)
+        return (end - start, string_list, format_region_details(stats, None))
+
+    mem.seek(start)
+    chunk = mem.read(end - start)
+    sampler = StringSampler(config.sample_count, config.sample_mode, seed=start)
+    for text in get_strings_from_bytes(chunk, config):
+        sampler.add(text)
+        if sampler.is_full:
+            break
+    if stats is not None:
+        stats.update(chunk)
+    if page_map is not None:
+        page_map.update(chunk)
+    return (len(chunk), sampler.result(), format_region_details(stats, page_map))
+
 def read_bytes_show_sections(mem_path, input_dict, sections_to_show, config: CliAppConfig):
     """
     Reads the specified memory regions from /proc/PID/mem and prints them.
@@ -130,16 +193,14 @@ def read_bytes_show_sections(mem_path, input_dict, sections_to_show, config: Cli
                     if size <= 0:
                         continue
                     try:
-                        mem.seek(start)
-                        chunk = mem.read(size)
-                        string_list = list(itertools.islice(get_strings_from_bytes(chunk, config), 3))
+                        chunk_size, string_list, details = read_region_preview(mem, start, end, config)
 
                         if config.verbose_out is True:
-                            click.secho(f"{line_num}: Chunk Size: {len(chunk)} bytes\n Path: {path}\n Permissions: {permissions}\n Inode: {inode}\n Address Range: ({hex(start)}-{hex(end)})\n Major Minor Id: {maj_min_id}\n Extracted Strings: {string_list}\n")
+                            click.secho(f"{line_num}: Chunk Size: {chunk_size} bytes\n Path: {path}\n Permissions: {permissions}\n Inode: {inode}\n Address Range: ({hex(start)}-{hex(end)})\n Major Minor Id: {maj_min_id}\n Extracted Strings: {string_list}\n{details}")
                         elif config.strings_out is True:  
-                            click.secho(f"{line_num}: Chunk Size: {len(chunk)} bytes\n Path: {path}\n Address Range: ({hex(start)}-{hex(end)})\n Extracted Strings: {string_list}\n")
+                            click.secho(f"{line_num}: Chunk Size: {chunk_size} bytes\n Path: {path}\n Address Range: ({hex(start)}-{hex(end)})\n Extracted Strings: {string_list}\n")
                         else:
-                            click.secho(f"{line_num}: Chunk Size: {len(chunk)} bytes\n Path: {path}\n Address Range: ({hex(start)}-{hex(end)})\n")
+                            click.secho(f"{line_num}: Chunk Size: {chunk_size} bytes\n Path: {path}\n Address Range: ({hex(start)}-{hex(end)})\n")
                     except OSError as e:
                         click.secho(f"Could not read region {hex(start)}-{hex(end)}: {e}")
 
@@ -159,8 +220,10 @@ def save_memory_sections_bin_write(full_file_path, chunk, start, end):
             bin_file.write(chunk)
     except OSError as e: 
         click.secho(f"Could not write chunk to binary file for region {hex(start)}-{hex(end)}: {e}")
+        return False
+    return True
 
-def save_memory_sections(mem_path, regions_dict, output_path):
+def save_memory_sections(mem_path, regions_dict, output_path, store=None, build_ids=None):
     """
     Reads specified memory regions from /proc/PID/mem and saves them as separate binary files. 
 
@@ -168,25 +231,43 @@ def save_memory_sections(mem_path, regions_dict, output_path):
         mem_path (str): Path to the /proc/PID/mem file. 
         regions_dict (list): A list of dictionaries where each dictionary a memory section to save.
         output_path (str): The dictionary where the binary files will be saved. 
+        store (LibraryStore, optional): If set, read-only file mappings are saved once in the
+            store and linked into output_path, without reading them again.
+        build_ids (dict, optional): The build ID of each mapped module path, part of the store key.
     """
     os.makedirs(output_path, exist_ok=True)
     with open(mem_path, "rb") as mem:
         for line_num, section in enumerate(regions_dict, 1):
-            address, permissions, _, _, _ = get_section_information(section)
+            address, permissions, path, inode, maj_min_id = get_section_information(section)
             try:
                 start, end = [int(x, 16) for x in address.split("-")]
             except ValueError:
                 click.secho(f"Invalid address format for {address}", fg="yellow")
                 continue 
             if "r" in permissions and (end - start) > 0:
+                filename = f"region-{hex(start)}-{hex(end)}.bin"
+                full_file_path = os.path.join(output_path, filename)
+                key = None
+                if store is not None and shared_lib_logic.is_shared_mapping(permissions, inode):
+                    key = shared_lib_logic.get_mapping_key(path, maj_min_id, inode, int(section.get("offsets", "0"), 16),
+                                                           end - start, (build_ids or {}).get(path))
+                    if not store.claim(key):
+                        store.link(key, full_file_path)
+                        continue
                 try:
                     mem.seek(start)
                     chunk = mem.read(end - start)
-                    filename = f"region-{hex(start)}-{hex(end)}.bin"
-                    full_file_path = os.path.join(output_path, filename)
-                    save_memory_sections_bin_write(full_file_path, chunk, start, end)
                 except OSError as e:
                     click.secho(f"Could not read region {hex(start)}-{hex(end)}: {e}")
+                    if key is not None:
+                        store.release(key)
+                    continue
+                if key is None:
+                    save_memory_sections_bin_write(full_file_path, chunk, start, end)
+                elif save_memory_sections_bin_write(store.get_temp_path(key), chunk, start, end):
+                    store.commit(key, full_file_path)
+                else:
+                    store.release(key)
         click.secho(f"Successfully saved {len(regions_dict)} region(s) to '{output_path}'.", fg="green") 
 
 
@@ -210,14 +291,12 @@ def save_memory_none_seek_read(start, end, line_num, path, permissions, inode, m
         length_out (int, optional): Minimum string length to extract. Defaults to 4.
     """
     try:
-        mem.seek(start)
-        chunk = mem.read(size)
-        string_list = list(itertools.islice(get_strings_from_bytes(chunk, config), 3))
+        chunk_size, string_list, details = read_region_preview(mem, start, start + size, config)
 
         if config.verbose_out is True:
-            log_file.write(f"{line_num}: Chunk Size: {len(chunk)} bytes\n Path: {path}\n Permissions: {permissions}\n Inode: {inode}\n Address Range: ({hex(start)}-{hex(end)})\n Major Minor Id: {maj_min_id}\n Extracted Strings: {string_list}\n" + "\n")
+            log_file.write(f"{line_num}: Chunk Size: {chunk_size} bytes\n Path: {path}\n Permissions: {permissions}\n Inode: {inode}\n Address Range: ({hex(start)}-{hex(end)})\n Major Minor Id: {maj_min_id}\n Extracted Strings: {string_list}\n{details}" + "\n")
         else:
-            log_file.write(f"{line_num}: Chunk Size: {len(chunk)} bytes\n Path: {path}\n Address Range: ({hex(start)}-{hex(end)})\n" + "\n")
+            log_file.write(f"{line_num}: Chunk Size: {chunk_size} bytes\n Path: {path}\n Address Range: ({hex(start)}-{hex(end)})\n" + "\n")
     except OSError as e:
         click.secho(f"Could not read region {hex(start)}-{hex(end)}: {e}")
 
@@ -274,18 +353,41 @@ def save_memory_none(mem_path, regions_dict, config: CliAppConfig):
     click.secho(f"Successfully saved {len(regions_dict)} unclassified region(s) to '{full_file_path}'.", fg="green")
 
 
-def save_memory_strings_write(full_file_path, string_list, successful_saves_count):
+def iter_region_strings(mem, start, end, config: CliAppConfig):
     """
-    Writes extracted strings from a memory region to a text file.
+    Streams the strings of a memory region as it is read in chunks.
+
+    Args:
+        mem (file object): The open /proc/PID/mem file handle.
+        start (int): The starting address of the memory region.
+        end (int): The ending address of the memory region.
+        config (CliAppConfig): Provides the minimum string length.
+
+    Yields:
+        tuple: (address, string, encoding) for each string found.
+    """
+    scanner = StringScanner(config)
+    try:
+        for address, chunk in pipeline_logic.iter_region_chunks(mem, start, end):
+            yield from scanner.feed(chunk, address)
+    except OSError as e:
+        click.secho(f"Could not read region {hex(start)}-{hex(end)}: {e}")
+    yield from scanner.flush()
+
+def save_memory_strings_write(full_file_path, strings, successful_saves_count, show_encoding=False):
+    """
+    Streams extracted strings from a memory region to a text file, one 'ADDRESS<TAB>STRING' per line.
 
     Args:
         full_file_path (str): The complete path to the output strings file. 
-        string_list (list of str): The list of strings extracted from a region. 
+        strings (iterable of tuple): (address, string, encoding) tuples, consumed as they are found.
         successful_saves_count (list of int): A list used to track the count of successful saves (mutable object)
+        show_encoding (bool, optional): If True, writes each string's encoding as an extra column.
     """
     try:
-        with open(full_file_path, "w") as strings_file:
-            strings_file.write(f"\n--Extracted Strings --\n {string_list}")
+        with open(full_file_path, "w", buffering=STRINGS_BUFFER_SIZE) as strings_file:
+            for address, text, encoding in strings:
+                strings_file.write(format_string_line(address, text, encoding if show_encoding else None))
         successful_saves_count[0] += 1
     except OSError as e: 
         click.secho(f"Could not write strings to file: {e}")
@@ -320,12 +422,11 @@ def save_memory_strings_read_bin(full_file_path, successful_saves_count, mem_pat
                     continue
                 try:
                     mem.seek(start)
-                    chunk = mem.read(size)
-                    string_list = list(get_strings_from_bytes(chunk, config))
                     filename = f"region-{hex(start)}-{hex(end)}-strings.txt"
                     full_file_path = os.path.join(output_path, filename)
                     
-                    save_memory_strings_write(full_file_path, string_list, successful_saves_count)
+                    strings = iter_region_strings(mem, start, end, config)
+                    save_memory_strings_write(full_file_path, strings, successful_saves_count, get_encoding(config) != "ascii")
                 except OSError as e: 
                     click.secho(f"Could not read region {hex(start)}-{hex(end)}: {e}")
         
@@ -505,11 +606,17 @@ def format_output_bytes_section_log(mem_path, input_dict, section_flag_dict, con
             if section_name: 
                 sections_to_save.append(section_name)
 
+    shared = {}
+    if config.lib_store:
+        shared = {"store": shared_lib_logic.get_library_store(config.lib_store),
+                  "build_ids": elf_logic.read_build_ids(mem_path, input_dict, shared_lib_logic.SHARED_SECTIONS)}
+
     for section_name in sections_to_save: 
         section_dict = input_dict.get(section_name, {})
         if section_dict: 
             section_output_dir = os.path.join(config.save_dir, section_name)
-            save_memory_sections(mem_path, section_dict, section_output_dir)
+            save_memory_sections(mem_path, section_dict, section_output_dir,
+                                 **(shared if section_name in shared_lib_logic.SHARED_SECTIONS else {}))
         else: 
             click.secho(f"No regions found for section '{section_name}'.", fg="yellow")
 
@@ -544,6 +651,27 @@ def format_output_bytes_strings_log(mem_path, input_dict, section_flag_dict, con
         else: 
             click.secho(f"No regions found for section '{section_name}'.", fg="yellow")
 
+def format_output_bytes_pipeline(mem_path, input_dict, section_flag_dict, config: CliAppConfig):
+    """
+    Reads the specified memory sections once and writes every requested output in the same pass.
+
+    Args:
+        mem_path (str): The path to the /proc/PID/mem file.
+        input_dict (dict): Dictionary of categorized memory regions.
+        section_flag_dict (dict): Dictionary mapping section names to boolean flags
+        config (CliAppConfig): Selects the outputs (binaries, strings, hashes, console preview).
+    """
+    if not isinstance(config.save_dir, str):
+        click.secho(f"Internal Error: save_dir is not a valid path string ({config.save_dir}).")
+        return
+
+    sections_to_read = pipeline_logic.get_sections_from_flags(section_flag_dict)
+    build_ids = None
+    if config.lib_store and config.flag_sec_log:
+        build_ids = elf_logic.read_build_ids(mem_path, input_dict, shared_lib_logic.SHARED_SECTIONS)
+    sinks = pipeline_logic.build_sinks(config, build_ids)
+    pipeline_logic.run_region_pipeline(mem_path, input_dict, sections_to_read, sinks)
+
 def format_output_bytes_console_log(mem_path, input_dict, section_flag_dict, config: CliAppConfig):
     """
     Formats and saves specified memory sections (by flag) to the console
@@ -611,6 +739,10 @@ def format_output_bytes(mem_path, input_dict, config: CliAppConfig):
     if config.flag_none_log:
         print_to_console = False
         format_output_bytes_none_log(mem_path, input_dict, config)
+
+    elif config.pipeline_outputs_active():
+        print_to_console = False
+        format_output_bytes_pipeline(mem_path, input_dict, sections_to_log_dict, config)
     
     elif config.flag_sec_log:
         print_to_console = False
@@ -0,0 +1,726 @@
+"""Single-pass region pipeline: every region is read once and fanned out to any number of sinks."""
+import os
+import time
+import hashlib
+from dataclasses import dataclass
+import click
+from . import pid_mapping_logic
+from . import shared_lib_logic
+from .diff_logic import REGION_FILE_PATTERN
+from .config_pid import CliAppConfig, FLAG_TO_SECTION_MAP
+from .strings_logic import (StringScanner, StringSampler, STRINGS_BUFFER_SIZE, PAGE_SIZE, format_string_line, get_encoding,
+                            get_stride_offsets, get_first_string)
+from .stats_logic import RegionStats, save_stats_file
+from .heatmap_logic import PageMap, save_page_map
+from .dedupe_logic import StringIndex, TopStrings, format_dedupe_line, format_top_line
+
+CHUNK_SIZE = 1 << 20
+
+@dataclass(frozen=True)
+class RegionInfo:
+    """Describes the region currently flowing through the pipeline."""
+
+    section_name: str
+    line_num: int
+    start: int
+    end: int
+    permissions: str = ""
+    path: str = ""
+    inode: str = ""
+    maj_min_id: str = ""
+    offset: int = 0
+
+    @property
+    def size(self) -> int:
+        """Returns the size of the region in bytes."""
+        return self.end - self.start
+
+def iter_region_chunks(mem, start, end, chunk_size=CHUNK_SIZE):
+    """
+    Reads a memory region in fixed-size chunks.
+
+    Args:
+        mem (file object): The open /proc/PID/mem file handle.
+        start (int): The starting address of the region.
+        end (int): The ending address of the region.
+        chunk_size (int): The maximum size of each read.
+
+    Yields:
+        tuple: (address, chunk) for each chunk read.
+    """
+    mem.seek(start)
+    address = start
+    while address < end:
+        chunk = mem.read(min(chunk_size, end - address))
+        if not chunk:
+            break
+        yield (address, chunk)
+        address += len(chunk)
+
+def get_sections_from_flags(section_flag_dict):
+    """
+    Converts a dictionary of section flags to the section names that are set.
+
+    Args:
+        section_flag_dict (dict): Dictionary mapping flag names to booleans.
+
+    Returns:
+        list of str: Section names in flag order.
+    """
+    sections = []
+    for flag, is_true in section_flag_dict.items():
+        section_name = FLAG_TO_SECTION_MAP.get(flag)
+        if is_true and section_name:
+            sections.append(section_name)
+    return sections
+
+def iter_readable_regions(input_dict, sections):
+    """
+    Yields the readable, non-empty regions of the selected sections.
+
+    Args:
+        input_dict (dict): Dictionary of categorized memory regions.
+        sections (list of str): Section names to include.
+
+    Yields:
+        RegionInfo: One entry per readable region.
+    """
+    for section_name in sections:
+        for line_num, section in enumerate(input_dict.get(section_name, []), 1):
+            address, permissions, path, inode, maj_min_id = pid_mapping_logic.get_section_information(section)
+            try:
+                start, end = [int(x, 16) for x in address.split("-")]
+            except ValueError:
+                click.secho(f"Invalid address format for {address}", fg="yellow")
+                continue
+            if "r" in permissions and end > start:
+                offset = int(section.get("offsets", "0") or "0", 16)
+                yield RegionInfo(section_name, line_num, start, end, permissions, path, inode, maj_min_id, offset)
+
+class RegionSink:
+    """
+    Base class for consumers fed by run_region_pipeline.
+
+    Every hook is optional. For each region the pipeline calls begin_region,
+    then feed once per chunk in address order, then end_region. A sink that
+    sets finished, e.g. a search that has all the matches it needs, stops the
+    pipeline after the current chunk; end_region, end_section and close are
+    still called.
+    """
+
+    finished = False
+
+    def begin_section(self, section_name, region_count):
+        """Called before the regions of a section are read."""
+
+    def begin_region(self, region: RegionInfo):
+        """Called before the first chunk of a region."""
+
+    def feed(self, address, chunk):
+        """Called with each chunk of the current region."""
+
+    def end_region(self):
+        """Called after the last chunk of a region, even if a read failed."""
+
+    def end_section(self, section_name):
+        """Called after the regions of a section have been read."""
+
+    def close(self):
+        """Called once after every section has been read."""
+
+class BinarySink(RegionSink):
+    """
+    Writes each region to save_dir/SECTION/region-START-END.bin.
+
+    Args:
+        save_dir (str): The parent directory of the section directories.
+        store (LibraryStore, optional): If set, read-only file mappings are saved
+            once in the store and linked into save_dir.
+        build_ids (dict, optional): The build ID of each mapped module path, part of the store key.
+    """
+
+    def __init__(self, save_dir, store=None, build_ids=None):
+        self.save_dir = save_dir
+        self.store = store
+        self.build_ids = build_ids or {}
+        self.bin_file = None
+        self.region = None
+        self.key = None
+        self.written = 0
+        self.saved_regions = 0
+
+    def begin_section(self, section_name, region_count):
+        os.makedirs(os.path.join(self.save_dir, section_name), exist_ok=True)
+        self.saved_regions = 0
+
+    def get_region_path(self, region: RegionInfo):
+        """Returns the file a region is saved to."""
+        return os.path.join(self.save_dir, region.section_name, f"region-{hex(region.start)}-{hex(region.end)}.bin")
+
+    def begin_region(self, region: RegionInfo):
+        self.region = region
+        self.key = None
+        self.written = 0
+        full_file_path = self.get_region_path(region)
+        if (self.store is not None and region.section_name in shared_lib_logic.SHARED_SECTIONS
+                and shared_lib_logic.is_shared_mapping(region.permissions, region.inode)):
+            key = shared_lib_logic.get_mapping_key(region.path, region.maj_min_id, region.inode, region.offset,
+                                                   region.size, self.build_ids.get(region.path))
+            if not self.store.claim(key):
+                self.store.link(key, full_file_path)
+                self.bin_file = None
+                self.saved_regions += 1
+                return
+            self.key = key
+            full_file_path = self.store.get_temp_path(key)
+        try:
+            self.bin_file = open(full_file_path, "wb")
+        except OSError as e:
+            self.bin_file = None
+            click.secho(f"Could not write chunk to binary file for region {hex(region.start)}-{hex(region.end)}: {e}")
+
+    def feed(self, address, chunk):
+        if self.bin_file is None:
+            return
+        try:
+            self.bin_file.write(chunk)
+            self.written += len(chunk)
+        except OSError as e:
+            click.secho(f"Could not write chunk to binary file for region {hex(self.region.start)}-{hex(self.region.end)}: {e}")
+            self.bin_file.close()
+            self.bin_file = None
+
+    def end_region(self):
+        if self.bin_file is not None:
+            self.bin_file.close()
+            self.bin_file = None
+            self.saved_regions += 1
+            if self.key is not None and self.written == self.region.size:
+                self.store.commit(self.key, self.get_region_path(self.region))
+            elif self.key is not None:
+                # A partial read is kept for this dump only, never shared.
+                self.store.release(self.key, self.get_region_path(self.region))
+        elif self.key is not None:
+            self.store.release(self.key)
+        self.key = None
+
+    def end_section(self, section_name):
+        output_path = os.path.join(self.save_dir, section_name)
+        click.secho(f"Successfully saved {self.saved_regions} region(s) to '{output_path}'.", fg="green")
+
+class StringsSink(RegionSink):
+    """
+    Streams the strings of each region to save_dir/SECTION/region-START-END-strings.txt.
+
+    Each line is 'ADDRESS<TAB>STRING', written as strings are found. When an
+    encoding other than ASCII is selected, the encoding of each string is
+    written as a column between the two.
+
+    Args:
+        save_dir (str): The parent directory of the section directories.
+        config (CliAppConfig): Provides the minimum string length and encoding.
+    """
+
+    def __init__(self, save_dir, config: CliAppConfig):
+        self.save_dir = save_dir
+        self.scanner = StringScanner(config)
+        self.show_encoding = get_encoding(config) != "ascii"
+        self.strings_file = None
+        self.saved_regions = 0
+
+    def begin_section(self, section_name, region_count):
+        os.makedirs(os.path.join(self.save_dir, section_name), exist_ok=True)
+        self.saved_regions = 0
+
+    def begin_region(self, region: RegionInfo):
+        self.scanner.reset()
+        filename = f"region-{hex(region.start)}-{hex(region.end)}-strings.txt"
+        try:
+            self.strings_file = open(os.path.join(self.save_dir, region.section_name, filename), "w", buffering=STRINGS_BUFFER_SIZE)
+        except OSError as e:
+            self.strings_file = None
+            click.secho(f"Could not write strings to file: {e}")
+
+    def write_strings(self, strings):
+        """Writes (address, string, encoding) tuples to the current strings file."""
+        if self.strings_file is None:
+            return
+        try:
+            self.strings_file.writelines(format_string_line(address, text, encoding if self.show_encoding else None)
+                                         for address, text, encoding in strings)
+        except OSError as e:
+            click.secho(f"Could not write strings to file: {e}")
+            self.strings_file.close()
+            self.strings_file = None
+
+    def feed(self, address, chunk):
+        self.write_strings(self.scanner.feed(chunk, address))
+
+    def end_region(self):
+        self.write_strings(self.scanner.flush())
+        if self.strings_file is not None:
+            self.strings_file.close()
+            self.strings_file = None
+            self.saved_regions += 1
+
+    def end_section(self, section_name):
+        output_path = os.path.join(self.save_dir, section_name)
+        click.secho(f"Successfully saved strings of {self.saved_regions} region(s) to '{output_path}'.", fg="green")
+
+class DedupeStringsSink(RegionSink):
+    """
+    Writes every unique string of the dump once to save_dir/strings-dedupe.txt.
+
+    Each line is 'COUNT<TAB>ADDRESSES<TAB>STRING', where ADDRESSES are the first
+    addresses the string was found at, and lines are sorted by string.
+
+    Args:
+        save_dir (str): The directory the file is written to.
+        config (CliAppConfig): Provides the minimum string length and encoding.
+        index (StringIndex, optional): The index to fill. Defaults to one spilling into save_dir.
+    """
+
+    def __init__(self, save_dir, config: CliAppConfig, index=None):
+        self.save_dir = save_dir
+        self.scanner = StringScanner(config)
+        self.index = index
+        self.regions = 0
+
+    def begin_region(self, region: RegionInfo):
+        if self.index is None:
+            os.makedirs(self.save_dir, exist_ok=True)
+            self.index = StringIndex(self.save_dir)
+        self.scanner.reset()
+
+    def feed(self, address, chunk):
+        for string_address, text, _ in self.scanner.feed(chunk, address):
+            self.index.add(text, string_address)
+
+    def end_region(self):
+        for string_address, text, _ in self.scanner.flush():
+            self.index.add(text, string_address)
+        self.regions += 1
+
+    def close(self):
+        if self.index is None:
+            return
+        full_file_path = os.path.join(self.save_dir, "strings-dedupe.txt")
+        unique = 0
+        try:
+            with open(full_file_path, "w", buffering=STRINGS_BUFFER_SIZE) as dedupe_file:
+                for text, count, addresses in self.index.iter_entries():
+                    dedupe_file.write(format_dedupe_line(text, count, addresses))
+                    unique += 1
+        except OSError as e:
+            self.index.close()
+            click.secho(f"Could not write strings to file: {e}")
+            return
+        click.secho(f"Successfully saved {unique} unique strings ({self.index.total} found in "
+                    f"{self.regions} region(s)) to '{full_file_path}'.", fg="green")
+
+class TopStringsSink(RegionSink):
+    """
+    Writes the estimated most frequent strings of the dump to save_dir/strings-top.txt.
+
+    Each line is 'COUNT<TAB>ERROR<TAB>STRING', most frequent first. With
+    config.flag_top_by_section, every section also gets its own
+    save_dir/SECTION/strings-top.txt.
+
+    Args:
+        save_dir (str): The directory the files are written to.
+        config (CliAppConfig): Provides top_strings, the minimum string length and encoding.
+    """
+
+    def __init__(self, save_dir, config: CliAppConfig):
+        self.save_dir = save_dir
+        self.top_count = config.top_strings
+        self.by_section = config.flag_top_by_section
+        self.scanner = StringScanner(config)
+        self.sketch = TopStrings(self.top_count)
+        self.section_sketches = {}
+        self.section_sketch = None
+
+    def begin_section(self, section_name, region_count):
+        if self.by_section:
+            self.section_sketch = self.section_sketches.setdefault(section_name, TopStrings(self.top_count))
+
+    def begin_region(self, region: RegionInfo):
+        self.scanner.reset()
+
+    def add_strings(self, strings):
+        """Adds scanned (address, text, encoding) strings to the sketches."""
+        for _, text, _ in strings:
+            self.sketch.add(text)
+            if self.section_sketch is not None:
+                self.section_sketch.add(text)
+
+    def feed(self, address, chunk):
+        self.add_strings(self.scanner.feed(chunk, address))
+
+    def end_region(self):
+        self.add_strings(self.scanner.flush())
+
+    def write_top(self, full_file_path, sketch):
+        """Writes the top strings of one sketch and reports the file."""
+        try:
+            os.makedirs(os.path.dirname(full_file_path), exist_ok=True)
+            with open(full_file_path, "w", buffering=STRINGS_BUFFER_SIZE) as top_file:
+                for text, count, error in sketch.top():
+                    top_file.write(format_top_line(text, count, error))
+        except OSError as e:
+            click.secho(f"Could not write strings to file: {e}")
+            return
+        click.secho(f"Successfully saved the top {min(self.top_count, len(sketch.entries))} strings "
+                    f"({sketch.total} found) to '{full_file_path}'.", fg="green")
+
+    def close(self):
+        for section_name, sketch in self.section_sketches.items():
+            self.write_top(os.path.join(self.save_dir, section_name, "strings-top.txt"), sketch)
+        self.write_top(os.path.join(self.save_dir, "strings-top.txt"), self.sketch)
+
+class ConsolePreviewSink(RegionSink):
+    """
+    Prints each region and a preview of its strings, like read_bytes_show_sections.
+
+    The strings are picked by config.sample_mode: the first strings, a
+    reservoir sample of the whole region, or the first string of every Nth page.
+    The pipeline only runs when another output needs every byte, so stride
+    picks its pages from chunks read anyway and saves no reads here; only the
+    console-only path, read_bytes_show_sections, reads just the sampled pages.
+
+    Args:
+        config (CliAppConfig): Provides verbose_out, strings_out, the minimum string length and the sampling options.
+    """
+
+    def __init__(self, config: CliAppConfig):
+        self.config = config
+        self.scanner = StringScanner(config)
+        self.encoding = get_encoding(config)
+        self.region = None
+        self.chunk_size = 0
+        self.sampler = None
+        self.stride_offsets = set()
+        self.string_list = []
+        self.stats = None
+        self.page_map = None
+
+    def begin_section(self, section_name, region_count):
+        click.secho(f"\n--- {section_name.upper()} SECTIONS ---\n", fg="green")
+
+    def begin_region(self, region: RegionInfo):
+        self.region = region
+        self.chunk_size = 0
+        self.sampler = StringSampler(self.config.sample_count, self.config.sample_mode, seed=region.start)
+        if self.config.sample_mode == "stride":
+            self.stride_offsets = set(get_stride_offsets(region.size, self.config.sample_count))
+        self.string_list = []
+        self.stats = RegionStats() if self.config.flag_stats and self.config.verbose_out else None
+        self.page_map = PageMap() if self.config.flag_page_map and self.config.verbose_out else None
+        self.scanner.reset()
+
+    def feed(self, address, chunk):
+        self.chunk_size += len(chunk)
+        if self.stats is not None:
+            self.stats.update(chunk)
+        if self.page_map is not None:
+            self.page_map.update(chunk)
+        if self.config.sample_mode == "stride":
+            # Chunks are page aligned, so every sampled page lies inside one chunk.
+            chunk_offset = address - self.region.start
+            for page_offset in range(0, len(chunk), PAGE_SIZE):
+                if chunk_offset + page_offset in self.stride_offsets:
+                    text = get_first_string(chunk[page_offset:page_offset + PAGE_SIZE], self.scanner.pattern, self.encoding)
+                    if text is not None:
+                        self.string_list.append(text)
+        elif not self.sampler.is_full:
+            for _, text, _ in self.scanner.feed(chunk, address):
+                self.sampler.add(text)
+                if self.sampler.is_full:
+                    break
+
+    def end_region(self):
+        if self.config.sample_mode != "stride":
+            if not self.sampler.is_full:
+                for _, text, _ in self.scanner.flush():
+                    self.sampler.add(text)
+            self.string_list = self.sampler.result()
+        region = self.region
+        address_range = f"({hex(region.start)}-{hex(region.end)})"
+        if self.config.verbose_out:
+            details = pid_mapping_logic.format_region_details(self.stats, self.page_map)
+            click.secho(f"{region.line_num}: Chunk Size: {self.chunk_size} bytes\n Path: {region.path}\n Permissions: {region.permissions}\n Inode: {region.inode}\n Address Range: {address_range}\n Major Minor Id: {region.maj_min_id}\n Extracted Strings: {self.string_list}\n{details}")
+        elif self.config.strings_out:
+            click.secho(f"{region.line_num}: Chunk Size: {self.chunk_size} bytes\n Path: {region.path}\n Address Range: {address_range}\n Extracted Strings: {self.string_list}\n")
+        else:
+            click.secho(f"{region.line_num}: Chunk Size: {self.chunk_size} bytes\n Path: {region.path}\n Address Range: {address_range}\n")
+
+class HashSink(RegionSink):
+    """
+    Writes a SHA-256 manifest of every region to save_dir/hashes.sha256.
+
+    The manifest uses the sha256sum format, so a '--log-sections' dump can be
+    checked with 'sha256sum -c hashes.sha256' from the save directory.
+
+    Args:
+        save_dir (str): The directory the manifest is written to.
+    """
+
+    def __init__(self, save_dir):
+        self.save_dir = save_dir
+        self.region = None
+        self.hasher = None
+        self.lines = []
+
+    def begin_region(self, region: RegionInfo):
+        self.region = region
+        self.hasher = hashlib.sha256()
+
+    def feed(self, address, chunk):
+        self.hasher.update(chunk)
+
+    def end_region(self):
+        filename = f"region-{hex(self.region.start)}-{hex(self.region.end)}.bin"
+        self.lines.append(f"{self.hasher.hexdigest()}  {self.region.section_name}/{filename}\n")
+
+    def close(self):
+        os.makedirs(self.save_dir, exist_ok=True)
+        full_file_path = os.path.join(self.save_dir, "hashes.sha256")
+        try:
+            with open(full_file_path, "w") as hash_file:
+                hash_file.writelines(self.lines)
+        except OSError as e:
+            click.secho(f"Could not write hashes to file: {e}")
+            return
+        click.secho(f"Successfully saved hashes of {len(self.lines)} region(s) to '{full_file_path}'.", fg="green")
+
+class ContentStatsSink(RegionSink):
+    """
+    Writes the content statistics of every region to save_dir/stats.json.
+
+    Args:
+        save_dir (str): The directory the file is written to.
+    """
+
+    def __init__(self, save_dir):
+        self.save_dir = save_dir
+        self.region = None
+        self.stats = None
+        self.regions = []
+
+    def begin_region(self, region: RegionInfo):
+        self.region = region
+        self.stats = RegionStats()
+
+    def feed(self, address, chunk):
+        self.stats.update(chunk)
+
+    def end_region(self):
+        region = self.region
+        self.regions.append({
+            "section": region.section_name,
+            "start": hex(region.start),
+            "end": hex(region.end),
+            "permissions": region.permissions,
+            "path": region.path,
+            **self.stats.summary(),
+        })
+
+    def close(self):
+        save_stats_file(self.save_dir, self.regions)
+
+class PageMapSink(RegionSink):
+    """
+    Writes the page classes of every region next to its binary file.
+
+    Each region gets save_dir/SECTION/region-START-END-pages.txt, with one
+    class symbol per page (see heatmap_logic.PAGE_CLASSES) and 64 pages per line.
+
+    Args:
+        save_dir (str): The parent directory of the section directories.
+    """
+
+    def __init__(self, save_dir):
+        self.save_dir = save_dir
+        self.region = None
+        self.page_map = None
+        self.regions = 0
+
+    def begin_region(self, region: RegionInfo):
+        self.region = region
+        self.page_map = PageMap()
+
+    def feed(self, address, chunk):
+        self.page_map.update(chunk)
+
+    def end_region(self):
+        region = self.region
+        filename = f"region-{hex(region.start)}-{hex(region.end)}-pages.txt"
+        save_page_map(os.path.join(self.save_dir, region.section_name, filename), self.page_map.result())
+        self.regions += 1
+
+    def close(self):
+        click.secho(f"Successfully saved page maps for {self.regions} region(s) to '{self.save_dir}'.", fg="green")
+
+class StatsSink(RegionSink):
+    """Counts the regions and bytes read and reports the read throughput."""
+
+    def __init__(self):
+        self.regions = 0
+        self.bytes_read = 0
+        self.started = time.perf_counter()
+
+    def begin_region(self, region: RegionInfo):
+        self.regions += 1
+
+    def feed(self, address, chunk):
+        self.bytes_read += len(chunk)
+
+    def close(self):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        click.secho(f"Read {self.bytes_read} bytes from {self.regions} region(s) in {elapsed:.3f}s "
+                    f"({self.bytes_read / elapsed / (1 << 20):.1f} MiB/s).", fg="green")
+
+def run_region_pipeline(mem_path, input_dict, sections, sinks):
+    """
+    Reads every readable region of the selected sections once and feeds all sinks.
+
+    Args:
+        mem_path (str): Path to the /proc/PID/mem file.
+        input_dict (dict): Dictionary of categorized memory regions.
+        sections (list of str): Section names to read.
+        sinks (list of RegionSink): Consumers of the region data.
+    """
+    with open(mem_path, "rb") as mem:
+        for section_name in sections:
+            regions = list(iter_readable_regions(input_dict, [section_name]))
+            if not regions:
+                click.secho(f"No regions found for section '{section_name}'.", fg="yellow")
+                continue
+
+            for sink in sinks:
+                sink.begin_section(section_name, len(regions))
+            for region in regions:
+                for sink in sinks:
+                    sink.begin_region(region)
+                try:
+                    for address, chunk in iter_region_chunks(mem, region.start, region.end):
+                        for sink in sinks:
+                            sink.feed(address, chunk)
+                        if any(sink.finished for sink in sinks):
+                            break
+                except OSError as e:
+                    click.secho(f"Could not read region {hex(region.start)}-{hex(region.end)}: {e}")
+                finally:
+                    for sink in sinks:
+                        sink.end_region()
+                if any(sink.finished for sink in sinks):
+                    break
+            for sink in sinks:
+                sink.end_section(section_name)
+            if any(sink.finished for sink in sinks):
+                break
+
+    for sink in sinks:
+        sink.close()
+
+def list_saved_region_files(save_dir, section_name):
+    """
+    Lists the region files of one section of a saved '--log-sections' dump.
+
+    Args:
+        save_dir (str): The parent directory of the section directories.
+        section_name (str): The section to list.
+
+    Returns:
+        list of tuple: (RegionInfo, full_file_path) sorted by start address.
+    """
+    section_dir = os.path.join(save_dir, section_name)
+    try:
+        filenames = os.listdir(section_dir)
+    except OSError:
+        return []
+
+    regions = []
+    for filename in filenames:
+        match = REGION_FILE_PATTERN.match(filename)
+        if match:
+            regions.append((int(match.group(1), 16), int(match.group(2), 16), os.path.join(section_dir, filename)))
+    regions.sort()
+    return [(RegionInfo(section_name, line_num, start, end), full_file_path)
+            for line_num, (start, end, full_file_path) in enumerate(regions, 1)]
+
+def run_saved_region_pipeline(save_dir, sections, sinks, input_dict=None):
+    """
+    Feeds the region files of a saved dump to sinks as if they were read from memory.
+
+    Used after a snapshot, so strings and hashes describe the patched image
+    rather than memory that kept changing during the first pass.
+
+    Args:
+        save_dir (str): The parent directory of the section directories.
+        sections (list of str): Section names to read.
+        sinks (list of RegionSink): Consumers of the region data.
+        input_dict (dict, optional): The categorized memory regions, to restore the permissions and path of each region file.
+    """
+    mapped_regions = {}
+    if input_dict:
+        mapped_regions = {(region.section_name, region.start, region.end): region
+                          for region in iter_readable_regions(input_dict, sections)}
+    for section_name in sections:
+        regions = list_saved_region_files(save_dir, section_name)
+        if not regions:
+            continue
+
+        for sink in sinks:
+            sink.begin_section(section_name, len(regions))
+        for region, full_file_path in regions:
+            region = mapped_regions.get((section_name, region.start, region.end), region)
+            for sink in sinks:
+                sink.begin_region(region)
+            try:
+                with open(full_file_path, "rb") as bin_file:
+                    for offset, chunk in iter_region_chunks(bin_file, 0, region.size):
+                        for sink in sinks:
+                            sink.feed(region.start + offset, chunk)
+            except OSError as e:
+                click.secho(f"Could not read region file {full_file_path}: {e}")
+            finally:
+                for sink in sinks:
+                    sink.end_region()
+        for sink in sinks:
+            sink.end_section(section_name)
+
+    for sink in sinks:
+        sink.close()
+
+def build_sinks(config: CliAppConfig, build_ids=None):
+    """
+    Creates the sinks requested by a configuration.
+
+    Args:
+        config (CliAppConfig): The dump configuration.
+        build_ids (dict, optional): The build ID of each mapped module path, used with config.lib_store.
+
+    Returns:
+        list of RegionSink: The sinks, with a StatsSink last.
+    """
+    sinks = []
+    if config.flag_sec_log:
+        store = shared_lib_logic.get_library_store(config.lib_store) if config.lib_store else None
+        sinks.append(BinarySink(config.save_dir, store, build_ids))
+    if config.flag_strings_log and config.flag_strings_dedupe:
+        sinks.append(DedupeStringsSink(config.save_dir, config))
+    if config.flag_strings_log and config.top_strings:
+        sinks.append(TopStringsSink(config.save_dir, config))
+    if config.flag_strings_log and not (config.flag_strings_dedupe or config.top_strings):
+        sinks.append(StringsSink(config.save_dir, config))
+    if config.flag_hash_log:
+        sinks.append(HashSink(config.save_dir))
+    if config.flag_stats and config.save_dir:
+        sinks.append(ContentStatsSink(config.save_dir))
+    if config.flag_page_map and config.save_dir:
+        sinks.append(PageMapSink(config.save_dir))
+    if config.verbose_out or config.strings_out:
+        sinks.append(ConsolePreviewSink(config))
+    sinks.append(StatsSink())
+    return sinks
@@ -0,0 +1,169 @@
+"""Pointer scan: counts the words of each region that point into mapped memory, by target category."""
+import array
+import bisect
+import sys
+import click
+from . import pipeline_logic
+from .sample_logic import build_region_index
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+DEFAULT_SECTIONS = ("heap", "stack", "anon_map", "anon")
+WORD_SIZE = 8
+
+class PointerIndex:
+    """
+    The mapped regions of a process as sorted bounds, to test many words at once.
+
+    Words are only pointers if they fall inside a region: the start of the
+    region at or below each word is found by binary search (NumPy
+    searchsorted on whole arrays when it is installed), then the word is
+    checked against that region's end.
+
+    Args:
+        input_dict (dict): Dictionary of categorized memory regions from group_regions.
+    """
+
+    def __init__(self, input_dict):
+        region_index = build_region_index(input_dict)
+        self.categories = tuple(dict.fromkeys(category for _, _, _, _, category in region_index))
+        category_ids = {category: index for index, category in enumerate(self.categories)}
+        self.starts = [start for start, _, _, _, _ in region_index]
+        self.ends = [end for _, end, _, _, _ in region_index]
+        self.category_ids = [category_ids[category] for _, _, _, _, category in region_index]
+        # Most words (zeros, small integers, text) fall outside the mapped span.
+        self.low = self.starts[0] if region_index else 0
+        self.high = max(self.ends, default=0)
+        if numpy is not None:
+            self.start_array = numpy.array(self.starts, dtype=numpy.uint64)
+            self.end_array = numpy.array(self.ends, dtype=numpy.uint64)
+            self.category_array = numpy.array(self.category_ids, dtype=numpy.intp)
+
+    def find_category(self, address):
+        """
+        Finds the category of the region an address points into.
+
+        Args:
+            address (int): The address.
+
+        Returns:
+            str or None: The category, or None if no region contains the address.
+        """
+        position = bisect.bisect_right(self.starts, address) - 1
+        if position < 0 or address >= self.ends[position]:
+            return None
+        return self.categories[self.category_ids[position]]
+
+    def count_pointers(self, data, base_address):
+        """
+        Counts the aligned 8-byte little-endian words of a buffer that point into a region.
+
+        Args:
+            data (bytes): The buffer.
+            base_address (int): The address of data[0], used for word alignment.
+
+        Returns:
+            list of int: The pointer count per target category, in the order of self.categories.
+        """
+        start = -base_address % WORD_SIZE
+        word_count = max(len(data) - start, 0) // WORD_SIZE
+        if not word_count or not self.starts:
+            return [0] * len(self.categories)
+        if numpy is not None:
+            return self.count_pointers_numpy(data, start, word_count)
+
+        words = array.array("Q", data[start:start + word_count * WORD_SIZE])
+        if sys.byteorder != "little":
+            words.byteswap()
+        counts = [0] * len(self.categories)
+        low, high, starts, ends = self.low, self.high, self.starts, self.ends
+        for word in words:
+            if low <= word < high:
+                position = bisect.bisect_right(starts, word) - 1
+                if word < ends[position]:
+                    counts[self.category_ids[position]] += 1
+        return counts
+
+    def count_pointers_numpy(self, data, start, word_count):
+        """Counts pointers like count_pointers, testing every word of the buffer at once with NumPy."""
+        words = numpy.frombuffer(data, dtype="<u8", count=word_count, offset=start)
+        words = words[(words >= self.low) & (words < self.high)]
+        # Every remaining word is at or above the first start, so positions are never negative.
+        positions = numpy.searchsorted(self.start_array, words, side="right") - 1
+        inside = words < self.end_array[positions]
+        return numpy.bincount(self.category_array[positions[inside]], minlength=len(self.categories)).tolist()
+
+def format_targets(categories, counts):
+    """
+    Formats pointer counts per target category.
+
+    Args:
+        categories (tuple of str): The category names.
+        counts (list of int): The count of each category.
+
+    Returns:
+        str: e.g. 'heap:120,shared_libs:40', by descending count; '-' when there are none.
+    """
+    ranked = sorted((-count, category) for category, count in zip(categories, counts) if count)
+    return ",".join(f"{category}:{-count}" for count, category in ranked) or "-"
+
+def format_pointer_line(region: pipeline_logic.RegionInfo, words, categories, counts):
+    """
+    Formats the pointer counts of one source region.
+
+    Args:
+        region (RegionInfo): The source region.
+        words (int): The number of words read.
+        categories (tuple of str): The category names.
+        counts (list of int): The pointer count of each target category.
+
+    Returns:
+        str: 'START-END<TAB>CATEGORY<TAB>WORDS<TAB>POINTERS<TAB>TARGETS<TAB>PATH'.
+    """
+    return (f"{region.start:#x}-{region.end:#x}\t{region.section_name}\t{words}\t{sum(counts)}\t"
+            f"{format_targets(categories, counts)}\t{region.path}")
+
+class PointerSink(pipeline_logic.RegionSink):
+    """
+    Counts the pointers in every region fed by the region pipeline, by target category.
+
+    Each chunk is tested as a whole against the PointerIndex, so memory use
+    does not grow with the region size. One line is printed per source
+    region, and the totals per target category on close.
+
+    Args:
+        index (PointerIndex): The regions pointers may target.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.region = None
+        self.words = 0
+        self.counts = []
+        self.total_words = 0
+        self.total_counts = [0] * len(index.categories)
+        self.regions = 0
+
+    def begin_region(self, region: pipeline_logic.RegionInfo):
+        self.region = region
+        self.words = 0
+        self.counts = [0] * len(self.index.categories)
+
+    def feed(self, address, chunk):
+        self.words += len(chunk) // WORD_SIZE
+        for position, count in enumerate(self.index.count_pointers(chunk, address)):
+            self.counts[position] += count
+
+    def end_region(self):
+        click.echo(format_pointer_line(self.region, self.words, self.index.categories, self.counts))
+        self.total_words += self.words
+        for position, count in enumerate(self.counts):
+            self.total_counts[position] += count
+        self.regions += 1
+
+    def close(self):
+        click.secho(f"Found {sum(self.total_counts)} pointer(s) in {self.total_words} word(s) of {self.regions} "
+                    f"region(s): {format_targets(self.index.categories, self.total_counts)}.", fg="green")
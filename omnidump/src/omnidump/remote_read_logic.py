@@ -0,0 +1,116 @@
+"""Batched reads of another process's memory with process_vm_readv, falling back to pread on /proc/PID/mem."""
+import os
+import ctypes
+import ctypes.util
+
+IOV_MAX = 1024
+
+class IOVec(ctypes.Structure):
+    """struct iovec used by process_vm_readv."""
+    # pylint: disable=too-few-public-methods
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+def _load_process_vm_readv():
+    """Returns the libc process_vm_readv function, or None if it is unavailable."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        function = libc.process_vm_readv
+    except (OSError, AttributeError):
+        return None
+    function.restype = ctypes.c_ssize_t
+    function.argtypes = [ctypes.c_int, ctypes.POINTER(IOVec), ctypes.c_ulong,
+                         ctypes.POINTER(IOVec), ctypes.c_ulong, ctypes.c_ulong]
+    return function
+
+_process_vm_readv = _load_process_vm_readv()
+
+class BatchReader:
+    """
+    Reads a fixed list of (address, size) ranges from a process, all at once.
+
+    The local buffer and iovec arrays are built once, so each call to read()
+    costs one process_vm_readv system call per IOV_MAX ranges. If the call is
+    unavailable or fails, each range is read with os.pread on the open
+    /proc/PID/mem descriptor instead.
+
+    Args:
+        pid (int): The target process ID.
+        ranges (list of tuple): (address, size) ranges to read on every call.
+        mem_fd (int): An open /proc/PID/mem descriptor used for the fallback.
+    """
+
+    def __init__(self, pid, ranges, mem_fd):
+        self.pid = pid
+        self.ranges = list(ranges)
+        self.mem_fd = mem_fd
+        self.total_size = sum(size for _, size in self.ranges)
+        self.buffer = ctypes.create_string_buffer(max(self.total_size, 1))
+        self.use_vm_readv = _process_vm_readv is not None
+
+        self.batches = []
+        offset = 0
+        for batch_start in range(0, len(self.ranges), IOV_MAX):
+            batch = self.ranges[batch_start:batch_start + IOV_MAX]
+            local_iov = (IOVec * len(batch))()
+            remote_iov = (IOVec * len(batch))()
+            batch_size = 0
+            for index, (address, size) in enumerate(batch):
+                local_iov[index].iov_base = ctypes.addressof(self.buffer) + offset + batch_size
+                local_iov[index].iov_len = size
+                remote_iov[index].iov_base = address
+                remote_iov[index].iov_len = size
+                batch_size += size
+            self.batches.append((offset, batch_size, local_iov, remote_iov, len(batch)))
+            offset += batch_size
+
+    def _read_pread(self):
+        """Reads every range with os.pread into the shared buffer."""
+        offset = 0
+        for address, size in self.ranges:
+            chunk = os.pread(self.mem_fd, size, address)
+            if len(chunk) != size:
+                raise OSError(f"Short read at {hex(address)}")
+            ctypes.memmove(ctypes.addressof(self.buffer) + offset, chunk, size)
+            offset += size
+
+    def read(self):
+        """
+        Reads every range.
+
+        Returns:
+            bytes: The contents of all ranges concatenated in request order.
+
+        Raises:
+            OSError: If a range could not be read.
+        """
+        if self.use_vm_readv:
+            for _, batch_size, local_iov, remote_iov, count in self.batches:
+                result = _process_vm_readv(self.pid, local_iov, count, remote_iov, count, 0)
+                if result != batch_size:
+                    # EPERM in some sandboxes, or a partial read: use /proc/PID/mem from now on.
+                    self.use_vm_readv = False
+                    break
+            else:
+                return self.buffer.raw[:self.total_size]
+        self._read_pread()
+        return self.buffer.raw[:self.total_size]
+
+def read_ranges(pid, ranges, mem_fd):
+    """
+    Reads a one-off list of ranges from a process in a single batch.
+
+    Args:
+        pid (int): The target process ID.
+        ranges (list of tuple): (address, size) ranges.
+        mem_fd (int): An open /proc/PID/mem descriptor used for the fallback.
+
+    Returns:
+        list of bytes: One bytes object per range, in request order.
+    """
+    data = BatchReader(pid, ranges, mem_fd).read()
+    chunks = []
+    offset = 0
+    for _, size in ranges:
+        chunks.append(data[offset:offset + size])
+        offset += size
+    return chunks
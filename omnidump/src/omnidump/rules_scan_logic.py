@@ -0,0 +1,431 @@
+"""
+Rule scan: matches a file of byte, string and regex signatures against process memory.
+
+A rule file holds one pattern per line; a rule matches where any of its patterns does:
+
+    # comment
+    RULE_NAME "text with \\x00 escapes" [ascii] [wide]
+    RULE_NAME { 4D 5A 90 00 }
+    RULE_NAME /regex/[is]
+"""
+import array
+import codecs
+import collections
+import re
+import click
+from . import pipeline_logic
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+DEFAULT_SECTIONS = ("heap", "stack", "anon_map", "anon")
+RULE_NAME = re.compile(r"[A-Za-z_][\w.-]*")
+STRING_MODIFIERS = {"ascii", "wide"}
+REGEX_FLAGS = {"i": re.IGNORECASE, "s": re.DOTALL}
+# Flags a rule regex may also set inline at its start, e.g. /(?i)cmd\.exe/.
+INLINE_FLAGS = {"i": re.IGNORECASE, "m": re.MULTILINE, "s": re.DOTALL, "x": re.VERBOSE}
+INLINE_FLAGS_PREFIX = re.compile(r"\(\?([a-zA-Z]+)\)")
+# Regex matches are only guaranteed across chunk boundaries up to this length.
+REGEX_OVERLAP = 4096
+
+def parse_string_pattern(text):
+    """
+    Parses a quoted string pattern and its modifiers.
+
+    Args:
+        text (str): e.g. '"cmd.exe" ascii wide'.
+
+    Returns:
+        list of bytes: The pattern in each requested encoding.
+
+    Raises:
+        ValueError: If the string is not closed or a modifier is unknown.
+    """
+    match = re.fullmatch(r'"((?:[^"\\]|\\.)*)"\s*(.*)', text)
+    if match is None:
+        raise ValueError("unterminated string")
+    literal = codecs.escape_decode(match.group(1).encode("utf-8"))[0]
+    modifiers = set(match.group(2).split())
+    if not modifiers <= STRING_MODIFIERS:
+        raise ValueError(f"unknown modifier(s): {', '.join(sorted(modifiers - STRING_MODIFIERS))}")
+    patterns = []
+    if "ascii" in modifiers or "wide" not in modifiers:
+        patterns.append(literal)
+    if "wide" in modifiers:
+        patterns.append(bytes(byte for char in literal for byte in (char, 0)))
+    return patterns
+
+def parse_rule_line(line):
+    """
+    Parses one line of a rule file.
+
+    Args:
+        line (str): The line.
+
+    Returns:
+        tuple or None: (rule, kind, pattern), where kind is 'literal' and pattern
+        is a list of bytes, or kind is 'regex' and pattern is a bytes regex.
+        None for blank and comment lines.
+
+    Raises:
+        ValueError: If the line is not a valid rule.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    parts = line.split(None, 1)
+    if not RULE_NAME.fullmatch(parts[0]) or len(parts) < 2:
+        raise ValueError("expected 'RULE_NAME PATTERN'")
+    rule, pattern = parts
+    if pattern.startswith('"'):
+        patterns = parse_string_pattern(pattern)
+    elif pattern.startswith("{") and pattern.endswith("}"):
+        try:
+            patterns = [bytes.fromhex(pattern[1:-1])]
+        except ValueError:
+            raise ValueError("invalid hex pattern") from None
+    elif pattern.startswith("/") and pattern.rfind("/") > 0:
+        end = pattern.rfind("/")
+        flags = 0
+        for flag in pattern[end + 1:]:
+            if flag not in REGEX_FLAGS:
+                raise ValueError(f"unknown regex flag '{flag}'")
+            flags |= REGEX_FLAGS[flag]
+        source = pattern[1:end]
+        # Leading inline flags become compile flags, so the regex can still be
+        # wrapped in a group of the combined alternation.
+        prefix = INLINE_FLAGS_PREFIX.match(source)
+        while prefix is not None:
+            for flag in prefix.group(1):
+                if flag not in INLINE_FLAGS:
+                    raise ValueError(f"unsupported inline regex flag '{flag}'")
+                flags |= INLINE_FLAGS[flag]
+            source = source[prefix.end():]
+            prefix = INLINE_FLAGS_PREFIX.match(source)
+        try:
+            compiled = re.compile(source.encode("utf-8"), flags)
+        except re.error as e:
+            raise ValueError(f"invalid regex: {e}") from None
+        if compiled.groupindex:
+            raise ValueError("named groups are not supported")
+        if compiled.match(b""):
+            raise ValueError("regex matches the empty string")
+        return (rule, "regex", compiled)
+    else:
+        raise ValueError("expected a \"string\", {hex bytes} or /regex/")
+    if not all(patterns):
+        raise ValueError("empty pattern")
+    return (rule, "literal", patterns)
+
+def parse_rule_file(file_path):
+    """
+    Reads a rule file.
+
+    Args:
+        file_path (str): The rule file.
+
+    Returns:
+        tuple: (literals, regexes), lists of (rule, bytes) and (rule, re.Pattern).
+
+    Raises:
+        ValueError: With the line number, if a line is not a valid rule.
+    """
+    literals = []
+    regexes = []
+    with open(file_path, "r", encoding="utf-8") as rule_file:
+        for line_num, line in enumerate(rule_file, start=1):
+            try:
+                parsed = parse_rule_line(line)
+            except ValueError as e:
+                raise ValueError(f"{file_path}:{line_num}: {e}") from None
+            if parsed is None:
+                continue
+            rule, kind, pattern = parsed
+            if kind == "regex":
+                regexes.append((rule, pattern))
+            else:
+                literals.extend((rule, literal) for literal in pattern)
+    return (literals, regexes)
+
+class AhoCorasick:
+    """
+    Finds every occurrence of many byte patterns in one pass over a buffer.
+
+    Uses pyahocorasick when it is installed. Otherwise the automaton is built
+    here as a complete DFA: one flat array of 256 transitions per state, with
+    the states that end a pattern numbered last, so the scan loop is one array
+    lookup and one comparison per byte.
+
+    Args:
+        patterns (list of bytes): The non-empty patterns.
+    """
+
+    def __init__(self, patterns):
+        self.lengths = [len(pattern) for pattern in patterns]
+        if ahocorasick is not None:
+            self.automaton = ahocorasick.Automaton()
+            indexes = collections.defaultdict(list)
+            for index, pattern in enumerate(patterns):
+                indexes[pattern.decode("latin-1")].append(index)
+            for text, pattern_indexes in indexes.items():
+                self.automaton.add_word(text, tuple(pattern_indexes))
+            self.automaton.make_automaton()
+        else:
+            self.build(patterns)
+
+    def build(self, patterns):
+        """Builds the pure Python DFA: trie, failure links, then the transition table."""
+        # Bytes no pattern contains send the automaton back to the root, so only
+        # runs of pattern bytes at least as long as the shortest pattern are
+        # scanned. The other bytes are translated to one that is found by a
+        # single-byte class, which sre searches much faster than a large set.
+        used = set().union(*patterns)
+        self.runs = None
+        if patterns and len(used) < 256:
+            separator = min(set(range(256)) - used)
+            self.run_table = bytes(byte if byte in used else separator for byte in range(256))
+            self.runs = re.compile(b"[^%s]{%d,}" % (re.escape(bytes([separator])), min(self.lengths)))
+
+        goto = [{}]
+        outputs = [[]]
+        for index, pattern in enumerate(patterns):
+            state = 0
+            for byte in pattern:
+                if byte not in goto[state]:
+                    goto[state][byte] = len(goto)
+                    goto.append({})
+                    outputs.append([])
+                state = goto[state][byte]
+            outputs[state].append(index)
+
+        fail = [0] * len(goto)
+        order = list(goto[0].values())
+        for state in order:
+            for byte, child in goto[state].items():
+                if state:
+                    fallback = fail[state]
+                    while fallback and byte not in goto[fallback]:
+                        fallback = fail[fallback]
+                    fail[child] = goto[fallback].get(byte, 0)
+                outputs[child] = outputs[child] + outputs[fail[child]]
+                order.append(child)
+
+        # Renumber so every state with an output comes after every state without one.
+        ranked = sorted(range(len(goto)), key=lambda state: bool(outputs[state]))
+        new_ids = [0] * len(goto)
+        for new_id, state in enumerate(ranked):
+            new_ids[state] = new_id << 8
+        self.first_output = sum(not output for output in outputs) << 8
+        self.outputs = [outputs[state] for state in ranked]
+
+        self.table = array.array("I", bytes(4 * 256 * len(goto)))
+        root_row = array.array("I", [0] * 256)
+        for byte, child in goto[0].items():
+            root_row[byte] = new_ids[child]
+        self.table[0:256] = root_row
+        for state in order:
+            row = self.table[new_ids[fail[state]]:new_ids[fail[state]] + 256]
+            for byte, child in goto[state].items():
+                row[byte] = new_ids[child]
+            self.table[new_ids[state]:new_ids[state] + 256] = row
+
+    def iter_matches(self, data):
+        """
+        Finds every pattern occurrence in a buffer, including overlapping ones.
+
+        Args:
+            data (bytes): The buffer.
+
+        Yields:
+            tuple: (start, pattern_index) by end offset.
+        """
+        if not self.lengths:
+            return
+        if ahocorasick is not None or self.runs is None:
+            yield from self.iter_run_matches(data, 0)
+            return
+        for run in self.runs.finditer(data.translate(self.run_table)):
+            yield from self.iter_run_matches(data[run.start():run.end()], run.start())
+
+    def iter_run_matches(self, data, base):
+        """Yields (start, pattern_index) for a run of data that starts at offset base."""
+        if ahocorasick is not None:
+            for end, pattern_indexes in self.automaton.iter(data.decode("latin-1")):
+                for index in pattern_indexes:
+                    yield (base + end + 1 - self.lengths[index], index)
+            return
+        table = self.table
+        first_output = self.first_output
+        state = 0
+        for offset, byte in enumerate(data, start=base + 1):
+            state = table[state + byte]
+            if state >= first_output:
+                for index in self.outputs[state >> 8]:
+                    yield (offset - self.lengths[index], index)
+
+def get_group_source(pattern):
+    """
+    Wraps a rule regex as a group of the combined alternation, keeping its flags inline.
+
+    Args:
+        pattern (re.Pattern): The compiled rule regex.
+
+    Returns:
+        bytes: e.g. b'(?i:cmd\\.exe)'.
+    """
+    flags = b"".join(letter.encode("ascii") for letter, flag in INLINE_FLAGS.items() if pattern.flags & flag)
+    return b"(?%s:%s)" % (flags, pattern.pattern)
+
+def format_rule_match(address, rule, category, path):
+    """
+    Formats one rule match.
+
+    Args:
+        address (int): The address of the first matched byte.
+        rule (str): The rule name.
+        category (str): The region category from get_region_category.
+        path (str): The region path.
+
+    Returns:
+        str: 'ADDRESS<TAB>RULE<TAB>CATEGORY<TAB>PATH'.
+    """
+    return f"{address:#018x}\t{rule}\t{category}\t{path}"
+
+class RuleScanner:
+    """
+    Matches compiled rules against a stream of chunks.
+
+    Literals go through one AhoCorasick automaton. Regexes are found with one
+    alternation of all of them, searched again from the byte after each hit,
+    so every offset where any regex matches is visited; there each regex is
+    tried on its own, so rules matching the same or overlapping bytes are all
+    reported, as if each regex had been run alone. Regexes with capturing
+    groups run on their own, since the alternation would renumber their
+    backreferences. The tail of each chunk is
+    carried into the next, long enough for the longest literal and for
+    REGEX_OVERLAP bytes of regex, and only matches starting before the tail
+    are reported, so each is found exactly once.
+
+    Args:
+        literals (list of tuple): (rule, bytes) pairs.
+        regexes (list of tuple): (rule, re.Pattern) pairs.
+
+    Raises:
+        ValueError: If the regexes cannot be combined.
+    """
+
+    def __init__(self, literals, regexes):
+        self.literal_rules = [rule for rule, _ in literals]
+        self.automaton = AhoCorasick([pattern for _, pattern in literals])
+        self.combined_regexes = [(rule, pattern) for rule, pattern in regexes if not pattern.groups]
+        self.separate_regexes = [(rule, pattern) for rule, pattern in regexes if pattern.groups]
+        self.regex = None
+        if self.combined_regexes:
+            try:
+                self.regex = re.compile(b"|".join(get_group_source(pattern) for _, pattern in self.combined_regexes))
+            except re.error as e:
+                raise ValueError(f"invalid regex rules: {e}") from e
+        longest = max((len(pattern) for _, pattern in literals), default=1)
+        self.overlap = max(longest, REGEX_OVERLAP if regexes else 0) - 1
+        self.carry = b""
+        self.carry_address = 0
+
+    def reset(self):
+        """Discards any carried bytes before scanning a new region."""
+        self.carry = b""
+        self.carry_address = 0
+
+    def scan(self, data, base, limit):
+        """Yields (address, rule) for matches in data starting before limit, once per address and rule."""
+        matches = set()
+        for start, index in self.automaton.iter_matches(data):
+            if start < limit:
+                matches.add((start, self.literal_rules[index]))
+        if self.regex is not None:
+            # The end of each regex's last match: like finditer, matches of one regex never overlap.
+            match_ends = [0] * len(self.combined_regexes)
+            hit = self.regex.search(data, 0)
+            while hit is not None and hit.start() < limit:
+                start = hit.start()
+                for index, (rule, pattern) in enumerate(self.combined_regexes):
+                    if match_ends[index] <= start:
+                        match = pattern.match(data, start)
+                        if match is not None:
+                            match_ends[index] = match.end()
+                            matches.add((start, rule))
+                hit = self.regex.search(data, start + 1)
+        for rule, pattern in self.separate_regexes:
+            for match in pattern.finditer(data):
+                if match.start() >= limit:
+                    break
+                matches.add((match.start(), rule))
+        for start, rule in sorted(matches):
+            yield (base + start, rule)
+
+    def feed(self, chunk, address):
+        """
+        Scans the next chunk of a region.
+
+        Args:
+            chunk (bytes): The chunk data.
+            address (int): The virtual address of the first byte of the chunk.
+
+        Yields:
+            tuple: (address, rule) for each match that starts before the carried tail.
+        """
+        data = self.carry + chunk
+        base = self.carry_address if self.carry else address
+        keep_from = max(len(data) - self.overlap, 0)
+        yield from self.scan(data, base, keep_from)
+        self.carry = data[keep_from:]
+        self.carry_address = base + keep_from
+
+    def flush(self):
+        """
+        Finishes the current region.
+
+        Yields:
+            tuple: (address, rule) for matches in the carried tail.
+        """
+        data, base = self.carry, self.carry_address
+        self.reset()
+        yield from self.scan(data, base, len(data))
+
+class RuleScanSink(pipeline_logic.RegionSink):
+    """
+    Prints the rule matches of every region fed by the region pipeline.
+
+    Args:
+        literals (list of tuple): (rule, bytes) pairs.
+        regexes (list of tuple): (rule, re.Pattern) pairs.
+    """
+
+    def __init__(self, literals, regexes):
+        self.scanner = RuleScanner(literals, regexes)
+        self.region = None
+        self.matches = 0
+        self.rules = set()
+        self.regions = 0
+
+    def begin_region(self, region: pipeline_logic.RegionInfo):
+        self.region = region
+        self.scanner.reset()
+
+    def report(self, matches):
+        """Prints matches of the current region."""
+        for address, rule in matches:
+            click.echo(format_rule_match(address, rule, self.region.section_name, self.region.path))
+            self.matches += 1
+            self.rules.add(rule)
+
+    def feed(self, address, chunk):
+        self.report(self.scanner.feed(chunk, address))
+
+    def end_region(self):
+        self.report(self.scanner.flush())
+        self.regions += 1
+
+    def close(self):
+        click.secho(f"Found {self.matches} match(es) of {len(self.rules)} rule(s) in {self.regions} region(s).", fg="green")
@@ -0,0 +1,194 @@
+"""High-frequency sampling of a few addresses into a compact binary time series."""
+import os
+import re
+import time
+import bisect
+import struct
+import click
+from . import pid_mapping_logic
+from .remote_read_logic import BatchReader
+
+SAMPLE_MAGIC = b"ODSAMPL1"
+HEADER_STRUCT = struct.Struct("<8sIId")
+ADDRESS_STRUCT = struct.Struct("<QI4x")
+TIMESTAMP_STRUCT = struct.Struct("<Q")
+ADDR_PATTERN = re.compile(r"^\s*(0x[0-9a-fA-F]+|\d+)\s*:\s*(\d+)\s*$")
+MAX_SAMPLE_SIZE = 4096
+
+def parse_sample_address(text):
+    """
+    Parses an '--addr' value of the form ADDRESS:SIZE, e.g. '0x7ffd1000:8'.
+
+    Args:
+        text (str): The address specification.
+
+    Returns:
+        tuple: (address, size)
+
+    Raises:
+        ValueError: If the specification is malformed or the size is out of range.
+    """
+    match = ADDR_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Invalid address '{text}'. Use ADDRESS:SIZE, e.g. 0x7ffd1000:8.")
+    address, size = int(match.group(1), 0), int(match.group(2))
+    if not 0 < size <= MAX_SAMPLE_SIZE:
+        raise ValueError(f"Invalid size {size} for '{text}'. Use a size between 1 and {MAX_SAMPLE_SIZE}.")
+    return (address, size)
+
+def build_region_index(input_dict):
+    """
+    Builds a sorted index of the regions returned by group_regions.
+
+    Args:
+        input_dict (dict): Dictionary of categorized memory regions.
+
+    Returns:
+        list of tuple: (start, end, permissions, path, category) sorted by start.
+    """
+    region_index = []
+    for category, sections in input_dict.items():
+        for section in sections:
+            address, permissions, path, _, _ = pid_mapping_logic.get_section_information(section)
+            try:
+                start, end = [int(x, 16) for x in address.split("-")]
+            except ValueError:
+                continue
+            region_index.append((start, end, permissions, path, category))
+    region_index.sort()
+    return region_index
+
+def find_region(region_index, address, size=1):
+    """
+    Finds the region that contains an address range.
+
+    Args:
+        region_index (list of tuple): The index from build_region_index.
+        address (int): The first address.
+        size (int): The number of bytes that must be inside the region.
+
+    Returns:
+        tuple or None: The containing (start, end, permissions, path, category) entry.
+    """
+    position = bisect.bisect_right(region_index, (address, float("inf"))) - 1
+    if position < 0:
+        return None
+    region = region_index[position]
+    if region[0] <= address and address + size <= region[1]:
+        return region
+    return None
+
+def validate_sample_addresses(region_index, addresses):
+    """
+    Checks that every sampled address lies inside a single readable region.
+
+    Args:
+        region_index (list of tuple): The index from build_region_index.
+        addresses (list of tuple): (address, size) pairs.
+
+    Returns:
+        list of str: One error message per invalid address (empty when all are valid).
+    """
+    errors = []
+    for address, size in addresses:
+        region = find_region(region_index, address, size)
+        if region is None:
+            errors.append(f"{hex(address)}:{size} is not inside a single mapped region.")
+        elif "r" not in region[2]:
+            errors.append(f"{hex(address)}:{size} is in a non-readable region ({region[2]} {region[4]}).")
+    return errors
+
+def write_sample_header(output_file, addresses, rate):
+    """
+    Writes the header of a sample file.
+
+    Args:
+        output_file (file object): The binary output file.
+        addresses (list of tuple): (address, size) pairs in record order.
+        rate (float): The requested sampling rate in Hz.
+    """
+    output_file.write(HEADER_STRUCT.pack(SAMPLE_MAGIC, len(addresses), 0, rate))
+    for address, size in addresses:
+        output_file.write(ADDRESS_STRUCT.pack(address, size))
+
+def load_samples(full_file_path):
+    """
+    Reads a sample file written by run_sampler.
+
+    Args:
+        full_file_path (str): The sample file.
+
+    Returns:
+        tuple: (addresses, rate, records) where records is a list of
+               (nanoseconds, [bytes per address]) tuples.
+    """
+    with open(full_file_path, "rb") as sample_file:
+        magic, count, _, rate = HEADER_STRUCT.unpack(sample_file.read(HEADER_STRUCT.size))
+        if magic != SAMPLE_MAGIC:
+            raise ValueError(f"'{full_file_path}' is not an omnidump sample file.")
+        addresses = [ADDRESS_STRUCT.unpack(sample_file.read(ADDRESS_STRUCT.size)) for _ in range(count)]
+        record_size = TIMESTAMP_STRUCT.size + sum(size for _, size in addresses)
+
+        records = []
+        while True:
+            record = sample_file.read(record_size)
+            if len(record) < record_size:
+                break
+            (nanoseconds,) = TIMESTAMP_STRUCT.unpack_from(record)
+            values = []
+            offset = TIMESTAMP_STRUCT.size
+            for _, size in addresses:
+                values.append(record[offset:offset + size])
+                offset += size
+            records.append((nanoseconds, values))
+    return (addresses, rate, records)
+
+def run_sampler(pid, addresses, rate, output_path, count=None, duration=None):
+    """
+    Samples addresses of a process at a fixed rate and writes a binary time series.
+
+    Each record is a little-endian u64 of nanoseconds since the first sample,
+    followed by the raw bytes of every address in '--addr' order. All addresses
+    are read in one batched system call per tick.
+
+    Args:
+        pid (int): The target process ID.
+        addresses (list of tuple): (address, size) pairs.
+        rate (float): Samples per second.
+        output_path (str): The output file.
+        count (int, optional): Stop after this many samples.
+        duration (float, optional): Stop after this many seconds.
+
+    Returns:
+        tuple: (samples_written, late_ticks)
+    """
+    period = 1.0 / rate
+    samples = 0
+    late_ticks = 0
+    mem_fd = os.open(f"/proc/{pid}/mem", os.O_RDONLY)
+    try:
+        reader = BatchReader(pid, addresses, mem_fd)
+        with open(output_path, "wb", buffering=1 << 20) as output_file:
+            write_sample_header(output_file, addresses, rate)
+            first_tick = time.perf_counter()
+            next_tick = first_tick
+            try:
+                while (count is None or samples < count) and (duration is None or next_tick - first_tick < duration):
+                    now = time.perf_counter()
+                    if now < next_tick:
+                        time.sleep(next_tick - now)
+                        now = time.perf_counter()
+                    elif now - next_tick > period:
+                        # Fell more than a period behind: count it and realign the schedule.
+                        late_ticks += 1
+                        next_tick = now
+                    data = reader.read()
+                    output_file.write(TIMESTAMP_STRUCT.pack(int((now - first_tick) * 1e9)))
+                    output_file.write(data)
+                    samples += 1
+                    next_tick += period
+            except KeyboardInterrupt:
+                click.echo("\nStopped sampling.")
+    finally:
+        os.close(mem_fd)
+    return (samples, late_ticks)
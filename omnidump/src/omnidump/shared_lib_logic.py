@@ -0,0 +1,179 @@
+"""Deduplication of read-only file mappings, such as shared libraries, across the processes of a dump."""
+import os
+import shutil
+import threading
+import click
+
+SHARED_SECTIONS = ("executable", "shared_libs", "file_backed")
+STORE_DIR_NAME = "shared-libs"
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def is_shared_mapping(permissions, inode):
+    """
+    Tells whether a mapping holds the same bytes in every process that maps the file.
+
+    Args:
+        permissions (str): The mapping permissions, e.g. 'r-xp'.
+        inode (str): The inode of the mapped file, '0' for anonymous memory.
+
+    Returns:
+        bool: True for readable, non-writable mappings of a file.
+    """
+    return "r" in permissions and "w" not in permissions and inode not in ("", "0", "N/A")
+
+def get_mapping_key(path, maj_min_id, inode, offset, size, build_id=None):
+    """
+    Names a file mapping by what identifies its contents.
+
+    The device and inode identify the file, the offset and size the mapped
+    part, and the build ID guards against a file rewritten in place.
+
+    Args:
+        path (str): The mapped file, for a readable name.
+        maj_min_id (str): The device, e.g. '08:01'.
+        inode (str): The inode.
+        offset (int): The file offset of the mapping.
+        size (int): The mapping size.
+        build_id (str, optional): The ELF build ID of the file, if any.
+
+    Returns:
+        str: e.g. 'libc.so.6-08.01-1234-0-28000-6196744a....bin'.
+    """
+    name = os.path.basename(path) or "mapping"
+    return f"{name}-{maj_min_id.replace(':', '.')}-{inode}-{offset:x}-{size:x}-{build_id or 'none'}.bin"
+
+class LibraryStore:
+    """
+    Saves each shared file mapping once and hard-links it into every dump that maps it.
+
+    Worker threads of a group dump share one store: the first to claim a key
+    writes the mapping, and the others wait for it and link the stored file.
+    Files are copied instead where hard links are not supported.
+
+    Args:
+        store_dir (str): The directory the mappings are stored in.
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        self.lock = threading.Lock()
+        self.writing = {}
+        self.stored = 0
+        self.stored_bytes = 0
+        self.reused = 0
+        self.reused_bytes = 0
+
+    def get_path(self, key):
+        """Returns the stored file of a key."""
+        return os.path.join(self.store_dir, key)
+
+    def get_temp_path(self, key):
+        """Returns the file a claimed key is written to before commit."""
+        return f"{self.get_path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    def claim(self, key):
+        """
+        Claims a mapping for writing, unless it is stored or being stored.
+
+        Args:
+            key (str): The key from get_mapping_key.
+
+        Returns:
+            bool: True if the caller must write it to get_temp_path(key), then
+            call commit or release; False if it can be linked.
+        """
+        while True:
+            with self.lock:
+                pending = self.writing.get(key)
+                if pending is None:
+                    if os.path.exists(self.get_path(key)):
+                        return False
+                    os.makedirs(self.store_dir, exist_ok=True)
+                    self.writing[key] = threading.Event()
+                    return True
+            pending.wait()
+
+    def finish(self, key):
+        """Wakes the threads waiting for a claimed key."""
+        with self.lock:
+            self.writing.pop(key).set()
+
+    def commit(self, key, full_file_path):
+        """
+        Stores a claimed mapping written to get_temp_path(key), and links it to full_file_path.
+
+        Args:
+            key (str): The claimed key.
+            full_file_path (str): The region file of the dump being written.
+        """
+        try:
+            os.replace(self.get_temp_path(key), self.get_path(key))
+            with self.lock:
+                self.stored += 1
+                self.stored_bytes += os.path.getsize(self.get_path(key))
+        finally:
+            self.finish(key)
+        self.link_file(key, full_file_path)
+
+    def release(self, key, full_file_path=None):
+        """
+        Gives up a claimed key after a failed read or write, so another process may store it.
+
+        Args:
+            key (str): The claimed key.
+            full_file_path (str, optional): Keep what was written as this region file
+                instead of deleting it.
+        """
+        try:
+            if full_file_path is None:
+                os.remove(self.get_temp_path(key))
+            else:
+                os.replace(self.get_temp_path(key), full_file_path)
+        except OSError:
+            pass
+        self.finish(key)
+
+    def link_file(self, key, full_file_path):
+        """Hard-links, or copies, the stored file of a key to full_file_path."""
+        if os.path.lexists(full_file_path):
+            os.remove(full_file_path)
+        try:
+            os.link(self.get_path(key), full_file_path)
+        except OSError:
+            shutil.copyfile(self.get_path(key), full_file_path)
+
+    def link(self, key, full_file_path):
+        """
+        Reuses a stored mapping for the dump being written.
+
+        Args:
+            key (str): The key, for which claim returned False.
+            full_file_path (str): The region file of the dump being written.
+        """
+        self.link_file(key, full_file_path)
+        with self.lock:
+            self.reused += 1
+            self.reused_bytes += os.path.getsize(full_file_path)
+
+    def report(self):
+        """Prints how many mappings were stored and how many dumps reused them."""
+        click.secho(f"Shared mappings: stored {self.stored} ({self.stored_bytes} bytes) in '{self.store_dir}', "
+                    f"reused {self.reused} ({self.reused_bytes} bytes not written again).", fg="green")
+
+def get_library_store(store_dir):
+    """
+    Returns the store of a directory, shared by every dump of this run.
+
+    Args:
+        store_dir (str): The store directory.
+
+    Returns:
+        LibraryStore: The store.
+    """
+    with _stores_lock:
+        key = os.path.abspath(store_dir)
+        if key not in _stores:
+            _stores[key] = LibraryStore(store_dir)
+        return _stores[key]
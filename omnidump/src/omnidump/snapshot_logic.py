@@ -0,0 +1,369 @@
+"""Low-pause consistent snapshots: dump while running, then stop briefly to re-read changed pages."""
+import os
+import re
+import time
+import mmap
+import ctypes
+import signal
+import click
+from . import pid_mapping_logic
+from . import pipeline_logic
+from .config_pid import CliAppConfig
+
+PAGE_SIZE = mmap.PAGESIZE
+SOFT_DIRTY_BIT = 1 << 55
+STOP_TIMEOUT = 2.0
+# Bit 55 of a little-endian pagemap entry is the top bit of its seventh byte.
+DIRTY_BYTE_TABLE = bytes(1 if value & 0x80 else 0 for value in range(256))
+DIRTY_RUN_PATTERN = re.compile(b"\x01+")
+# Outputs computed from the saved image after the pause instead of from live memory.
+IMAGE_SINK_TYPES = (pipeline_logic.StringsSink, pipeline_logic.DedupeStringsSink, pipeline_logic.TopStringsSink,
+                    pipeline_logic.HashSink, pipeline_logic.ContentStatsSink, pipeline_logic.PageMapSink)
+
+def soft_dirty_supported():
+    """
+    Checks whether the kernel tracks soft-dirty bits in /proc/PID/pagemap.
+
+    A freshly written anonymous page is always soft-dirty on kernels built with
+    CONFIG_MEM_SOFT_DIRTY, so the probe maps one page, touches it and reads its
+    pagemap entry.
+
+    Returns:
+        bool: True if soft-dirty tracking is available.
+    """
+    probe = mmap.mmap(-1, PAGE_SIZE)
+    try:
+        probe[0] = 1
+        probe_buffer = ctypes.c_char.from_buffer(probe)
+        address = ctypes.addressof(probe_buffer)
+        del probe_buffer
+        with open("/proc/self/pagemap", "rb") as pagemap:
+            pagemap.seek((address // PAGE_SIZE) * 8)
+            entry = int.from_bytes(pagemap.read(8), "little")
+    except OSError:
+        return False
+    finally:
+        probe.close()
+    return bool(entry & SOFT_DIRTY_BIT)
+
+def clear_soft_dirty(pid):
+    """
+    Clears the soft-dirty bits of every page in a process.
+
+    Args:
+        pid (int): The target process ID.
+
+    Returns:
+        bool: True if the bits were cleared.
+    """
+    try:
+        with open(f"/proc/{pid}/clear_refs", "w") as clear_refs:
+            clear_refs.write("4")
+    except OSError:
+        return False
+    return True
+
+def read_stat_state(stat_path):
+    """Returns the single-letter state from a /proc stat file."""
+    with open(stat_path, "r") as stat_file:
+        stat = stat_file.read()
+    # The command name may contain spaces or parentheses, so split after the last ')'.
+    return stat[stat.rindex(")") + 2]
+
+def get_process_state(pid):
+    """
+    Returns the single-letter state of a process from /proc/PID/stat.
+
+    Args:
+        pid (int): The target process ID.
+
+    Returns:
+        str: The state letter (R, S, T, etc.).
+    """
+    return read_stat_state(f"/proc/{pid}/stat")
+
+def get_thread_states(pid):
+    """
+    Returns the single-letter state of every thread of a process from /proc/PID/task/*/stat.
+
+    Threads that exit while they are listed are left out.
+
+    Args:
+        pid (int): The target process ID.
+
+    Returns:
+        list of str: One state letter per thread.
+    """
+    states = []
+    for tid in os.listdir(f"/proc/{pid}/task"):
+        try:
+            states.append(read_stat_state(f"/proc/{pid}/task/{tid}/stat"))
+        except FileNotFoundError:
+            continue
+    return states
+
+def is_stopped(states):
+    """Tells whether every thread state is stopped (T) or traced (t)."""
+    return all(state in ("T", "t") for state in states)
+
+def stop_process(pid):
+    """
+    Stops a process with SIGSTOP and waits until the kernel reports every thread stopped.
+
+    SIGSTOP stops the threads of a process one by one, so the state of each
+    thread in /proc/PID/task is polled, not only the state of the main thread.
+    If the process does not stop within STOP_TIMEOUT, or the wait is
+    interrupted, it is resumed with SIGCONT before the error is raised.
+
+    Args:
+        pid (int): The target process ID.
+
+    Returns:
+        bool: True if the process was already stopped before this call.
+
+    Raises:
+        TimeoutError: If the process did not stop in time.
+    """
+    if is_stopped(get_thread_states(pid)):
+        return True
+
+    os.kill(pid, signal.SIGSTOP)
+    try:
+        deadline = time.monotonic() + STOP_TIMEOUT
+        while not is_stopped(get_thread_states(pid)):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"PID {pid} did not stop within {STOP_TIMEOUT}s")
+            time.sleep(0.0005)
+    except BaseException:
+        resume_process(pid)
+        raise
+    return False
+
+def resume_process(pid):
+    """
+    Resumes a process stopped by stop_process.
+
+    Args:
+        pid (int): The target process ID.
+    """
+    try:
+        os.kill(pid, signal.SIGCONT)
+    except ProcessLookupError:
+        pass
+
+def get_dirty_page_runs(pagemap, start, end):
+    """
+    Finds the soft-dirty pages of a region and coalesces them into runs.
+
+    Args:
+        pagemap (file object): The open /proc/PID/pagemap file handle.
+        start (int): The starting address of the region.
+        end (int): The ending address of the region.
+
+    The entries are scanned in bulk: the byte holding the soft-dirty bit of
+    every entry is sliced out, mapped to 0/1 with bytes.translate, and runs of
+    ones are found with a regex, so no Python code runs per page.
+
+    Returns:
+        list of tuple: (run_start, run_end) address ranges of dirty pages.
+    """
+    first_page = start // PAGE_SIZE
+    page_count = (end - start + PAGE_SIZE - 1) // PAGE_SIZE
+
+    pagemap.seek(first_page * 8)
+    dirty_flags = pagemap.read(page_count * 8)[6::8].translate(DIRTY_BYTE_TABLE)
+
+    runs = []
+    for match in DIRTY_RUN_PATTERN.finditer(dirty_flags):
+        run_start = (first_page + match.start()) * PAGE_SIZE
+        run_end = (first_page + match.end()) * PAGE_SIZE
+        runs.append((max(run_start, start), min(run_end, end)))
+    return runs
+
+def refresh_region_file(mem_fd, full_file_path, start, runs):
+    """
+    Re-reads address runs from memory and patches them into a saved region file.
+
+    Args:
+        mem_fd (int): The open /proc/PID/mem file descriptor.
+        full_file_path (str): The region's binary file from the first pass.
+        start (int): The starting address of the region.
+        runs (list of tuple): (run_start, run_end) address ranges to re-read.
+
+    Returns:
+        int: The number of bytes re-read.
+    """
+    refreshed = 0
+    with open(full_file_path, "r+b") as bin_file:
+        for run_start, run_end in runs:
+            try:
+                chunk = os.pread(mem_fd, run_end - run_start, run_start)
+            except OSError as e:
+                click.secho(f"Could not re-read {hex(run_start)}-{hex(run_end)}: {e}", fg="yellow")
+                continue
+            bin_file.seek(run_start - start)
+            bin_file.write(chunk)
+            refreshed += len(chunk)
+    return refreshed
+
+def get_region_file_path(save_dir, section_name, start, end):
+    """Returns the path the first pass saves a region to."""
+    return os.path.join(save_dir, section_name, f"region-{hex(start)}-{hex(end)}.bin")
+
+def get_saved_regions(input_dict, sections_to_save, save_dir):
+    """
+    Indexes the regions saved by the first pass.
+
+    Args:
+        input_dict (dict): Dictionary of categorized memory regions.
+        sections_to_save (list of str): Section names that were saved.
+        save_dir (str): The parent directory of the section directories.
+
+    Returns:
+        dict: {start: (end, permissions, full_file_path)} for each saved region.
+    """
+    saved_regions = {}
+    for region in pipeline_logic.iter_readable_regions(input_dict, sections_to_save):
+        full_file_path = get_region_file_path(save_dir, region.section_name, region.start, region.end)
+        if os.path.exists(full_file_path):
+            saved_regions[region.start] = (region.end, region.permissions, full_file_path)
+    return saved_regions
+
+def plan_region_refresh(region, saved, pagemap, use_soft_dirty):
+    """
+    Decides which address runs of a region must be read during the pause.
+
+    Read-only mappings cannot change while the target runs, so only regions
+    that are (or were) writable are re-read. A region that is new, or the part
+    of a region that grew, is read in full.
+
+    Args:
+        region (RegionInfo): The region as mapped while the target is stopped.
+        saved (tuple or None): (end, permissions, full_file_path) from the first pass.
+        pagemap (file object): The open /proc/PID/pagemap file handle.
+        use_soft_dirty (bool): If True, only soft-dirty pages of saved ranges are re-read.
+
+    Returns:
+        list of tuple: (run_start, run_end) address ranges to read.
+    """
+    if saved is None:
+        return [(region.start, region.end)]
+
+    old_end, old_permissions, _ = saved
+    kept_end = min(old_end, region.end)
+    runs = []
+    if "w" in region.permissions or "w" in old_permissions:
+        if use_soft_dirty:
+            runs.extend(get_dirty_page_runs(pagemap, region.start, kept_end))
+        else:
+            runs.append((region.start, kept_end))
+    if region.end > old_end:
+        runs.append((old_end, region.end))
+    return runs
+
+def refresh_saved_regions(pid, mem_path, saved_regions, sections_to_save, save_dir, use_soft_dirty):
+    """
+    Stops the target, brings the saved image up to date with its memory and resumes it.
+
+    While the target is stopped its maps are parsed again, so regions mapped
+    or grown since the first pass are read in full, regions that shrank are
+    truncated and regions that were unmapped are deleted. Changed pages of the
+    remaining writable regions are re-read and patched into the saved files.
+    The target is resumed on every exit path once SIGSTOP has been sent.
+
+    Args:
+        pid (int): The target process ID.
+        mem_path (str): Path to the /proc/PID/mem file.
+        saved_regions (dict): {start: (end, permissions, full_file_path)} from get_saved_regions.
+        sections_to_save (list of str): Section names that were saved.
+        save_dir (str): The parent directory of the section directories.
+        use_soft_dirty (bool): If True, only soft-dirty pages are re-read,
+                               otherwise every saved writable page is re-read.
+
+    Returns:
+        tuple: (pause_seconds, refreshed_bytes, remapped_regions) where remapped_regions
+               counts the regions that were added, resized or removed.
+    """
+    refreshed = 0
+    remapped = 0
+    saved_regions = dict(saved_regions)
+    mem_fd = os.open(mem_path, os.O_RDONLY)
+    try:
+        with open(f"/proc/{pid}/pagemap", "rb") as pagemap:
+            # The pause is timed from the SIGSTOP, including the wait for every thread to stop.
+            pause_start = time.perf_counter()
+            was_stopped = stop_process(pid)
+            try:
+                input_dict = pid_mapping_logic.group_regions(f"/proc/{pid}/maps") or {}
+                for region in pipeline_logic.iter_readable_regions(input_dict, sections_to_save):
+                    saved = saved_regions.pop(region.start, None)
+                    runs = plan_region_refresh(region, saved, pagemap, use_soft_dirty)
+                    full_file_path = get_region_file_path(save_dir, region.section_name, region.start, region.end)
+                    if saved is None:
+                        os.makedirs(os.path.dirname(full_file_path), exist_ok=True)
+                        open(full_file_path, "wb").close()
+                        remapped += 1
+                    elif saved[2] != full_file_path:
+                        os.makedirs(os.path.dirname(full_file_path), exist_ok=True)
+                        os.replace(saved[2], full_file_path)
+                        remapped += 1
+                    os.truncate(full_file_path, region.size)
+                    refreshed += refresh_region_file(mem_fd, full_file_path, region.start, runs)
+
+                for _, _, full_file_path in saved_regions.values():
+                    os.remove(full_file_path)
+                    remapped += 1
+            finally:
+                if not was_stopped:
+                    resume_process(pid)
+                pause = time.perf_counter() - pause_start
+    finally:
+        os.close(mem_fd)
+    return (pause, refreshed, remapped)
+
+def snapshot_dump(mem_path, input_dict, config: CliAppConfig):
+    """
+    Saves the selected sections as a consistent snapshot with a short stop-the-world window.
+
+    The first pass saves every region while the target keeps running. The
+    target is then stopped, its mappings are re-read, only the pages written
+    since the first pass began (tracked with soft-dirty bits) and any new or
+    grown ranges are read and patched into the saved files, and the target is
+    resumed.
+
+    Strings, deduplicated strings, hashes, content statistics and page maps
+    requested alongside the snapshot are then produced from the saved image,
+    so they match the .bin files.
+
+    Args:
+        mem_path (str): Path to the /proc/PID/mem file.
+        input_dict (dict): Dictionary of categorized memory regions.
+        config (CliAppConfig): The dump configuration (flag_sec_log, save_dir, pid).
+    """
+    section_flag_dict = {flag: True for flag in config.section_flags_active()}
+    sections_to_save = pipeline_logic.get_sections_from_flags(section_flag_dict)
+
+    use_soft_dirty = soft_dirty_supported() and clear_soft_dirty(config.pid)
+    if not use_soft_dirty:
+        click.secho("Soft-dirty tracking is unavailable; every writable region will be re-read while the process is stopped.", fg="yellow")
+
+    first_pass_start = time.perf_counter()
+    pid_mapping_logic.format_output_bytes_section_log(mem_path, input_dict, section_flag_dict, config)
+    first_pass = time.perf_counter() - first_pass_start
+
+    saved_regions = get_saved_regions(input_dict, sections_to_save, config.save_dir)
+    try:
+        pause, refreshed, remapped = refresh_saved_regions(config.pid, mem_path, saved_regions, sections_to_save,
+                                                           config.save_dir, use_soft_dirty)
+    except (OSError, TimeoutError) as e:
+        click.secho(f"Could not complete the snapshot pause for PID {config.pid}: {e}", fg="red")
+        return
+
+    click.secho(f"Snapshot of PID {config.pid}: first pass {first_pass:.3f}s, "
+                f"paused for {pause * 1000:.3f}ms, re-read {refreshed} byte(s) "
+                f"({refreshed // PAGE_SIZE} page(s)), {remapped} region(s) mapped, resized or unmapped "
+                f"since the first pass.", fg="green")
+
+    image_sinks = [sink for sink in pipeline_logic.build_sinks(config) if isinstance(sink, IMAGE_SINK_TYPES)]
+    if image_sinks:
+        pipeline_logic.run_saved_region_pipeline(config.save_dir, sections_to_save, image_sinks, input_dict)
@@ -0,0 +1,121 @@
+"""Per-region content statistics: zero and printable ratios, Shannon entropy and a byte histogram."""
+import collections
+import json
+import math
+import os
+import click
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Same byte set as strings_logic.PRINTABLE_CLASS.
+PRINTABLE_BYTES = b"\t\n\x0b\x0c\r" + bytes(range(0x20, 0x7f))
+STATS_FILE_NAME = "stats.json"
+
+def get_entropy(histogram, total):
+    """
+    Computes the Shannon entropy of a byte histogram.
+
+    Args:
+        histogram (list of int): The count of each byte value.
+        total (int): The number of bytes counted.
+
+    Returns:
+        float: The entropy in bits per byte, from 0.0 to 8.0.
+    """
+    if not total:
+        return 0.0
+    return max(-sum(count / total * math.log2(count / total) for count in histogram if count), 0.0)
+
+class RegionStats:
+    """
+    Accumulates the content statistics of a region over its chunks.
+
+    With NumPy the byte histogram is a single bincount per chunk. Without it,
+    zero and printable bytes are still counted with bytes.count and
+    bytes.translate, and the histogram falls back to collections.Counter,
+    which is several times slower.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.zero_count = 0
+        self.printable_count = 0
+        self.counts = numpy.zeros(256, dtype=numpy.int64) if numpy is not None else collections.Counter()
+
+    def update(self, chunk):
+        """
+        Adds a chunk of the region.
+
+        Args:
+            chunk (bytes): The chunk data.
+        """
+        self.size += len(chunk)
+        if numpy is not None:
+            self.counts += numpy.bincount(numpy.frombuffer(chunk, dtype=numpy.uint8), minlength=256)
+        else:
+            self.zero_count += chunk.count(0)
+            self.printable_count += len(chunk) - len(chunk.translate(None, PRINTABLE_BYTES))
+            self.counts.update(chunk)
+
+    @property
+    def histogram(self):
+        """Returns the count of each byte value as a list of 256 ints."""
+        if numpy is not None:
+            return self.counts.tolist()
+        return [self.counts[value] for value in range(256)]
+
+    def summary(self):
+        """
+        Returns the statistics of the bytes added so far.
+
+        Returns:
+            dict: size, zero_ratio, printable_ratio, entropy and histogram.
+        """
+        histogram = self.histogram
+        if numpy is not None:
+            zero_count = histogram[0]
+            printable_count = sum(histogram[value] for value in PRINTABLE_BYTES)
+        else:
+            zero_count, printable_count = self.zero_count, self.printable_count
+        size = max(self.size, 1)
+        return {
+            "size": self.size,
+            "zero_ratio": round(zero_count / size, 6),
+            "printable_ratio": round(printable_count / size, 6),
+            "entropy": round(get_entropy(histogram, self.size), 6),
+            "histogram": histogram,
+        }
+
+def format_stats(summary):
+    """
+    Formats region statistics for the '--verbose' output.
+
+    Args:
+        summary (dict): The result of RegionStats.summary.
+
+    Returns:
+        str: e.g. 'Entropy: 7.99 bits/byte, Zero: 0.4%, Printable: 37.1% (of 4096 bytes)'.
+    """
+    return (f"Entropy: {summary['entropy']:.2f} bits/byte, Zero: {summary['zero_ratio']:.1%}, "
+            f"Printable: {summary['printable_ratio']:.1%} (of {summary['size']} bytes)")
+
+def save_stats_file(save_dir, regions):
+    """
+    Writes the statistics of every region to save_dir/stats.json.
+
+    Args:
+        save_dir (str): The directory the file is written to.
+        regions (list of dict): One entry per region, with its address, section, path and statistics.
+    """
+    full_file_path = os.path.join(save_dir, STATS_FILE_NAME)
+    try:
+        os.makedirs(save_dir, exist_ok=True)
+        with open(full_file_path, "w") as stats_file:
+            json.dump({"regions": regions}, stats_file)
+    except OSError as e:
+        click.secho(f"Could not write stats to file: {e}")
+        return
+    click.secho(f"Successfully saved stats for {len(regions)} region(s) to '{full_file_path}'.", fg="green")
@@ -0,0 +1,313 @@
+"""Streaming string extraction over chunked memory reads."""
+import mmap
+import random
+import re
+from .config_pid import CliAppConfig
+
+DEFAULT_MIN_LENGTH = 4
+STRINGS_BUFFER_SIZE = 1 << 20
+# Same byte set as string.printable: 0x20-0x7e plus \t \n \x0b \x0c \r.
+PRINTABLE_CLASS = rb"[\t\n\x0b\x0c\r\x20-\x7e]"
+# Printable ASCII plus every Unicode scalar value except C0/C1 controls and surrogates.
+UTF8_PRINTABLE_CLASS = "[\\t\\n\\x0b\\x0c\\r\\x20-\\x7e\\xa0-\\ud7ff\\ue000-\\U0010ffff]"
+ENCODINGS = ("ascii", "utf8", "utf16le", "all")
+# Most bytes a single character can take in each mode.
+CHAR_BYTES = {"ascii": 1, "utf8": 4, "utf16le": 2, "all": 2}
+SAMPLE_MODES = ("first", "reservoir", "stride")
+DEFAULT_SAMPLE_COUNT = 3
+PAGE_SIZE = mmap.PAGESIZE
+# Keeps every string on a single line of the strings log.
+LINE_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\x0b": "\\x0b", "\x0c": "\\x0c"})
+
+def get_min_length(config: CliAppConfig):
+    """
+    Returns the minimum string length for a configuration.
+
+    Args:
+        config (CliAppConfig): The dump configuration.
+
+    Returns:
+        int: config.length_out, or 4 when it is not set.
+    """
+    return config.length_out if config.length_out else DEFAULT_MIN_LENGTH
+
+def get_encoding(config: CliAppConfig):
+    """
+    Returns the string encoding mode for a configuration.
+
+    Args:
+        config (CliAppConfig): The dump configuration.
+
+    Returns:
+        str: config.encoding, or 'ascii' when it is not set.
+    """
+    return config.encoding if config.encoding else "ascii"
+
+def format_string_line(address, text, encoding=None):
+    """
+    Formats one line of a strings log.
+
+    The address is zero-padded so lines sort correctly with 'sort', and
+    whitespace control characters in the string are escaped.
+
+    Args:
+        address (int): The virtual address of the string.
+        text (str): The string.
+        encoding (str, optional): If given, written as a column between the address and the string.
+
+    Returns:
+        str: 'ADDRESS<TAB>STRING' (or 'ADDRESS<TAB>ENCODING<TAB>STRING') followed by a newline.
+    """
+    if encoding is None:
+        return f"{address:#018x}\t{text.translate(LINE_ESCAPES)}\n"
+    return f"{address:#018x}\t{encoding}\t{text.translate(LINE_ESCAPES)}\n"
+
+def compile_strings_pattern(min_length, encoding="ascii"):
+    """
+    Compiles the bytes pattern that matches printable runs of a minimum length.
+
+    In 'all' mode ASCII and UTF-16LE strings are found in the same pass: both
+    alternatives start after a shared printable character, so the wide
+    alternative costs one byte comparison wherever a string could begin.
+
+    In 'utf8' mode the pattern is a str pattern, applied to the decoded buffer
+    by iter_string_matches, so the minimum length counts code points.
+
+    Args:
+        min_length (int): The minimum number of characters.
+        encoding (str): 'ascii', 'utf8', 'utf16le' or 'all'.
+
+    Returns:
+        re.Pattern: The compiled pattern.
+    """
+    if encoding == "utf8":
+        return re.compile(UTF8_PRINTABLE_CLASS + "{%d,}" % min_length)
+    if encoding == "ascii":
+        return re.compile(PRINTABLE_CLASS + b"{%d,}" % min_length)
+    if encoding == "utf16le":
+        return re.compile(b"(?:" + PRINTABLE_CLASS + b"\\x00){%d,}" % min_length)
+    rest = max(min_length - 1, 0)
+    wide = b"\\x00(?:" + PRINTABLE_CLASS + b"\\x00){%d,}" % rest
+    narrow = PRINTABLE_CLASS + b"{%d,}" % rest
+    return re.compile(PRINTABLE_CLASS + b"(?:" + wide + b"|" + narrow + b")")
+
+def decode_string(raw):
+    """
+    Decodes a match of compile_strings_pattern and identifies its encoding.
+
+    A printable ASCII character is never zero, so a zero second byte marks a wide string.
+
+    Args:
+        raw (bytes): The matched bytes.
+
+    Returns:
+        tuple: (string, encoding)
+    """
+    if raw[1:2] == b"\x00":
+        return (raw.decode("utf-16-le"), "utf16le")
+    return (raw.decode("ascii"), "ascii")
+
+def iter_utf8_matches(data, pattern):
+    """
+    Finds UTF-8 strings in a buffer.
+
+    The whole buffer is validated by one decode, which maps every byte that is
+    not part of a valid sequence to a lone surrogate. The surrogates are outside
+    the pattern's character class, so invalid bytes end strings just like
+    non-printable ones. Byte offsets are recovered by re-encoding only the text
+    between matches.
+
+    Args:
+        data (bytes): The buffer.
+        pattern (re.Pattern): A 'utf8' pattern from compile_strings_pattern.
+
+    Yields:
+        tuple: (start, end, string, encoding) with byte offsets into data. The
+               encoding is 'ascii' for strings without multibyte characters.
+    """
+    text = data.decode("utf-8", "surrogateescape")
+    position = 0
+    offset = 0
+    for match in pattern.finditer(text):
+        offset += len(text[position:match.start()].encode("utf-8", "surrogateescape"))
+        string = match.group()
+        end = offset + len(string.encode("utf-8"))
+        yield (offset, end, string, "ascii" if string.isascii() else "utf8")
+        offset = end
+        position = match.end()
+
+def iter_string_matches(data, pattern, encoding):
+    """
+    Finds strings in a buffer.
+
+    Args:
+        data (bytes): The buffer.
+        pattern (re.Pattern): The pattern from compile_strings_pattern.
+        encoding (str): The encoding mode the pattern was compiled for.
+
+    Yields:
+        tuple: (start, end, string, encoding) with byte offsets into data.
+    """
+    if encoding == "utf8":
+        yield from iter_utf8_matches(data, pattern)
+        return
+    for match in pattern.finditer(data):
+        yield (match.start(), match.end(), *decode_string(match.group()))
+
+class StringScanner:
+    """
+    Finds strings in a stream of chunks without splitting strings at chunk boundaries.
+
+    A string that touches the end of a chunk is held back and re-scanned
+    together with the next chunk, as are the last few bytes that could still
+    begin a string, so results are identical to scanning the whole region at once.
+
+    Args:
+        config (CliAppConfig): Provides length_out, the minimum string length,
+                               and encoding.
+    """
+
+    def __init__(self, config: CliAppConfig):
+        self.min_length = get_min_length(config)
+        self.encoding = get_encoding(config)
+        self.pattern = compile_strings_pattern(self.min_length, self.encoding)
+        # A string ending within the last character's worth of bytes may still grow:
+        # a wide character may be missing its zero byte, a UTF-8 sequence its continuation bytes.
+        self.char_bytes = CHAR_BYTES[self.encoding]
+        self.tail_bytes = self.min_length * self.char_bytes
+        self.carry = b""
+        self.carry_address = 0
+
+    def reset(self):
+        """Discards any carried bytes before scanning a new region."""
+        self.carry = b""
+        self.carry_address = 0
+
+    def feed(self, chunk, address):
+        """
+        Scans the next chunk of a region.
+
+        Args:
+            chunk (bytes): The chunk data.
+            address (int): The virtual address of the first byte of the chunk.
+
+        Yields:
+            tuple: (address, string, encoding) for each complete string found.
+        """
+        if self.carry:
+            data = self.carry + chunk
+            base = self.carry_address
+        else:
+            data = chunk
+            base = address
+
+        hold_from = len(data) - self.char_bytes
+        keep_from = max(len(data) - self.tail_bytes, 0)
+        for start, end, text, encoding in iter_string_matches(data, self.pattern, self.encoding):
+            if end > hold_from:
+                keep_from = start
+                break
+            keep_from = max(keep_from, end)
+            yield (base + start, text, encoding)
+
+        self.carry = data[keep_from:]
+        self.carry_address = base + keep_from
+
+    def flush(self):
+        """
+        Finishes the current region.
+
+        Yields:
+            tuple: (address, string, encoding) for a string that ran to the end of the region.
+        """
+        carry, carry_address = self.carry, self.carry_address
+        self.reset()
+        for start, _, text, encoding in iter_string_matches(carry, self.pattern, self.encoding):
+            yield (carry_address + start, text, encoding)
+
+class StringSampler:
+    """
+    Picks the strings shown in a region preview.
+
+    In 'first' mode the first sample_count strings are kept and is_full tells
+    the caller it can stop scanning. In 'reservoir' mode every string is offered
+    and a uniform sample of sample_count is kept in one pass (Algorithm R), so
+    the preview covers the whole region, not just its start. Samples are
+    returned in the order they were found.
+
+    Args:
+        sample_count (int): The number of strings to keep.
+        mode (str): 'first' or 'reservoir'.
+        seed (int, optional): Seeds the reservoir, so a region gives the same preview on every run.
+    """
+
+    def __init__(self, sample_count=DEFAULT_SAMPLE_COUNT, mode="first", seed=None):
+        self.sample_count = sample_count
+        self.mode = mode
+        self.rng = random.Random(seed)
+        self.samples = []
+        self.seen = 0
+
+    @property
+    def is_full(self) -> bool:
+        """Returns True when no later string can change the sample."""
+        return self.mode == "first" and len(self.samples) >= self.sample_count
+
+    def add(self, text):
+        """
+        Offers one string to the sample.
+
+        Args:
+            text (str): The string.
+        """
+        if len(self.samples) < self.sample_count:
+            self.samples.append((self.seen, text))
+        elif self.mode == "reservoir":
+            slot = self.rng.randrange(self.seen + 1)
+            if slot < self.sample_count:
+                self.samples[slot] = (self.seen, text)
+        self.seen += 1
+
+    def result(self):
+        """
+        Returns the sampled strings.
+
+        Returns:
+            list of str: The samples in the order they were found.
+        """
+        return [text for _, text in sorted(self.samples)]
+
+def get_stride_offsets(size, sample_count, page_size=PAGE_SIZE):
+    """
+    Returns the offsets of the pages read for a 'stride' preview.
+
+    Every Nth page of the region is read, with N chosen so sample_count pages
+    are spread evenly over it.
+
+    Args:
+        size (int): The region size in bytes.
+        sample_count (int): The number of pages to read.
+        page_size (int, optional): The page size.
+
+    Returns:
+        list of int: Page-aligned offsets into the region.
+    """
+    pages = -(-size // page_size)
+    stride = max(pages // sample_count, 1)
+    return [page * page_size for page in range(0, pages, stride)][:sample_count]
+
+def get_first_string(data, pattern, encoding):
+    """
+    Returns the first string of a buffer, e.g. of one page read for a 'stride' preview.
+
+    Args:
+        data (bytes): The buffer.
+        pattern (re.Pattern): The pattern from compile_strings_pattern.
+        encoding (str): The encoding mode the pattern was compiled for.
+
+    Returns:
+        str or None: The first string, or None if the buffer holds none.
+    """
+    for _, _, text, _ in iter_string_matches(data, pattern, encoding):
+        return text
+    return None
@@ -0,0 +1,250 @@
+"""Pointer chasing: follows linked lists and trees in another process through a batched, prefetching page cache."""
+import bisect
+import collections
+from dataclasses import dataclass
+from .remote_read_logic import read_ranges
+from .sample_logic import build_region_index
+
+PAGE_SIZE = 4096
+PAGE_MASK = ~(PAGE_SIZE - 1)
+WORD_SIZE = 8
+DEFAULT_CACHE_PAGES = 4096
+DEFAULT_PREFETCH = 1
+DEFAULT_MAX_NODES = 1000000
+
+def get_readable_ranges(input_dict):
+    """
+    Lists the readable regions of a process, merged where they touch.
+
+    Args:
+        input_dict (dict): Dictionary of categorized memory regions from group_regions.
+
+    Returns:
+        list of tuple: (start, end) ranges sorted by start.
+    """
+    ranges = []
+    for start, end, permissions, _, _ in build_region_index(input_dict):
+        if "r" not in permissions or end <= start:
+            continue
+        if ranges and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], end)
+        else:
+            ranges.append((start, end))
+    return ranges
+
+class PageCache:
+    """
+    An LRU cache of the pages of another process.
+
+    Missing pages are read in one batch per load: the requested pages plus
+    up to 'prefetch' readable neighbours on each side, merged into
+    contiguous ranges and read with a single process_vm_readv call (pread on
+    /proc/PID/mem where it is not available). Pages that cannot be read are
+    cached as None, so they are not read again.
+
+    Args:
+        pid (int): The target process ID.
+        mem_fd (int): An open /proc/PID/mem descriptor used for the fallback.
+        readable_ranges (list of tuple): (start, end) ranges from get_readable_ranges.
+        capacity (int, optional): The number of pages kept.
+        prefetch (int, optional): The neighbouring pages read on each side of a missing page.
+    """
+
+    def __init__(self, pid, mem_fd, readable_ranges, capacity=DEFAULT_CACHE_PAGES, prefetch=DEFAULT_PREFETCH):
+        self.pid = pid
+        self.mem_fd = mem_fd
+        self.readable_ranges = readable_ranges
+        self.range_starts = [start for start, _ in readable_ranges]
+        self.capacity = capacity
+        self.prefetch = prefetch
+        self.pages = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+        self.pages_read = 0
+
+    def is_readable(self, address, size=1):
+        """Tells whether address to address + size lies inside one readable region."""
+        position = bisect.bisect_right(self.range_starts, address) - 1
+        return position >= 0 and address + size <= self.readable_ranges[position][1]
+
+    def store(self, page, data):
+        """Caches a page, evicting the least recently used pages beyond the capacity."""
+        self.pages[page] = data
+        self.pages.move_to_end(page)
+        while len(self.pages) > self.capacity:
+            self.pages.popitem(last=False)
+
+    def load(self, ranges):
+        """
+        Reads the missing pages of a set of ranges, and their neighbours, in one batch.
+
+        Args:
+            ranges (list of tuple): (address, size) ranges about to be read.
+        """
+        wanted = set()
+        for address, size in ranges:
+            for page in range(address & PAGE_MASK, address + size, PAGE_SIZE):
+                if page not in self.pages:
+                    wanted.add(page)
+        for page in list(wanted):
+            for step in range(1, self.prefetch + 1):
+                for neighbour in (page - step * PAGE_SIZE, page + step * PAGE_SIZE):
+                    if neighbour not in self.pages and self.is_readable(neighbour, PAGE_SIZE):
+                        wanted.add(neighbour)
+        if not wanted:
+            return
+
+        batch = []
+        for page in sorted(wanted):
+            if not self.is_readable(page, PAGE_SIZE):
+                self.store(page, None)
+            elif batch and batch[-1][0] + batch[-1][1] == page:
+                batch[-1] = (batch[-1][0], batch[-1][1] + PAGE_SIZE)
+            else:
+                batch.append((page, PAGE_SIZE))
+        if not batch:
+            return
+        try:
+            chunks = read_ranges(self.pid, batch, self.mem_fd)
+        except OSError:
+            # One unreadable range fails the whole batch: retry each range on its own.
+            chunks = []
+            for read_range in batch:
+                try:
+                    chunks.extend(read_ranges(self.pid, [read_range], self.mem_fd))
+                except OSError:
+                    chunks.append(None)
+        self.batches += 1
+        for (start, size), chunk in zip(batch, chunks):
+            for offset in range(0, size, PAGE_SIZE):
+                self.store(start + offset, None if chunk is None else chunk[offset:offset + PAGE_SIZE])
+                self.pages_read += chunk is not None
+
+    def read(self, address, size):
+        """
+        Reads bytes of the process through the cache.
+
+        Args:
+            address (int): The first address.
+            size (int): The number of bytes.
+
+        Returns:
+            bytes or None: The bytes, or None if any of their pages cannot be read.
+        """
+        pages = range(address & PAGE_MASK, address + size, PAGE_SIZE)
+        if any(page not in self.pages for page in pages):
+            self.misses += 1
+            self.load([(address, size)])
+        else:
+            self.hits += 1
+        data = []
+        for page in pages:
+            page_data = self.pages.get(page)
+            if page_data is None:
+                return None
+            self.pages.move_to_end(page)
+            data.append(page_data)
+        offset = address - pages[0]
+        return b"".join(data)[offset:offset + size]
+
+    def read_word(self, address):
+        """Reads a little-endian 8-byte word, or returns None if it cannot be read."""
+        data = self.read(address, WORD_SIZE)
+        return None if data is None else int.from_bytes(data, "little")
+
+@dataclass
+class WalkNode:
+    """One node visited by a pointer walk."""
+    address: int
+    depth: int
+    # The word at each next offset; None where it could not be read.
+    values: list
+
+class PointerWalker:
+    """
+    Follows pointer chains breadth first from a start address.
+
+    Every node holds a pointer at each of the next offsets: one for a linked
+    list, two or more for a tree. The pointer fields of a whole level are
+    loaded in one batch before they are read, so a tree level costs one
+    batched read, not one per node. Null pointers and pointers outside readable memory
+    end a branch. A pointer back to an ancestor of its node is a cycle; a
+    pointer to any other visited node is a shared node. Neither is followed
+    again.
+
+    Args:
+        cache (PageCache): The page cache of the target process.
+        next_offsets (list of int): The offsets of the pointer fields in each node.
+        max_nodes (int, optional): The walk stops after this many nodes.
+    """
+
+    def __init__(self, cache, next_offsets, max_nodes=DEFAULT_MAX_NODES):
+        self.cache = cache
+        self.next_offsets = list(next_offsets)
+        self.max_nodes = max_nodes
+        self.parents = {}
+        self.cycles = []
+        self.shared = 0
+        self.outside = 0
+        self.truncated = False
+        self.depth = 0
+
+    def is_ancestor(self, address, node):
+        """Tells whether address is node or one of the nodes it was reached from."""
+        while node is not None:
+            if node == address:
+                return True
+            node = self.parents[node]
+        return False
+
+    def walk(self, start):
+        """
+        Walks the nodes reachable from start.
+
+        Args:
+            start (int): The address of the first node.
+
+        Yields:
+            WalkNode: Each visited node, level by level.
+        """
+        self.parents = {start: None}
+        frontier = [start]
+        depth = 0
+        while frontier:
+            self.depth = depth
+            self.cache.load([(address + offset, WORD_SIZE) for address in frontier for offset in self.next_offsets])
+            next_frontier = []
+            for address in frontier:
+                values = [self.cache.read_word(address + offset) for offset in self.next_offsets]
+                yield WalkNode(address, depth, values)
+                for value in values:
+                    if not value:
+                        continue
+                    if value in self.parents:
+                        if self.is_ancestor(value, address):
+                            self.cycles.append((address, value))
+                        else:
+                            self.shared += 1
+                    elif not self.cache.is_readable(value):
+                        self.outside += 1
+                    elif len(self.parents) >= self.max_nodes:
+                        self.truncated = True
+                    else:
+                        self.parents[value] = address
+                        next_frontier.append(value)
+            frontier = next_frontier
+            depth += 1
+
+def format_walk_node(node: WalkNode):
+    """
+    Formats one visited node.
+
+    Args:
+        node (WalkNode): The node.
+
+    Returns:
+        str: 'ADDRESS<TAB>DEPTH<TAB>POINTERS', the pointers comma-separated in offset order, '?' where unreadable.
+    """
+    values = ",".join("?" if value is None else f"{value:#x}" for value in node.values)
+    return f"{node.address:#018x}\t{node.depth}\t{values}"
@@ -0,0 +1,205 @@
+"""Watch mode: report mapping changes of running processes with low overhead."""
+import re
+import time
+import hashlib
+from datetime import datetime
+import click
+from . import pid_mapping_logic
+
+INTERVAL_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m)?\s*$")
+INTERVAL_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, None: 1.0}
+ANON_CATEGORIES = ("anon", "anon_map")
+ROLLUP_FIELDS = ("Rss", "Pss", "Anonymous", "Swap")
+
+def parse_interval(interval):
+    """
+    Parses a watch interval such as '500ms', '2s', '1m' or '1.5'.
+
+    Args:
+        interval (str): The interval text. A bare number is in seconds.
+
+    Returns:
+        float: The interval in seconds.
+
+    Raises:
+        ValueError: If the interval is malformed or not positive.
+    """
+    match = INTERVAL_PATTERN.match(interval)
+    if not match:
+        raise ValueError(f"Invalid interval '{interval}'. Use a value such as 500ms, 2s or 1m.")
+    seconds = float(match.group(1)) * INTERVAL_UNITS[match.group(2)]
+    if seconds <= 0:
+        raise ValueError("The interval must be greater than 0.")
+    return seconds
+
+def index_regions(categorized_regions):
+    """
+    Indexes categorized regions by their start address.
+
+    Args:
+        categorized_regions (dict): The dictionary returned by categorize_regions.
+
+    Returns:
+        dict: {start: (end, category, permissions, path)}
+    """
+    region_index = {}
+    for category, sections in categorized_regions.items():
+        for section in sections:
+            address, permissions, path, _, _ = pid_mapping_logic.get_section_information(section)
+            start, end = [int(x, 16) for x in address.split("-")]
+            region_index[start] = (end, category, permissions, path)
+    return region_index
+
+def diff_region_index(old_index, new_index):
+    """
+    Compares two region indexes and returns the mapping events between them.
+
+    Args:
+        old_index (dict): The previous index from index_regions.
+        new_index (dict): The current index from index_regions.
+
+    Returns:
+        list of tuple: (event, category, start, end, path) sorted by address.
+                       Events are 'mmap', 'anon' (new anonymous region), 'munmap',
+                       'grow', 'shrink' and 'mprotect'.
+    """
+    events = []
+    for start in new_index.keys() - old_index.keys():
+        end, category, _, path = new_index[start]
+        event = "anon" if category in ANON_CATEGORIES else "mmap"
+        events.append((event, category, start, end, path))
+
+    for start in old_index.keys() - new_index.keys():
+        end, category, _, path = old_index[start]
+        events.append(("munmap", category, start, end, path))
+
+    for start in old_index.keys() & new_index.keys():
+        old_end, _, old_permissions, _ = old_index[start]
+        end, category, permissions, path = new_index[start]
+        if end > old_end:
+            events.append(("grow", category, start, end, path))
+        elif end < old_end:
+            events.append(("shrink", category, start, end, path))
+        elif permissions != old_permissions:
+            events.append(("mprotect", category, start, end, f"{old_permissions} -> {permissions} {path}".rstrip()))
+
+    return sorted(events, key=lambda event: event[2])
+
+def read_rollup(pid):
+    """
+    Reads the memory totals of a process from /proc/PID/smaps_rollup.
+
+    Args:
+        pid (int): The process ID.
+
+    Returns:
+        dict: {field: kilobytes} for the fields in ROLLUP_FIELDS.
+    """
+    rollup = {}
+    with open(f"/proc/{pid}/smaps_rollup", "r") as rollup_file:
+        for line in rollup_file:
+            field, _, value = line.partition(":")
+            if field in ROLLUP_FIELDS:
+                rollup[field] = int(value.split()[0])
+    return rollup
+
+def watch_pid_tick(pid, state, rollup=False):
+    """
+    Re-reads the maps of one process and returns the events since the last tick.
+
+    The raw maps content is hashed first; when it is unchanged the process is
+    skipped without parsing or classifying a single line.
+
+    Args:
+        pid (int): The process ID.
+        state (dict): Per-process state kept between ticks ('digest', 'index', 'rollup').
+                      An empty dict records a baseline without reporting events.
+        rollup (bool): If True, also report changes in smaps_rollup totals.
+
+    Returns:
+        list of tuple: (event, category, start, end, path) mapping events, followed
+                       by ('rollup', field, old_kb, new_kb, '') totals that changed.
+
+    Raises:
+        ProcessLookupError: If the process has exited. A zombie still has a
+                            /proc entry but its maps are empty.
+    """
+    with open(f"/proc/{pid}/maps", "rb") as maps_file:
+        content = maps_file.read()
+    if not content:
+        raise ProcessLookupError(f"PID {pid} has no mappings")
+
+    events = []
+    digest = hashlib.blake2b(content, digest_size=16).digest()
+    if digest != state.get("digest"):
+        lines = content.decode("utf-8", errors="replace").splitlines(keepends=True)
+        new_index = index_regions(pid_mapping_logic.categorize_regions(lines))
+        if "index" in state:
+            events.extend(diff_region_index(state["index"], new_index))
+        state["digest"] = digest
+        state["index"] = new_index
+
+    if rollup:
+        new_rollup = read_rollup(pid)
+        old_rollup = state.get("rollup")
+        if old_rollup is not None:
+            for field in ROLLUP_FIELDS:
+                if field in new_rollup and new_rollup[field] != old_rollup.get(field):
+                    events.append(("rollup", field, old_rollup.get(field, 0), new_rollup[field], ""))
+        state["rollup"] = new_rollup
+
+    return events
+
+def print_watch_event(pid, event):
+    """
+    Prints a single watch event with a timestamp.
+
+    Args:
+        pid (int): The process ID.
+        event (tuple): An event returned by watch_pid_tick.
+    """
+    event_colors = {"mmap": "green", "anon": "green", "grow": "yellow", "shrink": "yellow",
+                    "munmap": "red", "mprotect": "blue", "rollup": "white"}
+    timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+    name, category, start, end, path = event
+
+    if name == "rollup":
+        message = f"[{timestamp}] PID {pid} {category}: {start} kB -> {end} kB ({end - start:+d} kB)"
+    else:
+        message = f"[{timestamp}] PID {pid} {name} {category} ({hex(start)}-{hex(end)}) {end - start} bytes {path}".rstrip()
+    click.secho(message, fg=event_colors.get(name, "white"))
+
+def run_watch(pids, interval, rollup=False, count=None):
+    """
+    Watches the maps of one or more processes on a fixed interval.
+
+    Args:
+        pids (list of int): The process IDs to watch.
+        interval (float): Seconds between ticks.
+        rollup (bool): If True, also report smaps_rollup total changes.
+        count (int, optional): Number of ticks after the baseline. Runs until
+                               every process exits when not provided.
+    """
+    states = {pid: {} for pid in pids}
+    tick = 0
+    next_tick = time.monotonic()
+    while states and (count is None or tick <= count):
+        for pid in list(states):
+            try:
+                for event in watch_pid_tick(pid, states[pid], rollup):
+                    print_watch_event(pid, event)
+            except (FileNotFoundError, ProcessLookupError):
+                click.secho(f"PID {pid} exited.", fg="red")
+                del states[pid]
+            except PermissionError:
+                click.secho(f"Permission denied for PID {pid}. Please run as sudo.", fg="red")
+                del states[pid]
+
+        tick += 1
+        next_tick += interval
+        delay = next_tick - time.monotonic()
+        if delay > 0 and states and (count is None or tick <= count):
+            time.sleep(delay)
+        elif delay <= 0:
+            # Fell behind: realign instead of firing a burst of catch-up ticks.
+            next_tick = time.monotonic()
@@ -1,14 +1,26 @@
 from unittest import mock 
 from datetime import datetime
+import array
+import ctypes
+import io
+import random
+import sqlite3
+import struct
 import subprocess
 import sys
 import time
+import zipfile
+import zlib
 import pytest
 import os
 import psutil
 from omnidump.pid_mapping_logic import get_section_information, get_strings_from_bytes, save_memory_none_bin_read, save_memory_none_seek_read, save_memory_strings_read_bin, process_lines, categorize_regions, save_memory_sections 
 from click.testing import CliRunner
 from omnidump.config_pid import CliAppConfig
+from omnidump.snapshot_logic import SOFT_DIRTY_BIT
+from omnidump.key_scan_logic import expand_aes_key, swap_words
+from omnidump.pid_mapping_logic import group_regions
+from omnidump.walk_logic import PageCache, get_readable_ranges
 
 '''
 --- Mock Data Fixture ---
@@ -421,12 +433,12 @@ def mock_sms_config(mock_output_path):
 
 @pytest.fixture 
 def mock_smsw_log_string(mock_smsw_strings_list):
-    final_string = f"\n--Extracted Strings --\n {mock_smsw_strings_list}" 
-    return final_string
+    log_lines = ["0x0000000040000000\ta\\tb\n", "0x0000000040000010\tc\\nd\n"]
+    return log_lines
 
 @pytest.fixture
 def mock_smsw_strings_list():
-    strings_list = ['a', 'b']
+    strings_list = [(0x40000000, 'a\tb', 'ascii'), (0x40000010, 'c\nd', 'ascii')]
     return strings_list
 
 @pytest.fixture
@@ -755,6 +767,11 @@ def mock_fobstl():
     with mock.patch('omnidump.pid_mapping_logic.format_output_bytes_strings_log') as mock_fobstl:
         yield mock_fobstl
 
+@pytest.fixture 
+def mock_fobp():
+    with mock.patch('omnidump.pid_mapping_logic.format_output_bytes_pipeline') as mock_fobp:
+        yield mock_fobp
+
 @pytest.fixture 
 def mock_fobcl():
     with mock.patch('omnidump.pid_mapping_logic.format_output_bytes_console_log') as mock_fobcl:
@@ -807,6 +824,16 @@ def mock_fob_priority_sections_log_config():
         save_dir=None
     )
 
+@pytest.fixture
+def mock_fob_priority_sections_only_log_config():
+    return CliAppConfig (
+        flag_sec_log=True,
+        flag_exec_sec=True,
+        length_out=5,
+        verbose_out=True, 
+        save_dir=None
+    )
+
 @pytest.fixture
 def mock_fob_priority_strings_log_config():
     return CliAppConfig (
@@ -910,3 +937,521 @@ def mock_click_secho():
     """Mocks printing function used for all the console output."""
     with mock.patch('omnidump.pid_mapping_logic.click.secho') as mock_secho:
         yield mock_secho
+
+'''
+--- PID Group Logic ---
+'''
+
+@pytest.fixture
+def mock_group_config(mock_output_path):
+    """CliAppConfig for process group dumps"""
+    return CliAppConfig(
+        save_dir=mock_output_path,
+        flag_sec_log=True,
+        flag_he_sec=True
+    )
+
+@pytest.fixture
+def mock_child_process():
+    """Starts a short-lived child process of the test runner."""
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    yield child
+    child.kill()
+    child.wait()
+
+@pytest.fixture
+def mock_estimate_capture_size():
+    """Mocks the capture size estimate with fixed sizes per PID."""
+    sizes = {10: 0x1000, 11: 0x9000, 12: 0x4000}
+    with mock.patch('omnidump.pid_group_logic.estimate_capture_size', side_effect=lambda pid, sections: sizes[pid]) as mock_ecs:
+        yield mock_ecs
+
+'''
+--- Snapshot Logic ---
+'''
+
+@pytest.fixture
+def mock_pagemap_dirty():
+    """Fake pagemap file with pages 1, 2 and 4 of the first five pages soft-dirty."""
+    entries = array.array('Q', [0, SOFT_DIRTY_BIT, SOFT_DIRTY_BIT, 0, SOFT_DIRTY_BIT])
+    return io.BytesIO(entries.tobytes())
+
+@pytest.fixture
+def mock_pagemap_large():
+    """Fake pagemap of 100000 pages with pages 0, 1000-1002 and the last page soft-dirty."""
+    page_count = 100000
+    entries = array.array('Q', [0]) * page_count
+    for page in (0, 1000, 1001, 1002, page_count - 1):
+        entries[page] = SOFT_DIRTY_BIT | 0x1234
+    return (io.BytesIO(entries.tobytes()), page_count)
+
+@pytest.fixture
+def mock_snapshot_regions():
+    """Categorized regions with one writable and one read-only heap region."""
+    return {
+        "heap": [
+            {"address": "1000-3000", "permissions": "rw-p"},
+            {"address": "5000-6000", "permissions": "r--p"}
+        ]
+    }
+
+'''
+--- Diff Logic ---
+'''
+
+@pytest.fixture
+def mock_dump_dirs(tmp_path):
+    """Two saved dumps: one heap page changed, the heap grew, one mapping removed and one added."""
+    dump_a = tmp_path / "a"
+    dump_b = tmp_path / "b"
+    for dump_dir in (dump_a, dump_b):
+        (dump_dir / "heap").mkdir(parents=True)
+        (dump_dir / "anon_map").mkdir(parents=True)
+
+    pages = [bytes([index]) * 4096 for index in range(8)]
+    (dump_a / "heap" / "region-0x1000-0x9000.bin").write_bytes(b"".join(pages))
+    pages[5] = b"\xff" * 4096
+    (dump_b / "heap" / "region-0x1000-0xa000.bin").write_bytes(b"".join(pages) + b"\x00" * 4096)
+
+    (dump_a / "anon_map" / "region-0x20000-0x21000.bin").write_bytes(b"\x00" * 4096)
+    (dump_b / "anon_map" / "region-0x30000-0x31000.bin").write_bytes(b"\x00" * 4096)
+    return (str(dump_a), str(dump_b))
+
+'''
+--- Watch Logic ---
+'''
+
+@pytest.fixture
+def mock_watch_index_old():
+    """Region index before a tick: heap, an anon mapping and a library."""
+    return {
+        0x1000: (0x5000, "heap", "rw-p", "[heap]"),
+        0x20000: (0x21000, "anon_map", "rw-p", ""),
+        0x30000: (0x31000, "shared_libs", "r-xp", "/usr/lib/libc.so.6"),
+    }
+
+@pytest.fixture
+def mock_watch_index_new():
+    """Region index after a tick: heap grew, anon unmapped, new anon and library mprotect."""
+    return {
+        0x1000: (0x9000, "heap", "rw-p", "[heap]"),
+        0x30000: (0x31000, "shared_libs", "r--p", "/usr/lib/libc.so.6"),
+        0x40000: (0x42000, "anon_map", "rw-p", ""),
+    }
+
+@pytest.fixture
+def mock_maps_lines():
+    """Two /proc/PID/maps snapshots where the heap grows."""
+    before = b"55d000001000-55d000005000 rw-p 00000000 00:00 0 [heap]\n"
+    after = b"55d000001000-55d000009000 rw-p 00000000 00:00 0 [heap]\n"
+    return (before, after)
+
+'''
+--- Sample Logic ---
+'''
+
+@pytest.fixture
+def mock_sample_regions():
+    """Categorized regions with a readable heap and a guard page."""
+    return {
+        "heap": [{"address": "1000-3000", "permissions": "rw-p", "file_path": "[heap]"}],
+        "guard_pages": [{"address": "3000-4000", "permissions": "---p", "file_path": ""}]
+    }
+
+@pytest.fixture
+def mock_sample_counter():
+    """A ctypes counter in the test process and its (address, size)."""
+    counter = ctypes.c_uint64(0x1122334455667788)
+    yield (counter, ctypes.addressof(counter), ctypes.sizeof(counter))
+
+'''
+--- Region Pipeline ---
+'''
+
+@pytest.fixture
+def mock_pipeline_config(tmp_path):
+    """CliAppConfig for a combined sections, strings and hashes pipeline run"""
+    return CliAppConfig(
+        save_dir=str(tmp_path),
+        length_out=4,
+        flag_sec_log=True,
+        flag_strings_log=True,
+        flag_hash_log=True,
+        flag_he_sec=True
+    )
+
+@pytest.fixture
+def mock_pipeline_memory(tmp_path):
+    """A fake mem file holding one heap region at 0x1000 and its categorized regions."""
+    region = b"\x00" * 10 + b"hello world" + b"\x00" * (0x1000 - 21)
+    mem_file = tmp_path / "mem"
+    mem_file.write_bytes(b"\x00" * 0x1000 + region)
+    input_dict = {"heap": [{"address": "1000-2000", "permissions": "rw-p", "file_path": "[heap]"}]}
+    return (str(mem_file), input_dict, region)
+
+'''
+--- String Dedupe ---
+'''
+
+@pytest.fixture
+def mock_dedupe_strings():
+    """(string, address) occurrences with repeats, in the order they are found."""
+    rng = random.Random(35)
+    words = ["alpha", "beta", "gamma\tdelta", "epsilon", "zeta", "eta", "theta"] + [f"word{n}" for n in range(200)]
+    return [(rng.choice(words), 0x1000 + index * 16) for index in range(3000)]
+
+@pytest.fixture
+def mock_dedupe_memory(tmp_path):
+    """A fake mem file holding two heap regions that repeat the same strings."""
+    region = (b"\x00repeated string\x00unique one\x00" + b"\x00repeated string\x00" * 3).ljust(0x1000, b"\x00")
+    second_region = b"\x00repeated string\x00unique two\x00".ljust(0x1000, b"\x00")
+    mem_file = tmp_path / "mem"
+    mem_file.write_bytes(b"\x00" * 0x1000 + region + second_region)
+    input_dict = {"heap": [{"address": "1000-2000", "permissions": "rw-p", "file_path": "[heap]"},
+                           {"address": "2000-3000", "permissions": "rw-p", "file_path": "[heap]"}]}
+    return (str(mem_file), input_dict)
+
+'''
+--- Page Heatmap ---
+'''
+
+@pytest.fixture
+def mock_classified_pages():
+    """One page of each class, keyed by the kind of content."""
+    rng = random.Random(39)
+    code = bytes.fromhex("554889e5488b45f84889c7e800000000c3") + bytes.fromhex("4883ec10488d3d00000000e8") + b"\xcc"
+    return {
+        "zero": b"\x00" * 4096,
+        "text": (b"The quick brown fox jumps over the lazy dog.\n" * 100)[:4096],
+        "random": bytes(rng.randrange(256) for _ in range(4096)),
+        "pointers": b"".join(struct.pack("<QQ", 0x55d0c0de0000 + index * 32, index) for index in range(256)),
+        "code": (code * 200)[:4096],
+        "counters": b"".join(struct.pack("<Q", index) for index in range(512)),
+    }
+
+'''
+--- Entropy Scan ---
+'''
+
+@pytest.fixture
+def mock_entropy_data():
+    """Low-entropy heap-like data with three planted 32-byte keys, and the key offsets."""
+    rng = random.Random(40)
+    filler = (b"session=ok; user=alice\n" + b"\x00" * 40 + struct.pack("<QQ", 1, 2)) * 60
+    key_offsets = [300, 1700, len(filler) - 32]
+    data = bytearray(filler)
+    for key_offset in key_offsets:
+        data[key_offset:key_offset + 32] = bytes(rng.sample(range(256), 32))
+    return (bytes(data), key_offsets)
+
+@pytest.fixture
+def mock_click_echo():
+    """Mocks click.echo used for the scan output."""
+    with mock.patch('omnidump.entropy_scan_logic.click.echo') as mock_echo:
+        yield mock_echo
+
+'''
+--- Key Scan ---
+'''
+
+@pytest.fixture
+def mock_key_data():
+    """Heap-like data with planted AES schedules and a ChaCha state, and the expected (offset, type, key) matches."""
+    rng = random.Random(41)
+    filler = (b"\x00" * 24 + struct.pack("<QQ", 0x7f12_3456_7000, 64) + b"name=worker-1\n\x00\x00") * 80
+    data = bytearray(filler)
+    aes128_key = bytes.fromhex("2b7e151628aed2a6abf7158809cf4f3c")
+    aes192_key = bytes(rng.randrange(256) for _ in range(24))
+    aes256_key = bytes(rng.randrange(256) for _ in range(32))
+    chacha_key = bytes(rng.randrange(256) for _ in range(32))
+    # AES-128 in FIPS-197 byte order, AES-256 as little-endian words, AES-192
+    # straight after a zero run, and a ChaCha state whose block ends the data.
+    data[400:576] = expand_aes_key(aes128_key)
+    data[1200:1440] = swap_words(expand_aes_key(aes256_key))
+    data[2000:2100] = bytes(100)
+    data[2100:2308] = expand_aes_key(aes192_key)
+    chacha_offset = len(data) - 64
+    data[chacha_offset:] = b"expand 32-byte k" + chacha_key + bytes(16)
+    expected = [
+        (400, "aes128", aes128_key),
+        (1200, "aes256", aes256_key),
+        (2100, "aes192", aes192_key),
+        (chacha_offset, "chacha20-256", chacha_key),
+    ]
+    return (bytes(data), expected)
+
+@pytest.fixture
+def mock_key_echo():
+    """Mocks click.echo used for the key scan output."""
+    with mock.patch('omnidump.key_scan_logic.click.echo') as mock_echo:
+        yield mock_echo
+
+'''
+--- Rule Scan ---
+'''
+
+@pytest.fixture
+def mock_rule_file(tmp_path):
+    """A rule file with string, wide string, hex and regex rules."""
+    rule_file = tmp_path / "rules.txt"
+    rule_file.write_text(
+        "# IR signatures\n"
+        "\n"
+        'cobalt_pipe "\\\\\\\\.\\\\pipe\\\\msagent_" ascii wide\n'
+        "mz_header { 4D 5A 90 00 }\n"
+        'token_regex /tok_[a-f0-9]{16}/i\n'
+        'shell_cmd "/bin/sh -c"\n'
+    )
+    return str(rule_file)
+
+@pytest.fixture
+def mock_rule_data():
+    """Heap-like data with every rule of mock_rule_file planted, and the expected (offset, rule) matches."""
+    filler = (b"\x00" * 40 + b"user=alice;path=/usr/lib\n" + bytes(range(0x80, 0x97))) * 40
+    data = bytearray(filler)
+    plants = [
+        (100, "cobalt_pipe", b"\\\\.\\pipe\\msagent_1f"),
+        (700, "cobalt_pipe", "\\\\.\\pipe\\msagent_".encode("utf-16le")),
+        (1500, "mz_header", b"MZ\x90\x00\x03\x00"),
+        (2200, "token_regex", b"TOK_0123456789ABCDEF"),
+        (2900, "shell_cmd", b"/bin/sh -c"),
+        (len(filler) - 10, "shell_cmd", b"/bin/sh -c"),
+    ]
+    for offset, _, planted in plants:
+        data[offset:offset + len(planted)] = planted
+    return (bytes(data), [(offset, rule) for offset, rule, _ in plants])
+
+@pytest.fixture
+def mock_rule_echo():
+    """Mocks click.echo used for the rule scan output."""
+    with mock.patch('omnidump.rules_scan_logic.click.echo') as mock_echo:
+        yield mock_echo
+
+'''
+--- Grep ---
+'''
+
+@pytest.fixture
+def mock_grep_data():
+    """Code-like data with 'mov rax, [rip+disp32]; nop' sequences at known offsets, and the offsets."""
+    rng = random.Random(43)
+    data = bytearray(rng.randrange(256) for _ in range(5000))
+    offsets = [10, 1020, 1029, 4091]
+    for offset in offsets:
+        data[offset:offset + 9] = b"\x48\x8b\x05" + bytes(rng.randrange(256) for _ in range(4)) + b"\x90\x90"
+    return (bytes(data), offsets)
+
+@pytest.fixture
+def mock_grep_echo():
+    """Mocks click.echo used for the grep output."""
+    with mock.patch('omnidump.grep_logic.click.echo') as mock_echo:
+        yield mock_echo
+
+'''
+--- IOC ---
+'''
+
+@pytest.fixture
+def mock_ioc_data():
+    """Heap-like data with one indicator of each type planted, some repeated, and the expected (type, value, offsets)."""
+    data = bytearray((b"\x00" * 24 + bytes(range(0x80, 0xa8))) * 64)
+    base64_blob = b"QUJDREVGR0hJSktMTU5PUFFSU1RVVldYWVoxMjM0NTY3ODkwYWJjZGVm"
+    plants = [
+        ("url", b"https://c2.example.com/beacon?id=42", [64, 2050]),
+        ("email", b"ops@corp.example.org", [300]),
+        ("ipv6", b"2001:db8::ff00:42:8329", [500]),
+        ("ipv4", b"203.0.113.7", [700, 900, 3060]),
+        ("domain", b"update.evil.ru", [1100]),
+        ("path", b"/tmp/.x/payload.bin", [1300]),
+        ("path", b"C:\\Users\\Public\\svc.exe", [1500]),
+        ("base64", base64_blob, [1700]),
+    ]
+    for _, value, offsets in plants:
+        for offset in offsets:
+            data[offset:offset + len(value)] = value
+    return (bytes(data), plants)
+
+@pytest.fixture
+def mock_ioc_echo():
+    """Mocks click.echo used for the indicator output."""
+    with mock.patch('omnidump.ioc_logic.click.echo') as mock_echo:
+        yield mock_echo
+
+'''
+--- Carve ---
+'''
+
+def make_png():
+    """Builds a 1x1 grayscale PNG."""
+    def png_chunk(kind, body):
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+    return (b"\x89PNG\r\n\x1a\n" + png_chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 0, 0, 0, 0))
+            + png_chunk(b"IDAT", zlib.compress(b"\x00\x7f")) + png_chunk(b"IEND", b""))
+
+def make_elf():
+    """Builds a 64-bit little-endian ELF file with one loadable segment and no section headers."""
+    header = (b"\x7fELF\x02\x01\x01" + b"\x00" * 9 + struct.pack("<HHIQQQIHHHHHH", 2, 62, 1, 0x401000, 64, 0, 0, 64, 56, 1, 0, 0, 0))
+    segment = struct.pack("<IIQQQQQQ", 1, 5, 0, 0x400000, 0x400000, 300, 300, 0x1000)
+    return header + segment + bytes(range(180))
+
+@pytest.fixture
+def mock_carve_data(tmp_path):
+    """Heap-like data with a PNG, ZIP, ELF, PDF and SQLite file planted, a false ZIP magic, and the expected (offset, type, bytes)."""
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("notes.txt", "meet at 10\n" * 20)
+    database_path = tmp_path / "carve.db"
+    with sqlite3.connect(str(database_path)) as connection:
+        connection.execute("CREATE TABLE hosts (name TEXT)")
+        connection.execute("INSERT INTO hosts VALUES ('10.0.0.5')")
+    connection.close()
+    files = [
+        (500, "png", make_png()),
+        (1500, "zip", archive.getvalue()),
+        (3000, "elf", make_elf()),
+        (4000, "pdf", b"%PDF-1.4\n1 0 obj\n<< /Type /Catalog >>\nendobj\ntrailer\n<< /Root 1 0 R >>\n%%EOF"),
+        (5000, "sqlite", database_path.read_bytes()),
+    ]
+    data = bytearray((b"\x00" * 40 + b"user=alice;path=/usr/lib\n" + bytes(range(0x80, 0x97))) * 200)
+    data[100:110] = b"PK\x03\x04\x00\x00junk"
+    for offset, _, contents in files:
+        data[offset:offset + len(contents)] = contents
+    return (bytes(data), files)
+
+@pytest.fixture
+def mock_nested_zip():
+    """A stored (uncompressed) ZIP archive of three files, one a PNG, so local headers and a PNG magic lie inside it."""
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("a.txt", "first\n" * 50)
+        zip_file.writestr("image.png", make_png())
+        zip_file.writestr("b.txt", "second\n" * 50)
+    return archive.getvalue()
+
+@pytest.fixture
+def mock_carve_echo():
+    """Mocks click.echo used for the carve output."""
+    with mock.patch('omnidump.carve_logic.click.echo') as mock_echo:
+        yield mock_echo
+
+'''
+--- ELF Symbols ---
+'''
+
+ELF_BASE = 0x10000
+ELF_BUILD_ID = bytes(range(1, 21))
+
+def make_elf_image(hash_tag):
+    """Builds a mapped 64-bit shared library with a build ID note and three dynamic symbols, indexed by DT_HASH or DT_GNU_HASH."""
+    image = bytearray(0x2000)
+    header = b"\x7fELF\x02\x01\x01" + b"\x00" * 9 + struct.pack("<HHIQQQIHHHHHH", 3, 62, 1, 0, 64, 0, 0, 64, 56, 3, 64, 0, 0)
+    program_headers = (struct.pack("<IIQQQQQQ", 1, 5, 0, 0, 0, 0x2000, 0x2000, 0x1000)
+                       + struct.pack("<IIQQQQQQ", 2, 6, 576, 576, 576, 112, 112, 8)
+                       + struct.pack("<IIQQQQQQ", 4, 4, 256, 256, 256, 36, 36, 4))
+    note = struct.pack("<III", 4, 20, 3) + b"GNU\x00" + ELF_BUILD_ID
+    strings = b"\x00main_loop\x00g_config\x00helper\x00"
+    symbols = (b"\x00" * 24 + struct.pack("<IBBHQQ", 1, 0x12, 0, 1, 0x1000, 0x40)
+               + struct.pack("<IBBHQQ", 11, 0x11, 0, 1, 0x1800, 8) + struct.pack("<IBBHQQ", 20, 0x12, 0, 1, 0x1100, 0x20))
+    if hash_tag == 4:
+        hash_table = struct.pack("<IIIIIII", 1, 4, 1, 0, 2, 3, 0)
+    else:
+        hash_table = struct.pack("<IIIIQIIII", 1, 1, 1, 6, 0, 1, 2, 4, 7)
+    dynamic = b"".join(struct.pack("<QQ", tag, value) for tag, value in
+                       [(hash_tag, 512), (5, 320), (6, 384), (10, len(strings)), (11, 24), (0, 0)])
+    for offset, data in [(0, header), (64, program_headers), (256, note), (320, strings), (384, symbols),
+                         (512, hash_table), (576, dynamic)]:
+        image[offset:offset + len(data)] = data
+    return bytes(image)
+
+@pytest.fixture(params=[4, 0x6ffffef5], ids=["hash", "gnu_hash"])
+def mock_elf_mem(request, tmp_path):
+    """A mem file with a synthetic ELF image mapped at ELF_BASE, the open descriptor, and its maps entry."""
+    mem_file = tmp_path / "mem"
+    mem_file.write_bytes(b"\x00" * ELF_BASE + make_elf_image(request.param))
+    mem_fd = os.open(str(mem_file), os.O_RDONLY)
+    input_dict = {"shared_libs": [{"address": f"{ELF_BASE:x}-{ELF_BASE + 0x2000:x}", "permissions": "r-xp",
+                                   "offsets": "00000000", "maj_min_id": "08:01", "inode": "42", "file_path": "/usr/lib/libfake.so"}]}
+    yield (mem_fd, input_dict)
+    os.close(mem_fd)
+
+'''
+--- Shared Libraries ---
+'''
+
+@pytest.fixture
+def mock_shared_mem(tmp_path):
+    """A mem file with a library mapped at ELF_BASE followed by its writable data and a heap, and the section dicts."""
+    mem_file = tmp_path / "mem"
+    mem_file.write_bytes(b"\x00" * ELF_BASE + make_elf_image(4) + b"\x11" * 0x1000 + b"\x22" * 0x1000)
+    library = {"offsets": "00000000", "maj_min_id": "08:01", "inode": "42", "file_path": "/usr/lib/libfake.so"}
+    input_dict = {
+        "shared_libs": [
+            dict(library, address=f"{ELF_BASE:x}-{ELF_BASE + 0x2000:x}", permissions="r-xp"),
+            dict(library, address=f"{ELF_BASE + 0x2000:x}-{ELF_BASE + 0x3000:x}", permissions="rw-p", offsets="00002000"),
+        ],
+        "heap": [{"address": f"{ELF_BASE + 0x3000:x}-{ELF_BASE + 0x4000:x}", "permissions": "rw-p", "offsets": "00000000",
+                  "maj_min_id": "00:00", "inode": "0", "file_path": "[heap]"}],
+    }
+    return (str(mem_file), input_dict)
+
+'''
+--- Pointers ---
+'''
+
+@pytest.fixture
+def mock_pointer_data(tmp_path):
+    """A mem file whose heap holds pointers into the heap, a library and the stack, the maps dict, and the expected counts."""
+    input_dict = {
+        "heap": [{"address": "10000-20000", "permissions": "rw-p", "offsets": "00000000", "maj_min_id": "00:00",
+                  "inode": "0", "file_path": "[heap]"}],
+        "shared_libs": [{"address": "7f0000000000-7f0000002000", "permissions": "r-xp", "offsets": "00000000",
+                         "maj_min_id": "08:01", "inode": "42", "file_path": "/usr/lib/libfake.so"}],
+        "stack": [{"address": "7ffd00000000-7ffd00001000", "permissions": "rw-p", "offsets": "00000000",
+                   "maj_min_id": "00:00", "inode": "0", "file_path": "[stack]"}],
+    }
+    words = [0x10000, 0x1fff8, 0x18000, 0x7f0000000010, 0x7f0000001ff8, 0x7ffd00000800,
+             0x20000, 0xffff, 0x7f0000002000, 0x7ffd00001000, 0, 1, 0x4141414141414141]
+    heap = bytearray(0x10000)
+    for position, word in enumerate(words):
+        struct.pack_into("<Q", heap, 0x1000 * position, word)
+    struct.pack_into("<Q", heap, 0x8004, 0x10000)
+    mem_file = tmp_path / "mem"
+    mem_file.write_bytes(b"\x00" * 0x10000 + bytes(heap))
+    return (str(mem_file), input_dict, {"heap": 3, "shared_libs": 2, "stack": 1})
+
+@pytest.fixture
+def mock_pointer_echo():
+    """Mocks click.echo used for the pointer output."""
+    with mock.patch('omnidump.pointer_logic.click.echo') as mock_echo:
+        yield mock_echo
+
+'''
+--- Pointer Walk ---
+'''
+
+class MockTreeNode(ctypes.Structure):
+    """A list or binary tree node in the test process: a value, then left (next) and right pointers."""
+    # pylint: disable=too-few-public-methods
+    _fields_ = [("value", ctypes.c_uint64), ("left", ctypes.c_uint64), ("right", ctypes.c_uint64)]
+
+@pytest.fixture
+def mock_walk_nodes():
+    """3000 nodes in the test process: 0-1999 a list whose tail points back to node 10, 2000-2006 a tree sharing node 2006."""
+    nodes = (MockTreeNode * 3000)()
+    addresses = [ctypes.addressof(node) for node in nodes]
+    for index in range(2000):
+        nodes[index].value = index
+        nodes[index].left = addresses[index + 1] if index < 1999 else addresses[10]
+    for parent, left, right in [(2000, 2001, 2002), (2001, 2003, 2004), (2002, 2005, 2006), (2004, 0, 2006)]:
+        nodes[parent].left = addresses[left] if left else 0
+        nodes[parent].right = addresses[right]
+    nodes[2005].left = 0x10
+    yield (nodes, addresses)
+
+@pytest.fixture
+def mock_self_cache():
+    """A page cache over the readable memory of the test process."""
+    mem_fd = os.open("/proc/self/mem", os.O_RDONLY)
+    readable_ranges = get_readable_ranges(group_regions("/proc/self/maps"))
+    yield lambda capacity=4096, prefetch=1: PageCache(os.getpid(), mem_fd, readable_ranges, capacity, prefetch)
+    os.close(mem_fd)
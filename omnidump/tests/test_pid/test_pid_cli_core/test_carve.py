@@ -0,0 +1,130 @@
+"""
+Test for Functions
+
+- get_png_size (carve_logic)
+- get_zip_size (carve_logic)
+- get_elf_size (carve_logic)
+- FileCarver (carve_logic)
+- CarveSink (carve_logic)
+"""
+import os
+from unittest import mock
+import pytest
+from omnidump.carve_logic import CarveSink, FileCarver, get_elf_size, get_png_size, get_zip_size
+from omnidump.pipeline_logic import RegionInfo, run_region_pipeline
+
+@pytest.mark.parametrize("get_size, file_type", [(get_png_size, "png"), (get_zip_size, "zip"), (get_elf_size, "elf")])
+def test_gs_partial_headers(mock_carve_data, get_size, file_type):
+    """
+    Extent From Headers
+
+    Goal: Verify the size readers wait for more data on a cut header and find the size on the whole file.
+
+    Assertions: Assert None for the first bytes only, the file size for the file, and 0 for a wrong header.
+    """
+    _, files = mock_carve_data
+    contents = next(contents for _, kind, contents in files if kind == file_type)
+    assert get_size(contents[:20], 0) is None
+    assert get_size(contents + b"\x00" * 64, 0) == len(contents)
+    assert get_size(contents[:4] + b"\xff" * 60, 0) == 0
+
+@pytest.mark.parametrize("chunk_size", [64, 1000, 1 << 20])
+def test_fc_chunk_boundaries(mock_carve_data, chunk_size):
+    """
+    Streaming Carve
+
+    Goal: Verify every planted file is carved whole whatever the chunk size, and the false magic is dropped.
+
+    Assertions: Assert the carves equal the planted files at their addresses, with nothing skipped.
+    """
+    data, files = mock_carve_data
+    carver = FileCarver()
+    carves = []
+    for offset in range(0, len(data), chunk_size):
+        carves.extend(carver.feed(data[offset:offset + chunk_size], 0x1000 + offset))
+    carves.extend(carver.flush())
+
+    assert sorted((carve.address, carve.file_type, bytes(carve.data)) for carve in carves) == [
+        (0x1000 + offset, file_type, contents) for offset, file_type, contents in files]
+    assert carver.skipped == 0
+
+def test_fc_limits(mock_carve_data):
+    """
+    Size Limit And Region End
+
+    Goal: Verify files larger than max_size and files cut off by the end of the region are skipped.
+
+    Assertions: Assert only the small files are carved, and the others are counted as skipped.
+    """
+    data, files = mock_carve_data
+    carver = FileCarver(["png", "sqlite"], max_size=4096)
+    carves = list(carver.feed(data[:6000], 0))
+    carves.extend(carver.flush())
+
+    assert [carve.file_type for carve in carves] == ["png"]
+    assert carver.skipped == 1
+
+@pytest.mark.parametrize("chunk_size", [64, 1 << 20])
+def test_fc_nested_magics(mock_nested_zip, chunk_size):
+    """
+    Magics Inside A Carve
+
+    Goal: Verify the local file headers and the PNG inside a ZIP archive do not start carves of their own.
+
+    Assertions: Assert the archive is carved once, whole, and nothing is skipped.
+    """
+    data = b"\x00" * 100 + mock_nested_zip + b"\x00" * 100
+    carver = FileCarver()
+    carves = []
+    for offset in range(0, len(data), chunk_size):
+        carves.extend(carver.feed(data[offset:offset + chunk_size], offset))
+    carves.extend(carver.flush())
+
+    assert [(carve.address, carve.file_type, bytes(carve.data)) for carve in carves] == [(100, "zip", mock_nested_zip)]
+    assert carver.skipped == 0
+
+def test_cs_unwritable_dir(tmp_path, mock_carve_echo, mock_carve_data):
+    """
+    Write Errors
+
+    Goal: Verify a save directory that cannot be written is reported per file instead of ending the scan.
+
+    Assertions: Assert nothing is printed as carved and the count stays at zero.
+    """
+    data, _ = mock_carve_data
+    blocker = tmp_path / "carved"
+    blocker.write_bytes(b"")
+    sink = CarveSink(str(blocker))
+    with mock.patch('omnidump.carve_logic.click.secho') as mock_secho:
+        sink.begin_region(RegionInfo("heap", 1, 0x1000, 0x1000 + len(data), "rw-p", "[heap]"))
+        sink.feed(0x1000, data)
+        sink.end_region()
+
+    assert sink.carved == 0
+    assert not mock_carve_echo.called
+    assert "Could not write carved file" in mock_secho.call_args_list[0].args[0]
+
+def test_cs_pipeline(tmp_path, mock_carve_echo, mock_carve_data):
+    """
+    Carved Files
+
+    Goal: Verify the sink writes each carved file, named by its address, and prints it with its region.
+
+    Assertions: Assert the saved files hold the planted bytes and one line is printed per file.
+    """
+    data, files = mock_carve_data
+    mem_file = tmp_path / "mem"
+    mem_file.write_bytes(b"\x00" * 0x1000 + data)
+    save_dir = str(tmp_path / "carved")
+    input_dict = {"heap": [{"address": f"1000-{0x1000 + len(data):x}", "permissions": "rw-p", "file_path": "[heap]"}]}
+
+    run_region_pipeline(str(mem_file), input_dict, ["heap"], [CarveSink(save_dir, ["zip", "pdf"])])
+
+    lines = [call.args[0] for call in mock_carve_echo.call_args_list]
+    expected = [(offset, file_type, contents) for offset, file_type, contents in files if file_type in ("zip", "pdf")]
+    assert sorted(os.listdir(save_dir)) == [f"{0x1000 + offset:016x}.{file_type}" for offset, file_type, _ in expected]
+    for offset, file_type, contents in expected:
+        file_path = os.path.join(save_dir, f"{0x1000 + offset:016x}.{file_type}")
+        with open(file_path, "rb") as carved_file:
+            assert carved_file.read() == contents
+        assert f"{0x1000 + offset:#018x}\t{file_type}\t{len(contents)}\t{file_path}\theap\t[heap]" in lines
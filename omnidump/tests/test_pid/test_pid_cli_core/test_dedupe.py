@@ -0,0 +1,126 @@
+"""
+Test for Functions
+
+- StringIndex (dedupe_logic)
+- TopStrings (dedupe_logic)
+- DedupeStringsSink (pipeline_logic)
+- TopStringsSink (pipeline_logic)
+"""
+import collections
+import os
+import random
+import pytest
+from omnidump.config_pid import CliAppConfig
+from omnidump.dedupe_logic import StringIndex, TopStrings
+from omnidump.pipeline_logic import run_region_pipeline, build_sinks, DedupeStringsSink, TopStringsSink
+
+@pytest.mark.parametrize("memory_budget", [10 ** 9, 2000, 1])
+def test_si_counts_and_addresses(tmp_path, mock_dedupe_strings, memory_budget):
+    """
+    Counts and First Addresses
+
+    Goal: Verify every unique string is reported once with its total count and first
+          three addresses, whether the index stays in memory or spills sorted runs.
+
+    Assertions: Assert the merged entries match a direct count of the occurrences,
+                sorted by escaped string. Assert spilled runs are deleted after the merge.
+    """
+    index = StringIndex(str(tmp_path), memory_budget=memory_budget)
+    for text, address in mock_dedupe_strings:
+        index.add(text, address)
+    spilled = len(index.runs)
+
+    counts = collections.Counter()
+    addresses = collections.defaultdict(list)
+    for text, address in mock_dedupe_strings:
+        key = text.replace("\t", "\\t")
+        counts[key] += 1
+        addresses[key].append(address)
+    expected = [(key, counts[key], addresses[key][:3]) for key in sorted(counts)]
+
+    assert list(index.iter_entries()) == expected
+    assert index.total == len(mock_dedupe_strings)
+    assert (spilled > 0) == (memory_budget < 10 ** 9)
+    assert not index.runs
+
+def test_dss_pipeline(tmp_path, mock_dedupe_memory):
+    """
+    Dedupe Output
+
+    Goal: Verify the dedupe sink replaces the per-region strings files with one file
+          of unique strings across all regions.
+
+    Assertions: Assert build_sinks picks the dedupe sink. Assert strings-dedupe.txt holds
+                one line per unique string with counts and first addresses. Assert no
+                per-region strings files are written.
+    """
+    mem_path, input_dict = mock_dedupe_memory
+    config = CliAppConfig(save_dir=str(tmp_path / "out"), flag_strings_log=True,
+                          flag_strings_dedupe=True, flag_he_sec=True)
+    sinks = build_sinks(config)
+    assert isinstance(sinks[0], DedupeStringsSink)
+
+    run_region_pipeline(mem_path, input_dict, ["heap"], sinks)
+
+    with open(os.path.join(config.save_dir, "strings-dedupe.txt"), "r") as dedupe_file:
+        lines = dedupe_file.read().splitlines()
+    assert lines == [
+        "5\t0x0000000000001001,0x000000000000101d,0x000000000000102e\trepeated string",
+        "1\t0x0000000000001011\tunique one",
+        "1\t0x0000000000002011\tunique two",
+    ]
+    assert not os.path.exists(os.path.join(config.save_dir, "heap"))
+
+@pytest.mark.parametrize("capacity", [10 ** 6, 50])
+def test_ts_heavy_hitters(capacity):
+    """
+    Heavy Hitters
+
+    Goal: Verify the sketch finds the most frequent strings of a skewed stream and
+          bounds its estimates, whether or not it had to prune candidates.
+
+    Assertions: Assert the top strings match an exact count. Assert every estimate
+                is at least the true count and at most 'error' above it. Assert the
+                small sketch pruned and stayed within twice its capacity.
+    """
+    rng = random.Random(36)
+    words = [f"word{n}" for n in range(2000)]
+    weights = [1.0 / (rank + 1) for rank in range(len(words))]
+    stream = rng.choices(words, weights=weights, k=20000)
+
+    sketch = TopStrings(5, capacity=capacity)
+    for text in stream:
+        sketch.add(text)
+    counts = collections.Counter(stream)
+    top = sketch.top()
+
+    assert [text for text, _, _ in top] == [text for text, _ in counts.most_common(5)]
+    for text, count, error in top:
+        assert count - error <= counts[text] <= count
+    assert (sketch.floor > 0) == (capacity == 50)
+    assert len(sketch.entries) <= 2 * capacity
+    assert sketch.total == len(stream)
+
+def test_tss_pipeline(tmp_path, mock_dedupe_memory):
+    """
+    Top Strings Output
+
+    Goal: Verify the top strings sink writes the most frequent strings of the dump and
+          of each section instead of the per-region strings files.
+
+    Assertions: Assert build_sinks picks the top strings sink. Assert strings-top.txt and
+                heap/strings-top.txt hold the top two strings with their counts.
+    """
+    mem_path, input_dict = mock_dedupe_memory
+    config = CliAppConfig(save_dir=str(tmp_path / "out"), flag_strings_log=True, top_strings=2,
+                          flag_top_by_section=True, flag_he_sec=True)
+    sinks = build_sinks(config)
+    assert isinstance(sinks[0], TopStringsSink)
+
+    run_region_pipeline(mem_path, input_dict, ["heap"], sinks)
+
+    for full_file_path in [os.path.join(config.save_dir, "strings-top.txt"),
+                           os.path.join(config.save_dir, "heap", "strings-top.txt")]:
+        with open(full_file_path, "r") as top_file:
+            assert top_file.read().splitlines() == ["5\t0\trepeated string", "1\t0\tunique one"]
+    assert os.listdir(os.path.join(config.save_dir, "heap")) == ["strings-top.txt"]
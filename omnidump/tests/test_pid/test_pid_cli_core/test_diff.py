@@ -0,0 +1,106 @@
+"""
+Test for Functions
+
+- diff_region_pages
+- load_manifest_hashes
+- diff_dumps
+- print_dump_diff
+
+(diff_logic)
+"""
+import hashlib
+import os
+from unittest import mock
+from omnidump.diff_logic import diff_region_pages, diff_dumps, load_manifest_hashes, print_dump_diff
+
+def test_drp_pages(tmp_path):
+    """
+    Changed Pages
+
+    Goal: Verify only the pages that differ are reported, including a short last page,
+          and that pages past the common size are ignored.
+
+    Assertions: Assert pages 1 and 3 are reported.
+    """
+    file_a = tmp_path / "a.bin"
+    file_b = tmp_path / "b.bin"
+    file_a.write_bytes(b"A" * 4096 * 3 + b"B" * 2048)
+    file_b.write_bytes(b"A" * 4096 + b"C" * 4096 + b"A" * 4096 + b"D" * 2048 + b"E" * 8192)
+
+    assert diff_region_pages(str(file_a), str(file_b)) == [1, 3]
+
+def test_drp_identical(tmp_path):
+    """
+    Identical Regions
+
+    Goal: Verify identical regions produce no changed pages.
+
+    Assertions: Assert an empty change list.
+    """
+    full_file_path = tmp_path / "region.bin"
+    full_file_path.write_bytes(b"A" * 4096 * 4)
+
+    assert not diff_region_pages(str(full_file_path), str(full_file_path))
+
+def test_dd_changes(mock_dump_dirs):
+    """
+    Full Diff
+
+    Goal: Verify regions are aligned by section and start address.
+
+    Assertions: Assert the changed heap page, the heap growth, and the
+                new/removed anon mappings are reported.
+    """
+    result = diff_dumps(*mock_dump_dirs)
+
+    assert result["changed"] == [("heap", 0x1000, [(0x6000, 0x7000)])]
+    assert result["resized"] == [("heap", 0x1000, 0x9000, 0xa000)]
+    assert result["removed"] == [("anon_map", 0x20000, 0x21000)]
+    assert result["new"] == [("anon_map", 0x30000, 0x31000)]
+    assert result["identical"] == 0
+
+def test_dd_stored_hashes(mock_dump_dirs):
+    """
+    Stored Hashes
+
+    Goal: Verify regions with matching '--log-hashes' manifest entries are counted as
+          identical without reading them, and stale manifests are ignored.
+
+    Assertions: Assert the matching region is identical and diff_region_pages is not
+                called for it. Assert a region modified after its manifest is compared.
+    """
+    dump_a, dump_b = mock_dump_dirs
+    stack = b"\x07" * 4096
+    for dump_dir in (dump_a, dump_b):
+        os.makedirs(os.path.join(dump_dir, "stack"))
+        with open(os.path.join(dump_dir, "stack", "region-0x50000-0x51000.bin"), "wb") as bin_file:
+            bin_file.write(stack)
+        with open(os.path.join(dump_dir, "hashes.sha256"), "w") as manifest:
+            manifest.write(f"{hashlib.sha256(stack).hexdigest()}  stack/region-0x50000-0x51000.bin\n")
+    assert os.path.join(dump_a, "stack", "region-0x50000-0x51000.bin") in load_manifest_hashes(dump_a)
+
+    with mock.patch('omnidump.diff_logic.diff_region_pages', return_value=[]) as mock_drp:
+        result = diff_dumps(dump_a, dump_b)
+    assert result["identical"] == 1
+    assert all("stack" not in call.args[0] for call in mock_drp.call_args_list)
+
+    stale_file = os.path.join(dump_b, "stack", "region-0x50000-0x51000.bin")
+    manifest_time = os.path.getmtime(os.path.join(dump_b, "hashes.sha256"))
+    os.utime(stale_file, (manifest_time + 10, manifest_time + 10))
+    with mock.patch('omnidump.diff_logic.diff_region_pages', return_value=[]) as mock_drp:
+        diff_dumps(dump_a, dump_b)
+    assert any("stack" in call.args[0] for call in mock_drp.call_args_list)
+
+def test_pdd_summary(mock_dump_dirs):
+    """
+    Diff Summary
+
+    Goal: Verify the summary line counts every kind of difference, resized regions included.
+
+    Assertions: Assert the summary line gives the changed, resized, new and removed region counts.
+    """
+    with mock.patch('omnidump.diff_logic.click.secho') as mock_secho:
+        print_dump_diff(diff_dumps(*mock_dump_dirs))
+
+    assert mock_secho.call_args_list[-1].args[0] == (
+        "\n0 identical, 1 changed, 1 resized, 1 new, 1 removed region(s); 1 changed page(s).")
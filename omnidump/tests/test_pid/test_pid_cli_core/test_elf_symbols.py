@@ -0,0 +1,71 @@
+"""
+Test for Functions
+
+- find_module_bases (elf_logic)
+- read_module (elf_logic)
+- reconstruct_image (elf_logic)
+- SymbolIndex (elf_logic)
+"""
+import os
+from unittest import mock
+from omnidump import elf_logic
+from omnidump.elf_logic import SymbolIndex, find_module_bases, read_module, reconstruct_image
+
+ELF_BASE = 0x10000
+BUILD_ID = bytes(range(1, 21)).hex()
+
+def test_rm_module(mock_elf_mem):
+    """
+    Module Parsing
+
+    Goal: Verify the build ID, load bias, segments and dynamic symbols are read from the mapped image.
+
+    Assertions: Assert the module fields and its symbols sorted by value, with both hash table types.
+    """
+    mem_fd, input_dict = mock_elf_mem
+    assert find_module_bases(input_dict) == [(ELF_BASE, "/usr/lib/libfake.so")]
+
+    module = read_module(mem_fd, ELF_BASE, "/usr/lib/libfake.so")
+
+    assert module.build_id == BUILD_ID
+    assert module.bias == ELF_BASE
+    assert [segment.kind for segment in module.segments] == [1, 2, 4]
+    assert module.symbols == [(0x1000, 0x40, "func", "main_loop"), (0x1100, 0x20, "func", "helper"),
+                              (0x1800, 8, "object", "g_config")]
+    assert module.source == "memory"
+    assert reconstruct_image(mem_fd, module) == os.pread(mem_fd, 0x2000, ELF_BASE)
+
+def test_rm_cache(mock_elf_mem, tmp_path):
+    """
+    Symbol Cache
+
+    Goal: Verify symbols are saved by build ID and later read from the cache instead of memory.
+
+    Assertions: Assert the cache file exists, the second read comes from it, and the symbol tables are not read again.
+    """
+    mem_fd, _ = mock_elf_mem
+    cache_dir = str(tmp_path / "cache")
+    first = read_module(mem_fd, ELF_BASE, "/usr/lib/libfake.so", cache_dir)
+    with mock.patch.object(elf_logic, "read_dynamic_symbols") as mock_rds:
+        second = read_module(mem_fd, ELF_BASE, "/usr/lib/libfake.so", cache_dir)
+
+    assert os.path.isfile(os.path.join(cache_dir, f"{BUILD_ID}.json"))
+    assert first.source == "memory" and second.source == "cache"
+    assert second.symbols == first.symbols
+    mock_rds.assert_not_called()
+
+def test_si_lookup(mock_elf_mem):
+    """
+    Address Lookup
+
+    Goal: Verify addresses resolve to the symbol containing them, or to an offset from the module base.
+
+    Assertions: Assert addresses inside, at the end of, and outside symbols.
+    """
+    mem_fd, _ = mock_elf_mem
+    index = SymbolIndex([read_module(mem_fd, ELF_BASE, "/usr/lib/libfake.so")])
+
+    assert index.lookup(ELF_BASE + 0x1010) == ("main_loop", 0x10, "/usr/lib/libfake.so")
+    assert index.format_address(ELF_BASE + 0x1100) == "libfake.so!helper+0x0"
+    assert index.format_address(ELF_BASE + 0x1040) == "libfake.so+0x1040"
+    assert index.format_address(ELF_BASE - 1) == "?"
@@ -0,0 +1,82 @@
+"""
+Test for Functions
+
+- iter_high_entropy_windows (entropy_scan_logic)
+- EntropyScanner (entropy_scan_logic)
+- EntropyScanSink (entropy_scan_logic)
+"""
+import collections
+import math
+import random
+import pytest
+from omnidump.entropy_scan_logic import EntropyScanner, EntropyScanSink, iter_high_entropy_windows
+from omnidump.pipeline_logic import run_region_pipeline
+
+def brute_force_windows(data, window, threshold):
+    """Computes the entropy of every window from scratch."""
+    matches = []
+    for start in range(len(data) - window + 1):
+        counts = collections.Counter(data[start:start + window]).values()
+        entropy = -sum(count / window * math.log2(count / window) for count in counts)
+        if entropy >= threshold - 1e-9:
+            matches.append((start, round(entropy, 6)))
+    return matches
+
+@pytest.mark.parametrize("window, threshold", [(32, 4.7), (16, 3.8), (8, 2.5)])
+def test_ihew_matches_brute_force(mock_entropy_data, window, threshold):
+    """
+    Incremental Entropy
+
+    Goal: Verify the sliding histogram and block skipping find exactly the windows a
+          from-scratch entropy computation finds.
+
+    Assertions: Assert the offsets and entropies match for several window sizes.
+    """
+    data, _ = mock_entropy_data
+    found = [(start, round(entropy, 6)) for start, entropy in iter_high_entropy_windows(data, window, threshold)]
+    assert found == brute_force_windows(data, window, threshold)
+
+@pytest.mark.parametrize("chunk_size", [7, 100, 4096])
+def test_es_chunk_boundaries(mock_entropy_data, chunk_size):
+    """
+    Chunked Scan
+
+    Goal: Verify spans are the same whatever the chunk size, and cover the planted keys.
+
+    Assertions: Assert the spans equal a single-chunk scan and each key lies inside a span.
+    """
+    data, key_offsets = mock_entropy_data
+    whole = EntropyScanner()
+    expected = list(whole.feed(data, 0x1000)) + list(whole.flush())
+
+    scanner = EntropyScanner()
+    spans = []
+    for offset in range(0, len(data), chunk_size):
+        spans.extend(scanner.feed(data[offset:offset + chunk_size], 0x1000 + offset))
+    spans.extend(scanner.flush())
+
+    assert spans == expected
+    for key_offset in key_offsets:
+        assert any(start <= 0x1000 + key_offset and 0x1000 + key_offset + 32 <= end for start, end, _ in spans)
+
+def test_ess_pipeline(tmp_path, mock_click_echo, mock_entropy_data):
+    """
+    Scan Output
+
+    Goal: Verify the sink prints each span with its address, length, entropy, category and path.
+
+    Assertions: Assert one line per planted key with the region's category and path.
+    """
+    data, key_offsets = mock_entropy_data
+    mem_file = tmp_path / "mem"
+    mem_file.write_bytes(b"\x00" * 0x1000 + data)
+    input_dict = {"heap": [{"address": f"1000-{0x1000 + len(data):x}", "permissions": "rw-p", "file_path": "[heap]"}]}
+
+    run_region_pipeline(str(mem_file), input_dict, ["heap"], [EntropyScanSink()])
+
+    lines = [call.args[0].split("\t") for call in mock_click_echo.call_args_list]
+    assert len(lines) == len(key_offsets)
+    for (address, length, entropy, category, path), key_offset in zip(lines, key_offsets):
+        assert int(address, 16) <= 0x1000 + key_offset < int(address, 16) + int(length)
+        assert float(entropy) >= 4.7
+        assert (category, path) == ("heap", "[heap]")
@@ -44,7 +44,7 @@ def test_fob_priority_sections_log(
     mock_fobcl,
     mock_input_flag_fob_exe,
     mock_click_secho,
-    mock_fob_priority_sections_log_config,
+    mock_fob_priority_sections_only_log_config,
     mock_mem_path
 ):
     """
@@ -58,7 +58,7 @@ def test_fob_priority_sections_log(
     all_args = {
         'mem_path': mock_mem_path,
         'input_dict': mock_input_flag_fob_exe,
-        'config': mock_fob_priority_sections_log_config 
+        'config': mock_fob_priority_sections_only_log_config 
     }
 
     format_output_bytes(**all_args)
@@ -74,6 +74,40 @@ def test_fob_priority_sections_log(
     #Assert 4
     mock_click_secho.assert_not_called()
 
+def test_fob_combined_logs_pipeline(
+    mock_fobstl,
+    mock_fobsl,
+    mock_fobcl,
+    mock_fobp,
+    mock_input_flag_fob_exe,
+    mock_click_secho,
+    mock_fob_priority_sections_log_config,
+    mock_mem_path
+):
+    """
+    Combined Logs
+
+    Goal: Verify '--log-sections' with '--log-strings' is handled by a single pipeline pass.
+
+    Assertions: Assert format_output_bytes_pipeline is called once. Assert fobsl, fobstl
+                and fobcl are not called.
+    """
+    all_args = {
+        'mem_path': mock_mem_path,
+        'input_dict': mock_input_flag_fob_exe,
+        'config': mock_fob_priority_sections_log_config 
+    }
+
+    format_output_bytes(**all_args)
+
+    #Assert 1
+    mock_fobp.assert_called_once()
+
+    #Assert 2
+    mock_fobsl.assert_not_called()
+    mock_fobstl.assert_not_called()
+    mock_fobcl.assert_not_called()
+
 def test_fob_priority_strings_log(
     mock_fobstl,
     mock_fobcl,
@@ -1,6 +1,7 @@
 """Test for Function get_strings_from_bytes (pid_mapping_logic)"""
 import random
 import pytest
+from omnidump.config_pid import CliAppConfig
 from omnidump.pid_mapping_logic import get_strings_from_bytes
 def test_gsfb_2_argument_missing():
     """
@@ -185,3 +186,35 @@ def test_gsfb_max_bytes(mock_gsfb_1_argument_missing_config):
     byte_data = random.randbytes(1000)
     result = list(get_strings_from_bytes(byte_data, config=mock_gsfb_1_argument_missing_config))
     assert result
+
+@pytest.mark.parametrize("encoding, expected", [
+    ("ascii", ['ABCD']),
+    ("utf16le", ['Wide']),
+    ("all", ['ABCD', 'Wide']),
+])
+def test_gsfb_encoding(encoding, expected):
+    """
+    Encoding Modes
+
+    Goal: Verify UTF-16LE strings are extracted only when their encoding is selected,
+          and in the same scan as ASCII strings with 'all'.
+
+    Assertions: Assert the strings found for each encoding mode.
+    """
+    byte_data = b'ABCD\x01' + 'Wide'.encode('utf-16-le') + b'\x00\x00Wi\x00'
+    result = list(get_strings_from_bytes(byte_data, config=CliAppConfig(length_out=4, encoding=encoding)))
+    assert result == expected
+
+def test_gsfb_utf8():
+    """
+    UTF-8 Strings
+
+    Goal: Verify multibyte characters are kept inside strings, the minimum length counts
+          code points, and invalid sequences (stray bytes, encoded surrogates, C1 controls) end a string.
+
+    Assertions: Assert ['日本語テ', 'héllo', 'wxyz'] are returned.
+    """
+    byte_data = ('日本語'.encode() + b'\x00' + '日本語テ'.encode() + b'\xff' + 'héllo'.encode()
+                 + b'\xed\xa0\x80abc\xc2\x85wxyz')
+    result = list(get_strings_from_bytes(byte_data, config=CliAppConfig(length_out=4, encoding='utf8')))
+    assert result == ['日本語テ', 'héllo', 'wxyz']
@@ -0,0 +1,176 @@
+"""
+Test for Functions
+
+- parse_hex_pattern (grep_logic)
+- HexPattern (grep_logic)
+- ChunkSearcher (grep_logic)
+- compile_grep_regex (grep_logic)
+- HexGrepSink (grep_logic)
+- RegexGrepSink (grep_logic)
+"""
+import click
+import pytest
+from omnidump.grep_logic import (ChunkSearcher, HexGrepSink, HexPattern, RegexGrepSink, compile_grep_regex, escape_bytes,
+                                 iter_regex_matches, parse_hex_pattern)
+from omnidump.pipeline_logic import run_region_pipeline
+
+CODE_PATTERN = "48 8B ?5 ?? ?? ?? ?? 90 9?"
+
+def brute_force_matches(data, values, masks):
+    """Checks every offset of data against the masked pattern."""
+    return [start for start in range(len(data) - len(values) + 1)
+            if all(data[start + index] & mask == value for index, (value, mask) in enumerate(zip(values, masks)))]
+
+@pytest.mark.parametrize("text, values, masks", [
+    ("48 8B ?? 90", b"\x48\x8b\x00\x90", b"\xff\xff\x00\xff"),
+    ("488b??90", b"\x48\x8b\x00\x90", b"\xff\xff\x00\xff"),
+    ("4? ?b ff", b"\x40\x0b\xff", b"\xf0\x0f\xff"),
+])
+def test_php_valid(text, values, masks):
+    """
+    Pattern Parsing
+
+    Goal: Verify bytes, byte wildcards and nibble wildcards parse, with or without spaces.
+
+    Assertions: Assert the values and masks.
+    """
+    assert parse_hex_pattern(text) == (values, masks)
+
+@pytest.mark.parametrize("text, message", [
+    ("  ", "The pattern is empty."),
+    ("48 8", "'48 8' has an odd number of hex digits."),
+    ("48 zz", "'z' is not a hex digit or '?'."),
+    ("?? 4?", "The pattern needs at least one fully specified byte."),
+])
+def test_php_invalid(text, message):
+    """
+    Pattern Errors
+
+    Goal: Verify malformed patterns are rejected with a readable reason.
+
+    Assertions: Assert ValueError with the expected message.
+    """
+    with pytest.raises(ValueError) as error:
+        parse_hex_pattern(text)
+    assert str(error.value) == message
+
+@pytest.mark.parametrize("text", [CODE_PATTERN, "?? 8B 05", "90 9? ?0", "8b"])
+def test_hp_matches_brute_force(mock_grep_data, text):
+    """
+    Anchored Search
+
+    Goal: Verify the anchor search and masked check find exactly the offsets a byte-by-byte check finds.
+
+    Assertions: Assert the offsets match, including the planted ones for the code pattern.
+    """
+    data, offsets = mock_grep_data
+    pattern = HexPattern(text)
+    found = list(pattern.iter_matches(data, len(data)))
+    assert found == brute_force_matches(data, pattern.values, pattern.masks)
+    if text == CODE_PATTERN:
+        assert set(offsets) <= set(found)
+
+@pytest.mark.parametrize("chunk_size", [5, 100, 1024])
+def test_cs_chunk_boundaries(mock_grep_data, chunk_size):
+    """
+    Chunked Search
+
+    Goal: Verify matches across chunk boundaries are found exactly once, with their context.
+
+    Assertions: Assert the addresses, context and matched bytes equal a single-buffer search.
+    """
+    data, _ = mock_grep_data
+    pattern = HexPattern(CODE_PATTERN)
+    search = lambda buffer, start, limit: ((offset, 9) for offset in pattern.iter_matches(buffer, limit, start))
+    searcher = ChunkSearcher(search, 8, context=12)
+    matches = []
+    for offset in range(0, len(data), chunk_size):
+        matches.extend(searcher.feed(data[offset:offset + chunk_size], 0x1000 + offset))
+    matches.extend(searcher.flush())
+
+    assert matches == [(0x1000 + offset, data[max(offset - 12, 0):offset], data[offset:offset + 9], data[offset + 9:offset + 21])
+                       for offset in pattern.iter_matches(data, len(data))]
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 4096])
+def test_cs_regex_chunk_boundaries(chunk_size):
+    """
+    Chunked Regex Search
+
+    Goal: Verify regex matches, which do not overlap, are the same whatever the chunk size.
+
+    Assertions: Assert the matches equal finditer over the whole buffer.
+    """
+    data = b"".join(b"id=%d;" % number + b"\x00" * (number % 11) for number in range(300))
+    regex = compile_grep_regex(r"id=\d+;(?:\x00*id=\d+;)?")
+    searcher = ChunkSearcher(lambda buffer, start, limit: ((match.start(), len(match.group()))
+                                                           for match in iter_regex_matches(regex, buffer, start, limit)),
+                             63, context=4, overlapping=False)
+    matches = []
+    for offset in range(0, len(data), chunk_size):
+        matches.extend(searcher.feed(data[offset:offset + chunk_size], offset))
+    matches.extend(searcher.flush())
+
+    assert [(address, match) for address, _, match, _ in matches] == [(match.start(), match.group()) for match in regex.finditer(data)]
+    assert all(before == data[max(address - 4, 0):address] for address, before, _, _ in matches)
+
+@pytest.mark.parametrize("max_count", [None, 1, 2])
+def test_hgs_pipeline(tmp_path, mock_grep_echo, mock_grep_data, max_count):
+    """
+    Search Output
+
+    Goal: Verify the sink prints each match with its bytes and region, and stops at max_count.
+
+    Assertions: Assert the printed lines, and that the sink is finished once max_count is reached.
+    """
+    data, _ = mock_grep_data
+    mem_file = tmp_path / "mem"
+    mem_file.write_bytes(b"\x00" * 0x1000 + data)
+    input_dict = {"executable": [{"address": f"1000-{0x1000 + len(data):x}", "permissions": "r-xp", "file_path": "/usr/bin/app"}]}
+    pattern = HexPattern(CODE_PATTERN)
+    sink = HexGrepSink(pattern, max_count)
+
+    run_region_pipeline(str(mem_file), input_dict, ["executable"], [sink])
+
+    expected = [f"{0x1000 + offset:#018x}\t{data[offset:offset + 9].hex(' ')}\t1000-{0x1000 + len(data):x}\tr-xp\texecutable\t/usr/bin/app"
+                for offset in pattern.iter_matches(data, len(data))][:max_count]
+    assert [call.args[0] for call in mock_grep_echo.call_args_list] == expected
+    assert sink.finished == (max_count is not None)
+
+@pytest.mark.parametrize("text, ignore_case, message", [
+    ("(unclosed", False, "Invalid regex"),
+    ("a*", False, "The regex matches the empty string."),
+    ("TOKEN", True, None),
+])
+def test_cgr_compile(text, ignore_case, message):
+    """
+    Regex Compilation
+
+    Goal: Verify invalid and empty-matching regexes are rejected, and ignore_case applies.
+
+    Assertions: Assert ValueError with the expected message, or a case-insensitive match.
+    """
+    if message is None:
+        assert compile_grep_regex(text, ignore_case).search(b"x token x")
+        return
+    with pytest.raises(ValueError) as error:
+        compile_grep_regex(text, ignore_case)
+    assert message in str(error.value)
+
+def test_rgs_context(tmp_path, mock_grep_echo):
+    """
+    Regex Output
+
+    Goal: Verify each match is printed with its region and escaped context, and max_count stops the scan.
+
+    Assertions: Assert the unstyled lines and that only max_count matches are printed.
+    """
+    data = b"\x00" * 100 + b"Authorization: Bearer abc123\r\n" + b"\x00" * 100 + b"Bearer zzz\n"
+    mem_file = tmp_path / "mem"
+    mem_file.write_bytes(b"\x00" * 0x1000 + data)
+    input_dict = {"heap": [{"address": f"1000-{0x1000 + len(data):x}", "permissions": "rw-p", "file_path": "[heap]"}]}
+
+    run_region_pipeline(str(mem_file), input_dict, ["heap"], [RegexGrepSink(compile_grep_regex(r"Bearer \w+"), 6, 1)])
+
+    lines = [click.unstyle(call.args[0]) for call in mock_grep_echo.call_args_list]
+    assert lines == [f"{0x1000 + 115:#018x}\theap\t[heap]\ttion: Bearer abc123\\x0d\\x0a\\x00\\x00\\x00\\x00"]
+    assert escape_bytes(b"a\\b\xff") == "a\\\\b\\xff"
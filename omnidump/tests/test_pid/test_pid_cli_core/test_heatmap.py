@@ -0,0 +1,122 @@
+"""
+Test for Functions
+
+- classify_page (heatmap_logic)
+- classify_pages (heatmap_logic)
+- get_heatmap_cells (heatmap_logic)
+- render_heatmap (heatmap_logic)
+- PageMapSink (pipeline_logic)
+- read_bytes_show_sections with '--page-map' (pid_mapping_logic)
+"""
+import os
+from unittest import mock
+import click
+import pytest
+from omnidump import heatmap_logic
+from omnidump.config_pid import CliAppConfig
+from omnidump.heatmap_logic import PAGE_SIZE, classify_page, classify_pages, get_heatmap_cells, render_heatmap
+from omnidump.pid_mapping_logic import read_bytes_show_sections
+from omnidump.pipeline_logic import run_region_pipeline, build_sinks, PageMapSink
+
+@pytest.mark.parametrize("kind, expected", [
+    ("zero", "."),
+    ("text", "t"),
+    ("random", "E"),
+    ("pointers", "p"),
+    ("code", "c"),
+    ("counters", "d"),
+])
+def test_cp_classes(mock_classified_pages, kind, expected):
+    """
+    Page Classes
+
+    Goal: Verify each kind of page gets its class.
+
+    Assertions: Assert the class symbol of zero, text, random, pointer, code and counter pages.
+    """
+    assert classify_page(mock_classified_pages[kind]) == expected
+
+def test_cp_buffer_and_partial_page(mock_classified_pages):
+    """
+    Whole Buffers
+
+    Goal: Verify a buffer is classified page by page, including a trailing partial page.
+
+    Assertions: Assert one symbol per page in order.
+    """
+    data = mock_classified_pages["zero"] + mock_classified_pages["text"] + mock_classified_pages["random"][:2048]
+    assert classify_pages(data) == ".tE"
+
+def test_cp_numpy_matches_fallback(mock_classified_pages):
+    """
+    NumPy And Fallback
+
+    Goal: Verify the vectorized classification agrees with the page by page one.
+
+    Assertions: Assert both give the same symbols.
+    """
+    pytest.importorskip("numpy")
+    data = b"".join(mock_classified_pages.values())
+    with mock.patch.object(heatmap_logic, "numpy", None):
+        fallback = classify_pages(data)
+    assert classify_pages(data) == fallback
+
+def test_ghc_priority():
+    """
+    Heatmap Cells
+
+    Goal: Verify a cell covering several pages shows its most interesting page.
+
+    Assertions: Assert the pages per cell and that a single high-entropy page wins its cell.
+    """
+    symbols = "." * 30 + "E" + "." * 9 + "tttd"
+    cells, pages_per_cell = get_heatmap_cells(symbols, width=4, rows=2)
+    assert pages_per_cell == 6
+    assert cells == ".....Ett"
+
+def test_rh_rows():
+    """
+    Heatmap Rendering
+
+    Goal: Verify the heatmap has a legend and one row per width cells, prefixed by offsets.
+
+    Assertions: Assert the legend and row offsets once colors are removed.
+    """
+    lines = click.unstyle(render_heatmap("." * 6 + "p", width=4, rows=2)).splitlines()
+    assert lines[0].startswith(" Page Map (1 cell = 1 page(s)): E=high-entropy p=pointers")
+    assert lines[1:] == [f"  +{0:#010x} ....", f"  +{4 * PAGE_SIZE:#010x} ..p"]
+
+def test_pms_pipeline(tmp_path, mock_pipeline_memory):
+    """
+    Page Map Files
+
+    Goal: Verify '--page-map' with '--save-dir' writes a page map next to each region.
+
+    Assertions: Assert build_sinks adds the page map sink and the region's file holds one
+                symbol per page.
+    """
+    mem_path, input_dict, _ = mock_pipeline_memory
+    config = CliAppConfig(save_dir=str(tmp_path / "out"), flag_page_map=True, flag_he_sec=True)
+    sinks = build_sinks(config)
+    assert isinstance(sinks[0], PageMapSink)
+
+    run_region_pipeline(mem_path, input_dict, ["heap"], sinks)
+
+    with open(os.path.join(config.save_dir, "heap", "region-0x1000-0x2000-pages.txt"), "r") as page_map_file:
+        assert page_map_file.read() == "d\n"
+
+def test_rbss_verbose_page_map(mock_click_secho, mock_sections_data, mock_classified_pages):
+    """
+    Verbose Heatmap
+
+    Goal: Verify '--page-map' adds a heatmap of the region to the '--verbose' output.
+
+    Assertions: Assert the legend and the page classes of the region are shown.
+    """
+    config = CliAppConfig(length_out=4, verbose_out=True, flag_page_map=True)
+    with mock.patch("builtins.open", mock.mock_open(read_data=mock_classified_pages["random"])):
+        read_bytes_show_sections("/proc/self/mem", mock_sections_data, ["executable"], config)
+
+    output = click.unstyle(mock_click_secho.call_args[0][0])
+    assert " Page Map (1 cell = 1 page(s)):" in output
+    assert f"  +{0:#010x} E\n" in output
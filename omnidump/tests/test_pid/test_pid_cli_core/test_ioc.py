@@ -0,0 +1,79 @@
+"""
+Test for Functions
+
+- is_valid_ioc (ioc_logic)
+- iter_ioc_matches (ioc_logic)
+- IocSink (ioc_logic)
+"""
+import functools
+from unittest import mock
+import pytest
+from omnidump.grep_logic import escape_bytes
+from omnidump.ioc_logic import IocSink, is_valid_ioc, iter_ioc_matches
+from omnidump.pipeline_logic import iter_region_chunks, run_region_pipeline
+
+@pytest.mark.parametrize("ioc_type, value, expected", [
+    ("ipv6", b"fe80::1", True),
+    ("ipv6", b"12:34:56", False),
+    ("ipv6", b"::", False),
+    ("base64", b"QUJDREVGR0hJSktMTU5PUFFSU1RVVldYWVoxMjM0", True),
+    ("base64", b"abcdefghijklmnopqrstuvwxyzabcdefghijklmn", False),
+    ("url", b"http://a.b", True),
+])
+def test_ivi_false_positives(ioc_type, value, expected):
+    """
+    Match Validation
+
+    Goal: Verify pattern matches that are not real indicators are dropped.
+
+    Assertions: Assert addresses and mixed base64 are kept, times, '::' and plain words are not.
+    """
+    assert is_valid_ioc(ioc_type, value) is expected
+
+def test_iim_types(mock_ioc_data):
+    """
+    Combined Pattern
+
+    Goal: Verify one pass of the combined pattern tells every indicator type apart.
+
+    Assertions: Assert each planted indicator is found at its offsets with its type, and nothing else.
+    """
+    data, plants = mock_ioc_data
+    found = [(offset, ioc_type, data[offset:offset + size]) for offset, size, ioc_type in iter_ioc_matches(data, 0, len(data))]
+
+    assert found == sorted((offset, ioc_type, value) for ioc_type, value, offsets in plants for offset in offsets)
+
+def test_iim_no_library_names():
+    """
+    Domain Filtering
+
+    Goal: Verify file names with extensions that look like top-level domains are not reported as domains.
+
+    Assertions: Assert only the real domain is found.
+    """
+    data = b"\x00libc.so.6\x00setup.py\x00run.sh\x00README.md\x00www.example.com\x00"
+    assert [ioc_type for _, _, ioc_type in iter_ioc_matches(data, 0, len(data))] == ["domain"]
+
+@pytest.mark.parametrize("ioc_types", [None, ["ipv4", "url"]])
+def test_is_pipeline(tmp_path, mock_ioc_echo, mock_ioc_data, ioc_types):
+    """
+    Deduplicated Output
+
+    Goal: Verify the sink counts each indicator across chunks and prints it once with its first address.
+
+    Assertions: Assert one line per selected indicator, by type order then count, with counts and first addresses.
+    """
+    data, plants = mock_ioc_data
+    mem_file = tmp_path / "mem"
+    mem_file.write_bytes(b"\x00" * 0x1000 + data)
+    input_dict = {"heap": [{"address": f"1000-{0x1000 + len(data):x}", "permissions": "rw-p", "file_path": "[heap]"}]}
+
+    small_chunks = functools.partial(iter_region_chunks, chunk_size=1000)
+    with mock.patch('omnidump.pipeline_logic.iter_region_chunks', side_effect=small_chunks):
+        run_region_pipeline(str(mem_file), input_dict, ["heap"], [IocSink(ioc_types)])
+
+    lines = [call.args[0] for call in mock_ioc_echo.call_args_list]
+    expected = [(ioc_type, value, offsets) for ioc_type, value, offsets in plants if not ioc_types or ioc_type in ioc_types]
+    assert sorted(lines) == sorted(f"{ioc_type}\t{len(offsets)}\t{0x1000 + offsets[0]:#018x}\t{escape_bytes(value)}"
+                                   for ioc_type, value, offsets in expected)
+    assert [line.split("\t")[0] for line in lines] == [ioc_type for ioc_type, _, _ in expected]
@@ -0,0 +1,85 @@
+"""
+Test for Functions
+
+- expand_aes_key (key_scan_logic)
+- find_aes_schedules (key_scan_logic)
+- KeyScanner (key_scan_logic)
+- KeyScanSink (key_scan_logic)
+"""
+from unittest import mock
+import pytest
+from omnidump import key_scan_logic
+from omnidump.key_scan_logic import KeyScanner, KeyScanSink, expand_aes_key, find_aes_schedules
+from omnidump.pipeline_logic import run_region_pipeline
+
+@pytest.mark.parametrize("key_hex, last_word", [
+    ("2b7e151628aed2a6abf7158809cf4f3c", "b6630ca6"),
+    ("8e73b0f7da0e6452c810f32b809079e562f8ead2522c6b7b", "01002202"),
+    ("603deb1015ca71be2b73aef0857d77811f352c073b6108d72d9810a30914dff4", "706c631e"),
+])
+def test_eak_fips_vectors(key_hex, last_word):
+    """
+    Key Expansion
+
+    Goal: Verify the schedule of each key size matches the FIPS-197 appendix A examples.
+
+    Assertions: Assert the schedule length and its last word.
+    """
+    schedule = expand_aes_key(bytes.fromhex(key_hex))
+    assert len(schedule) == 4 * (len(key_hex) // 8 + 7) * 4
+    assert schedule[-4:].hex() == last_word
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_fas_candidate_paths(mock_key_data, use_numpy):
+    """
+    Schedule Search
+
+    Goal: Verify the residue and NumPy word checks find the same schedules, in both byte orders.
+
+    Assertions: Assert exactly the planted AES schedules are found, and none at an unaligned base.
+    """
+    data, expected = mock_key_data
+    if use_numpy:
+        pytest.importorskip("numpy")
+    with mock.patch.object(key_scan_logic, "numpy", key_scan_logic.numpy if use_numpy else None):
+        found = list(find_aes_schedules(data, len(data)))
+        unaligned = list(find_aes_schedules(data, len(data), base_address=2))
+
+    assert sorted(found) == [match for match in expected if match[1].startswith("aes")]
+    assert not unaligned
+
+@pytest.mark.parametrize("chunk_size", [64, 1000, 4096])
+def test_ks_chunk_boundaries(mock_key_data, chunk_size):
+    """
+    Chunked Scan
+
+    Goal: Verify every key is found exactly once whatever the chunk size.
+
+    Assertions: Assert the matches equal the planted keys at their addresses.
+    """
+    data, expected = mock_key_data
+    scanner = KeyScanner()
+    matches = []
+    for offset in range(0, len(data), chunk_size):
+        matches.extend(scanner.feed(data[offset:offset + chunk_size], 0x1000 + offset))
+    matches.extend(scanner.flush())
+
+    assert matches == [(0x1000 + offset, key_type, key) for offset, key_type, key in expected]
+
+def test_kss_pipeline(tmp_path, mock_key_echo, mock_key_data):
+    """
+    Scan Output
+
+    Goal: Verify the sink prints each key with its address, type, hex key, category and path.
+
+    Assertions: Assert one line per planted key with the region's category and path.
+    """
+    data, expected = mock_key_data
+    mem_file = tmp_path / "mem"
+    mem_file.write_bytes(b"\x00" * 0x1000 + data)
+    input_dict = {"heap": [{"address": f"1000-{0x1000 + len(data):x}", "permissions": "rw-p", "file_path": "[heap]"}]}
+
+    run_region_pipeline(str(mem_file), input_dict, ["heap"], [KeyScanSink()])
+
+    lines = [call.args[0] for call in mock_key_echo.call_args_list]
+    assert lines == [f"{0x1000 + offset:#018x}\t{key_type}\t{key.hex()}\theap\t[heap]" for offset, key_type, key in expected]
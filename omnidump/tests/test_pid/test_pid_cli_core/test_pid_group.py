@@ -0,0 +1,110 @@
+"""
+Test for Functions
+
+- get_tree_pids
+- get_cgroup_pids
+- order_pids_for_capture
+- dump_pid_group
+
+(pid_group_logic)
+"""
+import os
+import pytest
+from omnidump.pid_group_logic import get_tree_pids, get_cgroup_pids, order_pids_for_capture, dump_pid_group
+from omnidump.cli import pid_pass_flags
+
+def test_gtp_finds_child(mock_child_process):
+    """
+    Child Process
+
+    Goal: Verify the tree walk follows /proc/PID/task/*/children.
+
+    Assertions: Assert the root PID comes first and the child PID is included.
+    """
+    tree_pids = get_tree_pids(os.getpid())
+
+    assert tree_pids[0] == os.getpid()
+    assert mock_child_process.pid in tree_pids
+
+def test_gtp_missing_root():
+    """
+    Missing Root
+
+    Goal: Verify a root PID that does not exist is reported instead of returned as a one-member tree.
+
+    Assertions: Assert FileNotFoundError is raised.
+    """
+    with pytest.raises(FileNotFoundError):
+        get_tree_pids(2 ** 22 + 1)
+
+def test_gcp_directory(tmp_path):
+    """
+    cgroup Directory
+
+    Goal: Verify a cgroup directory resolves to its cgroup.procs file.
+
+    Assertions: Assert PIDs are returned sorted and deduplicated.
+    """
+    (tmp_path / "cgroup.procs").write_text("30\n10\n20\n10\n")
+
+    assert get_cgroup_pids(str(tmp_path)) == [10, 20, 30]
+
+def test_optc_largest_first(mock_estimate_capture_size, mock_group_config):
+    """
+    Largest First
+
+    Goal: Verify members are ordered by estimated capture size, largest first.
+
+    Assertions: Assert the order is [11, 12, 10].
+    """
+    assert order_pids_for_capture([10, 11, 12], mock_group_config) == [11, 12, 10]
+
+def test_dpg_member_save_dirs(mock_estimate_capture_size, mock_group_config, mock_output_path):
+    """
+    Member Save Directories
+
+    Goal: Verify each member is dumped once with its own pid-N save directory.
+
+    Assertions: Assert every PID is dumped and save_dir ends with pid-N.
+                Assert timings are returned in capture order.
+    """
+    dumped = {}
+
+    def fake_dump(config):
+        dumped[config.pid] = config.save_dir
+
+    timings = dump_pid_group([10, 11, 12], mock_group_config, fake_dump, workers=2)
+
+    assert dumped == {pid: os.path.join(mock_output_path, f"pid-{pid}") for pid in (10, 11, 12)}
+    assert [pid for pid, _, _ in timings] == [11, 12, 10]
+
+def test_dpg_empty_group(mock_group_config):
+    """
+    Empty Group
+
+    Goal: Verify an empty group is reported and nothing is dumped.
+
+    Assertions: Assert an empty timing list is returned.
+    """
+    assert not dump_pid_group([], mock_group_config, lambda config: None)
+
+def test_dpg_member_exits(mock_group_config, mock_child_process, capsys):
+    """
+    Member Exits During Capture
+
+    Goal: Verify a member that exits after the group is listed is reported, and the other members are still captured.
+
+    Assertions: Assert only the live member is timed, the exited PID is reported, and the spread is printed.
+    """
+    def exiting_dump(config):
+        if config.pid == mock_child_process.pid:
+            mock_child_process.kill()
+            mock_child_process.wait()
+        return pid_pass_flags(config)
+
+    timings = dump_pid_group([os.getpid(), mock_child_process.pid], mock_group_config, exiting_dump, workers=2)
+    output = capsys.readouterr().out
+
+    assert [pid for pid, _, _ in timings] == [os.getpid()]
+    assert f"Could not capture PID {mock_child_process.pid}" in output
+    assert "Captured 1 process(es)." in output
@@ -0,0 +1,82 @@
+"""
+Test for Functions
+
+- PointerIndex (pointer_logic)
+- format_targets (pointer_logic)
+- PointerSink (pointer_logic)
+"""
+import functools
+from unittest import mock
+import pytest
+from omnidump import pointer_logic
+from omnidump.pipeline_logic import iter_region_chunks, run_region_pipeline
+from omnidump.pointer_logic import PointerIndex, PointerSink, format_targets
+
+def test_pi_find_category(mock_pointer_data):
+    """
+    Region Lookup
+
+    Goal: Verify addresses are matched to the region that contains them, with exclusive ends.
+
+    Assertions: Assert the categories of region starts and last bytes, and None in gaps and at ends.
+    """
+    _, input_dict, _ = mock_pointer_data
+    index = PointerIndex(input_dict)
+    assert index.find_category(0x10000) == "heap"
+    assert index.find_category(0x7f0000001fff) == "shared_libs"
+    assert index.find_category(0x20000) is None
+    assert index.find_category(0xffff) is None
+    assert index.find_category(0x7ffd00001000) is None
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_pi_count_pointers(mock_pointer_data, use_numpy):
+    """
+    Word Bound Checks
+
+    Goal: Verify the array and NumPy paths count the same aligned pointers per target category.
+
+    Assertions: Assert the planted counts; the unaligned pointer, gaps and region ends are not counted, and a buffer
+    starting mid-word is read from its first aligned word.
+    """
+    mem_path, input_dict, expected = mock_pointer_data
+    if use_numpy:
+        pytest.importorskip("numpy")
+    with open(mem_path, "rb") as mem:
+        heap = mem.read()[0x10000:]
+    with mock.patch.object(pointer_logic, "numpy", pointer_logic.numpy if use_numpy else None):
+        index = PointerIndex(input_dict)
+        counts = dict(zip(index.categories, index.count_pointers(heap, 0x10000)))
+        shifted = index.count_pointers(heap[4:], 0x10004)
+
+    assert counts == expected
+    assert shifted == [2, 2, 1]
+
+def test_ft_ranked():
+    """
+    Target Format
+
+    Goal: Verify the targets are listed by descending count and empty counts are left out.
+
+    Assertions: Assert the formatted string, and '-' when there is no pointer.
+    """
+    assert format_targets(("heap", "stack", "vdso"), [2, 0, 5]) == "vdso:5,heap:2"
+    assert format_targets(("heap",), [0]) == "-"
+
+@pytest.mark.parametrize("chunk_size", [4096, 1 << 20])
+def test_ps_region_counts(mock_pointer_data, mock_pointer_echo, chunk_size):
+    """
+    Chunked Pointer Scan
+
+    Goal: Verify the sink sums the counts of every chunk of a region and prints one line per region.
+
+    Assertions: Assert the region line with its word and pointer counts, and the summary.
+    """
+    mem_path, input_dict, _ = mock_pointer_data
+    sink = PointerSink(PointerIndex(input_dict))
+    chunks = functools.partial(iter_region_chunks, chunk_size=chunk_size)
+    with mock.patch('omnidump.pipeline_logic.iter_region_chunks', side_effect=chunks):
+        run_region_pipeline(mem_path, input_dict, ["heap"], [sink])
+
+    assert mock_pointer_echo.call_args_list[0].args[0] == (
+        "0x10000-0x20000\theap\t8192\t6\theap:3,shared_libs:2,stack:1\t[heap]")
+    assert sink.total_counts == [3, 2, 1]
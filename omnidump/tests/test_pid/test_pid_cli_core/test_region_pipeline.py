@@ -0,0 +1,152 @@
+"""
+Test for Functions
+
+- StringScanner (strings_logic)
+- run_region_pipeline
+- build_sinks
+
+(pipeline_logic)
+"""
+import hashlib
+import os
+import random
+from unittest import mock
+import pytest
+from omnidump.config_pid import CliAppConfig
+from omnidump.strings_logic import StringScanner, compile_strings_pattern, iter_string_matches
+from omnidump.pid_mapping_logic import get_strings_from_bytes
+from omnidump.pipeline_logic import RegionSink, run_region_pipeline, build_sinks, iter_region_chunks
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 4096])
+def test_ss_chunk_boundaries(chunk_size, mock_gsfb_1_argument_missing_config):
+    """
+    Chunk Boundaries
+
+    Goal: Verify strings split across chunks are found exactly once and whole.
+
+    Assertions: Assert the streamed strings match get_strings_from_bytes on the whole buffer.
+    """
+    rng = random.Random(chunk_size)
+    byte_data = bytes(rng.choice(b"\x00\x01ABCDEFGH ") for _ in range(4000))
+    scanner = StringScanner(mock_gsfb_1_argument_missing_config)
+
+    found = []
+    for offset in range(0, len(byte_data), chunk_size):
+        found.extend(scanner.feed(byte_data[offset:offset + chunk_size], 0x1000 + offset))
+    found.extend(scanner.flush())
+
+    assert [text for _, text, _ in found] == list(get_strings_from_bytes(byte_data, mock_gsfb_1_argument_missing_config))
+    assert all(byte_data[address - 0x1000:].startswith(text.encode()) for address, text, _ in found)
+
+@pytest.mark.parametrize("encoding", ["utf8", "utf16le", "all"])
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_ss_encoded_chunk_boundaries(encoding, chunk_size):
+    """
+    Encoded Chunk Boundaries
+
+    Goal: Verify UTF-8 and UTF-16LE strings split across chunks, including in the
+          middle of a multibyte character, are found exactly once and whole.
+
+    Assertions: Assert the streamed hits match one scan of the whole buffer. Assert each
+                hit is reported with the encoding that reproduces its bytes.
+    """
+    config = CliAppConfig(length_out=4, encoding=encoding)
+    rng = random.Random(chunk_size)
+    parts = []
+    for _ in range(300):
+        text = "".join(rng.choice("ABCD é日😀") for _ in range(rng.randint(1, 9)))
+        parts.append(rng.choice([text.encode("utf-8"), text.encode("utf-16-le", "ignore"), bytes([rng.randrange(256)])]))
+    byte_data = b"".join(parts)
+    scanner = StringScanner(config)
+
+    found = []
+    for offset in range(0, len(byte_data), chunk_size):
+        found.extend(scanner.feed(byte_data[offset:offset + chunk_size], 0x1000 + offset))
+    found.extend(scanner.flush())
+
+    assert found == [(start + 0x1000, text, hit_encoding) for start, _, text, hit_encoding
+                     in iter_string_matches(byte_data, compile_strings_pattern(4, encoding), encoding)]
+    assert any(hit_encoding != "ascii" for _, _, hit_encoding in found)
+    codecs = {"ascii": "ascii", "utf8": "utf-8", "utf16le": "utf-16-le"}
+    assert all(byte_data[address - 0x1000:].startswith(text.encode(codecs[hit_encoding])) for address, text, hit_encoding in found)
+
+def test_irc_chunks(tmp_path):
+    """
+    Chunked Reads
+
+    Goal: Verify a region is read in chunks that cover it exactly.
+
+    Assertions: Assert chunk addresses and sizes.
+    """
+    mem_file = tmp_path / "mem"
+    mem_file.write_bytes(bytes(range(256)) * 16)
+
+    with open(mem_file, "rb") as mem:
+        chunks = list(iter_region_chunks(mem, 0x100, 0x400, chunk_size=0x200))
+
+    assert [(address, len(chunk)) for address, chunk in chunks] == [(0x100, 0x200), (0x300, 0x100)]
+
+def test_rrp_single_read(mock_pipeline_config, mock_pipeline_memory):
+    """
+    Single Pass
+
+    Goal: Verify binaries, strings and hashes are all produced from one read of the region.
+
+    Assertions: Assert the region is read once. Assert the .bin file, the strings
+                file and the sha256 manifest are written.
+    """
+    mem_path, input_dict, region = mock_pipeline_memory
+    save_dir = mock_pipeline_config.save_dir
+    sinks = build_sinks(mock_pipeline_config)
+
+    with mock.patch('omnidump.pipeline_logic.iter_region_chunks', wraps=iter_region_chunks) as mock_irc:
+        run_region_pipeline(mem_path, input_dict, ["heap"], sinks)
+
+    mock_irc.assert_called_once()
+    with open(os.path.join(save_dir, "heap", "region-0x1000-0x2000.bin"), "rb") as bin_file:
+        assert bin_file.read() == region
+    with open(os.path.join(save_dir, "heap", "region-0x1000-0x2000-strings.txt"), "r") as strings_file:
+        assert strings_file.read() == "0x000000000000100a\thello world\n"
+    with open(os.path.join(save_dir, "hashes.sha256"), "r") as hash_file:
+        assert hash_file.read() == f"{hashlib.sha256(region).hexdigest()}  heap/region-0x1000-0x2000.bin\n"
+
+def test_rrp_finished_sink(tmp_path):
+    """
+    Early Exit
+
+    Goal: Verify a sink that sets finished stops the pipeline after the current chunk.
+
+    Assertions: Assert no chunk or region after the finishing chunk is read, and every
+                sink still gets end_region, end_section and close.
+    """
+    mem_file = tmp_path / "mem"
+    mem_file.write_bytes(bytes(0x5000))
+    input_dict = {
+        "heap": [{"address": "1000-3000", "permissions": "rw-p", "file_path": "[heap]"},
+                 {"address": "3000-4000", "permissions": "rw-p", "file_path": "[heap]"}],
+        "stack": [{"address": "4000-5000", "permissions": "rw-p", "file_path": "[stack]"}],
+    }
+
+    class FirstChunkSink(RegionSink):
+        def __init__(self):
+            self.calls = []
+
+        def feed(self, address, chunk):
+            self.calls.append(("feed", address))
+            self.finished = True
+
+        def end_region(self):
+            self.calls.append(("end_region",))
+
+        def end_section(self, section_name):
+            self.calls.append(("end_section", section_name))
+
+        def close(self):
+            self.calls.append(("close",))
+
+    sink = FirstChunkSink()
+    small_chunks = lambda mem, start, end: iter_region_chunks(mem, start, end, chunk_size=0x1000)
+    with mock.patch('omnidump.pipeline_logic.iter_region_chunks', side_effect=small_chunks):
+        run_region_pipeline(str(mem_file), input_dict, ["heap", "stack"], [sink])
+
+    assert sink.calls == [("feed", 0x1000), ("end_region",), ("end_section", "heap"), ("close",)]
@@ -0,0 +1,163 @@
+"""
+Test for Functions
+
+- parse_rule_line (rules_scan_logic)
+- AhoCorasick (rules_scan_logic)
+- RuleScanner (rules_scan_logic)
+- RuleScanSink (rules_scan_logic)
+"""
+from unittest import mock
+import random
+import re
+import pytest
+from omnidump import rules_scan_logic
+from omnidump.rules_scan_logic import AhoCorasick, RuleScanner, RuleScanSink, parse_rule_file, parse_rule_line
+from omnidump.pipeline_logic import run_region_pipeline
+
+@pytest.mark.parametrize("line, expected", [
+    ("# comment", None),
+    ('cmd "cmd.exe"', ("cmd", "literal", [b"cmd.exe"])),
+    ('cmd "a\\x00b" wide', ("cmd", "literal", [b"a\x00\x00\x00b\x00"])),
+    ('cmd "ab" ascii wide', ("cmd", "literal", [b"ab", b"a\x00b\x00"])),
+    ("mz { 4D 5A }", ("mz", "literal", [b"MZ"])),
+])
+def test_prl_valid(line, expected):
+    """
+    Rule Parsing
+
+    Goal: Verify string, wide string and hex rules parse into their byte patterns.
+
+    Assertions: Assert the rule name, kind and patterns.
+    """
+    assert parse_rule_line(line) == expected
+
+@pytest.mark.parametrize("line, message", [
+    ("lonely", "expected 'RULE_NAME PATTERN'"),
+    ('cmd "open', "unterminated string"),
+    ('cmd "x" utf32', "unknown modifier(s): utf32"),
+    ("mz { 4D 5 }", "invalid hex pattern"),
+    ("re /a(/", "invalid regex"),
+    ("re /a*/", "regex matches the empty string"),
+    ("re /(?P<x>a)/", "named groups are not supported"),
+    ("re /a/x", "unknown regex flag 'x'"),
+    ("re /(?L)a/", "unsupported inline regex flag 'L'"),
+    ("bad pattern", "expected a \"string\", {hex bytes} or /regex/"),
+])
+def test_prl_invalid(line, message):
+    """
+    Rule Errors
+
+    Goal: Verify malformed rules are rejected with a readable reason.
+
+    Assertions: Assert ValueError with the expected message.
+    """
+    with pytest.raises(ValueError) as error:
+        parse_rule_line(line)
+    assert message in str(error.value)
+
+def test_prl_inline_flags():
+    """
+    Inline Regex Flags
+
+    Goal: Verify leading inline flags become compile flags, so the regex can be combined with others.
+
+    Assertions: Assert the flags are set, the prefix is removed, and the rule still matches in any case.
+    """
+    rule, kind, pattern = parse_rule_line("cmd /(?i)(?s)cmd.exe/")
+    assert (rule, kind, pattern.pattern) == ("cmd", "regex", b"cmd.exe")
+    assert pattern.flags & re.IGNORECASE and pattern.flags & re.DOTALL
+    assert list(RuleScanner([], [(rule, pattern)]).scan(b"run CMD\nEXE", 0, 12)) == [(4, "cmd")]
+
+def test_prf_line_numbers(tmp_path):
+    """
+    Rule File Errors
+
+    Goal: Verify a rule file error names the file and line.
+
+    Assertions: Assert the message starts with 'PATH:LINE:'.
+    """
+    rule_file = tmp_path / "rules.txt"
+    rule_file.write_text('ok "a"\n\nbroken {zz}\n')
+    with pytest.raises(ValueError) as error:
+        parse_rule_file(str(rule_file))
+    assert str(error.value) == f"{rule_file}:3: invalid hex pattern"
+
+@pytest.mark.parametrize("use_pyahocorasick", [False, True])
+def test_ac_matches_find(use_pyahocorasick):
+    """
+    Automaton Matches
+
+    Goal: Verify the automaton finds every occurrence, overlapping and nested, like repeated bytes.find.
+
+    Assertions: Assert the (start, pattern) pairs equal a brute-force search, with both backends.
+    """
+    if use_pyahocorasick:
+        pytest.importorskip("ahocorasick")
+    rng = random.Random(42)
+    patterns = [b"he", b"she", b"his", b"hers", b"he", b"\x00\x01"]
+    patterns += [bytes(rng.randrange(8) for _ in range(rng.randrange(2, 6))) for _ in range(50)]
+    data = bytes(rng.randrange(8) for _ in range(3000)) + b"ushers\x00\x01"
+    expected = set()
+    for index, pattern in enumerate(patterns):
+        start = data.find(pattern)
+        while start != -1:
+            expected.add((start, index))
+            start = data.find(pattern, start + 1)
+
+    with mock.patch.object(rules_scan_logic, "ahocorasick", rules_scan_logic.ahocorasick if use_pyahocorasick else None):
+        found = list(AhoCorasick(patterns).iter_matches(data))
+
+    assert sorted(found) == sorted(expected)
+
+@pytest.mark.parametrize("chunk_size", [16, 500, 4096])
+def test_rs_chunk_boundaries(mock_rule_file, mock_rule_data, chunk_size):
+    """
+    Chunked Scan
+
+    Goal: Verify literal and regex rules are matched exactly once whatever the chunk size.
+
+    Assertions: Assert the matches equal the planted rules at their addresses.
+    """
+    data, expected = mock_rule_data
+    scanner = RuleScanner(*parse_rule_file(mock_rule_file))
+    matches = []
+    for offset in range(0, len(data), chunk_size):
+        matches.extend(scanner.feed(data[offset:offset + chunk_size], 0x1000 + offset))
+    matches.extend(scanner.flush())
+
+    assert matches == [(0x1000 + offset, rule) for offset, rule in expected]
+
+def test_rs_overlapping_regexes():
+    """
+    Overlapping Regex Rules
+
+    Goal: Verify regex rules matching the same or overlapping bytes are all reported, and a backreference
+    still refers to its own rule's group.
+
+    Assertions: Assert every rule at every offset it matches at, each rule's own matches never overlapping.
+    """
+    regexes = [(rule, parse_rule_line(f"{rule} {source}")[2]) for rule, source in
+               [("word", r"/foo\w+/"), ("whole", "/foobar/"), ("tail", "/bar/"), ("double", r"/(o)\1/"), ("runs", "/a+/")]]
+    scanner = RuleScanner([], regexes)
+    data = b"xxfoobar aaa"
+
+    assert list(scanner.scan(data, 0, len(data))) == [(2, "whole"), (2, "word"), (3, "double"), (5, "tail"),
+                                                  (6, "runs"), (9, "runs")]
+
+def test_rss_pipeline(tmp_path, mock_rule_echo, mock_rule_file, mock_rule_data):
+    """
+    Scan Output
+
+    Goal: Verify the sink prints each match with its address, rule, category and path.
+
+    Assertions: Assert one line per planted rule with the region's category and path.
+    """
+    data, expected = mock_rule_data
+    mem_file = tmp_path / "mem"
+    mem_file.write_bytes(b"\x00" * 0x1000 + data)
+    input_dict = {"heap": [{"address": f"1000-{0x1000 + len(data):x}", "permissions": "rw-p", "file_path": "[heap]"}]}
+
+    run_region_pipeline(str(mem_file), input_dict, ["heap"], [RuleScanSink(*parse_rule_file(mock_rule_file))])
+
+    lines = [call.args[0] for call in mock_rule_echo.call_args_list]
+    assert lines == [f"{0x1000 + offset:#018x}\t{rule}\theap\t[heap]" for offset, rule in expected]
@@ -0,0 +1,90 @@
+"""
+Test for Functions
+
+- parse_sample_address
+- validate_sample_addresses
+- BatchReader.read
+- run_sampler / load_samples
+
+(sample_logic, remote_read_logic)
+"""
+import os
+import pytest
+from omnidump.sample_logic import parse_sample_address, build_region_index, validate_sample_addresses, run_sampler, load_samples
+from omnidump.remote_read_logic import BatchReader
+
+def test_psa_hex_and_size():
+    """
+    Address Parsing
+
+    Goal: Verify ADDRESS:SIZE values are parsed with hex or decimal addresses.
+
+    Assertions: Assert (address, size) tuples are returned.
+    """
+    assert parse_sample_address("0x7ffd1000:8") == (0x7ffd1000, 8)
+    assert parse_sample_address("4096:4") == (4096, 4)
+
+@pytest.mark.parametrize("text", ["0x1000", "0x1000:0", "zz:4"])
+def test_psa_invalid(text):
+    """
+    Invalid Address
+
+    Goal: Verify malformed values and zero sizes are rejected.
+
+    Assertions: Assert ValueError is raised.
+    """
+    with pytest.raises(ValueError):
+        parse_sample_address(text)
+
+def test_vsa_regions(mock_sample_regions):
+    """
+    Region Validation
+
+    Goal: Verify addresses are checked against the group_regions index.
+
+    Assertions: Assert heap addresses pass, guard pages, unmapped addresses and
+                values crossing the end of a region fail.
+    """
+    region_index = build_region_index(mock_sample_regions)
+    errors = validate_sample_addresses(region_index, [(0x1000, 8), (0x2ffc, 8), (0x3000, 4), (0x8000, 4)])
+
+    assert len(errors) == 3
+    assert "0x2ffc:8 is not inside a single mapped region." in errors[0]
+    assert "non-readable" in errors[1]
+
+def test_br_read_self(mock_sample_counter):
+    """
+    Batched Read
+
+    Goal: Verify every range is read in request order.
+
+    Assertions: Assert the counter bytes and its first half are returned concatenated.
+    """
+    _, address, size = mock_sample_counter
+    mem_fd = os.open("/proc/self/mem", os.O_RDONLY)
+    try:
+        data = BatchReader(os.getpid(), [(address, size), (address, 4)], mem_fd).read()
+    finally:
+        os.close(mem_fd)
+
+    assert data == (0x1122334455667788).to_bytes(8, "little") + (0x55667788).to_bytes(4, "little")
+
+def test_rs_round_trip(tmp_path, mock_sample_counter):
+    """
+    Sample File Round Trip
+
+    Goal: Verify the header and records written by run_sampler can be loaded back.
+
+    Assertions: Assert 5 samples with increasing timestamps and the counter value.
+    """
+    _, address, size = mock_sample_counter
+    output_path = str(tmp_path / "samples.bin")
+
+    samples, _ = run_sampler(os.getpid(), [(address, size)], 2000, output_path, count=5)
+    addresses, rate, records = load_samples(output_path)
+
+    assert samples == 5
+    assert addresses == [(address, size)]
+    assert rate == 2000
+    assert [timestamp for timestamp, _ in records] == sorted(timestamp for timestamp, _ in records)
+    assert int.from_bytes(records[-1][1][0], "little") == 0x1122334455667788
@@ -7,7 +7,9 @@ Test for Functions
 
 (pid_mapping_logic)
 """
+import functools
 from unittest import mock
+from omnidump.pipeline_logic import iter_region_chunks
 from omnidump.pid_mapping_logic import save_memory_strings_read_bin, save_memory_strings, save_memory_strings_write
 def test_smsw_write(
         mock_smsw_strings_list,
@@ -22,8 +24,8 @@ def test_smsw_write(
     Goal: Verify the strings are written to the file in the correct format
           and the counter is incremented. 
 
-    Assertions: Assert mock_file_handle.write() is called with a string containing: 
-                '\n--Extracted Strings --\n ['a', 'b']'. Assert that 
+    Assertions: Assert mock_file_handle.write() is called once per string with an
+                'ADDRESS<TAB>STRING' line, with tabs and newlines escaped. Assert that 
                 successful_saves_count is incremented by 1 
     """
     with mock.patch('builtins.open', new_callable=mock.mock_open) as mock_open_call:
@@ -33,13 +35,11 @@ def test_smsw_write(
 
         save_memory_strings_write(
             full_file_path=expected_full_path,
-            string_list=mock_smsw_strings_list,
+            strings=mock_smsw_strings_list,
             successful_saves_count=count
         )
 
-        expected_log_writes = [
-            mock.call(mock_smsw_log_string),
-        ]
+        expected_log_writes = [mock.call(line) for line in mock_smsw_log_string]
 
         mock_write_handle.write.assert_has_calls(expected_log_writes, any_order=False)
 
@@ -67,12 +67,12 @@ def test_smsw_os_error(
 
         save_memory_strings_write(
             full_file_path=expected_full_path,
-            string_list=mock_smsw_strings_list,
+            strings=mock_smsw_strings_list,
             successful_saves_count=count
         )
 
         #Assert 1
-        mock_open_call.assert_called_once_with(expected_full_path, 'w')
+        mock_open_call.assert_called_once_with(expected_full_path, 'w', buffering=1 << 20)
 
         #Assert 2
         error_message_printed = any(
@@ -165,11 +165,34 @@ def test_smsrb_multi_region_success(
         )
         #assert 1
         assert mock_mem_handle.seek.call_count == 2
-        assert mock_mem_handle.read.call_count == 2
 
         #assert 2
         assert mock_smsw.call_count == 2
 
+def test_smsrb_streamed_lines(tmp_path, mock_pipeline_memory, mock_sms_config):
+    """
+    Streamed Lines
+
+    Goal: Verify strings are streamed to the file with their absolute addresses,
+          including a string that spans a chunk boundary.
+
+    Assertions: Assert the file holds one 'ADDRESS<TAB>STRING' line per string in address order.
+    """
+    mem_path, _, _ = mock_pipeline_memory
+    with open(mem_path, "r+b") as mem_file:
+        mem_file.seek(0x10fa)
+        mem_file.write(b"split\tline")
+    region_dict = {"address": "1000-2000", "permissions": "rw-p", "file_path": "[heap]"}
+    count = [0]
+
+    small_chunks = functools.partial(iter_region_chunks, chunk_size=0x100)
+    with mock.patch('omnidump.pipeline_logic.iter_region_chunks', side_effect=small_chunks):
+        full_file_path = save_memory_strings_read_bin(None, count, mem_path, [region_dict], str(tmp_path), mock_sms_config)
+
+    with open(full_file_path, "r") as strings_file:
+        assert strings_file.read() == "0x000000000000100a\thello world\n0x00000000000010fa\tsplit\\tline\n"
+    assert count[0] == 1
+
 def test_smsrb_read_error(
     mock_click_secho,
     mock_output_path,
@@ -0,0 +1,136 @@
+"""
+Test for Functions
+
+- is_shared_mapping (shared_lib_logic)
+- get_mapping_key (shared_lib_logic)
+- LibraryStore (shared_lib_logic)
+- save_memory_sections (pid_mapping_logic)
+- BinarySink (pipeline_logic)
+"""
+import os
+import threading
+import pytest
+from omnidump.config_pid import CliAppConfig
+from omnidump.pid_mapping_logic import save_memory_sections
+from omnidump.pipeline_logic import build_sinks, run_region_pipeline
+from omnidump.shared_lib_logic import LibraryStore, get_mapping_key, is_shared_mapping
+
+@pytest.mark.parametrize("permissions, inode, expected", [
+    ("r-xp", "42", True), ("r--p", "42", True), ("rw-p", "42", False), ("r-xp", "0", False), ("---p", "42", False),
+])
+def test_ism_mappings(permissions, inode, expected):
+    """
+    Shared Mapping Detection
+
+    Goal: Verify only readable, non-writable file mappings are shared.
+
+    Assertions: Assert writable, anonymous and unreadable mappings are not.
+    """
+    assert is_shared_mapping(permissions, inode) is expected
+
+def test_gmk_build_id():
+    """
+    Mapping Key
+
+    Goal: Verify the key names the file, device, inode, offset, size and build ID.
+
+    Assertions: Assert the key format, and a different key for a different build ID.
+    """
+    key = get_mapping_key("/usr/lib/libc.so.6", "08:01", "1234", 0x28000, 0x1000, "abcd")
+    assert key == "libc.so.6-08.01-1234-28000-1000-abcd.bin"
+    assert get_mapping_key("/usr/lib/libc.so.6", "08:01", "1234", 0x28000, 0x1000) != key
+
+def test_ls_concurrent_claim(tmp_path):
+    """
+    Concurrent Claim
+
+    Goal: Verify one thread of many claims a key, and the others link it once committed.
+
+    Assertions: Assert a single claim, every dump file linked to the stored file, and the counters.
+    """
+    store = LibraryStore(str(tmp_path / "store"))
+    barrier = threading.Barrier(8)
+    claims = []
+
+    def dump(index):
+        full_file_path = str(tmp_path / f"dump-{index}.bin")
+        barrier.wait()
+        if store.claim("lib.bin"):
+            claims.append(index)
+            with open(store.get_temp_path("lib.bin"), "wb") as bin_file:
+                bin_file.write(b"\x7fELF" * 16)
+            store.commit("lib.bin", full_file_path)
+        else:
+            store.link("lib.bin", full_file_path)
+
+    threads = [threading.Thread(target=dump, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(claims) == 1
+    stored_inode = os.stat(store.get_path("lib.bin")).st_ino
+    assert all(os.stat(tmp_path / f"dump-{index}.bin").st_ino == stored_inode for index in range(8))
+    assert (store.stored, store.reused, store.reused_bytes) == (1, 7, 7 * 64)
+
+def test_ls_release(tmp_path):
+    """
+    Release After Failure
+
+    Goal: Verify a released key can be claimed again and leaves no stored file.
+
+    Assertions: Assert the temporary file is gone, nothing is stored, and the next claim succeeds.
+    """
+    store = LibraryStore(str(tmp_path / "store"))
+    assert store.claim("lib.bin")
+    open(store.get_temp_path("lib.bin"), "wb").close()
+    store.release("lib.bin")
+    assert not os.listdir(store.store_dir)
+    assert store.claim("lib.bin")
+
+def test_sms_dedupe_across_dumps(tmp_path, mock_shared_mem):
+    """
+    Save Sections With A Store
+
+    Goal: Verify two dumps of the same mappings store the read-only mapping once and link it into both.
+
+    Assertions: Assert identical bytes and inode for the library, distinct files for the writable mapping.
+    """
+    mem_path, input_dict = mock_shared_mem
+    store = LibraryStore(str(tmp_path / "shared-libs"))
+    for name in ("first", "second"):
+        save_memory_sections(mem_path, input_dict["shared_libs"], str(tmp_path / name), store, {"/usr/lib/libfake.so": "0102"})
+
+    library = "region-0x10000-0x12000.bin"
+    data = "region-0x12000-0x13000.bin"
+    assert (tmp_path / "first" / library).read_bytes() == (tmp_path / "second" / library).read_bytes()
+    assert os.stat(tmp_path / "first" / library).st_ino == os.stat(tmp_path / "second" / library).st_ino
+    assert os.stat(tmp_path / "first" / data).st_ino != os.stat(tmp_path / "second" / data).st_ino
+    assert (tmp_path / "second" / data).read_bytes() == b"\x11" * 0x1000
+    assert os.listdir(store.store_dir) == ["libfake.so-08.01-42-0-2000-0102.bin"]
+    assert (store.stored, store.reused) == (1, 1)
+
+def test_bs_dedupe_across_dumps(tmp_path, mock_shared_mem):
+    """
+    Binary Sink With A Store
+
+    Goal: Verify the region pipeline links the library of a second dump and still writes anonymous regions.
+
+    Assertions: Assert the library is linked into both dumps and the heap is written to each.
+    """
+    mem_path, input_dict = mock_shared_mem
+    lib_store = str(tmp_path / "fleet" / "shared-libs")
+    for name in ("first", "second"):
+        config = CliAppConfig(save_dir=str(tmp_path / "fleet" / name), flag_sec_log=True, lib_store=lib_store)
+        run_region_pipeline(mem_path, input_dict, ["shared_libs", "heap"], build_sinks(config))
+
+    first = tmp_path / "fleet" / "first"
+    second = tmp_path / "fleet" / "second"
+    library = os.path.join("shared_libs", "region-0x10000-0x12000.bin")
+    heap = os.path.join("heap", "region-0x13000-0x14000.bin")
+    assert os.stat(first / library).st_ino == os.stat(second / library).st_ino
+    assert (second / library).read_bytes()[:4] == b"\x7fELF"
+    assert os.stat(first / heap).st_ino != os.stat(second / heap).st_ino
+    assert (second / heap).read_bytes() == b"\x22" * 0x1000
+    assert len(os.listdir(lib_store)) == 1
@@ -0,0 +1,254 @@
+"""
+Test for Functions
+
+- get_dirty_page_runs
+- get_saved_regions
+- plan_region_refresh
+- get_thread_states
+- stop_process
+- refresh_saved_regions
+- snapshot_dump
+
+(snapshot_logic)
+"""
+import dataclasses
+import hashlib
+import json
+import os
+import signal
+from unittest import mock
+import pytest
+from omnidump.pipeline_logic import RegionInfo
+from omnidump.snapshot_logic import (PAGE_SIZE, get_dirty_page_runs, get_saved_regions, plan_region_refresh, stop_process,
+                                     get_process_state, get_thread_states, refresh_saved_regions, snapshot_dump)
+
+def test_gdpr_coalesce(mock_pagemap_dirty):
+    """
+    Coalesce Dirty Pages
+
+    Goal: Verify neighbouring soft-dirty pages are merged into a single run.
+
+    Assertions: Assert runs cover pages 1-2 and page 4.
+    """
+    runs = get_dirty_page_runs(mock_pagemap_dirty, 0, 5 * PAGE_SIZE)
+
+    assert runs == [(PAGE_SIZE, 3 * PAGE_SIZE), (4 * PAGE_SIZE, 5 * PAGE_SIZE)]
+
+def test_gdpr_bulk_scan(mock_pagemap_large):
+    """
+    Bulk Scan
+
+    Goal: Verify dirty runs are found across a large pagemap, including runs at both ends.
+
+    Assertions: Assert the runs match the dirty pages of the fake pagemap.
+    """
+    pagemap, page_count = mock_pagemap_large
+
+    runs = get_dirty_page_runs(pagemap, 0, page_count * PAGE_SIZE)
+
+    assert runs == [(0, PAGE_SIZE), (1000 * PAGE_SIZE, 1003 * PAGE_SIZE), ((page_count - 1) * PAGE_SIZE, page_count * PAGE_SIZE)]
+
+def test_gsr_index(tmp_path, mock_snapshot_regions):
+    """
+    Saved Region Index
+
+    Goal: Verify the regions saved by the first pass are indexed by start address.
+
+    Assertions: Assert both saved regions are returned with their permissions and files.
+    """
+    (tmp_path / "heap").mkdir()
+    (tmp_path / "heap" / "region-0x1000-0x3000.bin").write_bytes(b"\x00" * 0x2000)
+    (tmp_path / "heap" / "region-0x5000-0x6000.bin").write_bytes(b"\x00" * 0x1000)
+
+    saved_regions = get_saved_regions(mock_snapshot_regions, ["heap"], str(tmp_path))
+
+    assert saved_regions == {
+        0x1000: (0x3000, "rw-p", str(tmp_path / "heap" / "region-0x1000-0x3000.bin")),
+        0x5000: (0x6000, "r--p", str(tmp_path / "heap" / "region-0x5000-0x6000.bin")),
+    }
+
+@pytest.mark.parametrize("saved, permissions, end, expected", [
+    (None, "rw-p", 0x3000, [(0x1000, 0x3000)]),
+    ((0x3000, "r--p", "old.bin"), "r--p", 0x3000, []),
+    ((0x3000, "rw-p", "old.bin"), "rw-p", 0x3000, [(0x1000, 0x3000)]),
+    ((0x2000, "rw-p", "old.bin"), "rw-p", 0x4000, [(0x1000, 0x2000), (0x2000, 0x4000)]),
+    ((0x2000, "r--p", "old.bin"), "r--p", 0x4000, [(0x2000, 0x4000)]),
+    ((0x3000, "rw-p", "old.bin"), "rw-p", 0x2000, [(0x1000, 0x2000)]),
+])
+def test_prr_runs(saved, permissions, end, expected):
+    """
+    Refresh Plan
+
+    Goal: Verify new regions and grown ranges are read in full, read-only ranges are
+          skipped, and writable ranges are re-read up to the current end.
+
+    Assertions: Assert the planned runs for each case.
+    """
+    region = RegionInfo("heap", 1, 0x1000, end, permissions)
+
+    assert plan_region_refresh(region, saved, None, use_soft_dirty=False) == expected
+
+def test_sp_timeout_resumes():
+    """
+    Stop Timeout
+
+    Goal: Verify a process that never reports stopped is resumed before the timeout is raised.
+
+    Assertions: Assert TimeoutError is raised. Assert SIGSTOP and then SIGCONT are sent.
+    """
+    with mock.patch('omnidump.snapshot_logic.get_thread_states', return_value=["S"]), \
+         mock.patch('omnidump.snapshot_logic.STOP_TIMEOUT', 0.01), \
+         mock.patch('omnidump.snapshot_logic.os.kill') as mock_kill:
+        with pytest.raises(TimeoutError):
+            stop_process(4321)
+
+    assert mock_kill.call_args_list == [mock.call(4321, signal.SIGSTOP), mock.call(4321, signal.SIGCONT)]
+
+def test_sp_waits_for_threads():
+    """
+    Stop Every Thread
+
+    Goal: Verify stop_process keeps polling while any thread is still running after the main thread stopped.
+
+    Assertions: Assert the thread states are polled until all are stopped. Assert only SIGSTOP is sent.
+    """
+    thread_states = [["S", "S"], ["T", "R"], ["T", "t"]]
+    with mock.patch('omnidump.snapshot_logic.get_thread_states', side_effect=thread_states) as mock_states, \
+         mock.patch('omnidump.snapshot_logic.os.kill') as mock_kill:
+        assert stop_process(4321) is False
+
+    assert mock_states.call_count == 3
+    assert mock_kill.call_args_list == [mock.call(4321, signal.SIGSTOP)]
+
+def test_sp_stop_and_resume(mock_child_process):
+    """
+    Stop Process
+
+    Goal: Verify the target is reported stopped before stop_process returns.
+
+    Assertions: Assert the state is T after stopping. Assert a second call
+                reports the process as already stopped.
+    """
+    was_stopped = stop_process(mock_child_process.pid)
+    assert was_stopped is False
+    assert get_process_state(mock_child_process.pid) in ("T", "t")
+    assert set(get_thread_states(mock_child_process.pid)) <= {"T", "t"}
+    assert stop_process(mock_child_process.pid) is True
+
+    os.kill(mock_child_process.pid, signal.SIGCONT)
+
+def test_srr_full_refresh(tmp_path, mock_child_process):
+    """
+    Full Refresh
+
+    Goal: Verify the pause re-parses the maps: the saved stack is re-read, a stack
+          saved with a stale end is renamed and resized, and a region that is no
+          longer mapped is deleted. The process is resumed afterwards.
+
+    Assertions: Assert the stack file is renamed and holds the live bytes, the stale
+                file is removed, and the pause is measured.
+    """
+    with open(f"/proc/{mock_child_process.pid}/maps", "r") as maps_file:
+        address = next(line.split()[0] for line in maps_file if "[stack]" in line)
+    start, end = [int(x, 16) for x in address.split("-")]
+    (tmp_path / "stack").mkdir()
+    stale_stack = tmp_path / "stack" / f"region-{hex(start)}-{hex(end - PAGE_SIZE)}.bin"
+    stale_stack.write_bytes(b"\x00" * (end - start - PAGE_SIZE))
+    unmapped = tmp_path / "stack" / "region-0x1000-0x2000.bin"
+    unmapped.write_bytes(b"\x00" * PAGE_SIZE)
+
+    pause, refreshed, remapped = refresh_saved_regions(
+        mock_child_process.pid,
+        f"/proc/{mock_child_process.pid}/mem",
+        {start: (end - PAGE_SIZE, "rw-p", str(stale_stack)), 0x1000: (0x2000, "rw-p", str(unmapped))},
+        ["stack"],
+        str(tmp_path),
+        use_soft_dirty=False
+    )
+
+    stack_file = tmp_path / "stack" / f"region-{hex(start)}-{hex(end)}.bin"
+    assert refreshed == end - start
+    assert remapped == 2
+    assert pause > 0
+    assert not stale_stack.exists() and not unmapped.exists()
+    assert stack_file.stat().st_size == end - start
+    assert stack_file.read_bytes() != b"\x00" * (end - start)
+    assert get_process_state(mock_child_process.pid) not in ("T", "t")
+
+def test_sd_image_outputs(mock_pipeline_config, mock_pipeline_memory):
+    """
+    Outputs From The Image
+
+    Goal: Verify strings and hashes requested with '--snapshot' are produced from
+          the saved files after the pause has patched them.
+
+    Assertions: Assert the strings file holds the patched string and the manifest
+                holds the hash of the patched .bin file.
+    """
+    mem_path, input_dict, region = mock_pipeline_memory
+    bin_path = os.path.join(mock_pipeline_config.save_dir, "heap", "region-0x1000-0x2000.bin")
+    patched = region.replace(b"hello world", b"patched now")
+
+    def patch_saved_file(*args, **kwargs):
+        with open(bin_path, "wb") as bin_file:
+            bin_file.write(patched)
+        return (0.001, PAGE_SIZE, 0)
+
+    with mock.patch('omnidump.snapshot_logic.soft_dirty_supported', return_value=False), \
+         mock.patch('omnidump.snapshot_logic.refresh_saved_regions', side_effect=patch_saved_file):
+        snapshot_dump(mem_path, input_dict, mock_pipeline_config)
+
+    with open(os.path.join(mock_pipeline_config.save_dir, "heap", "region-0x1000-0x2000-strings.txt"), "r") as strings_file:
+        assert strings_file.read() == "0x000000000000100a\tpatched now\n"
+    with open(os.path.join(mock_pipeline_config.save_dir, "hashes.sha256"), "r") as hash_file:
+        assert hash_file.read() == f"{hashlib.sha256(patched).hexdigest()}  heap/region-0x1000-0x2000.bin\n"
+
+def test_sd_image_stats(mock_pipeline_config, mock_pipeline_memory):
+    """
+    Statistics From The Image
+
+    Goal: Verify '--stats' requested with '--snapshot' describes the patched .bin files.
+
+    Assertions: Assert stats.json holds the patched region, with its permissions and path.
+    """
+    mem_path, input_dict, _ = mock_pipeline_memory
+    config = dataclasses.replace(mock_pipeline_config, flag_stats=True)
+    bin_path = os.path.join(config.save_dir, "heap", "region-0x1000-0x2000.bin")
+
+    def patch_saved_file(*args, **kwargs):
+        with open(bin_path, "wb") as bin_file:
+            bin_file.write(b"\xff" * PAGE_SIZE)
+        return (0.001, PAGE_SIZE, 0)
+
+    with mock.patch('omnidump.snapshot_logic.soft_dirty_supported', return_value=False), \
+         mock.patch('omnidump.snapshot_logic.refresh_saved_regions', side_effect=patch_saved_file):
+        snapshot_dump(mem_path, input_dict, config)
+
+    with open(os.path.join(config.save_dir, "stats.json"), "r") as stats_file:
+        regions = json.load(stats_file)["regions"]
+    assert [(region["start"], region["permissions"], region["path"], region["zero_ratio"]) for region in regions] == [
+        ("0x1000", "rw-p", "[heap]", 0)]
+
+def test_sd_image_page_map(mock_pipeline_config, mock_pipeline_memory):
+    """
+    Page Map From The Image
+
+    Goal: Verify '--page-map' requested with '--snapshot' classifies the pages of the patched .bin files.
+
+    Assertions: Assert the page map of the region shows the patched text page.
+    """
+    mem_path, input_dict, _ = mock_pipeline_memory
+    config = dataclasses.replace(mock_pipeline_config, flag_page_map=True)
+    bin_path = os.path.join(config.save_dir, "heap", "region-0x1000-0x2000.bin")
+
+    def patch_saved_file(*args, **kwargs):
+        with open(bin_path, "wb") as bin_file:
+            bin_file.write(b"A" * PAGE_SIZE)
+        return (0.001, PAGE_SIZE, 0)
+
+    with mock.patch('omnidump.snapshot_logic.soft_dirty_supported', return_value=False), \
+         mock.patch('omnidump.snapshot_logic.refresh_saved_regions', side_effect=patch_saved_file):
+        snapshot_dump(mem_path, input_dict, config)
+
+    with open(os.path.join(config.save_dir, "heap", "region-0x1000-0x2000-pages.txt"), "r") as page_map_file:
+        assert page_map_file.read() == "t\n"
@@ -0,0 +1,114 @@
+"""
+Test for Functions
+
+- get_entropy (stats_logic)
+- RegionStats (stats_logic)
+- ContentStatsSink (pipeline_logic)
+- read_bytes_show_sections with '--stats' (pid_mapping_logic)
+"""
+import collections
+import json
+import math
+import os
+import random
+from unittest import mock
+import pytest
+from omnidump import stats_logic
+from omnidump.config_pid import CliAppConfig
+from omnidump.stats_logic import RegionStats, get_entropy
+from omnidump.pid_mapping_logic import read_bytes_show_sections
+from omnidump.pipeline_logic import run_region_pipeline, build_sinks, ContentStatsSink
+
+@pytest.mark.parametrize("data, expected", [
+    (b"", 0.0),
+    (b"\x00" * 4096, 0.0),
+    (b"ab" * 2048, 1.0),
+    (bytes(range(256)) * 16, 8.0),
+])
+def test_ge_known_values(data, expected):
+    """
+    Known Entropies
+
+    Goal: Verify the entropy of empty, constant, two-symbol and uniform data.
+
+    Assertions: Assert 0, 0, 1 and 8 bits per byte.
+    """
+    histogram = collections.Counter(data)
+    assert math.isclose(get_entropy([histogram[value] for value in range(256)], len(data)), expected)
+
+def test_rs_chunks_match_whole():
+    """
+    Chunked Statistics
+
+    Goal: Verify statistics accumulated over chunks equal those of the whole buffer.
+
+    Assertions: Assert the histogram, ratios and size of a zero, text and random mix.
+    """
+    rng = random.Random(38)
+    data = b"\x00" * 3000 + b"printable text\n" * 100 + bytes(rng.randrange(256) for _ in range(2500))
+    whole = RegionStats()
+    whole.update(data)
+    chunked = RegionStats()
+    for offset in range(0, len(data), 1000):
+        chunked.update(data[offset:offset + 1000])
+
+    summary = chunked.summary()
+    assert summary == whole.summary()
+    assert summary["size"] == len(data)
+    assert summary["histogram"] == [collections.Counter(data)[value] for value in range(256)]
+    assert summary["zero_ratio"] == round(data.count(0) / len(data), 6)
+    assert summary["printable_ratio"] == round(sum(byte in stats_logic.PRINTABLE_BYTES for byte in data) / len(data), 6)
+
+def test_rs_fallback_matches_numpy():
+    """
+    NumPy And Fallback
+
+    Goal: Verify the NumPy bincount path and the pure Python fallback agree.
+
+    Assertions: Assert both summaries are equal.
+    """
+    pytest.importorskip("numpy")
+    data = bytes(random.Random(38).randrange(256) for _ in range(10000))
+    fast = RegionStats()
+    fast.update(data)
+    with mock.patch.object(stats_logic, "numpy", None):
+        fallback = RegionStats()
+        fallback.update(data)
+        assert fallback.summary() == fast.summary()
+
+def test_css_pipeline(tmp_path, mock_pipeline_memory):
+    """
+    Stats File
+
+    Goal: Verify '--stats' with '--save-dir' writes one stats.json entry per region.
+
+    Assertions: Assert build_sinks adds the stats sink. Assert the entry's address,
+                size, ratios and entropy.
+    """
+    mem_path, input_dict, region = mock_pipeline_memory
+    config = CliAppConfig(save_dir=str(tmp_path / "out"), flag_stats=True, flag_he_sec=True)
+    sinks = build_sinks(config)
+    assert isinstance(sinks[0], ContentStatsSink)
+
+    run_region_pipeline(mem_path, input_dict, ["heap"], sinks)
+
+    with open(os.path.join(config.save_dir, "stats.json"), "r") as stats_file:
+        entry, = json.load(stats_file)["regions"]
+    assert (entry["section"], entry["start"], entry["end"], entry["size"]) == ("heap", "0x1000", "0x2000", 0x1000)
+    assert entry["zero_ratio"] == round((0x1000 - 11) / 0x1000, 6)
+    assert entry["printable_ratio"] == round(11 / 0x1000, 6)
+    assert 0 < entry["entropy"] < 1
+
+def test_rbss_verbose_stats(mock_click_secho, mock_sections_data):
+    """
+    Verbose Stats
+
+    Goal: Verify '--stats' adds a statistics line to the '--verbose' console output.
+
+    Assertions: Assert the entropy and ratios of the region are shown.
+    """
+    config = CliAppConfig(length_out=4, verbose_out=True, flag_stats=True)
+    with mock.patch("builtins.open", mock.mock_open(read_data=b"abababab")):
+        read_bytes_show_sections("/proc/self/mem", mock_sections_data, ["executable"], config)
+
+    assert "Stats: Entropy: 1.00 bits/byte, Zero: 0.0%, Printable: 100.0% (of 8 bytes)" in mock_click_secho.call_args[0][0]
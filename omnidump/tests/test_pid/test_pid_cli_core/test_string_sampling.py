@@ -0,0 +1,117 @@
+"""
+Test for Functions
+
+- StringSampler (strings_logic)
+- get_stride_offsets (strings_logic)
+- read_region_preview (pid_mapping_logic)
+- ConsolePreviewSink (pipeline_logic)
+"""
+import io
+from unittest import mock
+import pytest
+from omnidump.config_pid import CliAppConfig
+from omnidump.strings_logic import PAGE_SIZE, StringSampler, get_stride_offsets
+from omnidump.pid_mapping_logic import read_region_preview
+from omnidump.pipeline_logic import ConsolePreviewSink, RegionInfo
+
+def test_ss_first():
+    """
+    First Mode
+
+    Goal: Verify 'first' mode keeps the first strings and reports when it is full.
+
+    Assertions: Assert the first three strings are kept and is_full is set.
+    """
+    sampler = StringSampler(3, "first")
+    for text in ["a", "b", "c", "d"]:
+        sampler.add(text)
+
+    assert sampler.result() == ["a", "b", "c"]
+    assert sampler.is_full
+
+def test_ss_reservoir_covers_stream():
+    """
+    Reservoir Mode
+
+    Goal: Verify 'reservoir' mode keeps a sample spread over the whole stream, in the
+          order found, and gives the same sample for the same seed.
+
+    Assertions: Assert the sample size, order and repeatability. Assert, over many
+                seeds, strings from the end of the stream are picked about as often as
+                strings from its start.
+    """
+    stream = [f"string{n:04d}" for n in range(1000)]
+
+    def sample(seed):
+        sampler = StringSampler(5, "reservoir", seed=seed)
+        for text in stream:
+            sampler.add(text)
+        return sampler.result()
+
+    assert len(sample(1)) == 5 and sample(1) == sorted(sample(1)) == sample(1)
+    picks = [text for seed in range(400) for text in sample(seed)]
+    first_half = sum(text < "string0500" for text in picks)
+    assert 0.4 < first_half / len(picks) < 0.6
+
+@pytest.mark.parametrize("size, sample_count, expected", [
+    (100 * PAGE_SIZE, 4, [0, 25 * PAGE_SIZE, 50 * PAGE_SIZE, 75 * PAGE_SIZE]),
+    (2 * PAGE_SIZE, 4, [0, PAGE_SIZE]),
+    (10 * PAGE_SIZE, 3, [0, 3 * PAGE_SIZE, 6 * PAGE_SIZE]),
+])
+def test_gso_offsets(size, sample_count, expected):
+    """
+    Stride Offsets
+
+    Goal: Verify 'stride' mode spreads the pages it reads evenly over the region.
+
+    Assertions: Assert the page offsets for large and small regions.
+    """
+    assert get_stride_offsets(size, sample_count) == expected
+
+def test_rrp_stride_reads_pages():
+    """
+    Stride Reads
+
+    Goal: Verify a 'stride' preview reads only the sampled pages and keeps the first
+          string of each.
+
+    Assertions: Assert one page is read per sample and the strings come from pages
+                spread over the region. Assert the chunk size is the region size.
+    """
+    region = bytearray(64 * PAGE_SIZE)
+    for page in range(64):
+        region[page * PAGE_SIZE + 8:page * PAGE_SIZE + 16] = f"page{page:04d}".encode()
+    mem = mock.MagicMock(wraps=io.BytesIO(bytes(region)))
+    config = CliAppConfig(length_out=4, strings_out=True, sample_count=4, sample_mode="stride")
+
+    chunk_size, string_list, _ = read_region_preview(mem, 0, len(region), config)
+
+    assert chunk_size == len(region)
+    assert string_list == ["page0000", "page0016", "page0032", "page0048"]
+    assert [call.args[0] for call in mem.read.call_args_list] == [PAGE_SIZE] * 4
+
+@pytest.mark.parametrize("sample_mode", ["reservoir", "stride"])
+def test_cps_spread_preview(mock_click_secho, sample_mode):
+    """
+    Console Preview Sampling
+
+    Goal: Verify the pipeline console preview can show strings from the whole region
+          instead of only its start.
+
+    Assertions: Assert three strings are shown and at least one comes from the second
+                half of the region.
+    """
+    region = bytearray(64 * PAGE_SIZE)
+    for page in range(64):
+        region[page * PAGE_SIZE + 8:page * PAGE_SIZE + 16] = f"page{page:04d}".encode()
+    config = CliAppConfig(length_out=4, strings_out=True, sample_count=3, sample_mode=sample_mode)
+    sink = ConsolePreviewSink(config)
+
+    sink.begin_region(RegionInfo("heap", 1, 0x10000, 0x10000 + len(region)))
+    for offset in range(0, len(region), 16 * PAGE_SIZE):
+        sink.feed(0x10000 + offset, bytes(region[offset:offset + 16 * PAGE_SIZE]))
+    sink.end_region()
+
+    assert len(sink.string_list) == 3
+    assert any(text >= "page0032" for text in sink.string_list)
+    assert f"Extracted Strings: {sink.string_list}" in mock_click_secho.call_args[0][0]
@@ -0,0 +1,118 @@
+"""
+Test for Functions
+
+- get_readable_ranges (walk_logic)
+- PageCache (walk_logic)
+- PointerWalker (walk_logic)
+- format_walk_node (walk_logic)
+"""
+from omnidump.walk_logic import PAGE_SIZE, PointerWalker, WalkNode, format_walk_node, get_readable_ranges
+
+def test_grr_merged(mock_sample_regions):
+    """
+    Readable Ranges
+
+    Goal: Verify only readable regions are listed, and touching ones are merged.
+
+    Assertions: Assert the heap is kept and the guard page left out.
+    """
+    regions = dict(mock_sample_regions, anon=[{"address": "4000-5000", "permissions": "r--p", "file_path": ""},
+                                              {"address": "5000-6000", "permissions": "rw-p", "file_path": ""}])
+    assert get_readable_ranges(regions) == [(0x1000, 0x3000), (0x4000, 0x6000)]
+
+def test_pc_read_and_evict(mock_self_cache, mock_walk_nodes):
+    """
+    LRU Page Cache
+
+    Goal: Verify reads across page boundaries, hits on cached pages and eviction beyond the capacity.
+
+    Assertions: Assert the node values, one batch per miss, and no more pages kept than the capacity.
+    """
+    _, addresses = mock_walk_nodes
+    cache = mock_self_cache(capacity=2, prefetch=0)
+    assert [cache.read_word(addresses[index]) for index in (0, 1, 2)] == [0, 1, 2]
+    assert cache.misses == 1 and cache.hits == 2
+    for step in range(1, 4):
+        cache.read_word(addresses[0] + step * PAGE_SIZE)
+    assert len(cache.pages) == 2
+    assert addresses[0] & ~(PAGE_SIZE - 1) not in cache.pages
+    assert cache.read_word(0x10) is None
+    assert cache.read(addresses[1999], 24)[:8] == (1999).to_bytes(8, "little")
+
+def test_pc_prefetch(mock_self_cache, mock_walk_nodes):
+    """
+    Neighbour Prefetch
+
+    Goal: Verify a miss also reads the readable pages on each side in the same batch.
+
+    Assertions: Assert the neighbouring pages are cached after one batch, and reading them is a hit.
+    """
+    _, addresses = mock_walk_nodes
+    cache = mock_self_cache(prefetch=1)
+    page = addresses[1000] & ~(PAGE_SIZE - 1)
+    cache.read_word(page)
+    assert cache.batches == 1
+    assert page - PAGE_SIZE in cache.pages and page + PAGE_SIZE in cache.pages
+    cache.read_word(page + PAGE_SIZE)
+    assert cache.hits == 1
+
+def test_pw_list_cycle(mock_self_cache, mock_walk_nodes):
+    """
+    Linked List Walk
+
+    Goal: Verify a list is followed node by node and its loop back is reported as a cycle.
+
+    Assertions: Assert 2000 nodes in list order, one cycle from the tail to node 10, and far fewer batches than nodes.
+    """
+    _, addresses = mock_walk_nodes
+    walker = PointerWalker(mock_self_cache(), [8])
+    visited = list(walker.walk(addresses[0]))
+
+    assert [node.address for node in visited] == addresses[:2000]
+    assert [node.depth for node in visited[:3]] == [0, 1, 2]
+    assert walker.cycles == [(addresses[1999], addresses[10])]
+    assert walker.cache.batches < 100
+    assert not walker.truncated
+
+def test_pw_tree_shared(mock_self_cache, mock_walk_nodes):
+    """
+    Tree Walk
+
+    Goal: Verify both child pointers are followed level by level, a node reached twice is shared, not a cycle,
+    and a pointer outside readable memory ends its branch.
+
+    Assertions: Assert the nodes by level, one shared node, no cycle and one outside pointer.
+    """
+    _, addresses = mock_walk_nodes
+    walker = PointerWalker(mock_self_cache(), [8, 16])
+    visited = list(walker.walk(addresses[2000]))
+
+    assert [(node.address, node.depth) for node in visited] == [
+        (addresses[2000], 0), (addresses[2001], 1), (addresses[2002], 1),
+        (addresses[2003], 2), (addresses[2004], 2), (addresses[2005], 2), (addresses[2006], 2)]
+    assert walker.shared == 1
+    assert not walker.cycles
+    assert walker.outside == 1
+
+def test_pw_max_nodes(mock_self_cache, mock_walk_nodes):
+    """
+    Node Limit
+
+    Goal: Verify the walk stops at the node limit.
+
+    Assertions: Assert 100 nodes and the truncated flag.
+    """
+    _, addresses = mock_walk_nodes
+    walker = PointerWalker(mock_self_cache(), [8], max_nodes=100)
+    assert len(list(walker.walk(addresses[0]))) == 100
+    assert walker.truncated
+
+def test_fwn_unreadable():
+    """
+    Node Format
+
+    Goal: Verify a node line lists its pointers in offset order, with '?' for an unreadable field.
+
+    Assertions: Assert the formatted line.
+    """
+    assert format_walk_node(WalkNode(0x1000, 3, [0x2000, None, 0])) == "0x0000000000001000\t3\t0x2000,?,0x0"
@@ -0,0 +1,111 @@
+"""
+Test for Functions
+
+- parse_interval
+- diff_region_index
+- watch_pid_tick
+- run_watch
+
+(watch_logic)
+"""
+from unittest import mock
+import pytest
+from omnidump.pid_mapping_logic import categorize_regions
+from omnidump.watch_logic import parse_interval, diff_region_index, watch_pid_tick, run_watch
+
+@pytest.mark.parametrize("interval, seconds", [("500ms", 0.5), ("2s", 2.0), ("1m", 60.0), ("1.5", 1.5)])
+def test_pi_units(interval, seconds):
+    """
+    Interval Units
+
+    Goal: Verify ms, s, m and bare numbers are converted to seconds.
+
+    Assertions: Assert the parsed value in seconds.
+    """
+    assert parse_interval(interval) == seconds
+
+def test_pi_invalid():
+    """
+    Invalid Interval
+
+    Goal: Verify malformed intervals are rejected.
+
+    Assertions: Assert ValueError is raised.
+    """
+    with pytest.raises(ValueError):
+        parse_interval("soon")
+
+def test_dri_events(mock_watch_index_old, mock_watch_index_new):
+    """
+    Mapping Events
+
+    Goal: Verify growth, unmaps, new anon regions and permission changes are reported.
+
+    Assertions: Assert the events in address order.
+    """
+    events = diff_region_index(mock_watch_index_old, mock_watch_index_new)
+
+    assert [(event[0], event[2]) for event in events] == [
+        ("grow", 0x1000),
+        ("munmap", 0x20000),
+        ("mprotect", 0x30000),
+        ("anon", 0x40000),
+    ]
+
+def test_wpt_skip_unchanged(mock_maps_lines):
+    """
+    Unchanged Maps
+
+    Goal: Verify identical maps content skips classification entirely.
+
+    Assertions: Assert categorize_regions runs for the baseline and the change only.
+                Assert the heap growth event is reported once.
+    """
+    before, after = mock_maps_lines
+    state = {}
+    reads = [before, before, after]
+
+    with mock.patch('builtins.open', mock.mock_open()) as mock_open_call:
+        mock_open_call.return_value.read.side_effect = reads
+        with mock.patch('omnidump.watch_logic.pid_mapping_logic.categorize_regions', wraps=categorize_regions) as mock_cr:
+            assert not watch_pid_tick(1, state)
+            assert not watch_pid_tick(1, state)
+            events = watch_pid_tick(1, state)
+
+    assert mock_cr.call_count == 2
+    assert [event[0] for event in events] == ["grow"]
+
+def test_wpt_zombie_maps():
+    """
+    Zombie Process
+
+    Goal: Verify empty maps content (a zombie) is reported as an exit instead of unmapping every region.
+
+    Assertions: Assert ProcessLookupError is raised and the stored index is kept.
+    """
+    state = {"digest": b"old", "index": {0x1000: (0x2000, "heap", "rw-p", "[heap]")}}
+    with mock.patch('builtins.open', mock.mock_open(read_data=b"")):
+        with pytest.raises(ProcessLookupError):
+            watch_pid_tick(4321, state)
+    assert 0x1000 in state["index"]
+
+def test_rw_process_exit(mock_click_secho):
+    """
+    Process Exit
+
+    Goal: Verify a process that dies mid-read (ESRCH) is dropped without ending the
+          watch of the other processes.
+
+    Assertions: Assert the surviving PID is still polled on every tick and the exit is reported once.
+    """
+    def tick(pid, state, rollup):
+        if pid == 1:
+            raise ProcessLookupError(3, "No such process")
+        return []
+
+    with mock.patch('omnidump.watch_logic.watch_pid_tick', side_effect=tick) as mock_wpt:
+        run_watch([1, 2], 0.001, count=2)
+
+    assert [call.args[0] for call in mock_wpt.call_args_list].count(2) == 3
+    assert [call.args[0] for call in mock_wpt.call_args_list].count(1) == 1
+    mock_click_secho.assert_any_call("PID 1 exited.", fg="red")
@@ -0,0 +1,65 @@
+import os
+from omnidump.cli import grep, grep_bytes
+
+class TestGrepBytesFail:
+
+    def test_grep_bytes_bad_pattern_2(self, cli_runner):
+        """A pattern with an invalid digit. Returns error code 2."""
+        result = cli_runner.invoke(grep_bytes, [str(os.getpid()), "48 zz"])
+        assert result.exit_code == 2
+        assert "Error: 'z' is not a hex digit or '?'." in result.output
+
+    def test_grep_bytes_wildcards_only_2(self, cli_runner):
+        """A pattern without a fully specified byte. Returns error code 2."""
+        result = cli_runner.invoke(grep_bytes, [str(os.getpid()), "?? ??"])
+        assert result.exit_code == 2
+        assert "Error: The pattern needs at least one fully specified byte." in result.output
+
+    def test_grep_bytes_missing_process_1(self, cli_runner):
+        """A PID without a maps file. Returns error code 1."""
+        result = cli_runner.invoke(grep_bytes, ["999999999", "7f 45 4c 46"])
+        assert result.exit_code == 1
+        assert "Process file not found." in result.output
+
+class TestGrepBytesPass:
+
+    def test_grep_bytes_first_pass(self, cli_runner):
+        """Finds the first ELF header in the shared libraries of the current process and stops."""
+        result = cli_runner.invoke(grep_bytes, [str(os.getpid()), "7F 45 4C 46 ??", "-sl", "--first"])
+        assert result.exit_code == 0
+        lines = result.output.splitlines()
+        assert lines[0].split("\t")[1].startswith("7f 45 4c 46")
+        assert lines[0].split("\t")[4] == "shared_libs"
+        assert "Found 1 match(es)." in result.output
+        assert "from 1 region(s)" in result.output
+
+class TestGrepFail:
+
+    def test_grep_bad_regex_2(self, cli_runner):
+        """An unbalanced regex. Returns error code 2."""
+        result = cli_runner.invoke(grep, [str(os.getpid()), "(token"])
+        assert result.exit_code == 2
+        assert "Error: Invalid regex" in result.output
+
+    def test_grep_empty_match_2(self, cli_runner):
+        """A regex that matches the empty string. Returns error code 2."""
+        result = cli_runner.invoke(grep, [str(os.getpid()), "x*"])
+        assert result.exit_code == 2
+        assert "Error: The regex matches the empty string." in result.output
+
+    def test_grep_missing_process_1(self, cli_runner):
+        """A PID without a maps file. Returns error code 1."""
+        result = cli_runner.invoke(grep, ["999999999", "token"])
+        assert result.exit_code == 1
+        assert "Process file not found." in result.output
+
+class TestGrepPass:
+
+    def test_grep_max_count_pass(self, cli_runner):
+        """Finds an environment variable on the stack of the current process and stops at the first match."""
+        result = cli_runner.invoke(grep, [str(os.getpid()), "PATH=", "-st", "--max-count", "1", "-C", "4"])
+        assert result.exit_code == 0
+        fields = result.output.splitlines()[0].split("\t")
+        assert fields[1:3] == ["stack", "[stack]"]
+        assert "PATH=" in fields[3]
+        assert "Found 1 match(es)." in result.output
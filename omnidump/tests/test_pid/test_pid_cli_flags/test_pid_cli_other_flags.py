@@ -1,4 +1,5 @@
 """PID Other flags tests (section flags, and output flags i.e. --length, --verbose, -e, and -sl"""
+import os
 import pytest
 from omnidump.cli import dump_pid
 
@@ -194,3 +195,156 @@ def test_pid_sections_all_save_dir_pass(self_base_args, cli_runner, save_dir_bas
 
     result = cli_runner.invoke(dump_pid, args)
     assert result.exit_code == 0
+
+def test_pid_tree_self_fail(cli_runner, self_base_args):
+    """Self flag combined with tree flag. Returns error code 17."""
+    args = self_base_args + ["--tree", "1", "-e"]
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 17
+    assert "Error: '--tree' and '--cgroup' cannot be combined with a PID, '--self', or each other." in result.output
+
+def test_pid_tree_cgroup_fail(cli_runner):
+    """Tree flag combined with cgroup flag. Returns error code 17."""
+    args = ["--tree", "1", "--cgroup", "/sys/fs/cgroup/system.slice", "-e"]
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 17
+
+def test_pid_workers_without_group_fail(cli_runner, self_base_args):
+    """Workers flag without tree or cgroup flag. Returns error code 18."""
+    args = self_base_args + ["--workers", "4", "-e"]
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 18
+    assert "Error: The '--workers' flag requires '--tree' or '--cgroup'." in result.output
+
+def test_pid_tree_no_sections_fail(cli_runner):
+    """Tree flag without section flags. Returns error code 12."""
+    args = ["--tree", "1"]
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 12
+
+def test_pid_snapshot_without_log_sections_fail(cli_runner):
+    """Snapshot flag without log sections. Returns error code 19."""
+    args = ["1", "-h", "--snapshot"]
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 19
+    assert "Error: The '--snapshot' flag requires '--log-sections'." in result.output
+
+def test_pid_snapshot_self_fail(cli_runner, self_base_args, save_dir_base_args):
+    """Snapshot flag with self flag. Returns error code 20."""
+    args = self_base_args + ["-h", "--log-sections", "--snapshot"] + save_dir_base_args
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 20
+
+def test_pid_hash_log_no_sections_fail(cli_runner, self_base_args, save_dir_base_args):
+    """Self flag, log hashes, and save dir without section flags. Returns error code 21."""
+    args = self_base_args + ["--log-hashes"] + save_dir_base_args
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 21
+
+def test_pid_hash_log_no_save_dir_fail(cli_runner, self_base_args):
+    """Self flag, log hashes, and section flag without save dir. Returns error code 22."""
+    args = self_base_args + ["--log-hashes", "-h"]
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 22
+
+def test_pid_encoding_invalid_fail(cli_runner, self_base_args):
+    """Self flag, strings, and an unknown encoding. Returns click usage error code 2."""
+    args = self_base_args + ["-h", "--strings", "--encoding", "latin1"]
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 2
+
+def test_pid_dedupe_without_log_strings_fail(cli_runner, self_base_args, save_dir_base_args):
+    """Self flag, dedupe strings, and save dir without log strings. Returns error code 23."""
+    args = self_base_args + ["-h", "--dedupe-strings"] + save_dir_base_args
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 23
+    assert "Error: The '--dedupe-strings' flag requires '--log-strings'." in result.output
+
+def test_pid_top_strings_without_log_strings_fail(cli_runner, self_base_args, save_dir_base_args):
+    """Self flag, top strings, and save dir without log strings. Returns error code 25."""
+    args = self_base_args + ["-h", "--top-strings", "10"] + save_dir_base_args
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 25
+    assert "Error: The '--top-strings' flag requires '--log-strings'." in result.output
+
+def test_pid_top_by_section_without_top_strings_fail(cli_runner, self_base_args, save_dir_base_args):
+    """Self flag, log strings, and top by section without top strings. Returns error code 26."""
+    args = self_base_args + ["-h", "--log-strings", "--top-by-section"] + save_dir_base_args
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 26
+    assert "Error: The '--top-by-section' flag requires '--top-strings'." in result.output
+
+def test_pid_sample_without_preview_fail(cli_runner, self_base_args):
+    """Self flag, a section flag and sample mode without verbose or strings. Returns error code 27."""
+    args = self_base_args + ["-h", "--sample-mode", "reservoir"]
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 27
+    assert "Error: The '--sample' and '--sample-mode' flags require '--verbose' or '--strings'." in result.output
+
+def test_pid_stats_without_output_fail(cli_runner, self_base_args):
+    """Self flag, a section flag and stats without verbose or save dir. Returns error code 28."""
+    args = self_base_args + ["-h", "--stats"]
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 28
+    assert "Error: The '--stats' flag requires at least one section flag and '--verbose' or '--save-dir'." in result.output
+
+def test_pid_page_map_without_output_fail(cli_runner, self_base_args):
+    """Self flag, a section flag and page map without verbose or save dir. Returns error code 29."""
+    args = self_base_args + ["-h", "--page-map"]
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 29
+    assert "Error: The '--page-map' flag requires at least one section flag and '--verbose' or '--save-dir'." in result.output
+
+def test_pid_page_map_stride_fail(cli_runner, self_base_args):
+    """Self flag, a section flag, verbose and page map with stride sampling. Returns error code 30."""
+    args = self_base_args + ["-h", "--verbose", "--page-map", "--sample-mode", "stride"]
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 30
+    assert "Error: The '--page-map' flag reads every page and cannot be used with '--sample-mode stride'." in result.output
+
+def test_pid_tree_console_fail(cli_runner):
+    """Tree flag with a section flag but no log flag or save dir. Returns error code 24."""
+    args = ["--tree", "1", "-h"]
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 24
+
+def test_pid_dedupe_libs_without_log_sections_fail(cli_runner, self_base_args, save_dir_base_args):
+    """Self flag, dedupe libs, and save dir without log sections. Returns error code 31."""
+    args = self_base_args + ["-sl", "--log-strings", "--dedupe-libs"] + save_dir_base_args
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 31
+    assert "Error: The '--dedupe-libs' and '--lib-store' flags require '--log-sections'." in result.output
+
+def test_pid_lib_store_snapshot_fail(cli_runner, save_dir_base_args):
+    """Lib store flag with snapshot and log sections. Returns error code 32."""
+    args = ["1", "-sl", "--log-sections", "--snapshot", "--lib-store", "/tmp/libs"] + save_dir_base_args
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 32
+
+def test_pid_dedupe_libs_log_sections_pass(cli_runner, self_base_args, tmp_path):
+    """Self flag, shared libs, log sections, dedupe libs, and save dir. Returns error code 0."""
+    args = self_base_args + ["-sl", "--log-sections", "--dedupe-libs", "--save-dir", str(tmp_path)]
+
+    result = cli_runner.invoke(dump_pid, args)
+    assert result.exit_code == 0
+    assert "Shared mappings: stored" in result.output
+    assert os.listdir(tmp_path / "shared-libs")
@@ -0,0 +1,24 @@
+import os
+from omnidump.cli import pointers
+
+class TestPointersFail:
+
+    def test_pointers_bad_section_2(self, cli_runner):
+        """An unknown section name. Returns click usage error code 2."""
+        result = cli_runner.invoke(pointers, [str(os.getpid()), "--section", "bss"])
+        assert result.exit_code == 2
+
+    def test_pointers_missing_process_1(self, cli_runner):
+        """A PID without a maps file. Returns error code 1."""
+        result = cli_runner.invoke(pointers, ["999999999"])
+        assert result.exit_code == 1
+        assert "Process file not found." in result.output
+
+class TestPointersPass:
+
+    def test_pointers_self_heap_pass(self, cli_runner):
+        """Counts the pointers of the current process heap; the heap points into itself."""
+        result = cli_runner.invoke(pointers, [str(os.getpid()), "--section", "heap"])
+        assert result.exit_code == 0
+        assert "\theap\t" in result.output
+        assert "Found " in result.output and "heap:" in result.output
@@ -0,0 +1,128 @@
+import os
+from omnidump.cli import scan
+
+class TestScanEntropyFail:
+
+    def test_scan_entropy_threshold_2(self, cli_runner):
+        """A threshold a 16-byte window cannot reach. Returns error code 2."""
+        result = cli_runner.invoke(scan, ["entropy", str(os.getpid()), "--window", "16", "--threshold", "4.5"])
+        assert result.exit_code == 2
+        assert "Error: A 16-byte window cannot exceed 4 bits per byte. Lower '--threshold'." in result.output
+
+    def test_scan_entropy_missing_process_1(self, cli_runner):
+        """A PID without a maps file. Returns error code 1."""
+        result = cli_runner.invoke(scan, ["entropy", "999999999"])
+        assert result.exit_code == 1
+        assert "Process file not found." in result.output
+
+class TestScanEntropyPass:
+
+    def test_scan_entropy_self_pass(self, cli_runner):
+        """Scans the stack of the current process and reports a summary."""
+        result = cli_runner.invoke(scan, ["entropy", str(os.getpid()), "--section", "stack"])
+        assert result.exit_code == 0
+        assert "high-entropy span(s) in 1 region(s)." in result.output
+
+class TestScanKeysFail:
+
+    def test_scan_keys_missing_process_1(self, cli_runner):
+        """A PID without a maps file. Returns error code 1."""
+        result = cli_runner.invoke(scan, ["keys", "999999999"])
+        assert result.exit_code == 1
+        assert "Process file not found." in result.output
+
+class TestScanKeysPass:
+
+    def test_scan_keys_self_pass(self, cli_runner):
+        """Scans the stack of the current process and reports a summary."""
+        result = cli_runner.invoke(scan, ["keys", str(os.getpid()), "--section", "stack"])
+        assert result.exit_code == 0
+        assert "key(s) in 1 region(s)." in result.output
+
+class TestScanRulesFail:
+
+    def test_scan_rules_bad_rule_2(self, cli_runner, tmp_path):
+        """A rule file with an invalid line. Returns error code 2."""
+        rule_file = tmp_path / "rules.txt"
+        rule_file.write_text('ok "a"\nbroken {zz}\n')
+        result = cli_runner.invoke(scan, ["rules", str(rule_file), str(os.getpid())])
+        assert result.exit_code == 2
+        assert f"Error: {rule_file}:2: invalid hex pattern" in result.output
+
+    def test_scan_rules_uncombinable_regex_2(self, cli_runner, tmp_path):
+        """A verbose regex whose comment would swallow the closing parenthesis of the combined alternation. Returns error code 2."""
+        rule_file = tmp_path / "rules.txt"
+        rule_file.write_text('ok /abc/\nnote /(?x)key # trailing comment/\n')
+        result = cli_runner.invoke(scan, ["rules", str(rule_file), str(os.getpid())])
+        assert result.exit_code == 2
+        assert "Error: invalid regex rules:" in result.output
+
+    def test_scan_rules_empty_file_2(self, cli_runner, tmp_path):
+        """A rule file with only comments. Returns error code 2."""
+        rule_file = tmp_path / "rules.txt"
+        rule_file.write_text("# nothing yet\n")
+        result = cli_runner.invoke(scan, ["rules", str(rule_file), str(os.getpid())])
+        assert result.exit_code == 2
+        assert "Error: No rules found in" in result.output
+
+    def test_scan_rules_missing_process_1(self, cli_runner, tmp_path):
+        """A PID without a maps file. Returns error code 1."""
+        rule_file = tmp_path / "rules.txt"
+        rule_file.write_text('ok "a"\n')
+        result = cli_runner.invoke(scan, ["rules", str(rule_file), "999999999"])
+        assert result.exit_code == 1
+        assert "Process file not found." in result.output
+
+class TestScanRulesPass:
+
+    def test_scan_rules_self_pass(self, cli_runner, tmp_path):
+        """Scans the stack of the current process and reports a summary."""
+        rule_file = tmp_path / "rules.txt"
+        rule_file.write_text('path_var "PATH="\n')
+        result = cli_runner.invoke(scan, ["rules", str(rule_file), str(os.getpid()), "--section", "stack"])
+        assert result.exit_code == 0
+        assert "rule(s) in 1 region(s)." in result.output
+
+class TestScanIocsFail:
+
+    def test_scan_iocs_bad_type_2(self, cli_runner):
+        """An unknown indicator type. Returns error code 2."""
+        result = cli_runner.invoke(scan, ["iocs", str(os.getpid()), "--type", "hash"])
+        assert result.exit_code == 2
+        assert "Invalid value for '--type'" in result.output
+
+    def test_scan_iocs_missing_process_1(self, cli_runner):
+        """A PID without a maps file. Returns error code 1."""
+        result = cli_runner.invoke(scan, ["iocs", "999999999"])
+        assert result.exit_code == 1
+        assert "Process file not found." in result.output
+
+class TestScanIocsPass:
+
+    def test_scan_iocs_self_pass(self, cli_runner):
+        """Scans the stack of the current process for paths and reports a summary."""
+        result = cli_runner.invoke(scan, ["iocs", str(os.getpid()), "--section", "stack", "--type", "path"])
+        assert result.exit_code == 0
+        assert "unique indicator(s)" in result.output
+
+class TestScanCarveFail:
+
+    def test_scan_carve_no_save_dir_2(self, cli_runner):
+        """No '--save-dir'. Returns error code 2."""
+        result = cli_runner.invoke(scan, ["carve", str(os.getpid())])
+        assert result.exit_code == 2
+        assert "Missing option '--save-dir'" in result.output
+
+    def test_scan_carve_missing_process_1(self, cli_runner, tmp_path):
+        """A PID without a maps file. Returns error code 1."""
+        result = cli_runner.invoke(scan, ["carve", "999999999", "--save-dir", str(tmp_path)])
+        assert result.exit_code == 1
+        assert "Process file not found." in result.output
+
+class TestScanCarvePass:
+
+    def test_scan_carve_self_pass(self, cli_runner, tmp_path):
+        """Carves the stack of the current process and reports a summary."""
+        result = cli_runner.invoke(scan, ["carve", str(os.getpid()), "--section", "stack", "--save-dir", str(tmp_path)])
+        assert result.exit_code == 0
+        assert "file(s) to" in result.output
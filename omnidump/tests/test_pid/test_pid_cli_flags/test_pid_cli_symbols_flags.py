@@ -0,0 +1,27 @@
+import os
+from omnidump.cli import symbols
+
+class TestSymbolsFail:
+
+    def test_symbols_bad_lookup_2(self, cli_runner, tmp_path):
+        """A lookup address that is not a number. Returns error code 2."""
+        result = cli_runner.invoke(symbols, [str(os.getpid()), "--lookup", "main", "--cache-dir", str(tmp_path)])
+        assert result.exit_code == 2
+        assert "Invalid value for '--lookup'" in result.output
+
+    def test_symbols_missing_process_1(self, cli_runner, tmp_path):
+        """A PID without a maps file. Returns error code 1."""
+        result = cli_runner.invoke(symbols, ["999999999", "--cache-dir", str(tmp_path)])
+        assert result.exit_code == 1
+        assert "Process file not found." in result.output
+
+class TestSymbolsPass:
+
+    def test_symbols_self_pass(self, cli_runner, tmp_path):
+        """Indexes the current process twice; the second run reads the symbol tables from the cache."""
+        cache_dir = str(tmp_path / "cache")
+        first = cli_runner.invoke(symbols, [str(os.getpid()), "--cache-dir", cache_dir])
+        second = cli_runner.invoke(symbols, [str(os.getpid()), "--cache-dir", cache_dir])
+        assert first.exit_code == 0 and second.exit_code == 0
+        assert "(0 from cache)." in first.output
+        assert "\tcache\t" in second.output
@@ -0,0 +1,53 @@
+import ctypes
+import os
+from omnidump.cli import walk
+
+class TestWalkFail:
+
+    def test_walk_bad_start_2(self, cli_runner):
+        """A start address that is not a number. Returns error code 2."""
+        result = cli_runner.invoke(walk, [str(os.getpid()), "--start", "head"])
+        assert result.exit_code == 2
+        assert "Invalid value for '--start'" in result.output
+
+    def test_walk_bad_max_2(self, cli_runner):
+        """A node limit that is not a positive whole number. Returns error code 2."""
+        result = cli_runner.invoke(walk, [str(os.getpid()), "--start", "0x1000", "--max", "1.5"])
+        assert result.exit_code == 2
+        assert "Invalid value for '--max'" in result.output
+
+    def test_walk_unmapped_start_2(self, cli_runner):
+        """A start address outside readable memory. Returns error code 2."""
+        result = cli_runner.invoke(walk, [str(os.getpid()), "--start", "0x10"])
+        assert result.exit_code == 2
+        assert "is not inside a readable region" in result.output
+
+    def test_walk_missing_process_1(self, cli_runner):
+        """A PID without a maps file. Returns error code 1."""
+        result = cli_runner.invoke(walk, ["999999999", "--start", "0x1000"])
+        assert result.exit_code == 1
+        assert "Process file not found." in result.output
+
+class TestWalkPass:
+
+    def test_walk_list_cycle_pass(self, cli_runner):
+        """Walks a list in the test process with '--max 1e6' and reports the loop from its tail to its head."""
+        nodes = (ctypes.c_uint64 * 2000)()
+        for index in range(0, 2000, 2):
+            nodes[index + 1] = ctypes.addressof(nodes) + 8 * ((index + 2) % 2000)
+        start = ctypes.addressof(nodes)
+        result = cli_runner.invoke(walk, [str(os.getpid()), "--start", hex(start), "--max", "1e6"])
+        assert result.exit_code == 0
+        assert f"cycle\t{start + 8 * 1998:#018x}\t{start:#018x}" in result.output
+        assert "Visited 1000 node(s) over 1000 level(s): 1 cycle(s)" in result.output
+
+    def test_walk_tree_pass(self, cli_runner):
+        """Walks a three-node tree in the test process with two next offsets."""
+        nodes = (ctypes.c_uint64 * 9)()
+        start = ctypes.addressof(nodes)
+        nodes[1], nodes[2] = start + 24, start + 48
+        args = [str(os.getpid()), "--start", hex(start), "--next-offset", "8", "--next-offset", "16"]
+        result = cli_runner.invoke(walk, args)
+        assert result.exit_code == 0
+        assert f"{start:#018x}\t0\t{start + 24:#x},{start + 48:#x}" in result.output
+        assert "Visited 3 node(s) over 2 level(s): 0 cycle(s), 0 shared node(s)" in result.output